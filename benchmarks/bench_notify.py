@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+jord0.skills — NOTIFY Benchmark Suite
+
+Measures skills/NOTIFY/scripts/toast.py against stub notify-send, osascript
+and powershell.exe binaries (configurable delay), so numbers are comparable
+across machines and runs on any plain Linux box.
+
+Per backend it reports:
+    send_toast / send_progress / ask_choice   p50, p99 and mean latency (ms)
+    phases_ms                                 mean per-phase breakdown from
+                                              toast's timing hook
+    throughput_per_s                          sustained send_toast rate
+Plus cold `import toast` + detection time (cold and warm environment cache)
+and NotificationQueue enqueue rate.
+
+Usage:
+    python benchmarks/bench_notify.py
+    python benchmarks/bench_notify.py --quick --output results.json
+    python benchmarks/bench_notify.py --backend wsl-worker --delay 0.05
+    python benchmarks/bench_notify.py --compare baseline.json --threshold 1.25
+
+With --compare, exits 1 if any latency grew (or throughput shrank) by more
+than --threshold relative to the baseline.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent
+SCRIPTS_DIR = REPO_ROOT / "skills" / "NOTIFY" / "scripts"
+TOAST_PY = SCRIPTS_DIR / "toast.py"
+WORKER_PY = SCRIPTS_DIR / "worker.py"
+STUBS_DIR = Path(__file__).parent / "stubs"
+FAKE_POWERSHELL = REPO_ROOT / "tests" / "fixtures" / "fake_powershell.py"
+FAKE_NOTIFICATION_SERVER = REPO_ROOT / "tests" / "fixtures" / "fake_notification_server.py"
+
+RESULTS_VERSION = 1
+BACKENDS = ("linux-notify-send", "linux-dbus", "wsl-oneshot", "wsl-worker", "macos")
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def patched_env(**values: str | None):
+    """Temporarily set (or unset, with None) environment variables."""
+    saved = {key: os.environ.get(key) for key in values}
+    for key, value in values.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def load_toast():
+    """Import a fresh copy of toast.py (module-level state reset)."""
+    spec = importlib.util.spec_from_file_location("toast_under_bench", TOAST_PY)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def forced_environment(**flags) -> dict:
+    """A complete toast environment dict with the given overrides."""
+    env = {
+        "IS_WSL": False, "IS_LINUX": False, "IS_MACOS": False,
+        "LINUX_CAPS": {}, "WIN_TEMP": "/tmp", "POWERSHELL_EXE": "powershell.exe",
+        "binaries": {},
+    }
+    env.update(flags)
+    return env
+
+
+def summarize(samples: list[float]) -> dict:
+    """Latency summary in milliseconds."""
+    ordered = sorted(samples)
+    p99_index = min(len(ordered) - 1, int(round(0.99 * (len(ordered) - 1))))
+    return {
+        "n": len(ordered),
+        "p50_ms": round(statistics.median(ordered) * 1000, 3),
+        "p99_ms": round(ordered[p99_index] * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+    }
+
+
+def mean_phases(records: list[dict]) -> dict:
+    """Average the timing hook's per-phase breakdown over records."""
+    totals: dict[str, float] = {}
+    for record in records:
+        for phase, ms in record["phases_ms"].items():
+            totals[phase] = totals.get(phase, 0.0) + ms
+    return {phase: round(ms / len(records), 3) for phase, ms in sorted(totals.items())} if records else {}
+
+
+def stub_path() -> str:
+    return f"{STUBS_DIR}{os.pathsep}{os.environ.get('PATH', '')}"
+
+
+# ---------------------------------------------------------------------------
+# Backends — each yields a fresh toast module forced onto one code path
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def linux_notify_send(tmp: Path, delay: float):
+    with patched_env(PATH=stub_path(), STUB_DELAY=str(delay), NOTIFY_DBUS="0"):
+        toast = load_toast()
+        toast._environment = forced_environment(
+            IS_LINUX=True, LINUX_CAPS={"available": True, "replace": True, "actions": True},
+        )
+        yield toast
+
+
+@contextmanager
+def linux_dbus(tmp: Path, delay: float):
+    daemon = subprocess.Popen(
+        ["dbus-daemon", "--session", "--nofork", "--print-address=1"],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    server = None
+    try:
+        address = daemon.stdout.readline().strip()
+        with patched_env(DBUS_SESSION_BUS_ADDRESS=address, FAKE_NOTIFY_ACTION="1",
+                         FAKE_NOTIFY_LOG=None, NOTIFY_DBUS=None):
+            server = subprocess.Popen(
+                [sys.executable, str(FAKE_NOTIFICATION_SERVER)], stdout=subprocess.PIPE, text=True,
+            )
+            server.stdout.readline()  # "ready"
+            toast = load_toast()
+            toast._environment = forced_environment(IS_LINUX=True)
+            yield toast
+            if toast._bus is not None:
+                toast._bus.close()
+    finally:
+        for proc in (server, daemon):
+            if proc is not None:
+                proc.kill()
+                proc.wait()
+
+
+def _click_first_button(win_temp: Path, stop: threading.Event) -> None:
+    """Play Windows: answer every choice toast with button 1 as soon as it appears."""
+    answered = set()
+    while not stop.is_set():
+        for script in win_temp.glob("notify_choice_*_1.bat"):
+            if script in answered:
+                continue
+            try:
+                lines = script.read_text(encoding="ascii").splitlines()
+            except OSError:
+                continue  # Request already cleaned up
+            if len(lines) < 3:
+                continue  # Still being written
+            answer_name = lines[1].split("%TEMP%\\")[1].rstrip('"')
+            (win_temp / answer_name).write_text("1 \r\n", encoding="ascii")
+            try:
+                urllib.request.urlopen(lines[2].split('"')[1], timeout=2).read()
+            except OSError:
+                pass  # Request already finished via the file poll
+            answered.add(script)
+        time.sleep(0.001)
+
+
+@contextmanager
+def _wsl(tmp: Path, delay: float, worker: bool):
+    win_temp = tmp / "wintemp"
+    win_temp.mkdir(exist_ok=True)
+    cache = tmp / ("cache-worker" if worker else "cache-oneshot")
+    with patched_env(NOTIFY_CACHE_DIR=str(cache), FAKE_POWERSHELL_DELAY=str(delay),
+                     FAKE_POWERSHELL_LOG=None, NOTIFY_WORKER=None):
+        toast = load_toast()
+        toast._environment = forced_environment(
+            IS_WSL=True, WIN_TEMP=str(win_temp), POWERSHELL_EXE=str(FAKE_POWERSHELL),
+        )
+        proc = None
+        if worker:
+            proc = subprocess.Popen(
+                [sys.executable, str(WORKER_PY), "serve", "--powershell", str(FAKE_POWERSHELL),
+                 "--idle-timeout", "300"],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            deadline = time.monotonic() + 30
+            while toast.worker_request({"command": "ping"}, timeout=1) is None:
+                if time.monotonic() > deadline:
+                    raise RuntimeError("NOTIFY worker did not start")
+                time.sleep(0.05)
+        stop = threading.Event()
+        clicker = threading.Thread(target=_click_first_button, args=(win_temp, stop), daemon=True)
+        clicker.start()
+        try:
+            yield toast
+        finally:
+            stop.set()
+            clicker.join()
+            if proc is not None:
+                toast.worker_request({"command": "stop"}, timeout=5)
+                proc.wait(timeout=10)
+
+
+@contextmanager
+def wsl_oneshot(tmp: Path, delay: float):
+    with _wsl(tmp, delay, worker=False) as backend:
+        yield backend
+
+
+@contextmanager
+def wsl_worker(tmp: Path, delay: float):
+    with _wsl(tmp, delay, worker=True) as backend:
+        yield backend
+
+
+@contextmanager
+def macos(tmp: Path, delay: float):
+    with patched_env(PATH=stub_path(), STUB_DELAY=str(delay)):
+        toast = load_toast()
+        toast._environment = forced_environment(IS_MACOS=True)
+        yield toast
+
+
+BACKEND_SETUP = {
+    "linux-notify-send": linux_notify_send,
+    "linux-dbus": linux_dbus,
+    "wsl-oneshot": wsl_oneshot,
+    "wsl-worker": wsl_worker,
+    "macos": macos,
+}
+
+
+def backend_available(name: str) -> str | None:
+    """Return a reason the backend can't be benchmarked here, or None."""
+    if name == "linux-dbus" and not shutil.which("dbus-daemon"):
+        return "dbus-daemon not installed"
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Measurements
+# ---------------------------------------------------------------------------
+
+
+def measure_calls(toast, iterations: int) -> dict:
+    """Latency and phase breakdown of each public call."""
+    records: list[dict] = []
+    toast.set_timing_callback(records.append)
+    calls = {
+        "send_toast": lambda i: toast.send_toast("Benchmark", f"message {i} | detail"),
+        "send_progress": lambda i: toast.send_progress("Benchmark", f"step {i}", (i % 100) / 100),
+        "ask_choice": lambda i: toast.ask_choice("Continue?", ["Yes", "No"], timeout=5),
+    }
+    results = {}
+    try:
+        for name, call in calls.items():
+            n = iterations if name != "ask_choice" else max(3, iterations // 5)
+            call(-1)  # Warm-up (D-Bus connect, first worker round trip)
+            records.clear()
+            samples, ok = [], 0
+            for i in range(n):
+                start = time.perf_counter()
+                ok += bool(call(i))
+                samples.append(time.perf_counter() - start)
+            results[name] = {**summarize(samples), "ok": ok, "phases_ms": mean_phases(records)}
+    finally:
+        toast.set_timing_callback(None)
+    return results
+
+
+def measure_throughput(toast, duration: float) -> float:
+    """Sustained send_toast calls per second."""
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        toast.send_toast("Benchmark", f"burst {count}")
+        count += 1
+    return round(count / (time.perf_counter() - start), 1)
+
+
+IMPORT_SNIPPET = """
+import sys, time
+sys.path.insert(0, {scripts!r})
+start = time.perf_counter()
+import toast
+toast.get_environment()
+print(time.perf_counter() - start)
+"""
+
+
+def measure_import(tmp: Path, repeats: int) -> dict:
+    """Fresh-interpreter `import toast` + detection, cold and warm env cache."""
+    snippet = IMPORT_SNIPPET.format(scripts=str(SCRIPTS_DIR))
+    cold, warm = [], []
+    for i in range(repeats):
+        cache = tmp / f"import-cache-{i}"
+        env = {**os.environ, "NOTIFY_CACHE_DIR": str(cache)}
+        for samples in (cold, warm):  # First run populates the cache
+            out = subprocess.run(
+                [sys.executable, "-c", snippet], env=env, capture_output=True, text=True, check=True,
+            )
+            samples.append(float(out.stdout.strip()))
+    return {"cold_cache": summarize(cold), "warm_cache": summarize(warm)}
+
+
+def measure_queue(toast, count: int) -> dict:
+    """NotificationQueue.put() rate — what callers actually wait on."""
+    queue = toast.NotificationQueue(maxsize=count)
+    start = time.perf_counter()
+    for i in range(count):
+        queue.toast("Benchmark", f"queued {i}")
+    elapsed = time.perf_counter() - start
+    queue.close(timeout=30)
+    return {"enqueue_per_s": round(count / elapsed, 1), "sent": queue.sent, "dropped": queue.dropped}
+
+
+# ---------------------------------------------------------------------------
+# Regression comparison
+# ---------------------------------------------------------------------------
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """List metrics that regressed by more than threshold (ratio)."""
+    regressions = []
+
+    def check(label: str, now: float | None, before: float | None, higher_is_better: bool):
+        if not now or not before:
+            return
+        ratio = before / now if higher_is_better else now / before
+        if ratio > threshold:
+            regressions.append(f"{label}: {before} -> {now} ({ratio:.2f}x worse)")
+
+    for name, metrics in current.get("import", {}).items():
+        old = baseline.get("import", {}).get(name, {})
+        check(f"import/{name}/p50_ms", metrics.get("p50_ms"), old.get("p50_ms"), False)
+
+    for backend, metrics in current.get("backends", {}).items():
+        old = baseline.get("backends", {}).get(backend, {})
+        for call in ("send_toast", "send_progress", "ask_choice"):
+            for stat in ("p50_ms", "p99_ms"):
+                check(f"{backend}/{call}/{stat}", metrics.get(call, {}).get(stat),
+                      old.get(call, {}).get(stat), False)
+        check(f"{backend}/throughput_per_s", metrics.get("throughput_per_s"),
+              old.get("throughput_per_s"), True)
+
+    queue, old_queue = current.get("queue", {}), baseline.get("queue", {})
+    check("queue/enqueue_per_s", queue.get("enqueue_per_s"), old_queue.get("enqueue_per_s"), True)
+    return regressions
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+
+def print_report(results: dict) -> None:
+    print()
+    print("=" * 72)
+    print("  NOTIFY BENCHMARKS")
+    print("=" * 72)
+    imp = results["import"]
+    print(f"\n  import toast + detect   cold cache p50 {imp['cold_cache']['p50_ms']:>9.2f} ms"
+          f"   warm cache p50 {imp['warm_cache']['p50_ms']:>8.2f} ms")
+    for backend, metrics in results["backends"].items():
+        if "skipped" in metrics:
+            print(f"\n  {backend:<22}  SKIP — {metrics['skipped']}")
+            continue
+        print(f"\n  {backend:<22}  {metrics['throughput_per_s']:>9.1f} toasts/s sustained")
+        for call in ("send_toast", "send_progress", "ask_choice"):
+            m = metrics[call]
+            phases = "  ".join(f"{k}={v:.2f}" for k, v in m["phases_ms"].items())
+            print(f"    {call:<14} p50 {m['p50_ms']:>8.2f}  p99 {m['p99_ms']:>8.2f}  ms   [{phases}]")
+    print(f"\n  NotificationQueue       {results['queue']['enqueue_per_s']:>9.1f} enqueues/s")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NOTIFY — toast.py benchmarks")
+    parser.add_argument("--backend", action="append", choices=BACKENDS,
+                        help="Benchmark only this backend (repeatable)")
+    parser.add_argument("--iterations", type=int, default=100, help="Calls per latency sample")
+    parser.add_argument("--duration", type=float, default=2.0, help="Seconds per throughput run")
+    parser.add_argument("--import-repeats", type=int, default=5, help="Fresh interpreters per import sample")
+    parser.add_argument("--delay", type=float, default=0.0,
+                        help="Seconds each stub binary sleeps (simulated process cost)")
+    parser.add_argument("--quick", action="store_true", help="Small sample sizes (smoke test)")
+    parser.add_argument("--output", type=Path, help="Write JSON results here")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Allowed slowdown ratio versus --compare baseline")
+    args = parser.parse_args()
+
+    if args.quick:
+        args.iterations, args.duration, args.import_repeats = 10, 0.3, 2
+
+    sys.path.insert(0, str(SCRIPTS_DIR))  # toast imports dbus_notify lazily
+    os.environ.pop("NOTIFY_TIMING", None)
+    results = {
+        "version": RESULTS_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"iterations": args.iterations, "duration": args.duration,
+                   "import_repeats": args.import_repeats, "delay": args.delay},
+        "backends": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        with patched_env(NOTIFY_CACHE_DIR=str(tmp_path / "cache")):
+            results["import"] = measure_import(tmp_path, args.import_repeats)
+
+            for name in args.backend or BACKENDS:
+                reason = backend_available(name)
+                if reason:
+                    results["backends"][name] = {"skipped": reason}
+                    continue
+                with BACKEND_SETUP[name](tmp_path, args.delay) as toast:
+                    metrics = measure_calls(toast, args.iterations)
+                    metrics["throughput_per_s"] = measure_throughput(toast, args.duration)
+                results["backends"][name] = metrics
+
+            with linux_notify_send(tmp_path, args.delay) as toast:
+                results["queue"] = measure_queue(toast, args.iterations * 10)
+
+    print_report(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"  Results written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n  REGRESSIONS (>{args.threshold:.2f}x vs {args.compare}):")
+            for line in regressions:
+                print(f"    {line}")
+            sys.exit(1)
+        print(f"  No regressions vs {args.compare} (threshold {args.threshold:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+jord0.skills — PORTAL Benchmark Suite
+
+Replays a simulated portal history (one create, then --updates updates that
+append decisions, touch files and rewrite notes, seeded so runs are
+comparable) against skills/PORTAL/scripts/portal_store.py in four layouts:
+
+    full          every update rewrites the whole snapshot (the format before
+                  deltas; emulated with compact_every=1)
+    delta         base + one JSON-patch delta per update, compacted every 50
+    delta+gzip    the same, gzip-compressed
+    delta+zstd    the same, zstd-compressed (skipped without zstd support)
+
+Each update is committed to a throwaway git repository, as a synced portals
+folder would be. Per layout it reports:
+    sync_kib_per_update            bytes of portal files created or changed by
+                                   one update (what a file-sync tool uploads)
+    git_blob_kib / git_tree_kib    raw size of all blob / tree versions
+    git_pack_kib                   repository size after git gc
+    worktree_kib                   portal files on disk at the end
+    open                           p50, p99 and mean latency (ms) of a fresh
+                                   store's open(), sampled along the history
+    update                         p50, p99 and mean latency (ms) of update()
+
+Usage:
+    python benchmarks/bench_portal.py
+    python benchmarks/bench_portal.py --quick --output results.json
+    python benchmarks/bench_portal.py --updates 2000
+    python benchmarks/bench_portal.py --compare baseline.json --threshold 1.25
+
+With --compare, exits 1 if any latency or size grew by more than
+--threshold relative to the baseline.
+"""
+
+import argparse
+import importlib.util
+import json
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent
+PORTAL_STORE_PY = REPO_ROOT / "skills" / "PORTAL" / "scripts" / "portal_store.py"
+
+RESULTS_VERSION = 1
+SEED = 1729
+
+WORDS = """
+auth token refresh middleware session cookie cache redis queue worker retry backoff
+schema migration index query planner pool timeout websocket handshake rate limit
+config loader parser lexer renderer layout template fixture snapshot benchmark
+""".split()
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def load_store():
+    """Import a fresh copy of portal_store.py."""
+    spec = importlib.util.spec_from_file_location("portal_store_under_bench", PORTAL_STORE_PY)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def summarize(samples: list[float]) -> dict:
+    """Latency summary in milliseconds."""
+    ordered = sorted(samples)
+    p99_index = min(len(ordered) - 1, int(round(0.99 * (len(ordered) - 1))))
+    return {
+        "n": len(ordered),
+        "p50_ms": round(statistics.median(ordered) * 1000, 3),
+        "p99_ms": round(ordered[p99_index] * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+    }
+
+
+def history(updates: int) -> list[dict]:
+    """Field updates of one long-running portal, the same on every run."""
+    rng = random.Random(SEED)
+    phrase = lambda n: " ".join(rng.choices(WORDS, k=n))  # noqa: E731
+    decisions, files, steps = [], [], []
+    changes = []
+    for n in range(updates):
+        fields = {"session_state.notes": f"Update {n}: {phrase(12)}"}
+        roll = rng.random()
+        if roll < 0.4:
+            decisions.append(f"{phrase(6)} over {phrase(2)}")
+            fields["context.decisions"] = list(decisions)
+        elif roll < 0.7:
+            path = f"src/{rng.choice(WORDS)}/{rng.choice(WORDS)}.py"
+            if path not in files:
+                files.append(path)
+                fields["context.files_touched"] = list(files)
+        elif roll < 0.9:
+            steps = [phrase(5) for _ in range(rng.randint(1, 4))]
+            fields["continuation.next_steps"] = steps
+        else:
+            fields["context.current_state"] = f"feat/{rng.choice(WORDS)} @ {rng.getrandbits(28):07x} {phrase(4)}"
+        changes.append(fields)
+    return changes
+
+
+def git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=bench", "-c", "user.email=bench@example.invalid", *args],
+        cwd=repo, check=True, capture_output=True, text=True,
+    ).stdout
+
+
+def git_sizes(repo: Path) -> dict:
+    """Raw bytes of every blob / tree / commit, and the pack size after git gc (KiB)."""
+    raw = {}
+    for line in git(repo, "cat-file", "--batch-all-objects", "--batch-check").splitlines():
+        _, kind, size = line.split()
+        raw[kind] = raw.get(kind, 0) + int(size)
+    git(repo, "gc", "-q")
+    stats = dict(line.split(": ", 1) for line in git(repo, "count-objects", "-v").splitlines())
+    return {
+        "git_blob_kib": round(raw.get("blob", 0) / 1024, 1),
+        "git_tree_kib": round(raw.get("tree", 0) / 1024, 1),
+        "git_pack_kib": int(stats["size-pack"]),
+    }
+
+
+def file_sigs(directory: Path) -> dict[str, tuple[int, int]]:
+    return {
+        p.name: (p.stat().st_mtime_ns, p.stat().st_size)
+        for p in directory.iterdir() if p.is_file()
+    }
+
+
+# ---------------------------------------------------------------------------
+# Measurements
+# ---------------------------------------------------------------------------
+
+
+def run_layout(portal_store, tmp: Path, layout: str, changes: list[dict], use_git: bool) -> dict:
+    """Replay the history in one layout; return sizes and latencies."""
+    compression = {"delta+gzip": "gzip", "delta+zstd": "zstd"}.get(layout)
+    compact_every = 1 if layout == "full" else portal_store.COMPACT_EVERY
+    repo = tmp / layout.replace("+", "-")
+    directory = repo / "portals"
+    directory.mkdir(parents=True)
+    if use_git:
+        git(repo, "init", "-q")
+
+    store = portal_store.PortalStore(directory, compression=compression, compact_every=compact_every)
+    pid = store.create("bench", {"context.summary": "Simulated long-running task"})["portal ID"]
+    sample_every = max(len(changes) // 100, 1)
+    update_samples, open_samples = [], []
+    synced = 0
+    before = file_sigs(directory)
+    for n, fields in enumerate(changes):
+        start = time.perf_counter()
+        store.update(pid, fields)
+        update_samples.append(time.perf_counter() - start)
+        after = file_sigs(directory)
+        synced += sum(size for name, (_, size) in after.items() if before.get(name) != after[name])
+        before = after
+        if use_git:
+            git(repo, "add", "-A", "portals")
+            git(repo, "commit", "-q", "-m", f"update {n}")
+        if n % sample_every == 0 or n == len(changes) - 1:
+            start = time.perf_counter()
+            portal_store.PortalStore(directory).open(pid)  # Fresh process view: index + files
+            open_samples.append(time.perf_counter() - start)
+
+    metrics = {
+        "sync_kib_per_update": round(synced / len(changes) / 1024, 2),
+        "worktree_kib": round(sum(
+            p.stat().st_size for p in directory.iterdir() if p.is_file()
+        ) / 1024, 1),
+        "update": summarize(update_samples),
+        "open": summarize(open_samples),
+    }
+    if use_git:
+        metrics.update(git_sizes(repo))
+    return metrics
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """List metrics that regressed by more than threshold (ratio)."""
+    regressions = []
+
+    def check(label: str, now: float | None, before: float | None):
+        if not now or not before:
+            return
+        ratio = now / before
+        if ratio > threshold:
+            regressions.append(f"{label}: {before} -> {now} ({ratio:.2f}x worse)")
+
+    for layout, metrics in current.get("layouts", {}).items():
+        old = baseline.get("layouts", {}).get(layout, {})
+        for size in ("sync_kib_per_update", "git_blob_kib", "git_pack_kib", "worktree_kib"):
+            check(f"{layout}/{size}", metrics.get(size), old.get(size))
+        for call in ("open", "update"):
+            for stat in ("p50_ms", "p99_ms"):
+                check(f"{layout}/{call}/{stat}", metrics.get(call, {}).get(stat), old.get(call, {}).get(stat))
+    return regressions
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+
+def print_report(results: dict) -> None:
+    print()
+    print("=" * 72)
+    print(f"  PORTAL BENCHMARKS ({results['config']['updates']} updates)")
+    print("=" * 72)
+    for layout, metrics in results["layouts"].items():
+        if "skipped" in metrics:
+            print(f"\n  {layout:<12}  SKIP — {metrics['skipped']}")
+            continue
+        print(f"\n  {layout:<12}  written per update {metrics['sync_kib_per_update']:>7.2f} KiB"
+              f"   worktree {metrics['worktree_kib']:>6.1f} KiB")
+        if "git_pack_kib" in metrics:
+            print(f"    git        blobs {metrics['git_blob_kib']:>8.1f}  trees {metrics['git_tree_kib']:>7.1f}"
+                  f"  packed {metrics['git_pack_kib']:>6}  KiB")
+        for call in ("open", "update"):
+            m = metrics[call]
+            print(f"    {call:<10} p50 {m['p50_ms']:>8.3f}  p99 {m['p99_ms']:>8.3f}  mean {m['mean_ms']:>8.3f}  ms")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PORTAL — portal_store.py benchmarks")
+    parser.add_argument("--updates", type=int, default=500, help="Updates in the simulated history")
+    parser.add_argument("--no-git", action="store_true", help="Skip committing (no repository sizes)")
+    parser.add_argument("--quick", action="store_true", help="Short history (smoke test)")
+    parser.add_argument("--output", type=Path, help="Write JSON results here")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Allowed growth ratio versus --compare baseline")
+    args = parser.parse_args()
+
+    if args.quick:
+        args.updates = 60
+    use_git = not args.no_git and shutil.which("git") is not None
+
+    portal_store = load_store()
+    changes = history(args.updates)
+    results = {
+        "version": RESULTS_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"updates": args.updates, "seed": SEED, "git": use_git,
+                   "compact_every": portal_store.COMPACT_EVERY},
+        "layouts": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for layout in ("full", "delta", "delta+gzip", "delta+zstd"):
+            if layout == "delta+zstd":
+                try:
+                    portal_store._zstd()
+                except portal_store.PortalError as e:
+                    results["layouts"][layout] = {"skipped": str(e)}
+                    continue
+            results["layouts"][layout] = run_layout(portal_store, Path(tmp), layout, changes, use_git)
+
+    print_report(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"  Results written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n  REGRESSIONS (>{args.threshold:.2f}x vs {args.compare}):")
+            for line in regressions:
+                print(f"    {line}")
+            sys.exit(1)
+        print(f"  No regressions vs {args.compare} (threshold {args.threshold:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
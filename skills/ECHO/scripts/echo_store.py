@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+ECHO Store - Decision records with an append-only query log and a persistent index
+
+Each decision is one JSON file in echoes/ (ECHO-XXXX.json), written once at
+creation. Queries are not appended to the decision: each one is a line in
+echoes/queries.log.jsonl, so answering a query reads the decision and never
+rewrites it.
+
+Next to them, echoes/.echo-index/index.json maps every echo ID to its name,
+file, date, project, confidence and number of open unknowns, newest first.
+So:
+
+    query <id|name>   one index read + one decision read + one log append
+    list              served from the index alone, filtered and paginated
+    create            decision file and index replaced atomically
+                      (temp file + rename) under a lock
+
+The index is local, not synced (its folder carries its own .gitignore). It
+is validated against the echoes/ directory mtime on every call, which
+neither the index's own writes nor log appends touch. When git pull adds,
+replaces or removes decision files, only those are re-read; `rebuild`
+re-reads all of them.
+
+Log records:
+    {"id": "ECHO-L6C4", "question": "why not sessions?", "at": "2026-03-01T10:00:00+01:00",
+     "machine": "laptop"}
+
+Usage:
+    python echo_store.py create auth-strategy --decision "JWT with refresh tokens" \\
+        --reasoning "Stateless scales for our services" --alternatives "Sessions, API keys" \\
+        --confidence 0.8 --unknowns "Revocation at scale"
+    python echo_store.py query ECHO-L6C4 "why not session cookies?"   # or: query auth-strategy
+    python echo_store.py list --project my-api --low-confidence --open-unknowns
+    python echo_store.py history auth-strategy     # Queries logged for one echo (or all)
+    python echo_store.py rebuild
+    python echo_store.py --dir ~/.claude/echoes list
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import socket
+import string
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+INDEX_DIR = ".echo-index"
+INDEX_VERSION = 1
+LOG_NAME = "queries.log.jsonl"
+
+ID_ALPHABET = string.ascii_uppercase + string.digits
+NAME_RE = re.compile(r"^[A-Za-z0-9_-]+$")
+
+# `list --low-confidence` without a value
+LOW_CONFIDENCE = 0.6
+
+
+class EchoError(Exception):
+    """Unknown echo, invalid name, confidence or paging, or name already in use."""
+
+
+# ---------------------------------------------------------------------------
+# Locking and atomic writes
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def _lock(index_dir: Path):
+    """Serialize echo creation, index rewrites and query-log appends."""
+    with open(index_dir / "lock", "a+b") as lock:
+        try:
+            import fcntl
+        except ImportError:  # Windows
+            import msvcrt
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+            return
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _write_atomic(path: Path, data: dict, indent: int | None = 2) -> None:
+    """Swap in a decision file or the index by rename, so a concurrent query never reads a partial one."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+        f.write("\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _append(path: Path, record: dict) -> None:
+    """Log one query to queries.log.jsonl in a single write. Caller holds the lock."""
+    line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+    fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        size = os.fstat(fd).st_size
+        if size:
+            os.lseek(fd, size - 1, os.SEEK_SET)
+            if os.read(fd, 1) != b"\n":
+                line = b"\n" + line  # A killed query left half a line; history skips it
+        os.write(fd, line)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _now() -> str:
+    return datetime.now().astimezone().isoformat(timespec="seconds")
+
+
+def _timestamp(iso: str) -> float:
+    """Sort key for decision and query dates; a date without an offset counts as local time."""
+    try:
+        moment = datetime.fromisoformat(iso)
+    except (TypeError, ValueError):
+        return 0.0
+    if moment.tzinfo is None:
+        moment = moment.astimezone()
+    return moment.timestamp()
+
+
+def _confidence(value) -> float | None:
+    """0.0-1.0; percentages (0-100) as some echoes record them are scaled down."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    if value > 1:
+        value /= 100
+    return value if 0 <= value <= 1 else None
+
+
+def _split(value: str | None) -> list[str]:
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+
+class EchoStore:
+    """Echoes in one directory, fronted by .echo-index/index.json."""
+
+    def __init__(self, directory: Path):
+        self.dir = Path(directory)
+        self.index_dir = self.dir / INDEX_DIR
+        self.index_path = self.index_dir / "index.json"
+        self.log_path = self.dir / LOG_NAME
+        self._index: dict | None = None
+
+    @contextmanager
+    def _locked(self):
+        if not self.index_dir.is_dir():
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            (self.index_dir / ".gitignore").write_text("*\n", encoding="utf-8")
+        with _lock(self.index_dir):
+            yield
+
+    # -- Index -------------------------------------------------------------
+
+    def _dir_sig(self) -> str:
+        st = self.dir.stat()
+        return f"{st.st_mtime_ns}:{st.st_size}"
+
+    @staticmethod
+    def _file_sig(path: Path) -> str:
+        st = path.stat()
+        return f"{st.st_mtime_ns}:{st.st_size}"
+
+    def _summary(self, echo: dict, path: Path) -> dict:
+        """Index record for one echo: everything list filters on."""
+        decision = echo.get("decision") or {}
+        context = echo.get("context") or {}
+        return {
+            "name": echo.get("name", ""),
+            "file": path.name,
+            "sig": self._file_sig(path),
+            "created": echo.get("created", ""),
+            "ts": _timestamp(echo.get("created", "")),
+            "project": context.get("project", ""),
+            "confidence": _confidence(decision.get("confidence")),
+            "unknowns": len(decision.get("unknowns") or []),
+            "decision": decision.get("what", ""),
+        }
+
+    def _load_index(self) -> dict:
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+            if data.get("version") == INDEX_VERSION:
+                return data
+        except (OSError, ValueError):
+            pass
+        return {"version": INDEX_VERSION, "dir_sig": "", "echoes": {}}
+
+    def _save_index(self, index: dict) -> None:
+        """Store newest first so list() is a slice. Caller holds the lock."""
+        index["echoes"] = dict(sorted(
+            index["echoes"].items(),
+            key=lambda item: (item[1]["ts"], int(item[1]["sig"].split(":")[0])),  # mtime breaks ties
+            reverse=True,
+        ))
+        index["dir_sig"] = self._dir_sig()
+        _write_atomic(self.index_path, index, indent=None)
+        self._index = index
+
+    def _repair(self, index: dict, full: bool = False) -> dict:
+        """Re-read new or changed decision files, drop vanished ones. Caller holds the lock."""
+        by_file = {record["file"]: eid for eid, record in index["echoes"].items()}
+        echoes = {}
+        for path in self.dir.glob("*.json"):
+            if path.name.startswith("."):
+                continue
+            eid = by_file.get(path.name)
+            if not full and eid and index["echoes"][eid]["sig"] == self._file_sig(path):
+                echoes[eid] = index["echoes"][eid]
+                continue
+            try:
+                echo = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue  # Not an echo (or mid-sync); picked up once it changes
+            if not isinstance(echo, dict):
+                continue
+            eid = echo.get("id")
+            if isinstance(eid, str) and eid.startswith("ECHO-"):
+                echoes[eid] = self._summary(echo, path)
+        index["echoes"] = echoes
+        self._save_index(index)
+        return index
+
+    def _current(self) -> dict:
+        """Index on disk, repaired if decision files changed. Caller holds the lock."""
+        index = self._load_index()
+        if index["dir_sig"] != self._dir_sig():
+            index = self._repair(index)
+        return index
+
+    def index(self) -> dict:
+        """The index, repaired first if the directory changed behind our back."""
+        if self._index is not None and self._index["dir_sig"] == self._dir_sig():
+            return self._index
+        index = self._load_index()
+        if index["dir_sig"] != self._dir_sig():
+            with self._locked():
+                index = self._current()
+        self._index = index
+        return index
+
+    def rebuild(self) -> int:
+        """Re-read every decision file. Returns how many echoes are indexed."""
+        with self._locked():
+            return len(self._repair(self._load_index(), full=True)["echoes"])
+
+    # -- Lookup ------------------------------------------------------------
+
+    def resolve(self, ref: str) -> str:
+        """Echo ID for an ID or a name (exact, then case-insensitive)."""
+        echoes = self.index()["echoes"]
+        if ref.upper() in echoes:
+            return ref.upper()
+        matches = [eid for eid, record in echoes.items() if record["name"] == ref]
+        if not matches:
+            matches = [eid for eid, record in echoes.items() if record["name"].lower() == ref.lower()]
+        if not matches:
+            raise EchoError(f"No echo with ID or name {ref!r}")
+        return matches[0]  # Newest wins if a synced name collides
+
+    def load(self, ref: str) -> dict:
+        """The full decision record, without logging a query."""
+        eid = self.resolve(ref)
+        path = self.dir / self.index()["echoes"][eid]["file"]
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            self._index = None  # Deleted since the index was written
+            raise EchoError(f"Echo {eid} was removed") from None
+
+    def query(self, ref: str, question: str = "") -> dict:
+        """The decision record; the query is appended to the log, the record is not touched."""
+        echo = self.load(ref)
+        with self._locked():
+            _append(self.log_path, {
+                "id": echo["id"],
+                "question": question,
+                "at": _now(),
+                "machine": socket.gethostname(),
+            })
+        return echo
+
+    def history(self, ref: str | None = None, limit: int = 50) -> list[dict]:
+        """Logged queries, newest first: for one echo (including queries recorded
+        inside older decision files) or for all of them."""
+        eid = self.resolve(ref) if ref else None
+        records = []
+        try:
+            lines = self.log_path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            lines = []
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Torn line from a killed writer
+            if isinstance(record, dict) and (eid is None or record.get("id") == eid):
+                records.append(record)
+        if eid:
+            legacy = self.load(eid).get("queries") or []
+            records = [
+                {"id": eid, **q} if isinstance(q, dict) else {"id": eid, "question": str(q)}
+                for q in legacy
+            ] + records
+        records.reverse()  # Newest first; the stable sort keeps that order within one second
+        records.sort(key=lambda r: _timestamp(r.get("at") or r.get("timestamp", "")), reverse=True)
+        return records[:limit]
+
+    def list(self, project: str | None = None, max_confidence: float | None = None,
+             open_unknowns: bool = False, limit: int = 20, page: int = 1) -> dict:
+        """One page of echoes, newest first, filtered on indexed fields only."""
+        if limit < 1 or page < 1:
+            raise EchoError(f"limit and page must be at least 1 (got limit={limit}, page={page})")
+        selected = [
+            (eid, record) for eid, record in self.index()["echoes"].items()
+            if (project is None or record["project"].lower() == project.lower())
+            and (max_confidence is None
+                 or (record["confidence"] is not None and record["confidence"] < max_confidence))
+            and (not open_unknowns or record["unknowns"] > 0)
+        ]
+        start = (page - 1) * limit
+        return {
+            "total": len(selected),
+            "page": page,
+            "pages": max((len(selected) + limit - 1) // limit, 1),
+            "echoes": [
+                {"id": eid, **{k: v for k, v in record.items() if k not in ("file", "sig", "ts")}}
+                for eid, record in selected[start:start + limit]
+            ],
+        }
+
+    # -- Changes -----------------------------------------------------------
+
+    def _new_id(self, taken) -> str:
+        while True:
+            eid = "ECHO-" + "".join(random.choices(ID_ALPHABET, k=4))
+            if eid not in taken and not (self.dir / f"{eid}.json").exists():
+                return eid
+
+    def create(self, name: str, decision: dict, context: dict) -> dict:
+        """Save a new decision. decision/context hold the record's fields as documented."""
+        if not NAME_RE.match(name):
+            raise EchoError("Echo names may only contain letters, digits, '-' and '_'")
+        if decision.get("confidence") is not None:
+            confidence = _confidence(decision["confidence"])
+            if confidence is None:
+                raise EchoError("Confidence must be 0.0-1.0 (or a percentage)")
+            decision["confidence"] = confidence
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with self._locked():
+            index = self._current()
+            for eid, record in index["echoes"].items():
+                if record["name"] == name:
+                    raise EchoError(f"Name {name!r} is already used by {eid}")
+            eid = self._new_id(index["echoes"])
+            echo = {
+                "id": eid,
+                "name": name,
+                "created": _now(),
+                "decision": decision,
+                "context": {"project": Path.cwd().name, **{k: v for k, v in context.items() if v}},
+            }
+            path = self.dir / f"{eid}.json"
+            _write_atomic(path, echo)
+            index["echoes"][eid] = self._summary(echo, path)
+            self._save_index(index)
+        return echo
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ECHO — decision store")
+    parser.add_argument("--dir", type=Path, default=Path("echoes"),
+                        help="Echoes directory (default: ./echoes)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    create = sub.add_parser("create", help="Capture a decision")
+    create.add_argument("name")
+    create.add_argument("--decision", required=True, help="What was decided")
+    create.add_argument("--reasoning", default="", help="Why")
+    create.add_argument("--alternatives", help="Comma-separated rejected options")
+    create.add_argument("--confidence", help="0.0-1.0")
+    create.add_argument("--unknowns", help="Comma-separated open questions")
+    create.add_argument("--project", help="Project name (default: current directory)")
+    create.add_argument("--context", help="Additional session context")
+    create.add_argument("--files", help="Comma-separated related files")
+
+    query = sub.add_parser("query", help="Print a decision and log the question")
+    query.add_argument("ref")
+    query.add_argument("question", nargs="?", default="")
+
+    list_ = sub.add_parser("list", help="Echoes, newest first")
+    list_.add_argument("--project")
+    list_.add_argument("--low-confidence", type=float, nargs="?", const=LOW_CONFIDENCE,
+                       metavar="BELOW", help=f"Confidence below BELOW (default {LOW_CONFIDENCE})")
+    list_.add_argument("--open-unknowns", action="store_true", help="Only echoes with unknowns")
+    list_.add_argument("--limit", type=int, default=20)
+    list_.add_argument("--page", type=int, default=1)
+
+    history = sub.add_parser("history", help="Logged queries, newest first")
+    history.add_argument("ref", nargs="?", help="One echo (default: all)")
+    history.add_argument("--limit", type=int, default=50)
+
+    sub.add_parser("rebuild", help="Re-read every decision file into the index")
+    args = parser.parse_args()
+
+    if args.command != "create" and not args.dir.is_dir():
+        print(json.dumps({"error": f"Echoes directory not found: {args.dir}"}))
+        sys.exit(1)
+
+    store = EchoStore(args.dir)
+    try:
+        if args.command == "create":
+            decision = {
+                "what": args.decision,
+                "reasoning": args.reasoning,
+                "alternatives_rejected": _split(args.alternatives),
+                "confidence": args.confidence,
+                "unknowns": _split(args.unknowns),
+            }
+            context = {"project": args.project, "session": args.context, "related_files": _split(args.files)}
+            result = store.create(args.name, decision, context)
+        elif args.command == "query":
+            result = store.query(args.ref, args.question)
+        elif args.command == "list":
+            result = store.list(project=args.project, max_confidence=args.low_confidence,
+                                open_unknowns=args.open_unknowns, limit=args.limit, page=args.page)
+        elif args.command == "history":
+            result = {"queries": store.history(args.ref, limit=args.limit)}
+        else:
+            result = {"indexed": store.rebuild()}
+    except EchoError as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+NOTIFY D-Bus Backend - org.freedesktop.Notifications without notify-send
+
+A minimal, standard-library D-Bus client: just enough of the wire protocol
+(SASL EXTERNAL auth, message marshalling, method calls, signals) to talk to
+the desktop notification server over one persistent session-bus connection.
+toast.py uses it on Linux and falls back to spawning notify-send when the bus
+is unavailable.
+
+Usage:
+    from dbus_notify import NotificationBus
+
+    bus = NotificationBus()                     # $DBUS_SESSION_BUS_ADDRESS
+    nid = bus.notify("Building", "Step 1")
+    bus.notify("Building", "Step 2", replaces_id=nid)
+
+    nid = bus.notify("Deploy?", actions=["1", "Yes", "2", "No"])
+    action = bus.wait_for_action(nid, timeout=60)   # "1", "2", "" (closed) or None
+
+Variants are passed as (signature, value) tuples, e.g. hints
+{"urgency": ("y", 2)}, and returned unwrapped.
+"""
+
+import collections
+import os
+import socket
+import struct
+import threading
+import time
+from urllib.parse import unquote
+
+NOTIFICATIONS_NAME = "org.freedesktop.Notifications"
+NOTIFICATIONS_PATH = "/org/freedesktop/Notifications"
+BUS_NAME = "org.freedesktop.DBus"
+BUS_PATH = "/org/freedesktop/DBus"
+
+METHOD_CALL, METHOD_RETURN, ERROR, SIGNAL = 1, 2, 3, 4
+
+# Header field code -> (name, signature)
+_HEADER_FIELDS = {
+    1: ("path", "o"),
+    2: ("interface", "s"),
+    3: ("member", "s"),
+    4: ("error_name", "s"),
+    5: ("reply_serial", "u"),
+    6: ("destination", "s"),
+    7: ("sender", "s"),
+    8: ("signature", "g"),
+}
+_FIELD_CODES = {name: (code, sig) for code, (name, sig) in _HEADER_FIELDS.items()}
+
+_ALIGN = {
+    "y": 1, "b": 4, "n": 2, "q": 2, "i": 4, "u": 4, "x": 8, "t": 8, "d": 8,
+    "h": 4, "s": 4, "o": 4, "g": 1, "v": 1, "a": 4, "(": 8, "{": 8,
+}
+_FIXED = {
+    "y": "B", "b": "I", "n": "h", "q": "H", "i": "i", "u": "I",
+    "x": "q", "t": "Q", "d": "d", "h": "I",
+}
+
+
+class DBusError(Exception):
+    """Error reply from the bus, or a broken connection."""
+
+
+# ---------------------------------------------------------------------------
+# Marshalling
+# ---------------------------------------------------------------------------
+
+def split_signature(signature: str) -> list[str]:
+    """Split a signature into complete types: "sa{sv}i" -> ["s", "a{sv}", "i"]."""
+    types = []
+    i = 0
+    while i < len(signature):
+        end = _type_end(signature, i)
+        types.append(signature[i:end])
+        i = end
+    return types
+
+
+def _type_end(signature: str, i: int) -> int:
+    code = signature[i]
+    if code == "a":
+        return _type_end(signature, i + 1)
+    if code in "({":
+        depth = 0
+        for j in range(i, len(signature)):
+            if signature[j] in "({":
+                depth += 1
+            elif signature[j] in ")}":
+                depth -= 1
+                if depth == 0:
+                    return j + 1
+        raise ValueError(f"Unbalanced signature: {signature!r}")
+    return i + 1
+
+
+def _pad(buf: bytearray, align: int) -> None:
+    buf.extend(b"\0" * (-len(buf) % align))
+
+
+def _write(buf: bytearray, typ: str, value) -> None:
+    code = typ[0]
+    _pad(buf, _ALIGN[code])
+    if code in _FIXED:
+        buf.extend(struct.pack("<" + _FIXED[code], int(value) if code == "b" else value))
+    elif code in "so":
+        data = value.encode("utf-8")
+        buf.extend(struct.pack("<I", len(data)) + data + b"\0")
+    elif code == "g":
+        data = value.encode("ascii")
+        buf.extend(bytes([len(data)]) + data + b"\0")
+    elif code == "v":
+        inner_sig, inner = value
+        _write(buf, "g", inner_sig)
+        _write(buf, inner_sig, inner)
+    elif code == "(":
+        for sub, item in zip(split_signature(typ[1:-1]), value):
+            _write(buf, sub, item)
+    elif code == "a":
+        element = typ[1:]
+        length_at = len(buf)
+        buf.extend(b"\0\0\0\0")
+        _pad(buf, _ALIGN[element[0]])
+        start = len(buf)
+        if element[0] == "{":
+            key_type, value_type = split_signature(element[1:-1])
+            for key, item in value.items():
+                _pad(buf, 8)
+                _write(buf, key_type, key)
+                _write(buf, value_type, item)
+        else:
+            for item in value:
+                _write(buf, element, item)
+        struct.pack_into("<I", buf, length_at, len(buf) - start)
+    else:
+        raise ValueError(f"Unsupported D-Bus type: {typ!r}")
+
+
+def marshal(signature: str, values) -> bytes:
+    """Serialize values (little-endian) for a message body."""
+    buf = bytearray()
+    for typ, value in zip(split_signature(signature), values):
+        _write(buf, typ, value)
+    return bytes(buf)
+
+
+class _Reader:
+    """Sequential decoder over one message's bytes."""
+
+    def __init__(self, data: bytes, endian: str):
+        self.data = data
+        self.pos = 0
+        self.endian = endian
+
+    def align(self, n: int) -> None:
+        self.pos += -self.pos % n
+
+    def read(self, typ: str):
+        code = typ[0]
+        self.align(_ALIGN[code])
+        if code in _FIXED:
+            fmt = self.endian + _FIXED[code]
+            (value,) = struct.unpack_from(fmt, self.data, self.pos)
+            self.pos += struct.calcsize(fmt)
+            return bool(value) if code == "b" else value
+        if code in "so":
+            (length,) = struct.unpack_from(self.endian + "I", self.data, self.pos)
+            self.pos += 4
+            text = self.data[self.pos:self.pos + length].decode("utf-8", errors="replace")
+            self.pos += length + 1
+            return text
+        if code == "g":
+            length = self.data[self.pos]
+            text = self.data[self.pos + 1:self.pos + 1 + length].decode("ascii")
+            self.pos += length + 2
+            return text
+        if code == "v":
+            return self.read(self.read("g"))
+        if code == "(":
+            return tuple(self.read(sub) for sub in split_signature(typ[1:-1]))
+        if code == "a":
+            (length,) = struct.unpack_from(self.endian + "I", self.data, self.pos)
+            self.pos += 4
+            element = typ[1:]
+            self.align(_ALIGN[element[0]])
+            end = self.pos + length
+            if element[0] == "{":
+                key_type, value_type = split_signature(element[1:-1])
+                result = {}
+                while self.pos < end:
+                    self.align(8)
+                    key = self.read(key_type)
+                    result[key] = self.read(value_type)
+                return result
+            items = []
+            while self.pos < end:
+                items.append(self.read(element))
+            return items
+        raise ValueError(f"Unsupported D-Bus type: {typ!r}")
+
+
+class DBusMessage:
+    """One D-Bus message: type, header fields by name, decoded body."""
+
+    def __init__(self, msg_type: int, fields: dict, body: list | None = None,
+                 signature: str = "", serial: int = 0, flags: int = 0):
+        self.type = msg_type
+        self.fields = dict(fields)
+        if signature:
+            self.fields["signature"] = signature
+        self.body = list(body or [])
+        self.serial = serial
+        self.flags = flags
+
+    @property
+    def member(self) -> str | None:
+        return self.fields.get("member")
+
+    def encode(self, serial: int) -> bytes:
+        body = marshal(self.fields.get("signature", ""), self.body)
+        fields = [
+            (_FIELD_CODES[name][0], (_FIELD_CODES[name][1], value))
+            for name, value in self.fields.items()
+        ]
+        buf = bytearray(b"l" + bytes([self.type, self.flags, 1]))
+        buf.extend(struct.pack("<II", len(body), serial))
+        _write(buf, "a(yv)", fields)
+        _pad(buf, 8)
+        return bytes(buf) + body
+
+    @classmethod
+    def decode(cls, data: bytes) -> "DBusMessage":
+        endian = "<" if data[0:1] == b"l" else ">"
+        reader = _Reader(data, endian)
+        reader.pos = 8
+        serial = reader.read("u")
+        fields = {}
+        for code, value in reader.read("a(yv)"):
+            if code in _HEADER_FIELDS:
+                fields[_HEADER_FIELDS[code][0]] = value
+        reader.align(8)
+        body_reader = _Reader(data[reader.pos:], endian)
+        body = [body_reader.read(t) for t in split_signature(fields.get("signature", ""))]
+        return cls(data[1], fields, body, serial=serial, flags=data[2])
+
+
+# ---------------------------------------------------------------------------
+# Connection
+# ---------------------------------------------------------------------------
+
+def _connect(address: str, timeout: float) -> socket.socket:
+    """Connect to the first usable unix: entry of a D-Bus address string."""
+    for entry in address.split(";"):
+        transport, _, params = entry.partition(":")
+        if transport != "unix":
+            continue
+        keys = dict(p.split("=", 1) for p in params.split(",") if "=" in p)
+        if "path" in keys:
+            target = unquote(keys["path"])
+        elif "abstract" in keys:
+            target = "\0" + unquote(keys["abstract"])
+        else:
+            continue
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(target)
+            return sock
+        except OSError:
+            sock.close()
+    raise DBusError(f"No reachable unix transport in {address!r}")
+
+
+class DBusConnection:
+    """A blocking connection to a message bus. Thread-safe.
+
+    Messages that arrive while waiting for a method reply (signals, incoming
+    calls) are kept in `pending` for the caller to inspect.
+    """
+
+    def __init__(self, address: str | None = None, timeout: float = 5.0):
+        address = address or os.environ.get("DBUS_SESSION_BUS_ADDRESS")
+        if not address:
+            raise DBusError("DBUS_SESSION_BUS_ADDRESS is not set")
+        self.timeout = timeout
+        self.sock = _connect(address, timeout)
+        self.pending: collections.deque[DBusMessage] = collections.deque(maxlen=256)
+        self.lock = threading.RLock()
+        self._buffer = b""
+        self._serial = 0
+        try:
+            self._authenticate()
+            (self.unique_name,) = self.call(BUS_NAME, BUS_PATH, BUS_NAME, "Hello")
+        except (OSError, DBusError):
+            self.sock.close()
+            raise
+
+    def _authenticate(self) -> None:
+        uid = str(os.getuid()).encode("ascii").hex().encode("ascii")
+        self.sock.sendall(b"\0AUTH EXTERNAL " + uid + b"\r\n")
+        deadline = time.monotonic() + self.timeout
+        if not self._fill_until(b"\r\n", deadline):
+            raise DBusError("Bus did not answer AUTH")
+        line, _, self._buffer = self._buffer.partition(b"\r\n")
+        if not line.startswith(b"OK"):
+            raise DBusError(f"Bus rejected AUTH EXTERNAL: {line!r}")
+        self.sock.sendall(b"BEGIN\r\n")
+
+    def close(self) -> None:
+        self.sock.close()
+
+    def send(self, message: DBusMessage) -> int:
+        """Send a message. Returns its serial."""
+        with self.lock:
+            self._serial += 1
+            try:
+                self.sock.sendall(message.encode(self._serial))
+            except OSError as e:
+                raise DBusError(f"Bus connection lost: {e}") from e
+            return self._serial
+
+    def recv(self, deadline: float | None = None) -> DBusMessage | None:
+        """Receive the next message, or None if deadline (monotonic) passes."""
+        with self.lock:
+            if not self._fill(16, deadline):
+                return None
+            endian = "<" if self._buffer[0:1] == b"l" else ">"
+            body_length, _, fields_length = struct.unpack_from(endian + "III", self._buffer, 4)
+            header_length = 16 + fields_length
+            header_length += -header_length % 8
+            total = header_length + body_length
+            if not self._fill(total, deadline):
+                return None
+            data, self._buffer = self._buffer[:total], self._buffer[total:]
+            return DBusMessage.decode(data)
+
+    def call(self, destination: str, path: str, interface: str, member: str,
+             signature: str = "", args=(), timeout: float | None = None) -> list:
+        """Call a method and wait for its reply body."""
+        message = DBusMessage(
+            METHOD_CALL,
+            {"path": path, "interface": interface, "member": member, "destination": destination},
+            list(args),
+            signature=signature,
+        )
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        with self.lock:
+            serial = self.send(message)
+            while True:
+                reply = self.recv(deadline)
+                if reply is None:
+                    raise DBusError(f"No reply to {interface}.{member}")
+                if reply.fields.get("reply_serial") != serial:
+                    self.pending.append(reply)
+                    continue
+                if reply.type == ERROR:
+                    detail = reply.body[0] if reply.body else ""
+                    raise DBusError(f"{reply.fields.get('error_name')}: {detail}")
+                return reply.body
+
+    def reply(self, call: DBusMessage, signature: str = "", args=()) -> None:
+        """Answer an incoming method call."""
+        self.send(DBusMessage(
+            METHOD_RETURN,
+            {"reply_serial": call.serial, "destination": call.fields.get("sender", "")},
+            list(args),
+            signature=signature,
+        ))
+
+    def emit(self, path: str, interface: str, member: str, signature: str = "", args=()) -> None:
+        """Broadcast a signal."""
+        self.send(DBusMessage(
+            SIGNAL, {"path": path, "interface": interface, "member": member},
+            list(args), signature=signature,
+        ))
+
+    def _fill(self, size: int, deadline: float | None) -> bool:
+        """Buffer at least size bytes without consuming them."""
+        while len(self._buffer) < size:
+            if not self._recv_chunk(deadline):
+                return False
+        return True
+
+    def _fill_until(self, marker: bytes, deadline: float | None) -> bool:
+        while marker not in self._buffer:
+            if not self._recv_chunk(deadline):
+                return False
+        return True
+
+    def _recv_chunk(self, deadline: float | None) -> bool:
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            return False
+        self.sock.settimeout(remaining)
+        try:
+            chunk = self.sock.recv(65536)
+        except socket.timeout:
+            return False
+        except OSError as e:
+            raise DBusError(f"Bus connection lost: {e}") from e
+        if not chunk:
+            raise DBusError("Bus connection closed")
+        self._buffer += chunk
+        return True
+
+
+# ---------------------------------------------------------------------------
+# Notifications
+# ---------------------------------------------------------------------------
+
+class NotificationBus:
+    """Persistent client for org.freedesktop.Notifications."""
+
+    def __init__(self, address: str | None = None, timeout: float = 5.0):
+        self.conn = DBusConnection(address, timeout=timeout)
+        self.conn.call(
+            BUS_NAME, BUS_PATH, BUS_NAME, "AddMatch", "s",
+            [f"type='signal',interface='{NOTIFICATIONS_NAME}'"],
+        )
+        self._capabilities: list[str] | None = None
+
+    def capabilities(self) -> list[str]:
+        """Server capabilities ("actions", "body", ...), cached."""
+        if self._capabilities is None:
+            (self._capabilities,) = self._call("GetCapabilities")
+        return self._capabilities
+
+    def notify(
+        self,
+        summary: str,
+        body: str = "",
+        app_name: str = "NOTIFY",
+        replaces_id: int = 0,
+        icon: str = "",
+        actions: list[str] | tuple = (),
+        hints: dict | None = None,
+        expire_timeout: int = -1,
+    ) -> int:
+        """Show (or replace) a notification. Returns the server's ID for it."""
+        (notification_id,) = self._call(
+            "Notify", "susssasa{sv}i",
+            [app_name, replaces_id, icon, summary, body, list(actions), hints or {}, expire_timeout],
+        )
+        return notification_id
+
+    def close_notification(self, notification_id: int) -> None:
+        self._call("CloseNotification", "u", [notification_id])
+
+    def wait_for_action(self, notification_id: int, timeout: float = 60.0) -> str | None:
+        """Wait for ActionInvoked on a notification.
+
+        Returns:
+            The invoked action key, "" if the notification was closed without
+            one, or None if the timeout passed first.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self.conn.lock:
+                for message in list(self.conn.pending):
+                    if message.type != SIGNAL or not message.body:
+                        continue
+                    if message.body[0] != notification_id:
+                        continue
+                    if message.member == "ActionInvoked":
+                        self.conn.pending.remove(message)
+                        return message.body[1]
+                    if message.member == "NotificationClosed":
+                        self.conn.pending.remove(message)
+                        return ""
+                now = time.monotonic()
+                if now >= deadline:
+                    return None
+                # Short slices so other threads can use the connection meanwhile
+                message = self.conn.recv(min(deadline, now + 0.25))
+                if message is not None:
+                    self.conn.pending.append(message)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _call(self, member: str, signature: str = "", args=()) -> list:
+        return self.conn.call(
+            NOTIFICATIONS_NAME, NOTIFICATIONS_PATH, NOTIFICATIONS_NAME, member, signature, args,
+        )
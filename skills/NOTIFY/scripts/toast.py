@@ -18,19 +18,40 @@ Usage:
     # Progress bar
     python toast.py "Building" --progress 0.75 --status "75% complete"
 
+    # Merge a burst of toasts (e.g. parallel jobs finishing) into one
+    python toast.py "Job 3" "Finished" --digest
+
+    # Re-detect platform (after installing notify-send, BurntToast, etc.)
+    python toast.py --refresh-env
+
     # Programmatic
     from toast import send_toast, ask_choice, send_progress
     send_toast("Title", "Message")
     choice = ask_choice("What next?", ["This", "That", "Other"])
+
+    # Non-blocking
+    queue = NotificationQueue()
+    queue.toast("Title", "Message")     # returns immediately
+    await async_send_toast("Title", "Message")
 """
 
 import argparse
+import atexit
+import collections
+import functools
+import itertools
 import json
 import logging
 import os
+import secrets
+import select
 import shutil
+import socket
 import subprocess
+import sys
+import threading
 import time
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional
 
@@ -87,16 +108,10 @@ def check_notify_send_capabilities() -> dict[str, bool]:
     return capabilities
 
 
-# Environment detection
-IS_WSL = is_wsl()
-IS_LINUX = not IS_WSL and is_linux_desktop()
-IS_MACOS = not IS_WSL and not IS_LINUX and is_macos()
-LINUX_CAPS = check_notify_send_capabilities() if IS_LINUX else {}
-
 # Windows paths (only valid in WSL)
 def get_windows_temp() -> str:
     """Get Windows temp directory path from WSL."""
-    if not IS_WSL:
+    if not is_wsl():
         return "/tmp"
     try:
         cmd_exe = shutil.which("cmd.exe") or "/mnt/c/Windows/System32/cmd.exe"
@@ -115,42 +130,424 @@ def get_windows_temp() -> str:
     return "/tmp"
 
 
-WIN_TEMP = get_windows_temp()
-CHOICE_FILE = f"{WIN_TEMP}/notify_choice.txt"
+# ---------------------------------------------------------------------------
+# Environment detection (lazy, cached on disk)
+# ---------------------------------------------------------------------------
+#
+# Detection spawns `notify-send --help` and `cmd.exe /c echo %TEMP%`, which
+# costs hundreds of milliseconds on WSL. Results are computed on first use and
+# persisted to CACHE_DIR/env.json so later CLI calls skip every subprocess.
 
-# PowerShell path - needed when appendWindowsPath=false in wsl.conf
-POWERSHELL_EXE = (
-    shutil.which("powershell.exe")
-    or "/mnt/c/Windows/System32/WindowsPowerShell/v1.0/powershell.exe"
+ENV_CACHE_VERSION = 1
+
+CACHE_DIR = Path(
+    os.environ.get("NOTIFY_CACHE_DIR")
+    or Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "notify"
 )
+ENV_CACHE_FILE = CACHE_DIR / "env.json"
+
+# Binaries whose mtime invalidates the cache (reinstall/upgrade => re-detect)
+_DETECTION_BINARIES = ("notify-send", "osascript", "powershell.exe", "cmd.exe")
+
+# Module attributes resolved lazily through __getattr__ (kept for API compat)
+_ENV_ATTRS = ("IS_WSL", "IS_LINUX", "IS_MACOS", "LINUX_CAPS", "WIN_TEMP", "POWERSHELL_EXE")
+
+_environment: dict | None = None
+
+
+def _environment_key() -> dict[str, str]:
+    """Inputs that detection depends on. Any change invalidates the cache."""
+    import platform
+    return {
+        "version": str(ENV_CACHE_VERSION),
+        "kernel": platform.release(),
+        "path": os.environ.get("PATH", ""),
+        "display": os.environ.get("DISPLAY", ""),
+        "wayland_display": os.environ.get("WAYLAND_DISPLAY", ""),
+    }
+
+
+def _resolve_binaries() -> dict[str, str | None]:
+    """Where each detection binary is on PATH right now (None if absent)."""
+    return {name: shutil.which(name) for name in _DETECTION_BINARIES}
+
+
+def _binary_mtimes(paths: dict[str, str | None]) -> dict[str, float | None]:
+    """Stat each resolved binary. Missing binaries map to None."""
+    mtimes: dict[str, float | None] = {}
+    for name, path in paths.items():
+        try:
+            mtimes[name] = os.stat(path).st_mtime if path else None
+        except OSError:
+            mtimes[name] = None
+    return mtimes
+
+
+def _detect_environment() -> dict:
+    """Run full platform detection (may spawn subprocesses)."""
+    wsl = is_wsl()
+    linux = not wsl and is_linux_desktop()
+    macos = not wsl and not linux and is_macos()
+    binaries = _resolve_binaries()
+    return {
+        "IS_WSL": wsl,
+        "IS_LINUX": linux,
+        "IS_MACOS": macos,
+        "LINUX_CAPS": check_notify_send_capabilities() if linux else {},
+        "WIN_TEMP": get_windows_temp() if wsl else "/tmp",
+        # PowerShell path - needed when appendWindowsPath=false in wsl.conf
+        "POWERSHELL_EXE": (
+            binaries["powershell.exe"]
+            or "/mnt/c/Windows/System32/WindowsPowerShell/v1.0/powershell.exe"
+        ),
+        "binaries": binaries,
+    }
+
+
+def _load_environment_cache(key: dict[str, str]) -> dict | None:
+    """Return the cached environment if its key and binaries still match.
+
+    Binaries are looked up again rather than trusting the cached paths, so one
+    installed (or removed) since detection invalidates the cache even when
+    PATH itself is unchanged.
+    """
+    try:
+        cached = json.loads(ENV_CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("key") != key:
+        return None
+    env = cached.get("env")
+    if not isinstance(env, dict) or any(attr not in env for attr in _ENV_ATTRS):
+        return None
+    binaries = _resolve_binaries()
+    if binaries != env.get("binaries") or _binary_mtimes(binaries) != cached.get("mtimes"):
+        return None
+    return env
+
+
+def _save_environment_cache(key: dict[str, str], env: dict) -> None:
+    """Persist detection results atomically (temp file + rename)."""
+    payload = {
+        "key": key,
+        "mtimes": _binary_mtimes(env["binaries"]),
+        "env": env,
+    }
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = ENV_CACHE_FILE.with_name(f"{ENV_CACHE_FILE.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp, ENV_CACHE_FILE)
+    except OSError as e:
+        logger.debug(f"Could not write environment cache: {e}")
+
+
+def get_environment(refresh: bool = False) -> dict:
+    """Return detected platform info, detecting at most once per cache key.
+
+    Args:
+        refresh: Ignore the in-memory and on-disk caches and re-detect.
+
+    Returns:
+        Dict with IS_WSL, IS_LINUX, IS_MACOS, LINUX_CAPS, WIN_TEMP,
+        POWERSHELL_EXE and the resolved detection binaries.
+    """
+    global _environment
+    if _environment is not None and not refresh:
+        return _environment
+
+    key = _environment_key()
+    env = None if refresh else _load_environment_cache(key)
+    if env is None:
+        env = _detect_environment()
+        _save_environment_cache(key, env)
+    _environment = env
+    return env
+
+
+def get_choice_file() -> str:
+    """Path of the file WSL choice buttons write their answer to."""
+    return f"{get_environment()['WIN_TEMP']}/notify_choice.txt"
+
+
+def __getattr__(name: str):
+    """Resolve IS_WSL, LINUX_CAPS, CHOICE_FILE etc. on first access."""
+    if name in _ENV_ATTRS:
+        return get_environment()[name]
+    if name == "CHOICE_FILE":
+        return get_choice_file()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# ---------------------------------------------------------------------------
+# Timing instrumentation (opt-in)
+# ---------------------------------------------------------------------------
+#
+# NOTIFY_TIMING=1 prints a per-phase breakdown of every public call to stderr,
+# NOTIFY_TIMING=<path> appends it to a JSON-lines file, and
+# set_timing_callback() receives the same records in-process. Phases:
+#   detect   platform detection / cache lookup
+#   build    escaping and script/command construction
+#   connect  opening the D-Bus connection (first call only)
+#   dbus     D-Bus round trip            spawn    subprocess (notify-send,
+#   worker   PowerShell worker round trip         powershell.exe, osascript)
+#   wait     waiting for a choice         spool    digest spool append
+#   other    anything unaccounted for
+
+_timing_callback = None
+_timing_state = threading.local()
+
+
+def set_timing_callback(callback) -> None:
+    """Receive a timing record for every public call (None disables).
+
+    The callback is called as callback(record) with
+    {"call": "send_toast", "total_ms": 12.3, "phases_ms": {"detect": 0.1, ...}}.
+    """
+    global _timing_callback
+    _timing_callback = callback
+
+
+def _write_timing(target: str, record: dict) -> None:
+    line = json.dumps(record)
+    if target == "1":
+        print(line, file=sys.stderr)
+        return
+    try:
+        with open(target, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    except OSError as e:
+        logger.warning(f"Could not write timing record: {e}")
+
+
+def _timing_sink():
+    if _timing_callback is not None:
+        return _timing_callback
+    target = os.environ.get("NOTIFY_TIMING")
+    if not target or target == "0":
+        return None
+    return functools.partial(_write_timing, target)
+
+
+def _mark(phase: str) -> None:
+    """Attribute time since the previous mark to phase (no-op unless timing)."""
+    timer = getattr(_timing_state, "timer", None)
+    if timer is not None:
+        now = time.perf_counter()
+        timer["phases"][phase] = timer["phases"].get(phase, 0.0) + now - timer["last"]
+        timer["last"] = now
+
+
+def _timed(func):
+    """Report a per-phase timing record for each call (nested calls fold in)."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        sink = _timing_sink()
+        if sink is None or getattr(_timing_state, "timer", None) is not None:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        timer = {"phases": {}, "last": start}
+        _timing_state.timer = timer
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _mark("other")
+            _timing_state.timer = None
+            sink({
+                "call": func.__qualname__,
+                "total_ms": round((time.perf_counter() - start) * 1000, 3),
+                "phases_ms": {k: round(v * 1000, 3) for k, v in timer["phases"].items() if v > 0},
+            })
+    return wrapper
+
+
+# ---------------------------------------------------------------------------
+# PowerShell execution (persistent worker with one-shot fallback)
+# ---------------------------------------------------------------------------
+
+WORKER_SOCKET = CACHE_DIR / "worker.sock"
+
+
+def worker_request(payload: dict, timeout: float = 20.0) -> dict | None:
+    """Send one JSON request to the NOTIFY worker (see worker.py).
+
+    Returns:
+        The worker's JSON response, or None if no worker is running.
+    """
+    if not hasattr(socket, "AF_UNIX") or not WORKER_SOCKET.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(WORKER_SOCKET))
+            sock.sendall(json.dumps(payload).encode() + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+        return json.loads(line) if line else None
+    except (OSError, ValueError):
+        return None
+
+
+def _spawn_worker() -> None:
+    """Start worker.py in the background (NOTIFY_WORKER=auto)."""
+    worker_py = Path(__file__).resolve().with_name("worker.py")
+    try:
+        subprocess.Popen(
+            [sys.executable, str(worker_py), "start"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as e:
+        logger.warning(f"Failed to start NOTIFY worker: {e}")
+
+
+def _run_powershell(ps_script: str, timeout: float = 15.0) -> bool:
+    """Run a PowerShell script, preferring the warm worker over a new process.
+
+    With NOTIFY_WORKER=auto, a missing worker is started in the background and
+    this call falls back to a one-shot powershell.exe while it warms up.
+    """
+    _mark("build")
+    response = worker_request({"script": ps_script, "timeout": timeout}, timeout + 5)
+    if response is not None:
+        _mark("worker")
+        if not response.get("ok"):
+            logger.warning(f"NOTIFY worker error: {response.get('error')}")
+        return bool(response.get("ok"))
+
+    if os.environ.get("NOTIFY_WORKER") == "auto":
+        _spawn_worker()
+
+    try:
+        result = subprocess.run(
+            [get_environment()["POWERSHELL_EXE"], "-Command", ps_script],
+            capture_output=True,
+            timeout=timeout,
+        )
+        _mark("spawn")
+        return result.returncode == 0
+    except FileNotFoundError:
+        return False
+    except subprocess.TimeoutExpired:
+        logger.warning("PowerShell timed out sending notification")
+        return False
+
 
 # Progress notification state (for replacement)
 _progress_notification_id: int = 9999
+_progress_session_ids = itertools.count(1)
 
 
-def _send_linux_notify(
+# ---------------------------------------------------------------------------
+# Linux backends: D-Bus (persistent connection) with notify-send fallback
+# ---------------------------------------------------------------------------
+
+_URGENCY_LEVELS = {"low": 0, "normal": 1, "critical": 2}
+
+_bus = None
+_bus_unavailable = False
+
+
+def _notification_bus():
+    """Shared session-bus connection to the notification server, or None.
+
+    Talks to org.freedesktop.Notifications directly (see dbus_notify.py), so
+    no process is spawned per notification. Disable with NOTIFY_DBUS=0.
+    """
+    global _bus, _bus_unavailable
+    if _bus is not None or _bus_unavailable:
+        return _bus
+    if os.environ.get("NOTIFY_DBUS") == "0" or not os.environ.get("DBUS_SESSION_BUS_ADDRESS"):
+        _bus_unavailable = True
+        return None
+    try:
+        from dbus_notify import DBusError, NotificationBus
+    except ImportError:
+        _bus_unavailable = True
+        return None
+    try:
+        _mark("build")
+        _bus = NotificationBus()
+        _mark("connect")
+    except (OSError, DBusError) as e:
+        logger.debug(f"D-Bus unavailable, using notify-send: {e}")
+        _bus_unavailable = True
+    return _bus
+
+
+def _drop_bus(error: Exception) -> None:
+    """Give up on D-Bus for this process after a failure."""
+    global _bus, _bus_unavailable
+    logger.warning(f"D-Bus notification failed, falling back to notify-send: {error}")
+    if _bus is not None:
+        try:
+            _bus.close()
+        except OSError:
+            pass
+    _bus = None
+    _bus_unavailable = True
+
+
+def _linux_notify(
     title: str,
     message: str,
     icon: str | None = None,
     urgency: str = "normal",
     replace_id: int | None = None,
-) -> bool:
-    """Send notification via notify-send on Linux."""
-    if not IS_LINUX or not LINUX_CAPS.get("available"):
-        return False
+) -> int | None:
+    """Send a Linux notification.
+
+    Returns:
+        The server's notification ID (0 when notify-send doesn't report one),
+        or None on failure.
+    """
+    env = get_environment()
+    if not env["IS_LINUX"]:
+        return None
+    body = message.replace(" | ", "\n").replace("|", "\n")
+
+    bus = _notification_bus()
+    if bus is not None:
+        try:
+            _mark("build")
+            notification_id = bus.notify(
+                title, body, app_name=APP_NAME, replaces_id=replace_id or 0,
+                icon=icon or "", hints={"urgency": ("y", _URGENCY_LEVELS.get(urgency, 1))},
+            )
+            _mark("dbus")
+            return notification_id
+        except Exception as e:  # DBusError, socket errors, malformed replies
+            _drop_bus(e)
+
+    if not env["LINUX_CAPS"].get("available"):
+        return None
     try:
-        body = message.replace(" | ", "\n").replace("|", "\n")
         cmd = ["notify-send", title, body, f"--app-name={APP_NAME}"]
         cmd.extend(["-u", urgency])
-        if icon and LINUX_CAPS.get("icons"):
+        if icon and env["LINUX_CAPS"].get("icons"):
             cmd.extend(["-i", icon])
-        if replace_id is not None and LINUX_CAPS.get("replace"):
+        if replace_id is not None and env["LINUX_CAPS"].get("replace"):
             cmd.extend(["-r", str(replace_id)])
+        _mark("build")
         result = subprocess.run(cmd, capture_output=True, timeout=5)
-        return result.returncode == 0
+        _mark("spawn")
+        return 0 if result.returncode == 0 else None
     except (FileNotFoundError, subprocess.TimeoutExpired) as e:
         logger.warning(f"Failed to send Linux notification: {e}")
-        return False
+        return None
+
+
+def _send_linux_notify(
+    title: str,
+    message: str,
+    icon: str | None = None,
+    urgency: str = "normal",
+    replace_id: int | None = None,
+) -> bool:
+    """Send notification via D-Bus or notify-send on Linux."""
+    return _linux_notify(title, message, icon=icon, urgency=urgency, replace_id=replace_id) is not None
 
 
 def _escape_applescript_string(s: str) -> str:
@@ -165,18 +562,21 @@ def _escape_applescript_string(s: str) -> str:
 
 def _send_macos_notify(title: str, message: str, sound: bool = False) -> bool:
     """Send notification via osascript on macOS."""
-    if not IS_MACOS:
+    env = get_environment()
+    if not env["IS_MACOS"]:
         return False
     try:
         escaped_title = _escape_applescript_string(title)
         escaped_msg = _escape_applescript_string(message)
         sound_str = ' sound name "default"' if sound else ""
         script = f'display notification "{escaped_msg}" with title "{escaped_title}"{sound_str}'
+        _mark("build")
         result = subprocess.run(
             ["osascript", "-e", script],
             capture_output=True,
             timeout=5,
         )
+        _mark("spawn")
         return result.returncode == 0
     except (FileNotFoundError, subprocess.TimeoutExpired) as e:
         logger.warning(f"Failed to send macOS notification: {e}")
@@ -191,7 +591,41 @@ def _ask_linux_choice(
     timeout: float = 60.0,
 ) -> int | None:
     """Show interactive notification with action buttons on Linux."""
-    if not IS_LINUX or not LINUX_CAPS.get("actions"):
+    env = get_environment()
+    bus = _notification_bus() if env["IS_LINUX"] else None
+    if bus is not None:
+        try:
+            if "actions" not in bus.capabilities():
+                _send_linux_notify(APP_NAME, question, icon=icon, urgency=urgency)
+                return None
+            actions = []
+            for i, opt in enumerate(options, 1):
+                actions.extend([str(i), f"{i}. {opt}"])
+            notification_id = bus.notify(
+                APP_NAME, question, app_name=APP_NAME, icon=icon or "", actions=actions,
+                hints={"urgency": ("y", _URGENCY_LEVELS.get(urgency, 1))},
+            )
+        except Exception as e:  # DBusError, socket errors, malformed replies
+            _drop_bus(e)
+        else:
+            # The question is on screen: whatever happens now, don't ask it again via notify-send
+            _mark("dbus")
+            try:
+                action = bus.wait_for_action(notification_id, timeout)
+            except Exception as e:
+                _drop_bus(e)
+                return None
+            _mark("wait")
+            if action is None:
+                # Timed out. The server may have expired it already, so an error here is expected
+                try:
+                    bus.close_notification(notification_id)
+                except Exception as e:
+                    logger.debug(f"CloseNotification({notification_id}) failed: {e}")
+                return None
+            return int(action) if action.isdigit() else None
+
+    if not env["IS_LINUX"] or not env["LINUX_CAPS"].get("actions"):
         _send_linux_notify(APP_NAME, question, icon=icon, urgency=urgency)
         return None
     try:
@@ -199,13 +633,15 @@ def _ask_linux_choice(
             "notify-send", APP_NAME, question,
             f"--app-name={APP_NAME}", "--wait", "-u", urgency,
         ]
-        if icon and LINUX_CAPS.get("icons"):
+        if icon and env["LINUX_CAPS"].get("icons"):
             cmd.extend(["-i", icon])
         for i, opt in enumerate(options, 1):
             cmd.extend(["-A", f"{i}={i}. {opt}"])
+        _mark("build")
         result = subprocess.run(
             cmd, capture_output=True, text=True, timeout=timeout,
         )
+        _mark("wait")
         if result.returncode == 0 and result.stdout.strip():
             try:
                 return int(result.stdout.strip())
@@ -220,8 +656,12 @@ def _ask_linux_choice(
 
 
 def ensure_choice_scripts(count: int = 5) -> None:
-    """Create batch files for each choice option. WSL only."""
-    if not IS_WSL:
+    """Create shared batch files for each choice option. WSL only.
+
+    Legacy helper for external callers; ask_choice() uses ChoiceChannel.
+    """
+    env = get_environment()
+    if not env["IS_WSL"]:
         return
     ps_script = f'''
 $tempDir = $env:TEMP
@@ -233,26 +673,19 @@ $tempDir = $env:TEMP
     }}
 }}
 '''
-    try:
-        subprocess.run(
-            [POWERSHELL_EXE, "-Command", ps_script],
-            capture_output=True,
-            timeout=10,
-        )
-    except FileNotFoundError:
-        pass
+    _run_powershell(ps_script, timeout=10)
 
 
 def clear_choice() -> None:
     """Clear any existing choice file."""
-    choice_path = Path(CHOICE_FILE)
+    choice_path = Path(get_choice_file())
     if choice_path.exists():
         choice_path.unlink()
 
 
 def read_choice(timeout: float = 30.0) -> Optional[int]:
     """Wait for and read user's choice from button click."""
-    choice_path = Path(CHOICE_FILE)
+    choice_path = Path(get_choice_file())
     start = time.time()
     while time.time() - start < timeout:
         if choice_path.exists():
@@ -266,6 +699,127 @@ def read_choice(timeout: float = 30.0) -> Optional[int]:
     return None
 
 
+class ChoiceChannel:
+    """Answer channel for one WSL ask_choice() request.
+
+    Every request gets a random token, so its batch files and answer file are
+    private and concurrent ask_choice() calls never read each other's answers.
+    A button's batch file writes the answer file and also pings a loopback
+    socket with curl.exe (bundled with Windows 10 1803+), which wakes wait()
+    within milliseconds. inotify does not see writes made from Windows on
+    /mnt/c, so if the ping can't get through (localhostForwarding disabled)
+    the answer file is polled with exponential backoff instead.
+    """
+
+    def __init__(self, count: int):
+        self.count = count
+        self.token = secrets.token_hex(8)
+        win_temp = get_environment()["WIN_TEMP"]
+        self.choice_file = Path(f"{win_temp}/notify_choice_{self.token}.txt")
+        self.scripts = [
+            Path(f"{win_temp}/notify_choice_{self.token}_{i}.bat") for i in range(1, count + 1)
+        ]
+        self._server: socket.socket | None = None
+        try:
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server.bind(("127.0.0.1", 0))
+            server.listen(4)
+            server.setblocking(False)
+            self._server = server
+        except OSError as e:
+            logger.debug(f"Choice socket unavailable, polling only: {e}")
+
+    @property
+    def port(self) -> int | None:
+        return self._server.getsockname()[1] if self._server else None
+
+    def button_argument(self, index: int) -> str:
+        """PowerShell string for button `index`'s activation target."""
+        return f"$env:TEMP\\notify_choice_{self.token}_{index}.bat"
+
+    def write_scripts(self) -> None:
+        """Write one batch file per option into the Windows temp dir."""
+        for index, path in enumerate(self.scripts, 1):
+            lines = ["@echo off", f'echo {index} > "%TEMP%\\{self.choice_file.name}"']
+            if self.port:
+                lines.append(
+                    f'curl.exe -s -m 2 "http://127.0.0.1:{self.port}/{self.token}/{index}" >nul 2>&1'
+                )
+            path.write_text("\r\n".join(lines) + "\r\n", encoding="ascii")
+
+    def wait(self, timeout: float = 60.0) -> int | None:
+        """Block until a button is clicked. Returns 1-indexed choice or None."""
+        deadline = time.monotonic() + timeout
+        poll_interval = 0.05
+        while True:
+            answer = self._read_file()
+            if answer is not None:
+                return answer
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            step = min(poll_interval, remaining)
+            if self._server is not None:
+                readable, _, _ = select.select([self._server], [], [], step)
+                if readable:
+                    answer = self._accept()
+                    if answer is not None:
+                        return answer
+            else:
+                time.sleep(step)
+            poll_interval = min(poll_interval * 1.5, 1.0)
+
+    def close(self) -> None:
+        """Stop listening and remove this request's files."""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        for path in [self.choice_file, *self.scripts]:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    def __enter__(self) -> "ChoiceChannel":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _parse(self, text: str) -> int | None:
+        try:
+            index = int(text.strip().split()[0])
+        except (ValueError, IndexError):
+            return None
+        return index if 1 <= index <= self.count else None
+
+    def _read_file(self) -> int | None:
+        try:
+            return self._parse(self.choice_file.read_text(encoding="ascii", errors="replace"))
+        except OSError:
+            return None
+
+    def _accept(self) -> int | None:
+        """Handle one `GET /<token>/<n>` ping from a button's batch file."""
+        try:
+            conn, _ = self._server.accept()
+        except OSError:
+            return None
+        with conn:
+            try:
+                conn.settimeout(1)
+                request_line = conn.recv(1024).decode("ascii", errors="replace").split("\r\n")[0]
+                conn.sendall(b"HTTP/1.0 204 No Content\r\n\r\n")
+            except OSError:
+                return None
+        parts = request_line.split()
+        path = parts[1].strip("/").split("/") if len(parts) >= 2 else []
+        if len(path) != 2 or path[0] != self.token:
+            return None
+        return self._parse(path[1])
+
+
+@_timed
 def send_toast(
     title: str,
     message: str,
@@ -273,6 +827,7 @@ def send_toast(
     hero: bool = False,
     alarm: bool = False,
     sound: str | None = None,
+    digest: bool = False,
 ) -> bool:
     """Send a simple toast notification.
 
@@ -283,20 +838,27 @@ def send_toast(
         hero: Include app icon (WSL AppLogo).
         alarm: Play alarm sound / use critical urgency.
         sound: Override sound (Default, IM, Mail, Alarm, etc.) - None = silent.
+        digest: Merge with other digest toasts sent within DIGEST_WINDOW
+            seconds into one combined toast. Ignored for alarms.
 
     Returns:
-        True if toast was sent successfully.
+        True if toast was sent (or queued for the digest) successfully.
     """
-    if IS_LINUX:
+    if digest and not alarm:
+        return queue_digest(title, message, line3=line3)
+
+    env = get_environment()
+    _mark("detect")
+    if env["IS_LINUX"]:
         urgency = "critical" if alarm else "normal"
         full_message = f"{message} | {line3}" if line3 else message
         return _send_linux_notify(title, full_message, urgency=urgency)
 
-    if IS_MACOS:
+    if env["IS_MACOS"]:
         full_message = f"{message}\n{line3}" if line3 else message
         return _send_macos_notify(title, full_message, sound=alarm)
 
-    if not IS_WSL:
+    if not env["IS_WSL"]:
         return False
 
     title_escaped = title.replace("'", "''")
@@ -323,17 +885,10 @@ New-BurntToastNotification `
     {text_param} `
     {sound_param}
 """
-    try:
-        result = subprocess.run(
-            [POWERSHELL_EXE, "-Command", ps_script],
-            capture_output=True,
-            timeout=15,
-        )
-        return result.returncode == 0
-    except FileNotFoundError:
-        return False
+    return _run_powershell(ps_script)
 
 
+@_timed
 def ask_choice(
     question: str,
     options: list[str],
@@ -355,29 +910,29 @@ def ask_choice(
     Returns:
         1-indexed choice number, or None if timeout/cancelled.
     """
-    if IS_LINUX:
+    env = get_environment()
+    _mark("detect")
+    if env["IS_LINUX"]:
         urgency = "critical" if (alarm or urgent) else "normal"
         return _ask_linux_choice(question, options, urgency=urgency, timeout=timeout)
 
-    if IS_MACOS:
+    if env["IS_MACOS"]:
         _send_macos_notify(APP_NAME, question, sound=alarm)
         return None  # macOS doesn't support interactive buttons via osascript
 
-    if not IS_WSL:
+    if not env["IS_WSL"]:
         return None
 
     if len(options) > 5:
         options = options[:5]
 
-    ensure_choice_scripts(len(options))
-    clear_choice()
-
+    channel = ChoiceChannel(len(options))
     buttons = []
     for i, opt in enumerate(options, 1):
         opt_escaped = opt.replace("'", "''")
         buttons.append(
             f"$btn{i} = New-BTButton -Content '{i}. {opt_escaped}' "
-            f'-Arguments "$env:TEMP\\notify_choice_{i}.bat"'
+            f'-Arguments "{channel.button_argument(i)}"'
         )
 
     button_vars = ", ".join(f"$btn{i}" for i in range(1, len(options) + 1))
@@ -400,19 +955,28 @@ New-BurntToastNotification `
     {urgent_param} {sound_param} `
     -ExpirationTime $Expire
 """
-    try:
-        result = subprocess.run(
-            [POWERSHELL_EXE, "-Command", ps_script],
-            capture_output=True,
-            timeout=15,
-        )
-        if result.returncode != 0:
+    with channel:
+        try:
+            channel.write_scripts()
+        except OSError as e:
+            logger.warning(f"Failed to write choice scripts: {e}")
             return None
-        return read_choice(timeout)
-    except FileNotFoundError:
-        return None
+        if not _run_powershell(ps_script):
+            return None
+        choice = channel.wait(timeout)
+        _mark("wait")
+        return choice
 
 
+def _format_progress_text(status: str, value: float) -> str:
+    """Text progress bar for backends without a native one."""
+    bar_width = 20
+    filled = int(bar_width * value)
+    bar = "\u2588" * filled + "\u2591" * (bar_width - filled)
+    return f"{status} | [{bar}] {int(value * 100)}%"
+
+
+@_timed
 def send_progress(
     title: str,
     status: str,
@@ -430,22 +994,21 @@ def send_progress(
     Returns:
         True if sent successfully.
     """
+    env = get_environment()
+    _mark("detect")
     value_clamped = max(0.0, min(1.0, value))
     pct = int(value_clamped * 100)
 
-    if IS_LINUX:
-        bar_width = 20
-        filled = int(bar_width * value_clamped)
-        bar = "\u2588" * filled + "\u2591" * (bar_width - filled)
-        message = f"{status} | [{bar}] {pct}%"
+    if env["IS_LINUX"]:
         return _send_linux_notify(
-            title, message, replace_id=_progress_notification_id
+            title, _format_progress_text(status, value_clamped),
+            replace_id=_progress_notification_id,
         )
 
-    if IS_MACOS:
+    if env["IS_MACOS"]:
         return _send_macos_notify(title, f"{status} — {pct}%")
 
-    if not IS_WSL:
+    if not env["IS_WSL"]:
         return False
 
     title_escaped = title.replace("'", "''")
@@ -458,15 +1021,479 @@ New-BurntToastNotification `
     -Text '{title_escaped}' `
     -ProgressBar $Progress
 """
-    try:
-        result = subprocess.run(
-            [POWERSHELL_EXE, "-Command", ps_script],
-            capture_output=True,
-            timeout=15,
+    return _run_powershell(ps_script)
+
+
+class ProgressSession:
+    """A progress notification updated in place, rate limited.
+
+    Updates are coalesced to at most max_rate sends per second: the first
+    update goes out immediately, later ones inside the window are folded into
+    a single trailing send with the newest value. The final 100% update is
+    never delayed. Each session owns its own replace ID (Linux) or BurntToast
+    UniqueIdentifier (WSL), so concurrent progress bars don't overwrite each
+    other, and WSL updates the same toast through data binding instead of
+    stacking new ones.
+
+    Usage:
+        with progress("Building") as p:
+            for i, f in enumerate(files):
+                p.update(i / len(files), f"Compiling {f}")
+            p.update(1.0, "Done")
+
+    Args:
+        title: Notification title.
+        status: Initial status text.
+        max_rate: Maximum backend calls per second (0 = unlimited).
+    """
+
+    def __init__(self, title: str, status: str = "Working...", max_rate: float = 2.0):
+        self.title = title
+        self.status = status
+        self.value = 0.0
+        self.interval = 1.0 / max_rate if max_rate > 0 else 0.0
+        self.sent = 0
+        self.closed = False
+        session_number = next(_progress_session_ids)
+        # Unique per process and session; 9999 stays with send_progress()
+        self.replace_id = 10_000 + (os.getpid() % 1_000_000) * 1000 + session_number % 1000
+        self.tag = f"notify-progress-{os.getpid()}-{session_number}"
+        self._seq = 0
+        self._sent_seq = 0
+        self._started = False
+        self._last_send = float("-inf")
+        self._pending: tuple[int, float, str] | None = None
+        self._timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+
+    def update(self, value: float, status: str | None = None) -> bool:
+        """Report progress (0.0 to 1.0).
+
+        Returns:
+            True if sent now, False if coalesced into a later send or closed.
+        """
+        value = max(0.0, min(1.0, value))
+        with self._lock:
+            if self.closed:
+                return False
+            if status is not None:
+                self.status = status
+            self.value = value
+            self._seq += 1
+            update = (self._seq, value, self.status)
+            wait = self._last_send + self.interval - time.monotonic()
+            if value < 1.0 and wait > 0:
+                self._pending = update
+                if self._timer is None:
+                    self._timer = threading.Timer(wait, self._flush_pending)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return False
+            self._pending = None
+            self._last_send = time.monotonic()
+        return self._send(*update)
+
+    def close(self) -> None:
+        """Send any coalesced update still pending and end the session."""
+        with self._lock:
+            self.closed = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self._flush_pending()
+
+    def __enter__(self) -> "ProgressSession":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _flush_pending(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self._timer = None
+            if pending is not None:
+                self._last_send = time.monotonic()
+        if pending is not None:
+            self._send(*pending)
+
+    @_timed
+    def _send(self, seq: int, value: float, status: str) -> bool:
+        with self._send_lock:
+            if seq <= self._sent_seq:
+                return False  # A newer update already went out
+            self._sent_seq = seq
+            ok = self._send_backend(value, status)
+            self._started = self._started or ok
+            self.sent += 1
+            return ok
+
+    def _send_backend(self, value: float, status: str) -> bool:
+        env = get_environment()
+        if env["IS_LINUX"]:
+            notification_id = _linux_notify(
+                self.title, _format_progress_text(status, value), replace_id=self.replace_id
+            )
+            if notification_id:
+                self.replace_id = notification_id  # Server-assigned ID (D-Bus)
+            return notification_id is not None
+
+        if env["IS_MACOS"]:
+            return _send_macos_notify(self.title, f"{status} — {int(value * 100)}%")
+
+        if not env["IS_WSL"]:
+            return False
+
+        status_escaped = status.replace("'", "''")
+        binding = (
+            f"$Binding = @{{ NotifyStatus = '{status_escaped}'; NotifyValue = '{value:.4f}' }}"
         )
-        return result.returncode == 0
+        if self._started:
+            ps_script = f"""
+Import-Module BurntToast
+{binding}
+Update-BTNotification -UniqueIdentifier '{self.tag}' -DataBinding $Binding
+"""
+        else:
+            title_escaped = self.title.replace("'", "''")
+            ps_script = f"""
+Import-Module BurntToast
+{binding}
+$Progress = New-BTProgressBar -Status 'NotifyStatus' -Value 'NotifyValue'
+New-BurntToastNotification `
+    -Text '{title_escaped}' `
+    -ProgressBar $Progress `
+    -UniqueIdentifier '{self.tag}' `
+    -DataBinding $Binding
+"""
+        return _run_powershell(ps_script)
+
+
+def progress(title: str, status: str = "Working...", max_rate: float = 2.0) -> ProgressSession:
+    """Start a rate-limited, in-place progress notification (see ProgressSession)."""
+    return ProgressSession(title, status=status, max_rate=max_rate)
+
+
+# ---------------------------------------------------------------------------
+# Digest mode (merge bursts from any number of processes into one toast)
+# ---------------------------------------------------------------------------
+#
+# Digest notifications are appended to a spool file under an flock. The first
+# one of a burst writes a header (window id, deadline, max count) and spawns a
+# detached flusher that sends one combined toast when the window closes. A
+# burst that reaches the max count is flushed by whoever appended last. A
+# burst still spooled well past its deadline lost its flusher (killed, or the
+# machine rebooted), so the next caller flushes it and starts a fresh one.
+
+
+def _env_number(name: str, default, kind=float, minimum=0):
+    """A number from the environment; unset, malformed or below minimum means default."""
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = kind(raw)
+    except ValueError:
+        value = None
+    if value is None or not minimum <= value < float("inf"):
+        logger.warning(f"Ignoring {name}={raw!r}: expected a number >= {minimum}, using {default}")
+        return default
+    return value
+
+
+DIGEST_DIR = CACHE_DIR / "digest"
+DIGEST_SPOOL = DIGEST_DIR / "spool.jsonl"
+DIGEST_WINDOW = _env_number("NOTIFY_DIGEST_WINDOW", 2.0)
+DIGEST_MAX = _env_number("NOTIFY_DIGEST_MAX", 10, kind=int, minimum=1)
+DIGEST_SHOWN = 3  # Entries spelled out in the combined toast
+DIGEST_GRACE = 5.0  # Seconds past its deadline before a burst counts as orphaned
+
+
+@contextmanager
+def _digest_lock():
+    """Exclusive lock on the digest spool, shared by all toast.py processes."""
+    import fcntl
+    DIGEST_DIR.mkdir(parents=True, exist_ok=True)
+    with open(DIGEST_DIR / "spool.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def _read_digest_spool() -> tuple[dict | None, list[dict]]:
+    """Return (header, entries) of the current burst. Caller holds the lock."""
+    try:
+        lines = DIGEST_SPOOL.read_text(encoding="utf-8").splitlines()
     except FileNotFoundError:
-        return False
+        return None, []
+    records = []
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue  # Torn write from a killed process
+    if not records or "window" not in records[0]:
+        return None, []
+    return records[0], records[1:]
+
+
+def queue_digest(
+    title: str,
+    message: str,
+    line3: str | None = None,
+    window: float | None = None,
+    max_count: int | None = None,
+) -> bool:
+    """Add a notification to the shared digest instead of sending it now.
+
+    Args:
+        title: Toast title.
+        message: Toast body.
+        line3: Optional third line.
+        window: Seconds to gather a burst (first caller of a burst decides).
+        max_count: Flush as soon as this many notifications are waiting.
+
+    Returns:
+        True if queued (or, when this call completed the burst, if sent).
+    """
+    window = DIGEST_WINDOW if window is None else window
+    max_count = DIGEST_MAX if max_count is None else max_count
+    entry = {"title": title, "message": message, "line3": line3}
+    flush_now: list[dict] = []
+    orphaned: list[dict] = []
+    new_window = None
+
+    with _digest_lock():
+        header, entries = _read_digest_spool()
+        if header is not None and time.time() > header["deadline"] + DIGEST_GRACE:
+            orphaned, header, entries = entries, None, []
+        if header is None:
+            header = {
+                "window": secrets.token_hex(8),
+                "deadline": time.time() + window,
+                "max": max_count,
+            }
+            DIGEST_SPOOL.write_text(json.dumps(header) + "\n", encoding="utf-8")
+            new_window = header["window"]
+        with open(DIGEST_SPOOL, "a", encoding="utf-8") as spool:
+            spool.write(json.dumps(entry) + "\n")
+        entries.append(entry)
+        if len(entries) >= header["max"]:
+            DIGEST_SPOOL.unlink()
+            flush_now = entries
+
+    _mark("spool")
+    if orphaned:
+        logger.debug(f"Flushing {len(orphaned)} digest notifications left by a dead flusher")
+        _send_digest(orphaned)
+    if flush_now:
+        return _send_digest(flush_now)
+    if new_window:
+        _spawn_digest_flusher(new_window)
+    return True
+
+
+def flush_digest(window_id: str | None = None) -> bool:
+    """Send the pending digest now.
+
+    Args:
+        window_id: Only flush this burst, after waiting for its deadline.
+            Used by the detached flusher; a no-op if the burst was already
+            flushed by reaching its max count.
+    """
+    if window_id is not None:
+        with _digest_lock():
+            header, _ = _read_digest_spool()
+        if header is None or header["window"] != window_id:
+            return True
+        time.sleep(max(0.0, header["deadline"] - time.time()))
+
+    if not DIGEST_SPOOL.exists():
+        return True  # Flushed by reaching max count (or nothing queued)
+    with _digest_lock():
+        header, entries = _read_digest_spool()
+        if header is None or (window_id is not None and header["window"] != window_id):
+            return True
+        DIGEST_SPOOL.unlink()
+    return _send_digest(entries)
+
+
+def _spawn_digest_flusher(window_id: str) -> None:
+    """Start a detached toast.py that flushes window_id when it closes."""
+    try:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), "--digest-flush", window_id],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as e:
+        logger.warning(f"Failed to start digest flusher, sending now: {e}")
+        flush_digest()
+
+
+def _send_digest(entries: list[dict]) -> bool:
+    """Send a burst as one combined toast (a burst of one is sent as-is)."""
+    if not entries:
+        return True
+    if len(entries) == 1:
+        only = entries[0]
+        return send_toast(only["title"], only["message"], line3=only.get("line3"))
+    shown = " | ".join(f"{e['title']}: {e['message']}" for e in entries[:DIGEST_SHOWN])
+    hidden = len(entries) - DIGEST_SHOWN
+    return send_toast(
+        f"{len(entries)} notifications",
+        shown,
+        line3=f"+{hidden} more" if hidden > 0 else None,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Non-blocking API
+# ---------------------------------------------------------------------------
+
+
+async def async_send_toast(*args, **kwargs) -> bool:
+    """send_toast() for asyncio callers. Runs in a thread; never blocks the loop."""
+    import asyncio
+    return await asyncio.to_thread(send_toast, *args, **kwargs)
+
+
+async def async_send_progress(*args, **kwargs) -> bool:
+    """send_progress() for asyncio callers."""
+    import asyncio
+    return await asyncio.to_thread(send_progress, *args, **kwargs)
+
+
+async def async_ask_choice(*args, **kwargs) -> int | None:
+    """ask_choice() for asyncio callers. Other tasks keep running while waiting."""
+    import asyncio
+    return await asyncio.to_thread(ask_choice, *args, **kwargs)
+
+
+class NotificationQueue:
+    """Fire-and-forget notifications sent by one background thread.
+
+    put() only appends to an in-memory deque, so callers never wait on the
+    desktop backend. When the queue is full the drop policy decides what goes:
+    "oldest" discards the oldest pending notification (keep the latest news),
+    "newest" rejects the incoming one.
+
+    Usage:
+        queue = NotificationQueue(maxsize=100)
+        queue.toast("Build", "Step 3 done")
+        queue.progress("Build", "Linking...", 0.8)
+        queue.close()  # Drain pending notifications, stop the thread
+
+    Args:
+        maxsize: Maximum pending notifications.
+        drop: Drop policy when full, "oldest" or "newest".
+        drain_timeout: Seconds close() waits at interpreter exit.
+    """
+
+    def __init__(self, maxsize: int = 100, drop: str = "oldest", drain_timeout: float = 5.0):
+        if drop not in ("oldest", "newest"):
+            raise ValueError(f"drop must be 'oldest' or 'newest', not {drop!r}")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.drop = drop
+        self.drain_timeout = drain_timeout
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self._items: collections.deque = collections.deque()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._closed = False
+        self._thread: threading.Thread | None = None
+        atexit.register(self._close_at_exit)
+
+    def put(self, func, *args, **kwargs) -> bool:
+        """Queue func(*args, **kwargs). Returns False if dropped or closed."""
+        with self._cond:
+            if self._closed:
+                return False
+            if len(self._items) >= self.maxsize:
+                self.dropped += 1
+                if self.drop == "newest":
+                    return False
+                self._items.popleft()
+            self._items.append((func, args, kwargs))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="notify-queue", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+        return True
+
+    def toast(self, title: str, message: str, **kwargs) -> bool:
+        """Queue a send_toast()."""
+        return self.put(send_toast, title, message, **kwargs)
+
+    def progress(self, title: str, status: str, value: float, **kwargs) -> bool:
+        """Queue a send_progress()."""
+        return self.put(send_progress, title, status, value, **kwargs)
+
+    def pending(self) -> int:
+        """Notifications queued or currently being sent."""
+        with self._cond:
+            return len(self._items) + self._in_flight
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until everything queued so far is sent. False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._items and not self._in_flight, timeout
+            )
+
+    def close(self, timeout: float | None = None) -> bool:
+        """Stop accepting notifications, drain the queue, stop the thread.
+
+        Returns:
+            True if everything pending was sent before timeout.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        drained = self.flush(timeout)
+        if self._thread is not None:
+            self._thread.join(0 if not drained else timeout)
+        atexit.unregister(self._close_at_exit)
+        return drained
+
+    def __enter__(self) -> "NotificationQueue":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close(self.drain_timeout)
+
+    def _close_at_exit(self) -> None:
+        if not self.close(self.drain_timeout):
+            logger.warning(f"NotificationQueue: {self.pending()} notifications not sent")
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._items or self._closed)
+                if not self._items:
+                    return  # Closed and drained
+                func, args, kwargs = self._items.popleft()
+                self._in_flight = 1
+            try:
+                ok = func(*args, **kwargs)
+            except Exception as e:
+                logger.warning(f"NotificationQueue: {func.__name__} failed: {e}")
+                ok = False
+            with self._cond:
+                self._in_flight = 0
+                if ok is False:
+                    self.failed += 1
+                else:
+                    self.sent += 1
+                self._cond.notify_all()
 
 
 def main():
@@ -481,9 +1508,37 @@ def main():
     parser.add_argument("--status", default="Working...", help="Progress status text")
     parser.add_argument("--timeout", type=float, default=60.0, help="Choice timeout")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument(
+        "--refresh-env", action="store_true",
+        help="Re-detect platform and rewrite the environment cache",
+    )
+    parser.add_argument(
+        "--digest", action="store_true",
+        help="Merge with other --digest toasts sent in the same window",
+    )
+    parser.add_argument(
+        "--digest-window", type=float, default=None,
+        help=f"Digest gathering window in seconds (default {DIGEST_WINDOW})",
+    )
+    parser.add_argument("--digest-flush", metavar="WINDOW_ID", help=argparse.SUPPRESS)
 
     args = parser.parse_args()
 
+    if args.digest_flush:
+        flush_digest(args.digest_flush)
+        return
+
+    if args.refresh_env:
+        env = get_environment(refresh=True)
+        if not args.choices and args.progress is None and not args.message:
+            summary = {attr: env[attr] for attr in _ENV_ATTRS}
+            if args.json:
+                print(json.dumps(summary))
+            else:
+                for attr, value in summary.items():
+                    print(f"{attr}: {value}")
+            return
+
     if args.choices:
         choice = ask_choice(
             args.title,
@@ -516,6 +1571,15 @@ def main():
         else:
             print("Progress toast sent" if success else "Failed to send")
 
+    elif args.message and args.digest and not args.alarm:
+        success = queue_digest(
+            args.title, args.message, line3=args.line3, window=args.digest_window
+        )
+        if args.json:
+            print(json.dumps({"success": success, "digest": True}))
+        else:
+            print("Toast queued for digest" if success else "Failed to queue")
+
     elif args.message:
         success = send_toast(
             args.title, args.message, line3=args.line3, hero=args.hero, alarm=args.alarm
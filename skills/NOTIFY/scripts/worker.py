@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+NOTIFY Worker - Persistent PowerShell host for WSL toasts
+
+Every WSL toast normally starts a fresh powershell.exe and runs
+`Import-Module BurntToast`, which costs 1-3 seconds. The worker keeps one
+PowerShell process warm (BurntToast already imported) and feeds it scripts
+over a JSON-lines pipe. toast.py reaches the worker through a Unix socket and
+falls back to a one-shot powershell.exe whenever it isn't running.
+
+Usage:
+    python worker.py start                  # Spawn in the background
+    python worker.py status                 # Is it running?
+    python worker.py stop
+    python worker.py serve                  # Run in the foreground (debugging)
+    python worker.py serve --idle-timeout 300 --powershell /path/to/powershell.exe
+
+Socket protocol (one JSON object per line, one request per connection):
+    client -> worker   {"script": "<PowerShell>", "timeout": 15}
+    worker -> client   {"ok": true} | {"ok": false, "error": "..."}
+    client -> worker   {"command": "ping"} | {"command": "stop"}
+
+PowerShell pipe protocol (scripts are base64 UTF-8 to survive the console codepage):
+    worker -> pwsh     {"id": 1, "script": "<base64>"}
+    pwsh -> worker     {"id": 1, "ok": true} | {"id": 1, "ok": false, "error": "..."}
+"""
+
+import argparse
+import base64
+import fcntl
+import json
+import logging
+import os
+import select
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from toast import WORKER_SOCKET, get_environment, worker_request
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IDLE_TIMEOUT = 600.0
+STARTUP_TIMEOUT = 30.0
+
+WORKER_PID_FILE = WORKER_SOCKET.with_suffix(".pid")
+WORKER_LOCK_FILE = WORKER_SOCKET.with_suffix(".lock")
+
+# Runs inside the long-lived powershell.exe. The marker comment lets stand-in
+# PowerShell implementations recognise worker mode.
+WORKER_LOOP = r"""
+# NOTIFY-WORKER-LOOP
+$ErrorActionPreference = 'Stop'
+Import-Module BurntToast
+[Console]::Out.WriteLine('{"ready": true}')
+while ($true) {
+    $line = [Console]::In.ReadLine()
+    if ($line -eq $null) { break }
+    $req = $line | ConvertFrom-Json
+    try {
+        $script = [Text.Encoding]::UTF8.GetString([Convert]::FromBase64String($req.script))
+        & ([ScriptBlock]::Create($script)) | Out-Null
+        $resp = @{ id = $req.id; ok = $true }
+    } catch {
+        $resp = @{ id = $req.id; ok = $false; error = "$_" }
+    }
+    [Console]::Out.WriteLine(($resp | ConvertTo-Json -Compress))
+}
+"""
+
+
+class PowerShellHost:
+    """One warm powershell.exe speaking the JSON-lines pipe protocol."""
+
+    def __init__(self, powershell: str):
+        self.powershell = powershell
+        self.proc: subprocess.Popen | None = None
+        self._buffer = b""
+        self._next_id = 1
+
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def start(self) -> None:
+        """Launch PowerShell and wait for the BurntToast import to finish."""
+        self.close()
+        self._buffer = b""
+        self.proc = subprocess.Popen(
+            [self.powershell, "-NoProfile", "-NoLogo", "-NonInteractive",
+             "-Command", WORKER_LOOP],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        ready = self._read_line(STARTUP_TIMEOUT)
+        if ready is None or not json.loads(ready).get("ready"):
+            self.close()
+            raise RuntimeError("PowerShell worker failed to start (is BurntToast installed?)")
+
+    def run(self, script: str, timeout: float = 15.0) -> dict:
+        """Execute one script. Restarts PowerShell if it died or hung."""
+        if not self.alive():
+            self.start()
+        request_id = self._next_id
+        self._next_id += 1
+        encoded = base64.b64encode(script.encode("utf-8")).decode("ascii")
+        try:
+            self.proc.stdin.write(
+                json.dumps({"id": request_id, "script": encoded}).encode() + b"\n"
+            )
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            self.close()
+            return {"ok": False, "error": f"PowerShell pipe closed: {e}"}
+
+        deadline = time.monotonic() + timeout
+        while True:
+            line = self._read_line(deadline - time.monotonic())
+            if line is None:
+                # Hung or crashed - a fresh host is started on the next request
+                self.close()
+                return {"ok": False, "error": "PowerShell did not respond"}
+            try:
+                response = json.loads(line)
+            except ValueError:
+                continue  # Stray output from the script itself
+            if response.get("id") == request_id:
+                return {"ok": bool(response.get("ok")), "error": response.get("error")}
+
+    def close(self) -> None:
+        if self.proc is None:
+            return
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+            self.proc.wait()
+        self.proc = None
+
+    def _read_line(self, timeout: float) -> str | None:
+        """Read one line from PowerShell's stdout, or None on timeout/EOF."""
+        deadline = time.monotonic() + timeout
+        fd = self.proc.stdout.fileno()
+        while b"\n" not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            readable, _, _ = select.select([fd], [], [], remaining)
+            if not readable:
+                return None
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return None
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return line.decode("utf-8", errors="replace").strip()
+
+
+def _handle(conn: socket.socket, host: PowerShellHost) -> bool:
+    """Serve one client connection. Returns False when asked to stop."""
+    conn.settimeout(5)
+    with conn.makefile("rb") as reader:
+        line = reader.readline()
+    try:
+        request = json.loads(line)
+    except ValueError:
+        conn.sendall(b'{"ok": false, "error": "bad request"}\n')
+        return True
+
+    keep_running = True
+    command = request.get("command")
+    if command == "ping":
+        response = {"ok": True, "pid": os.getpid()}
+    elif command == "stop":
+        response = {"ok": True}
+        keep_running = False
+    elif "script" in request:
+        timeout = float(request.get("timeout", 15.0))
+        try:
+            response = host.run(request["script"], timeout=timeout)
+        except (RuntimeError, OSError) as e:
+            response = {"ok": False, "error": str(e)}
+    else:
+        response = {"ok": False, "error": "unknown request"}
+
+    try:
+        conn.settimeout(5)
+        conn.sendall(json.dumps(response).encode() + b"\n")
+    except OSError:
+        pass  # Client gave up waiting
+    return keep_running
+
+
+def serve(powershell: str, idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> None:
+    """Run the worker in the foreground until stopped or idle."""
+    WORKER_SOCKET.parent.mkdir(parents=True, exist_ok=True)
+    # Held for the worker's lifetime so racing `start`s can't both bind
+    lock = open(WORKER_LOCK_FILE, "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        raise SystemExit("NOTIFY worker is already running")
+    WORKER_SOCKET.unlink(missing_ok=True)  # Stale socket from a crashed worker
+
+    host = PowerShellHost(powershell)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # SIGTERM (logout, kill) should still clean up the socket
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        host.start()
+        server.bind(str(WORKER_SOCKET))
+        os.chmod(WORKER_SOCKET, 0o600)
+        server.listen(16)
+        server.settimeout(idle_timeout)
+        WORKER_PID_FILE.write_text(str(os.getpid()), encoding="utf-8")
+        logger.info(f"NOTIFY worker listening on {WORKER_SOCKET}")
+
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                logger.info("NOTIFY worker idle, shutting down")
+                break
+            with conn:
+                try:
+                    keep_running = _handle(conn, host)
+                except OSError as e:
+                    logger.warning(f"Dropped worker client: {e}")
+                    keep_running = True
+            if not keep_running:
+                break
+    finally:
+        server.close()
+        host.close()
+        WORKER_SOCKET.unlink(missing_ok=True)
+        WORKER_PID_FILE.unlink(missing_ok=True)
+        lock.close()
+
+
+def start_background(powershell: str | None = None, idle_timeout: float | None = None) -> int:
+    """Spawn a detached worker process. Returns its PID."""
+    cmd = [sys.executable, str(Path(__file__).resolve()), "serve"]
+    if powershell:
+        cmd.extend(["--powershell", powershell])
+    if idle_timeout is not None:
+        cmd.extend(["--idle-timeout", str(idle_timeout)])
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    return proc.pid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NOTIFY — Persistent PowerShell worker")
+    parser.add_argument("action", choices=["start", "stop", "status", "serve"])
+    parser.add_argument("--powershell", help="powershell.exe to host (default: detected)")
+    parser.add_argument(
+        "--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT,
+        help="Exit after this many seconds without a request",
+    )
+    parser.add_argument("--wait", type=float, default=30.0,
+                        help="start: seconds to wait for the worker to come up")
+    args = parser.parse_args()
+
+    powershell = args.powershell or get_environment()["POWERSHELL_EXE"]
+
+    if args.action == "serve":
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        serve(powershell, idle_timeout=args.idle_timeout)
+
+    elif args.action == "start":
+        if worker_request({"command": "ping"}, timeout=2) is not None:
+            print("NOTIFY worker already running")
+            return
+        start_background(powershell, args.idle_timeout)
+        deadline = time.monotonic() + args.wait
+        while time.monotonic() < deadline:
+            if worker_request({"command": "ping"}, timeout=2) is not None:
+                print(f"NOTIFY worker started ({WORKER_SOCKET})")
+                return
+            time.sleep(0.1)
+        print("NOTIFY worker failed to start", file=sys.stderr)
+        sys.exit(1)
+
+    elif args.action == "stop":
+        if worker_request({"command": "stop"}, timeout=5) is not None:
+            print("NOTIFY worker stopped")
+        else:
+            print("NOTIFY worker not running")
+
+    elif args.action == "status":
+        response = worker_request({"command": "ping"}, timeout=2)
+        if response is not None:
+            print(f"NOTIFY worker running (pid {response.get('pid')})")
+        else:
+            print("NOTIFY worker not running")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
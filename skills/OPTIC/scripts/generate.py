@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+OPTIC Image Generator
+Uses Google Gemini models for image generation and transformation.
+
+Usage:
+    python generate.py "prompt" [--quality] [--output filename]
+    python generate.py "prompt" --reference image.png   # Transform existing image
+    python generate.py --batch pack.jsonl [--workers 4] [--results results.jsonl]
+
+Examples:
+    python generate.py "a cozy coffee shop at night"
+    python generate.py "technical diagram of neural network" --quality
+    python generate.py "same scene but at sunset" --reference daytime.png
+    python generate.py --batch icons.jsonl --workers 8 --skip-existing
+
+Batch manifests are JSON lines; only "prompt" is required:
+    {"prompt": "hero banner, dawn", "output": "hero.png", "aspect": "16:9", "size": "2K",
+     "quality": true, "reference": "base.png"}
+
+A batch shares one client across a bounded pool of worker threads. Each
+image is written to disk as soon as it arrives. Rate limits (429) and
+transient server errors are retried with exponential backoff and jitter,
+and every worker holds off while the service asks for it. Results stream to
+a JSON-lines manifest (default: <output_dir>/<manifest>.results.jsonl) in
+completion order.
+
+Set OPTIC_BASE_URL (or "base_url" in config.json) to point the client at
+another endpoint, such as a local test server.
+"""
+
+import argparse
+import json
+import mimetypes
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from google import genai
+    from google.genai import errors, types
+except ImportError:
+    print("Error: google-genai package not installed.")
+    print("Run: pip install google-genai")
+    sys.exit(1)
+
+# HTTP statuses worth retrying: rate limited, or the service briefly unavailable
+RETRY_STATUS = {429, 500, 502, 503, 504}
+MAX_BACKOFF = 60.0  # seconds
+
+
+def load_config():
+    """Load imaging configuration."""
+    config_path = Path(__file__).parent / "config.json"
+    with open(config_path) as f:
+        return json.load(f)
+
+
+def get_api_key(config):
+    """Get API key from environment or .env file."""
+    env_var = config.get("api_key_env", "GEMINI_API_KEY")
+    api_key = os.environ.get(env_var)
+
+    # Try .env file if not in environment
+    if not api_key:
+        env_file = Path(__file__).parent.parent / ".env"
+        if not env_file.exists():
+            env_file = Path.cwd() / ".env"
+        if env_file.exists():
+            with open(env_file) as f:
+                for line in f:
+                    if line.startswith(f"{env_var}="):
+                        api_key = line.strip().split("=", 1)[1].strip('"\'')
+                        break
+
+    if not api_key:
+        print(f"Error: {env_var} not set.")
+        print(f"Set in environment or add to .env file")
+        sys.exit(1)
+    return api_key
+
+
+def make_client(config, api_key):
+    """One Gemini client; thread-safe, so a whole batch shares it."""
+    base_url = os.environ.get("OPTIC_BASE_URL") or config.get("base_url")
+    http_options = types.HttpOptions(base_url=base_url) if base_url else None
+    return genai.Client(api_key=api_key, http_options=http_options)
+
+
+def request_image(client, model_id: str, prompt: str, aspect_ratio: str = "3:4",
+                  size: str = None, reference_image: Path = None):
+    """One generate_content call. Returns (image bytes or None, response)."""
+    contents = [prompt]
+    if reference_image:
+        mime_type = mimetypes.guess_type(reference_image.name)[0] or "image/png"
+        contents.append(types.Part.from_bytes(data=reference_image.read_bytes(), mime_type=mime_type))
+
+    response = client.models.generate_content(
+        model=model_id,
+        contents=contents,
+        config=types.GenerateContentConfig(
+            response_modalities=["IMAGE"],
+            image_config=types.ImageConfig(
+                aspect_ratio=aspect_ratio,
+                image_size=size,
+            )
+        )
+    )
+
+    # Extract image from response
+    if response.candidates and response.candidates[0].content.parts:
+        for part in response.candidates[0].content.parts:
+            if hasattr(part, 'inline_data') and part.inline_data:
+                return part.inline_data.data, response
+    return None, response
+
+
+def write_image(path: Path, data: bytes):
+    """Write via temp file + rename, so an interrupted run never leaves half an image."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def generate_image(prompt: str, model_id: str, api_key: str, output_path: Path,
+                   aspect_ratio: str = "3:4", reference_image: Path = None,
+                   size: str = None, config: dict = None):
+    """Generate or transform an image using Gemini."""
+    client = make_client(config or {}, api_key)
+
+    print(f"Model: {model_id}")
+    print(f"Prompt: {prompt[:100]}{'...' if len(prompt) > 100 else ''}")
+    if reference_image:
+        print(f"Reference: {reference_image}")
+
+    image_data, response = request_image(client, model_id, prompt, aspect_ratio, size, reference_image)
+    if image_data:
+        write_image(output_path, image_data)
+        print(f"Saved: {output_path}")
+        return output_path
+
+    print("Error: No image generated")
+    if response.candidates:
+        print(f"Response: {response.candidates[0]}")
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Batch mode
+# ---------------------------------------------------------------------------
+
+
+class Backoff:
+    """Retry delays shared by all workers.
+
+    A 429 tells the whole client to slow down, so the pause applies to every
+    worker's next request, not only to the one that was rejected.
+    """
+
+    def __init__(self, base: float):
+        self.base = base
+        self._lock = threading.Lock()
+        self._not_before = 0.0
+
+    def wait(self):
+        with self._lock:
+            delay = self._not_before - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def failed(self, attempt: int, retry_after: float = None) -> float:
+        """Schedule the next attempt: Retry-After if given, else full-jitter exponential."""
+        cap = min(MAX_BACKOFF, self.base * 2 ** attempt)
+        delay = (retry_after if retry_after is not None else 0.0) + random.uniform(0, cap)
+        with self._lock:
+            self._not_before = max(self._not_before, time.monotonic() + delay)
+        return delay
+
+
+def _retry_after(error) -> float | None:
+    """Seconds from a Retry-After header, if the error carries one."""
+    try:
+        return float(error.response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def load_manifest(path: Path, config: dict) -> list:
+    """Jobs from a JSON-lines manifest; relative references resolve next to it.
+
+    Outputs must be relative paths that stay inside the output directory, and
+    no two entries may write the same file (workers run concurrently).
+    """
+    jobs = []
+    outputs = {}
+    for number, line in enumerate(path.read_text(encoding="utf-8").splitlines(), 1):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        try:
+            job = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"{path}:{number}: not JSON ({e})") from None
+        if not isinstance(job, dict) or not str(job.get("prompt", "")).strip():
+            raise ValueError(f"{path}:{number}: each line needs a \"prompt\"")
+        for key in ("output", "reference"):
+            if job.get(key) is not None and not isinstance(job[key], str):
+                raise ValueError(f"{path}:{number}: \"{key}\" must be a string, not {job[key]!r}")
+        reference = None
+        if job.get("reference"):
+            reference = (path.parent / os.path.expanduser(job["reference"])).resolve()
+            if not reference.exists():
+                raise ValueError(f"{path}:{number}: reference image not found: {job['reference']}")
+        filename = job.get("output") or f"{path.stem}_{len(jobs) + 1:03d}.png"
+        if not filename.endswith(".png"):
+            filename += ".png"
+        relative = Path(filename)
+        if relative.is_absolute() or relative.drive or ".." in relative.parts:
+            raise ValueError(f"{path}:{number}: output must be a relative path inside the output "
+                             f"directory: {job['output']}")
+        key = os.path.normcase(os.path.normpath(filename))
+        if key in outputs:
+            raise ValueError(f"{path}:{number}: output {filename} is already written by line {outputs[key]}")
+        outputs[key] = number
+        jobs.append({
+            "index": len(jobs),
+            "prompt": job["prompt"],
+            "output": filename,
+            "aspect": job.get("aspect", "3:4"),
+            "size": job.get("size"),
+            "model": config["models"]["quality" if job.get("quality") else "fast"]["model_id"],
+            "reference": reference,
+        })
+    return jobs
+
+
+def run_job(client, job: dict, output_dir: Path, backoff: Backoff, retries: int) -> dict:
+    """Generate one manifest entry, retrying rate limits and transient failures."""
+    import httpx  # google-genai's transport
+
+    result = {"index": job["index"], "prompt": job["prompt"], "model": job["model"],
+              "output": str(output_dir / job["output"])}
+    start = time.monotonic()
+
+    def failed(attempt: int, error: str) -> dict:
+        return {**result, "status": "failed", "attempts": attempt + 1,
+                "seconds": round(time.monotonic() - start, 3), "error": error}
+
+    for attempt in range(retries + 1):
+        backoff.wait()
+        try:
+            image_data, response = request_image(client, job["model"], job["prompt"], job["aspect"],
+                                                 job["size"], job["reference"])
+            if not image_data:
+                reason = response.candidates[0].finish_reason if response.candidates else "no candidates"
+                return failed(attempt, f"No image generated ({reason})")
+            write_image(output_dir / job["output"], image_data)
+        except errors.APIError as e:
+            if e.code not in RETRY_STATUS or attempt == retries:
+                return failed(attempt, f"{e.code} {e.message}")
+            backoff.failed(attempt, _retry_after(e))
+            continue
+        except httpx.TransportError as e:
+            if attempt == retries:
+                return failed(attempt, str(e))
+            backoff.failed(attempt)
+            continue
+        except Exception as e:  # An unreadable reference, a malformed response: this job fails, not the batch
+            return failed(attempt, f"{type(e).__name__}: {e}")
+        return {**result, "status": "ok", "attempts": attempt + 1,
+                "seconds": round(time.monotonic() - start, 3), "bytes": len(image_data)}
+
+
+def run_batch(manifest: Path, config: dict, api_key: str, output_dir: Path, results_path: Path,
+              workers: int, retries: int, backoff_base: float = 1.0, skip_existing: bool = False) -> dict:
+    """Run every manifest entry on a bounded pool; results stream to results_path."""
+    jobs = load_manifest(manifest, config)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    client = make_client(config, api_key)
+    backoff = Backoff(backoff_base)
+    counts = {"ok": 0, "failed": 0, "skipped": 0}
+    start = time.monotonic()
+
+    with open(results_path, "w", encoding="utf-8") as results:
+        def record(result):
+            counts[result["status"]] += 1
+            results.write(json.dumps(result, ensure_ascii=False) + "\n")
+            results.flush()
+            print(f"[{sum(counts.values())}/{len(jobs)}] {result['status']:<7} {result['output']}"
+                  + (f"  ({result['error']})" if result.get("error") else ""), flush=True)
+
+        pending = []
+        for job in jobs:
+            if skip_existing and (output_dir / job["output"]).exists():
+                record({"index": job["index"], "prompt": job["prompt"], "model": job["model"],
+                        "output": str(output_dir / job["output"]), "status": "skipped"})
+            else:
+                pending.append(job)
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = [pool.submit(run_job, client, job, output_dir, backoff, retries) for job in pending]
+            for future in as_completed(futures):
+                record(future.result())
+
+    return {**counts, "total": len(jobs), "seconds": round(time.monotonic() - start, 3),
+            "results": str(results_path)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OPTIC Image Generator")
+    parser.add_argument("prompt", nargs="?", help="Image generation prompt")
+    parser.add_argument("--quality", "-q", action="store_true",
+                        help="Use high-quality model (Gemini 3 Pro Image)")
+    parser.add_argument("--output", "-o", help="Output filename")
+    parser.add_argument("--reference", "--ref", metavar="IMAGE",
+                        help="Reference image for transformation (image-to-image)")
+    parser.add_argument("--aspect", "-a", default="3:4",
+                        help="Aspect ratio (default: 3:4)")
+    parser.add_argument("--size", "-s", choices=["1K", "2K", "4K"],
+                        help="Resolution (default: model default, 1K)")
+    batch = parser.add_argument_group("batch mode")
+    batch.add_argument("--batch", "-b", metavar="MANIFEST",
+                       help="JSON-lines manifest of prompts to generate concurrently")
+    batch.add_argument("--workers", "-w", type=int,
+                       help="Concurrent generations (default: config, 4)")
+    batch.add_argument("--retries", type=int,
+                       help="Retries per image on rate limits / server errors (default: config, 5)")
+    batch.add_argument("--backoff", type=float, default=1.0,
+                       help="Base retry delay in seconds (doubles per attempt, jittered)")
+    batch.add_argument("--results", metavar="FILE",
+                       help="Results manifest (default: <output_dir>/<manifest>.results.jsonl)")
+    batch.add_argument("--skip-existing", action="store_true",
+                       help="Skip entries whose output file already exists (resume a batch)")
+
+    args = parser.parse_args()
+    config = load_config()
+    defaults = config.get("defaults", {})
+    output_dir = Path(defaults.get("output_dir", "./output"))
+
+    if args.batch:
+        manifest = Path(os.path.expanduser(args.batch))
+        if not manifest.exists():
+            print(f"Error: Manifest not found: {args.batch}")
+            sys.exit(1)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        results_path = Path(args.results) if args.results else output_dir / f"{manifest.stem}.results.jsonl"
+        try:
+            summary = run_batch(
+                manifest, config, get_api_key(config), output_dir, results_path,
+                workers=args.workers or defaults.get("workers", 4),
+                retries=args.retries if args.retries is not None else defaults.get("retries", 5),
+                backoff_base=args.backoff, skip_existing=args.skip_existing,
+            )
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"Batch: {summary['ok']} ok, {summary['failed']} failed, {summary['skipped']} skipped "
+              f"in {summary['seconds']:.1f}s -> {summary['results']}")
+        sys.exit(1 if summary["failed"] else 0)
+
+    # Resolve reference image if provided
+    reference_path = None
+    if args.reference:
+        path = Path(os.path.expanduser(args.reference))
+        if not path.exists():
+            print(f"Error: Reference image not found: {args.reference}")
+            sys.exit(1)
+        reference_path = path
+
+    # Build prompt
+    if args.prompt:
+        prompt = args.prompt
+    else:
+        parser.print_help()
+        return
+
+    # Get settings
+    api_key = get_api_key(config)
+    model_key = "quality" if args.quality else "fast"
+    model_id = config["models"][model_key]["model_id"]
+
+    # Output path
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = args.output or f"generated_{timestamp}.png"
+    if not filename.endswith(".png"):
+        filename += ".png"
+    output_path = output_dir / filename
+
+    # Generate
+    generate_image(prompt, model_id, api_key, output_path, args.aspect, reference_path,
+                   size=args.size, config=config)
+
+
+if __name__ == "__main__":
+    main()
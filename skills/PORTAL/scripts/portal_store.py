@@ -0,0 +1,703 @@
+#!/usr/bin/env python3
+"""
+PORTAL Store - Portal snapshots with a persistent ID/name/date index
+
+Each portal is a base snapshot (PORTAL-XXXX.json) plus one small delta file
+per update (PORTAL-XXXX.0007.delta.json, a JSON-patch style op list), so a
+synced update commits a few hundred bytes instead of the whole snapshot.
+Opening a portal applies the deltas to the base; every COMPACT_EVERY updates
+they are folded into a new base. Bases and deltas can be gzip- or
+zstd-compressed (.gz / .zst suffix); all formats read transparently, and
+plain full-JSON portals from before deltas existed are valid bases.
+
+Next to the portals, portals/.portal-index/index.json maps every portal ID to
+its name, files, dates and summary, most recent first, and a portal with
+pending deltas is cached there already replayed. So:
+
+    open <id|name>   one index read + one file read (the base, or the cached
+                     replay; deltas are replayed only after a sync adds some)
+    list             served from the index alone, paginated
+    create / update / close   files and index replaced atomically
+                              (temp file + rename) under a lock
+
+The index is local, not synced (its folder carries its own .gitignore). It
+is validated against the portals/ directory mtime on every call, which the
+index's own writes never touch because they happen inside .portal-index/.
+When git pull (or Dropbox, ...) adds, replaces or removes portal files, only
+those portals are re-read; `rebuild` re-reads all of them.
+
+Usage:
+    python portal_store.py create auth-refactor --context "Auth refactor, 60%" \\
+        --state "feat/auth @ a1b2c3d Add middleware" --decisions "JWT over sessions" \\
+        --next "Token refresh" --files src/auth.py src/middleware.py
+    python portal_store.py open PORTAL-7X3F        # or: open auth-refactor
+    python portal_store.py list --limit 20 --page 2
+    python portal_store.py update PORTAL-7X3F --next "Write tests"
+    python portal_store.py close PORTAL-7X3F
+    python portal_store.py compact [PORTAL-7X3F]   # Fold deltas into the base now
+    python portal_store.py rebuild
+    python portal_store.py --compress gzip update PORTAL-7X3F ...
+    python portal_store.py --dir ~/.claude/portals list
+"""
+
+import argparse
+import copy
+import gzip
+import json
+import os
+import random
+import re
+import socket
+import string
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+INDEX_DIR = ".portal-index"
+INDEX_VERSION = 2
+
+ID_KEY = "portal ID"
+ID_ALPHABET = string.ascii_uppercase + string.digits
+NAME_RE = re.compile(r"^[A-Za-z0-9_-]+$")
+
+# Deltas folded into a new base after this many updates
+COMPACT_EVERY = 50
+
+COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+DELTA_RE = re.compile(r"^(?P<stem>.+)\.(?P<seq>\d+)\.delta\.json(?:\.gz|\.zst)?$")
+BASE_RE = re.compile(r"^(?P<stem>.+)\.json(?:\.gz|\.zst)?$")
+
+
+class PortalError(Exception):
+    """Unknown portal, invalid name or paging, corrupt delta, or name already in use."""
+
+
+# ---------------------------------------------------------------------------
+# Files: locking, compression, atomic writes
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def _lock(index_dir: Path):
+    """Serialize portal creates, updates and index rewrites from concurrent sessions."""
+    with open(index_dir / "lock", "a+b") as lock:
+        try:
+            import fcntl
+        except ImportError:  # Windows
+            import msvcrt
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+            return
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _zstd():
+    """(compress, decompress) from Python 3.14's compression.zstd or the zstandard package."""
+    try:
+        from compression import zstd  # Python 3.14+
+        return zstd.compress, zstd.decompress
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise PortalError("zstd needs Python 3.14+ or the zstandard package; use gzip") from None
+    return zstandard.ZstdCompressor().compress, zstandard.ZstdDecompressor().decompress
+
+
+def _encode(path: Path, data: bytes) -> bytes:
+    if path.name.endswith(".gz"):
+        return gzip.compress(data, mtime=0)  # mtime=0: identical content, identical blob
+    if path.name.endswith(".zst"):
+        return _zstd()[0](data)
+    return data
+
+
+def _decode(path: Path, data: bytes) -> bytes:
+    if path.name.endswith(".gz"):
+        return gzip.decompress(data)
+    if path.name.endswith(".zst"):
+        return _zstd()[1](data)
+    return data
+
+
+def _read_json(path: Path):
+    return json.loads(_decode(path, path.read_bytes()))
+
+
+def _write_json(path: Path, data, indent: int | None = 2, durable: bool = True) -> None:
+    """Write a base, delta, cached replay or the index as (optionally compressed) JSON.
+
+    The file is swapped in by rename, so `open` in another session finds the
+    previous version rather than a truncated one. durable=False skips the
+    fsync, for files that can be rebuilt after a crash.
+    """
+    text = json.dumps(data, indent=indent, ensure_ascii=False) + "\n"
+    payload = _encode(path, text.encode("utf-8"))
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(payload)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _now() -> str:
+    return datetime.now().astimezone().isoformat(timespec="seconds")
+
+
+def _timestamp(iso: str) -> float:
+    """Epoch seconds for a portal date (offset-less dates are local time); 0.0 if unparseable.
+
+    Portals synced from a machine in another time zone still list in the
+    order they were saved.
+    """
+    try:
+        moment = datetime.fromisoformat(iso)
+    except (TypeError, ValueError):
+        return 0.0
+    if moment.tzinfo is None:
+        moment = moment.astimezone()
+    return moment.timestamp()
+
+
+def _sig(path: Path) -> str:
+    st = path.stat()
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+# ---------------------------------------------------------------------------
+# Deltas (JSON-patch style: add / remove / replace on JSON pointers)
+# ---------------------------------------------------------------------------
+
+
+def _pointer(path: str, key) -> str:
+    return f"{path}/{str(key).replace('~', '~0').replace('/', '~1')}"
+
+
+def diff(old, new, path: str = "") -> list[dict]:
+    """Ops turning old into new. Lists that only grew become appends."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = [{"op": "remove", "path": _pointer(path, key)} for key in old if key not in new]
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": _pointer(path, key), "value": value})
+            elif old[key] != value:
+                ops.extend(diff(old[key], value, _pointer(path, key)))
+        return ops
+    if isinstance(old, list) and isinstance(new, list) and new[:len(old)] == old:
+        return [{"op": "add", "path": f"{path}/-", "value": value} for value in new[len(old):]]
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(doc, ops: list[dict]):
+    """Apply diff() ops to doc (in place where possible); returns the result."""
+    for op in ops:
+        parts = [p.replace("~1", "/").replace("~0", "~") for p in op["path"].split("/")[1:]]
+        if not parts:
+            doc = op["value"]
+            continue
+        parent = doc
+        for part in parts[:-1]:
+            parent = parent[int(part)] if isinstance(parent, list) else parent[part]
+        last = parts[-1]
+        if isinstance(parent, list):
+            if op["op"] == "remove":
+                del parent[int(last)]
+            elif op["op"] == "add":
+                if last == "-":
+                    parent.append(op["value"])
+                else:
+                    parent.insert(int(last), op["value"])
+            else:
+                parent[int(last)] = op["value"]
+        elif op["op"] == "remove":
+            del parent[last]
+        else:
+            parent[last] = op["value"]
+    return doc
+
+
+def _delta_seq(path: Path) -> int:
+    return int(DELTA_RE.match(path.name)["seq"])
+
+
+def load_portal(base: Path, deltas: list[Path]) -> dict:
+    """Base snapshot with its pending deltas applied.
+
+    Deltas at or below the base's revision were already folded in by a
+    compaction (one interrupted before it could delete them, or one made on
+    another machine) and are skipped.
+    """
+    portal = _read_json(base)
+    for path in sorted(deltas, key=_delta_seq):
+        seq = _delta_seq(path)
+        if seq <= portal.get("revision", 0):
+            continue
+        try:
+            portal = apply_patch(portal, _read_json(path)["ops"])
+        except (KeyError, IndexError, ValueError, TypeError) as e:
+            raise PortalError(f"Corrupt delta {path.name}: {e}") from None
+        portal["revision"] = seq
+    return portal
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+
+class PortalStore:
+    """Portals in one directory, fronted by .portal-index/index.json.
+
+    compression applies to files this store writes: "none", "gzip" or
+    "zstd". None keeps each portal's current format (plain for new ones).
+    """
+
+    def __init__(self, directory: Path, compression: str | None = None,
+                 compact_every: int = COMPACT_EVERY):
+        if compression is not None and compression not in COMPRESSION_SUFFIXES:
+            raise PortalError(f"Unknown compression {compression!r}")
+        self.dir = Path(directory)
+        self.index_dir = self.dir / INDEX_DIR
+        self.index_path = self.index_dir / "index.json"
+        self.compression = compression
+        self.compact_every = compact_every
+        self._index: dict | None = None
+
+    @contextmanager
+    def _locked(self):
+        if not self.index_dir.is_dir():
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            (self.index_dir / ".gitignore").write_text("*\n", encoding="utf-8")
+        with _lock(self.index_dir):
+            yield
+
+    def _suffix(self, base: Path | None = None) -> str:
+        """Compression suffix for new files (of the portal whose base is given)."""
+        if self.compression is not None:
+            return COMPRESSION_SUFFIXES[self.compression]
+        if base is not None:
+            for suffix in (".gz", ".zst"):
+                if base.name.endswith(suffix):
+                    return suffix
+        return ""
+
+    # -- Index -------------------------------------------------------------
+
+    def _dir_sig(self) -> str:
+        st = self.dir.stat()
+        return f"{st.st_mtime_ns}:{st.st_size}"
+
+    @staticmethod
+    def _group_sig(base: Path, deltas: list[Path]) -> str:
+        """Deltas are immutable and numbered, so count + last name identify them."""
+        last = max(deltas, key=_delta_seq).name if deltas else ""
+        return f"{_sig(base)}|{len(deltas)}|{last}"
+
+    def _summary(self, portal: dict, base: Path, deltas: list[Path]) -> dict:
+        """Index record for one portal."""
+        context = portal.get("context") or {}
+        origin = portal.get("origin") or {}
+        return {
+            "name": portal.get("name", ""),
+            "file": base.name,
+            "deltas": sorted((d.name for d in deltas), key=lambda n: int(DELTA_RE.match(n)["seq"])),
+            "sig": self._group_sig(base, deltas),
+            "created": portal.get("created", ""),
+            "updated": portal.get("updated") or portal.get("created", ""),
+            "ts": _timestamp(portal.get("updated") or portal.get("created", "")),
+            "mtime": max(path.stat().st_mtime_ns for path in (base, *deltas)),
+            "summary": context.get("summary", ""),
+            "project": origin.get("project", ""),
+            "machine": origin.get("machine", ""),
+        }
+
+    def _portal_files(self) -> dict[str, tuple[Path | None, list[Path]]]:
+        """{stem: (base, deltas)} for every portal file in the directory."""
+        groups: dict[str, tuple[Path | None, list[Path]]] = {}
+        for path in self.dir.iterdir():
+            if path.name.startswith(".") or not path.is_file():
+                continue
+            delta = DELTA_RE.match(path.name)
+            base = None if delta else BASE_RE.match(path.name)
+            if not delta and not base:
+                continue
+            stem = (delta or base)["stem"]
+            current, deltas = groups.get(stem, (None, []))
+            if delta:
+                deltas.append(path)
+            elif current is None or path.stat().st_mtime_ns > current.stat().st_mtime_ns:
+                current = path  # Two formats of one base: a re-compression was interrupted
+            groups[stem] = (current, deltas)
+        return groups
+
+    def _load_index(self) -> dict:
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+            if data.get("version") == INDEX_VERSION:
+                return data
+        except (OSError, ValueError):
+            pass
+        return {"version": INDEX_VERSION, "dir_sig": "", "portals": {}}
+
+    def _save_index(self, index: dict) -> None:
+        """Store most recent first so list() is a slice. Caller holds the lock."""
+        index["portals"] = dict(sorted(
+            index["portals"].items(),
+            key=lambda item: (item[1]["ts"], item[1]["mtime"]),  # Newest file breaks ties
+            reverse=True,
+        ))
+        index["dir_sig"] = self._dir_sig()
+        _write_json(self.index_path, index, indent=None)
+        self._index = index
+
+    def _repair(self, index: dict, full: bool = False) -> dict:
+        """Re-read new or changed portals, drop vanished ones. Caller holds the lock."""
+        by_file = {record["file"]: pid for pid, record in index["portals"].items()}
+        portals = {}
+        for base, deltas in self._portal_files().values():
+            if base is None:
+                continue  # Deltas whose base has not synced yet
+            pid = by_file.get(base.name)
+            if not full and pid and index["portals"][pid]["sig"] == self._group_sig(base, deltas):
+                portals[pid] = index["portals"][pid]
+                continue
+            try:
+                portal = load_portal(base, deltas)
+            except (OSError, ValueError, PortalError):
+                continue  # Not a portal (or mid-sync); picked up once it changes
+            if not isinstance(portal, dict):
+                continue
+            pid = portal.get(ID_KEY) or portal.get("id")  # Older portals used "id"
+            if isinstance(pid, str) and pid.startswith("PORTAL-"):
+                portals[pid] = self._summary(portal, base, deltas)
+        index["portals"] = portals
+        self._save_index(index)
+        for cache in self.index_dir.glob("*.cache.json"):
+            if cache.name.removesuffix(".cache.json") not in portals:
+                cache.unlink(missing_ok=True)
+        return index
+
+    def _current(self) -> dict:
+        """Index on disk, repaired if portal files changed. Caller holds the lock."""
+        index = self._load_index()
+        if index["dir_sig"] != self._dir_sig():
+            index = self._repair(index)
+        return index
+
+    def index(self) -> dict:
+        """The index, repaired first if the directory changed behind our back."""
+        if self._index is not None and self._index["dir_sig"] == self._dir_sig():
+            return self._index
+        index = self._load_index()
+        if index["dir_sig"] != self._dir_sig():
+            with self._locked():
+                index = self._current()
+        self._index = index
+        return index
+
+    def rebuild(self) -> int:
+        """Re-read every portal file. Returns how many portals are indexed."""
+        with self._locked():
+            return len(self._repair(self._load_index(), full=True)["portals"])
+
+    # -- Lookup ------------------------------------------------------------
+
+    def resolve(self, ref: str) -> str:
+        """Portal ID for an ID or a name (exact, then case-insensitive)."""
+        portals = self.index()["portals"]
+        if ref.upper() in portals:
+            return ref.upper()
+        matches = [pid for pid, record in portals.items() if record["name"] == ref]
+        if not matches:
+            matches = [pid for pid, record in portals.items() if record["name"].lower() == ref.lower()]
+        if not matches:
+            raise PortalError(f"No portal with ID or name {ref!r}")
+        return matches[0]  # Most recent wins if a synced name collides
+
+    def _files(self, record: dict) -> tuple[Path, list[Path]]:
+        return self.dir / record["file"], [self.dir / name for name in record["deltas"]]
+
+    def _compact_locked(self, portal: dict, base: Path, deltas: list[Path]) -> Path:
+        """Write portal as the new base and drop folded deltas. Returns the base."""
+        stem = BASE_RE.match(base.name)["stem"]
+        new_base = self.dir / f"{stem}.json{self._suffix(base)}"
+        _write_json(new_base, portal)
+        if new_base != base:
+            base.unlink(missing_ok=True)
+        for delta in deltas:
+            delta.unlink(missing_ok=True)
+        return new_base
+
+    def _cache_path(self, pid: str) -> Path:
+        return self.index_dir / f"{pid}.cache.json"
+
+    def _cache_put(self, pid: str, record: dict, portal: dict) -> None:
+        """Keep the replayed portal next to the index while it has deltas."""
+        if record["deltas"]:
+            _write_json(self._cache_path(pid), {"sig": record["sig"], "portal": portal},
+                        indent=None, durable=False)
+        else:
+            self._cache_path(pid).unlink(missing_ok=True)
+
+    def _materialize(self, pid: str, record: dict) -> dict:
+        """The portal; deltas are replayed only if no cached copy matches them."""
+        if record["deltas"]:
+            try:
+                cached = json.loads(self._cache_path(pid).read_text(encoding="utf-8"))
+                if cached["sig"] == record["sig"]:
+                    return cached["portal"]
+            except (OSError, ValueError, KeyError):
+                pass
+        try:
+            portal = load_portal(*self._files(record))
+        except FileNotFoundError:
+            self._index = None  # Changed since the index was written
+            raise PortalError(f"Portal {pid} was removed or compacted meanwhile; retry") from None
+        if record["deltas"]:
+            try:
+                self._cache_put(pid, record, portal)
+            except OSError:
+                pass  # Only a cache
+        return portal
+
+    def open(self, ref: str) -> dict:
+        pid = self.resolve(ref)
+        return self._materialize(pid, self.index()["portals"][pid])
+
+    def list(self, limit: int = 20, page: int = 1) -> dict:
+        """One page of portals, most recently updated first."""
+        if limit < 1 or page < 1:
+            raise PortalError(f"limit and page must be at least 1 (got limit={limit}, page={page})")
+        portals = self.index()["portals"]
+        start = (page - 1) * limit
+        items = list(portals.items())[start:start + limit]
+        hidden = ("file", "deltas", "sig", "ts", "mtime")
+        return {
+            "total": len(portals),
+            "page": page,
+            "pages": max((len(portals) + limit - 1) // limit, 1),
+            "portals": [
+                {"id": pid, **{k: v for k, v in record.items() if k not in hidden}}
+                for pid, record in items
+            ],
+        }
+
+    # -- Changes -----------------------------------------------------------
+
+    def _new_id(self, taken) -> str:
+        while True:
+            pid = "PORTAL-" + "".join(random.choices(ID_ALPHABET, k=4))
+            if pid not in taken and not any(
+                (self.dir / f"{pid}.json{suffix}").exists() for suffix in COMPRESSION_SUFFIXES.values()
+            ):
+                return pid
+
+    def create(self, name: str, fields: dict) -> dict:
+        if not NAME_RE.match(name):
+            raise PortalError("Portal names may only contain letters, digits, '-' and '_'")
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with self._locked():
+            index = self._current()
+            for pid, record in index["portals"].items():
+                if record["name"] == name:
+                    raise PortalError(f"Name {name!r} is already used by {pid}; use update")
+            pid = self._new_id(index["portals"])
+            now = _now()
+            portal = {
+                ID_KEY: pid,
+                "name": name,
+                "type": "portal",
+                "created": now,
+                "origin": {
+                    "project": Path.cwd().name,
+                    "machine": socket.gethostname(),
+                    "working_dir": str(Path.cwd()),
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M"),
+                },
+                "context": {},
+                "session_state": {},
+                "continuation": {},
+            }
+            _merge(portal, fields)
+            base = self.dir / f"{pid}.json{self._suffix()}"
+            _write_json(base, portal)
+            index["portals"][pid] = self._summary(portal, base, [])
+            self._save_index(index)
+        return portal
+
+    def update(self, ref: str, fields: dict) -> dict:
+        """Record changed fields as one delta; compacts every compact_every updates."""
+        pid = self.resolve(ref)
+        with self._locked():
+            index = self._current()
+            if pid not in index["portals"]:
+                raise PortalError(f"Portal {pid} was removed")
+            base, deltas = self._files(index["portals"][pid])
+            current = self._materialize(pid, index["portals"][pid])
+            portal = copy.deepcopy(current)
+            _merge(portal, fields)
+            portal["updated"] = _now()
+            revision = current.get("revision", 0) + 1
+
+            stem = BASE_RE.match(base.name)["stem"]
+            delta = self.dir / f"{stem}.{revision:04d}.delta.json{self._suffix(base)}"
+            _write_json(delta, {"revision": revision, "ops": diff(current, portal)}, indent=None)
+            portal["revision"] = revision
+            deltas.append(delta)
+            if len(deltas) >= self.compact_every:
+                base, deltas = self._compact_locked(portal, base, deltas), []
+
+            index["portals"][pid] = self._summary(portal, base, deltas)
+            self._save_index(index)
+            self._cache_put(pid, index["portals"][pid], portal)
+        return portal
+
+    def compact(self, ref: str | None = None) -> int:
+        """Fold deltas into the base (and apply self.compression) for one or all portals.
+
+        Returns how many portals were rewritten.
+        """
+        with self._locked():
+            index = self._current()
+            pids = [self.resolve(ref)] if ref else list(index["portals"])
+            rewritten = 0
+            for pid in pids:
+                base, deltas = self._files(index["portals"][pid])
+                if not deltas and base.name.endswith(".json" + self._suffix(base)):
+                    continue  # Nothing to fold and already in the wanted format
+                portal = load_portal(base, deltas)
+                base = self._compact_locked(portal, base, deltas)
+                index["portals"][pid] = self._summary(portal, base, [])
+                self._cache_put(pid, index["portals"][pid], portal)
+                rewritten += 1
+            self._save_index(index)
+        return rewritten
+
+    def close(self, ref: str) -> str:
+        pid = self.resolve(ref)
+        with self._locked():
+            index = self._current()
+            record = index["portals"].pop(pid, None)
+            if record is None:
+                raise PortalError(f"Portal {pid} was removed")
+            base, deltas = self._files(record)
+            for path in (base, *deltas, self._cache_path(pid)):
+                path.unlink(missing_ok=True)
+            self._save_index(index)
+        return pid
+
+
+def _merge(portal: dict, fields: dict) -> None:
+    """Apply {"section.key": value} fields; None values are skipped."""
+    for dotted, value in fields.items():
+        if value is None:
+            continue
+        section, key = dotted.split(".", 1)
+        portal.setdefault(section, {})[key] = value
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+# CLI flag -> portal field
+FIELD_FLAGS = {
+    "context": "context.summary",
+    "state": "context.current_state",
+    "work": "context.active_work",
+    "decisions": "context.decisions",
+    "blockers": "context.blockers",
+    "files": "context.files_touched",
+    "mood": "session_state.mood",
+    "energy": "session_state.energy",
+    "notes": "session_state.notes",
+    "next": "continuation.next_steps",
+    "questions": "continuation.questions_pending",
+    "important": "continuation.important_context",
+}
+LIST_FLAGS = {"work", "decisions", "blockers", "files", "next", "questions"}
+
+
+def _add_field_flags(parser: argparse.ArgumentParser) -> None:
+    for flag in FIELD_FLAGS:
+        if flag in LIST_FLAGS:
+            parser.add_argument(f"--{flag}", nargs="*")
+        else:
+            parser.add_argument(f"--{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PORTAL — portal store")
+    parser.add_argument("--dir", type=Path, default=Path("portals"),
+                        help="Portals directory (default: ./portals)")
+    parser.add_argument("--compress", choices=list(COMPRESSION_SUFFIXES),
+                        help="Compression for files written (default: keep each portal's format)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    create = sub.add_parser("create", help="Save a new portal")
+    create.add_argument("name")
+    _add_field_flags(create)
+
+    open_ = sub.add_parser("open", help="Print a portal by ID or name")
+    open_.add_argument("ref")
+
+    list_ = sub.add_parser("list", help="Portals, most recent first")
+    list_.add_argument("--limit", type=int, default=20)
+    list_.add_argument("--page", type=int, default=1)
+
+    update = sub.add_parser("update", help="Update fields of a portal")
+    update.add_argument("ref")
+    _add_field_flags(update)
+
+    close = sub.add_parser("close", help="Delete a portal")
+    close.add_argument("ref")
+
+    compact = sub.add_parser("compact", help="Fold deltas into base snapshots")
+    compact.add_argument("ref", nargs="?", help="One portal (default: all)")
+
+    sub.add_parser("rebuild", help="Re-read every portal file into the index")
+    args = parser.parse_args()
+
+    if args.command != "create" and not args.dir.is_dir():
+        print(json.dumps({"error": f"Portals directory not found: {args.dir}"}))
+        sys.exit(1)
+
+    try:
+        store = PortalStore(args.dir, compression=args.compress)
+        if args.command in ("create", "update"):
+            fields = {field: getattr(args, flag) for flag, field in FIELD_FLAGS.items()}
+            if args.command == "create":
+                result = store.create(args.name, fields)
+            else:
+                result = store.update(args.ref, fields)
+        elif args.command == "open":
+            result = store.open(args.ref)
+        elif args.command == "list":
+            result = store.list(limit=args.limit, page=args.page)
+        elif args.command == "close":
+            result = {"closed": store.close(args.ref)}
+        elif args.command == "compact":
+            result = {"compacted": store.compact(args.ref)}
+        else:
+            result = {"indexed": store.rebuild()}
+    except PortalError as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
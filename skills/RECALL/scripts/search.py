@@ -0,0 +1,524 @@
+#!/usr/bin/env python3
+"""
+RECALL Search - Inverted-index BM25 search over the knowledge base
+
+Builds a persistent inverted index (token -> postings) over every entry's
+title, tags and summary plus the report body, and answers top-k queries
+without scanning the knowledge base. Reports in research/ that are missing
+from index.json are indexed too (full-text only), so nothing falls through.
+
+Results follow RECALL's ranking tiers — exact title > tag > summary > full
+text — and BM25 orders results within a tier.
+
+Usage:
+    python search.py query "websocket auth"          # JSON, top 10
+    python search.py query "rust async" -k 5 --tag backend
+    python search.py build                           # Full refresh (re-stats every report)
+    python search.py build --rebuild                 # Drop and re-index everything
+    python search.py stats
+    python search.py similar "how do sockets authenticate"   # Needs NumPy (see vectors.py)
+    python search.py similar --id k-007
+    python search.py --kb path/to/knowledge query "..."
+
+The index lives in knowledge/.recall-index.sqlite and is refreshed
+incrementally: queries re-index only when index.json, RECON's journal
+(index.log.jsonl) or research/ changed, and then only the entries and
+reports that differ.
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import time
+from array import array
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+INDEX_NAME = ".recall-index.sqlite"
+LOG_NAME = "index.log.jsonl"  # RECON's append-only journal over index.json
+LOCK_NAME = ".index.lock"  # RECON holds it while appending or compacting
+SCHEMA_VERSION = "1"
+
+# BM25 parameters and per-field weights (BM25F-style sum)
+K1 = 1.2
+B = 0.75
+FIELDS = ("title", "tags", "summary", "body")
+FIELD_WEIGHTS = {"title": 3.0, "tags": 2.5, "summary": 1.5, "body": 1.0}
+
+# Ranking tiers, best first
+TIERS = ("title", "tag", "summary", "fulltext")
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+# Postings are keyed by integer term IDs (terms table) to keep rows small.
+# Each doc stores its own (term, field) keys, so removing a doc is a set of
+# primary-key deletes rather than a second index over postings.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS terms (tid INTEGER PRIMARY KEY, token TEXT UNIQUE NOT NULL);
+CREATE TABLE IF NOT EXISTS docs (
+    doc INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    sig TEXT NOT NULL,
+    entry TEXT NOT NULL,
+    title_norm TEXT NOT NULL,
+    len_title INTEGER, len_tags INTEGER, len_summary INTEGER, len_body INTEGER,
+    postings BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    tid INTEGER NOT NULL,
+    field INTEGER NOT NULL,
+    doc INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (tid, field, doc)
+) WITHOUT ROWID;
+"""
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+@contextmanager
+def _reading_lock(kb: Path):
+    """RECON's lock, shared where the platform allows; skipped if it can't be opened (read-only KB)."""
+    try:
+        lock = open(kb / LOCK_NAME, "a+b")
+    except OSError:
+        yield
+        return
+    with lock:
+        try:
+            import fcntl
+        except ImportError:  # Windows: msvcrt has no shared mode
+            import msvcrt
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+            return
+        fcntl.flock(lock, fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def load_entries(kb: Path) -> list[dict]:
+    """Entries from index.json plus RECON's journal (index.log.jsonl).
+
+    index.json is {"entries": [...]} or a bare list. Journal records are
+    {"op": "add", "entry": {...}} (insert or replace by id) and
+    {"op": "remove", "id": ...}, replayed in order.
+
+    Both files are read under RECON's lock, journal first: without the lock,
+    a compaction in between then only means replaying records the new
+    index.json already holds, which is harmless, instead of losing them.
+    """
+    with _reading_lock(kb):
+        try:
+            log = (kb / LOG_NAME).read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            log = []
+        try:
+            data = json.loads((kb / "index.json").read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            data = []
+    entries = data.get("entries", []) if isinstance(data, dict) else data
+    merged = {}
+    for i, entry in enumerate(e for e in entries if isinstance(e, dict)):
+        merged[entry.get("id", f"#{i}")] = entry
+    for line in log:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue  # Torn write from a killed RECON process
+        if not isinstance(record, dict):
+            continue
+        if record.get("op") == "add" and isinstance(record.get("entry"), dict):
+            merged[record["entry"].get("id")] = record["entry"]
+        elif record.get("op") == "remove":
+            merged.pop(record.get("id"), None)
+    return list(merged.values())
+
+
+def _file_sig(path: Path) -> str:
+    try:
+        st = path.stat()
+    except OSError:
+        return "missing"
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+def _source_sig(kb: Path) -> str:
+    """Cheap change detector: index.json, its journal and the research/ listing."""
+    return "|".join(_file_sig(kb / name) for name in ("index.json", LOG_NAME, "research"))
+
+
+def _orphan_title(path: Path, body: str) -> str:
+    heading = re.search(r"^#\s+(.+)$", body, re.MULTILINE)
+    return heading.group(1).strip() if heading else path.stem
+
+
+def _result(entry: dict, score: float) -> dict:
+    return {
+        "id": entry.get("id"),
+        "title": entry.get("title"),
+        "file": entry.get("file"),
+        "date": entry.get("date"),
+        "tags": entry.get("tags") or [],
+        "summary": entry.get("summary"),
+        "score": round(score, 4),
+    }
+
+
+class SearchIndex:
+    """Persistent inverted index for one knowledge base directory."""
+
+    def __init__(self, kb: Path):
+        self.kb = Path(kb)
+        self.db = sqlite3.connect(self.kb / INDEX_NAME)
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.db.execute("PRAGMA cache_size = -65536")  # 64 MiB: bulk indexing stays in memory
+        self.db.executescript(SCHEMA)
+        self._vocab: dict[str, int] | None = None
+        if self._meta("version") != SCHEMA_VERSION:
+            self.clear()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _meta(self, key: str) -> str | None:
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def clear(self) -> None:
+        with self.db:
+            self.db.execute("DELETE FROM postings")
+            self.db.execute("DELETE FROM docs")
+            self.db.execute("DELETE FROM terms")
+            # Similarity vectors (vec_*) are keyed by document signature and stay valid
+            self.db.execute(r"DELETE FROM meta WHERE key NOT LIKE 'vec\_%' ESCAPE '\'")
+            self._set_meta("version", SCHEMA_VERSION)
+
+    # -- Indexing ----------------------------------------------------------
+
+    def _documents(self) -> dict[str, tuple[dict, Path | None]]:
+        """{key: (entry, report path)} for every indexed entry and orphan report."""
+        docs = {}
+        referenced = set()
+        for i, entry in enumerate(load_entries(self.kb)):
+            path = self.kb / entry["file"] if entry.get("file") else None
+            if path is not None:
+                referenced.add(path.resolve())
+            docs[f"id:{entry.get('id', i)}"] = (entry, path)
+        research = self.kb / "research"
+        if research.is_dir():
+            for path in sorted(research.glob("*.md")):
+                if path.resolve() not in referenced:
+                    rel = path.relative_to(self.kb).as_posix()
+                    docs[f"file:{rel}"] = ({"id": None, "file": rel}, path)
+        return docs
+
+    def refresh(self, force: bool = False) -> int:
+        """Re-index changed entries. Returns how many documents were (re)indexed.
+
+        Without force, nothing is stat'ed unless index.json or the research/
+        listing changed since the last refresh.
+        """
+        source_sig = _source_sig(self.kb)
+        if not force and self._meta("source_sig") == source_sig:
+            return 0
+
+        existing = dict(self.db.execute("SELECT key, sig FROM docs"))
+        current = self._documents()
+        updated = 0
+        with self.db:
+            for key in existing.keys() - current.keys():
+                self._delete(key)
+            for key, (entry, path) in current.items():
+                sig_source = json.dumps(entry, sort_keys=True) + (_file_sig(path) if path else "")
+                sig = hashlib.sha1(sig_source.encode("utf-8")).hexdigest()
+                if existing.get(key) == sig:
+                    continue
+                self._delete(key)
+                self._insert(key, sig, entry, path)
+                updated += 1
+            self._set_meta("source_sig", source_sig)
+        return updated
+
+    def _delete(self, key: str) -> None:
+        row = self.db.execute("SELECT doc, postings FROM docs WHERE key = ?", (key,)).fetchone()
+        if row:
+            doc, keys = row[0], array("q", row[1])
+            self.db.executemany(
+                "DELETE FROM postings WHERE tid = ? AND field = ? AND doc = ?",
+                ((k >> 2, k & 3, doc) for k in keys),
+            )
+            self.db.execute("DELETE FROM docs WHERE doc = ?", (doc,))
+
+    def _term_ids(self, tokens) -> list[int]:
+        if self._vocab is None:
+            self._vocab = dict(self.db.execute("SELECT token, tid FROM terms"))
+        new = [t for t in dict.fromkeys(tokens) if t not in self._vocab]
+        if new:
+            self.db.executemany("INSERT INTO terms (token) VALUES (?)", ((t,) for t in new))
+            placeholders = ",".join("?" * len(new))
+            self._vocab.update(self.db.execute(
+                f"SELECT token, tid FROM terms WHERE token IN ({placeholders})", new
+            ))
+        return [self._vocab[t] for t in tokens]
+
+    def _insert(self, key: str, sig: str, entry: dict, path: Path | None) -> None:
+        body = ""
+        if path is not None:
+            try:
+                body = path.read_text(encoding="utf-8", errors="replace")
+            except OSError:
+                pass
+        if key.startswith("file:"):
+            entry = {**entry, "title": _orphan_title(path, body)}
+        tags = entry.get("tags") or []
+        fields = {
+            "title": tokenize(str(entry.get("title", ""))),
+            "tags": tokenize(" ".join(map(str, tags))),
+            "summary": tokenize(str(entry.get("summary", ""))),
+            "body": tokenize(body),
+        }
+        counts = [Counter(fields[field]) for field in FIELDS]
+        rows = []
+        for field_no, counter in enumerate(counts):
+            for tid, tf in zip(self._term_ids(list(counter)), counter.values()):
+                rows.append((tid, field_no, tf))
+        cursor = self.db.execute(
+            "INSERT INTO docs (key, sig, entry, title_norm,"
+            " len_title, len_tags, len_summary, len_body, postings)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, sig, json.dumps(entry), " ".join(fields["title"]),
+             *(len(fields[f]) for f in FIELDS),
+             array("q", (tid << 2 | field_no for tid, field_no, _ in rows)).tobytes()),
+        )
+        doc = cursor.lastrowid
+        self.db.executemany(
+            "INSERT INTO postings VALUES (?, ?, ?, ?)",
+            ((tid, field_no, doc, tf) for tid, field_no, tf in rows),
+        )
+
+    # -- Querying ----------------------------------------------------------
+
+    def search(self, query: str, k: int = 10, tag: str | None = None) -> list[dict]:
+        """Top-k entries for query, best first."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        n_docs, *total_lengths = self.db.execute(
+            "SELECT COUNT(*), SUM(len_title), SUM(len_tags), SUM(len_summary), SUM(len_body) FROM docs"
+        ).fetchone()
+        if not n_docs:
+            return []
+        avg_length = [max((total or 0) / n_docs, 1.0) for total in total_lengths]
+
+        # token -> field -> [(doc, tf)]
+        postings: dict[str, dict[int, list[tuple[int, int]]]] = {}
+        for term in terms:
+            by_field = defaultdict(list)
+            for field_no, doc, tf in self.db.execute(
+                "SELECT field, doc, tf FROM postings"
+                " WHERE tid = (SELECT tid FROM terms WHERE token = ?)", (term,)
+            ):
+                by_field[field_no].append((doc, tf))
+            postings[term] = by_field
+
+        candidates = {doc for by_field in postings.values() for plist in by_field.values() for doc, _ in plist}
+        if not candidates:
+            return []
+        lengths = {}
+        placeholders = ",".join("?" * len(candidates))
+        for row in self.db.execute(
+            f"SELECT doc, title_norm, len_title, len_tags, len_summary, len_body, entry"
+            f" FROM docs WHERE doc IN ({placeholders})", tuple(candidates),
+        ):
+            lengths[row[0]] = row[1:]
+
+        scores: dict[int, float] = defaultdict(float)
+        matched: dict[int, set[str]] = defaultdict(set)
+        for by_field in postings.values():
+            for field_no, plist in by_field.items():
+                field = FIELDS[field_no]
+                idf = math.log(1 + (n_docs - len(plist) + 0.5) / (len(plist) + 0.5))
+                for doc, tf in plist:
+                    norm = 1 - B + B * lengths[doc][1 + field_no] / avg_length[field_no]
+                    scores[doc] += FIELD_WEIGHTS[field] * idf * tf * (K1 + 1) / (tf + K1 * norm)
+                    matched[doc].add(field)
+
+        phrase = " ".join(tokenize(query))
+        ranked = []
+        for doc, score in scores.items():
+            title_norm, *_, entry_json = lengths[doc]
+            if f" {phrase} " in f" {title_norm} ":
+                tier = "title"
+            elif "tags" in matched[doc]:
+                tier = "tag"
+            elif "summary" in matched[doc]:
+                tier = "summary"
+            else:
+                tier = "fulltext"
+            ranked.append((-TIERS.index(tier), score, doc, tier, entry_json))
+
+        if tag:
+            tag = tag.lower()
+            ranked = [
+                r for r in ranked
+                if tag in (str(t).lower() for t in json.loads(r[4]).get("tags") or [])
+            ]
+
+        return [
+            {
+                **_result(json.loads(entry_json), score),
+                "tier": tier,
+                "matched": sorted(matched[doc], key=FIELDS.index),
+            }
+            for _, score, doc, tier, entry_json in heapq.nlargest(k, ranked)
+        ]
+
+    def entries(self, keys: list[str], scores: list[float]) -> list[dict]:
+        """Results for document keys (e.g. from vectors.VectorIndex), in order."""
+        if not keys:
+            return []
+        placeholders = ",".join("?" * len(keys))
+        found = dict(self.db.execute(f"SELECT key, entry FROM docs WHERE key IN ({placeholders})", keys))
+        return [_result(json.loads(found[key]), score) for key, score in zip(keys, scores) if key in found]
+
+    def stats(self) -> dict:
+        n_docs, orphans = self.db.execute(
+            "SELECT COUNT(*), SUM(key LIKE 'file:%') FROM docs"
+        ).fetchone()
+        n_tokens = self.db.execute("SELECT COUNT(*) FROM terms").fetchone()[0]
+        n_postings = self.db.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+        return {
+            "documents": n_docs,
+            "unindexed_reports": orphans or 0,
+            "tokens": n_tokens,
+            "postings": n_postings,
+            "index_bytes": os.path.getsize(self.kb / INDEX_NAME),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RECALL — knowledge base search")
+    parser.add_argument("--kb", type=Path, default=Path("knowledge"),
+                        help="Knowledge base directory (default: ./knowledge)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    query = sub.add_parser("query", help="Search; prints JSON")
+    query.add_argument("terms", nargs="+")
+    query.add_argument("-k", "--top", type=int, default=10, help="Number of results")
+    query.add_argument("--tag", help="Only entries carrying this tag")
+
+    similar = sub.add_parser("similar", help="Similarity search (needs NumPy); prints JSON")
+    similar.add_argument("terms", nargs="*")
+    similar.add_argument("--id", help="Find entries similar to this entry instead")
+    similar.add_argument("-k", "--top", type=int, default=10, help="Number of results")
+    similar.add_argument("--tag", help="Only entries carrying this tag")
+
+    build = sub.add_parser("build", help="Refresh the index (stats every report)")
+    build.add_argument("--rebuild", action="store_true", help="Drop and re-index everything")
+
+    sub.add_parser("stats", help="Index size")
+    args = parser.parse_args()
+
+    if not args.kb.is_dir():
+        print(json.dumps({"error": f"Knowledge base not found: {args.kb}"}))
+        sys.exit(1)
+
+    vectors = None
+    if args.command in ("similar", "build", "stats"):
+        try:
+            import vectors
+        except ImportError:
+            if args.command == "similar":
+                print(json.dumps({"error": "Similarity search needs NumPy: pip install numpy"}))
+                sys.exit(1)
+    if args.command == "similar" and not args.terms and not args.id:
+        print(json.dumps({"error": "Give query text or --id"}))
+        sys.exit(1)
+
+    with SearchIndex(args.kb) as index:
+        if args.command == "query":
+            start = time.perf_counter()
+            reindexed = index.refresh()
+            text = " ".join(args.terms)
+            results = index.search(text, k=args.top, tag=args.tag)
+            print(json.dumps({
+                "query": text,
+                "reindexed": reindexed,
+                "took_ms": round((time.perf_counter() - start) * 1000, 2),
+                "results": results,
+            }, indent=2))
+
+        elif args.command == "similar":
+            start = time.perf_counter()
+            reindexed = index.refresh()
+            vector_index = vectors.VectorIndex(index)
+            embedded = vector_index.sync()
+            text = " ".join(args.terms)
+            key = None
+            if args.id:
+                key = f"id:{args.id}"
+            hits = vector_index.similar(text=text, key=key, k=args.top, tag=args.tag)
+            print(json.dumps({
+                "query": text or None,
+                "similar_to": args.id,
+                "reindexed": reindexed,
+                "embedded": embedded,
+                "took_ms": round((time.perf_counter() - start) * 1000, 2),
+                "results": index.entries([key for key, _ in hits], [score for _, score in hits]),
+            }, indent=2))
+
+        elif args.command == "build":
+            if args.rebuild:
+                index.clear()
+            start = time.perf_counter()
+            reindexed = index.refresh(force=True)
+            stats = {"reindexed": reindexed}
+            if vectors is not None:
+                vector_index = vectors.VectorIndex(index)
+                if args.rebuild:
+                    vector_index.clear()
+                stats["embedded"] = vector_index.sync()
+            print(json.dumps({
+                **stats,
+                "took_ms": round((time.perf_counter() - start) * 1000, 2),
+                **index.stats(),
+            }, indent=2))
+
+        elif args.command == "stats":
+            stats = index.stats()
+            if vectors is not None:
+                stats.update(vectors.VectorIndex(index).stats())
+            print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
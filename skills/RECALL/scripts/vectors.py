@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+RECALL Vectors - Offline similarity search over hashed TF-IDF vectors
+
+Every indexed entry gets a fixed-size vector of hashed term features
+(the word itself plus a 5-letter prefix stem, so "authenticating" meets
+"authentication"). Vectors live in a NumPy memory-mapped file next to the
+keyword index, and a query is a chunked, vectorized cosine top-k over it.
+No network and no model download.
+
+IDF weights are applied at query time from a document-frequency table kept
+in the search database. Adding an entry therefore only writes that entry's
+row; nothing else is recomputed.
+
+Requires NumPy (optional: keyword search in search.py works without it).
+Used through search.py:
+    python search.py similar "how do sockets authenticate"
+    python search.py similar --id k-007          # Entries related to k-007
+"""
+
+import json
+import math
+import re
+import zlib
+from collections import Counter, defaultdict
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+VECTORS_NAME = ".recall-vectors.f32"
+VECTORS_VERSION = "1"   # Bump when features() or embed() change
+DIM = 2048              # Hashed feature space (float32: 8 KiB per entry)
+ROW_BYTES = DIM * 4
+PREFIX = 5              # Prefix-stem length
+GROW_ROWS = 1024        # Minimum file growth, in rows
+CHUNK_ROWS = 8192       # Rows scored per step (bounds scratch memory)
+
+FIELD_WEIGHTS = {"title": 3.0, "tags": 2.5, "summary": 1.5, "body": 1.0}
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before
+being below between both but by can could did do does doing down during each few for from
+further had has have having he her here hers him his how i if in into is it its itself just
+me more most my no nor not now of off on once only or other our ours out over own same she
+should so some such than that the their theirs them then there these they this those through
+to too under until up very was we were what when where which while who whom why will with
+would you your yours use using used vs versus
+""".split())
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vectors (key TEXT PRIMARY KEY, row INTEGER NOT NULL, sig TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS vector_free (row INTEGER PRIMARY KEY);
+"""
+
+
+def features(token: str) -> tuple[str, ...]:
+    """Features of one token: the word and its prefix stem (none for stopwords)."""
+    if token in STOPWORDS or len(token) < 2:
+        return ()
+    if len(token) > PREFIX:
+        return token, token[:PREFIX] + "~"
+    return (token,)
+
+
+@lru_cache(maxsize=1 << 16)
+def _hash(feature: str) -> tuple[int, float]:
+    """Stable (index, sign) for a feature; the sign keeps collisions unbiased."""
+    h = zlib.crc32(feature.encode("utf-8"))
+    return h % DIM, -1.0 if h >> 31 else 1.0
+
+
+def embed(weighted_texts: list[tuple[str, float]]) -> np.ndarray:
+    """Hashed, sublinear-TF vector (float32) for (text, weight) pairs."""
+    counts: defaultdict[str, float] = defaultdict(float)
+    for text, weight in weighted_texts:
+        for token, n in Counter(TOKEN_RE.findall(text.lower())).items():
+            for feature in features(token):
+                counts[feature] += n * weight
+    vector = np.zeros(DIM, dtype=np.float32)
+    for feature, tf in counts.items():
+        index, sign = _hash(feature)
+        vector[index] += sign * (1.0 + math.log(tf))
+    return vector
+
+
+def embed_entry(entry: dict, body: str) -> np.ndarray:
+    return embed([
+        (str(entry.get("title", "")), FIELD_WEIGHTS["title"]),
+        (" ".join(map(str, entry.get("tags") or [])), FIELD_WEIGHTS["tags"]),
+        (str(entry.get("summary", "")), FIELD_WEIGHTS["summary"]),
+        (body, FIELD_WEIGHTS["body"]),
+    ])
+
+
+class VectorIndex:
+    """Memory-mapped vectors for the documents of a SearchIndex.
+
+    Shares the SearchIndex's SQLite connection: the vectors table maps each
+    document key to a row of the memmap and the document signature that row
+    was computed from, so sync() only embeds documents that changed.
+    """
+
+    def __init__(self, search_index):
+        self.kb: Path = search_index.kb
+        self.db = search_index.db
+        self.db.executescript(SCHEMA)
+        self.path = self.kb / VECTORS_NAME
+        self._matrix: np.memmap | None = None
+        if (
+            self._meta("vec_version") != f"{VECTORS_VERSION}:{DIM}:{PREFIX}"
+            or self._capacity() < self._meta_int("vec_rows")  # Vector file deleted or truncated
+        ):
+            self.clear()
+
+    # -- Storage -----------------------------------------------------------
+
+    def _capacity(self) -> int:
+        try:
+            return self.path.stat().st_size // ROW_BYTES
+        except FileNotFoundError:
+            return 0
+
+    def _map(self, rows_needed: int = 0) -> np.memmap | None:
+        """Map the vector file, growing it to hold rows_needed rows."""
+        capacity = self._capacity()
+        if rows_needed > capacity:
+            capacity = max(rows_needed, capacity * 2, GROW_ROWS)
+            with open(self.path, "ab") as f:
+                f.truncate(capacity * ROW_BYTES)
+            self._matrix = None
+        if capacity == 0:
+            return None
+        if self._matrix is None or len(self._matrix) != capacity:
+            self._matrix = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(capacity, DIM))
+        return self._matrix
+
+    def _df(self) -> np.ndarray:
+        """Per-dimension document frequency."""
+        value = self._meta("vec_df")
+        if value is None or len(value) != DIM * 4:
+            return np.zeros(DIM, dtype=np.int32)
+        return np.frombuffer(value, dtype=np.int32).copy()
+
+    def _meta(self, key: str):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _meta_int(self, key: str) -> int:
+        return int(self._meta(key) or 0)
+
+    # -- Maintenance -------------------------------------------------------
+
+    def sync(self) -> int:
+        """Embed new and changed documents, free rows of removed ones.
+
+        Returns how many vectors were (re)computed.
+        """
+        docs = dict(self.db.execute("SELECT key, sig FROM docs"))
+        have = {key: (row, sig) for key, row, sig in self.db.execute("SELECT key, row, sig FROM vectors")}
+        stale = [key for key, (_, sig) in have.items() if docs.get(key) != sig]
+        missing = [key for key in docs if key not in have or docs[key] != have[key][1]]
+        if not stale and not missing:
+            return 0
+
+        with self.db:
+            df = self._df()
+            high_water = self._meta_int("vec_rows")
+            free = [r for (r,) in self.db.execute("SELECT row FROM vector_free ORDER BY row")]
+            matrix = self._map(high_water + max(0, len(missing) - len(free) - len(stale)))
+
+            for key in stale:
+                row = have[key][0]
+                df -= (matrix[row] != 0).astype(np.int32)
+                matrix[row] = 0
+                free.append(row)
+                self.db.execute("DELETE FROM vectors WHERE key = ?", (key,))
+
+            free.sort(reverse=True)
+            for key in missing:
+                entry_json, = self.db.execute("SELECT entry FROM docs WHERE key = ?", (key,)).fetchone()
+                entry = json.loads(entry_json)
+                body = ""
+                if entry.get("file"):
+                    try:
+                        body = (self.kb / entry["file"]).read_text(encoding="utf-8", errors="replace")
+                    except OSError:
+                        pass
+                if free:
+                    row = free.pop()
+                else:
+                    row = high_water
+                    high_water += 1
+                    matrix = self._map(high_water)
+                vector = embed_entry(entry, body)
+                matrix[row] = vector
+                df += (vector != 0).astype(np.int32)
+                self.db.execute("INSERT INTO vectors VALUES (?, ?, ?)", (key, row, docs[key]))
+
+            matrix.flush()
+            self.db.execute("DELETE FROM vector_free")
+            self.db.executemany("INSERT INTO vector_free VALUES (?)", ((r,) for r in free))
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('vec_df', ?)", (np.maximum(df, 0).tobytes(),))
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('vec_rows', ?)", (str(high_water),))
+        return len(missing)
+
+    def clear(self) -> None:
+        with self.db:
+            self.db.execute("DELETE FROM vectors")
+            self.db.execute("DELETE FROM vector_free")
+            self.db.execute("DELETE FROM meta WHERE key IN ('vec_df', 'vec_rows')")
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('vec_version', ?)",
+                            (f"{VECTORS_VERSION}:{DIM}:{PREFIX}",))
+        self._matrix = None
+        self.path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        return {
+            "vectors": self.db.execute("SELECT COUNT(*) FROM vectors").fetchone()[0],
+            "vector_bytes": self._capacity() * ROW_BYTES,
+        }
+
+    # -- Querying ----------------------------------------------------------
+
+    def similar(self, text: str | None = None, key: str | None = None, k: int = 10,
+                tag: str | None = None) -> list[tuple[str, float]]:
+        """Top-k (document key, cosine) for free text or for an indexed document."""
+        rows = dict(self.db.execute("SELECT row, key FROM vectors"))
+        matrix = self._map()
+        if not rows or matrix is None:
+            return []
+
+        if key is not None:
+            found = self.db.execute("SELECT row FROM vectors WHERE key = ?", (key,)).fetchone()
+            if found is None:
+                return []
+            query = np.array(matrix[found[0]])
+        else:
+            query = embed([(text or "", 1.0)])
+
+        n_docs = len(rows)
+        idf = np.log((n_docs + 1) / (self._df() + 1)).astype(np.float32) + 1.0
+        weights = idf * idf
+        query_norm = float(np.sqrt(query * query @ weights))
+        if query_norm == 0.0:
+            return []
+        query_weighted = query * weights
+
+        n_rows = self._meta_int("vec_rows")
+        scores = np.full(n_rows, -np.inf, dtype=np.float32)
+        for start in range(0, n_rows, CHUNK_ROWS):
+            block = matrix[start:min(start + CHUNK_ROWS, n_rows)]
+            dots = block @ query_weighted
+            norms = np.sqrt((block * block) @ weights)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cosine = dots / (norms * query_norm)
+            cosine[norms == 0] = -np.inf  # Freed rows
+            scores[start:start + len(block)] = cosine
+
+        if key is not None:
+            scores[found[0]] = -np.inf
+        if tag:
+            tag = tag.lower()
+            allowed = np.zeros(n_rows, dtype=bool)
+            for row, entry_json in self.db.execute(
+                "SELECT vectors.row, docs.entry FROM vectors JOIN docs USING (key)"
+            ):
+                if tag in (str(t).lower() for t in json.loads(entry_json).get("tags") or []):
+                    allowed[row] = True
+            scores[~allowed] = -np.inf
+
+        k = min(k, n_rows)
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(rows[int(r)], float(scores[r])) for r in top if np.isfinite(scores[r]) and scores[r] > 0]
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+RECON Knowledge Index - Journaled, append-only index maintenance
+
+Adding a report appends one JSON line to knowledge/index.log.jsonl instead of
+rewriting knowledge/index.json, so saving costs the same with 10 entries or
+10,000. The log is folded back into index.json (the snapshot) once it grows
+as large as the snapshot itself, which keeps adds amortized O(1).
+
+Every write happens under an exclusive lock on knowledge/.index.lock, so
+parallel RECON sessions can save at the same time without losing entries.
+Snapshots are written to a temp file and renamed into place; a reader never
+sees a half-written index.json.
+
+Journal records:
+    {"op": "add", "entry": {...}}     # Insert, or replace the entry with the same id
+    {"op": "remove", "id": "k-001"}
+
+Usage:
+    python kb_index.py add --title "Vector DBs" --file research/2026-02-01_vector-dbs.md \\
+        --tags vector,databases --summary "pgvector vs Qdrant vs Weaviate"
+    python kb_index.py add --json '{"id": "k-007", "title": ..., "file": ...}'
+    python kb_index.py remove k-007
+    python kb_index.py compact                 # Fold the log into index.json now
+    python kb_index.py list                    # Snapshot + log, as JSON
+    python kb_index.py --kb path/to/knowledge add ...
+"""
+
+import argparse
+import json
+import os
+import sys
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+
+SNAPSHOT_NAME = "index.json"
+LOG_NAME = "index.log.jsonl"
+LOCK_NAME = ".index.lock"
+
+# Compact once the log is at least this big *and* as big as the snapshot
+COMPACT_MIN_BYTES = 64 * 1024
+
+# ---------------------------------------------------------------------------
+# Locking and atomic writes
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def index_lock(kb: Path):
+    """Serialize writers of this knowledge base's journal and index.json (flock, msvcrt on Windows)."""
+    with open(kb / LOCK_NAME, "a+b") as lock:
+        try:
+            import fcntl
+        except ImportError:  # Windows
+            import msvcrt
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+            return
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Replace a file in one rename after fsync.
+
+    Compaction swaps index.json this way, so a search running meanwhile
+    replays the journal over either the old snapshot or the new one.
+    """
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+
+def read_snapshot(kb: Path) -> dict:
+    """index.json as a dict ({"entries": [...]}); a bare list is accepted too."""
+    try:
+        data = json.loads((kb / SNAPSHOT_NAME).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {"entries": []}
+    if isinstance(data, list):
+        return {"entries": data}
+    data.setdefault("entries", [])
+    return data
+
+
+def read_log(kb: Path) -> list[dict]:
+    """Journal records in order. A torn last line (killed writer) is skipped."""
+    try:
+        lines = (kb / LOG_NAME).read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return []
+    records = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict):
+            records.append(record)
+    return records
+
+
+def apply_log(entries: list[dict], records: list[dict]) -> list[dict]:
+    """Replay journal records over snapshot entries.
+
+    Replay is idempotent (adds replace by id, removes drop by id), so a log
+    that survives a crash mid-compaction can safely be applied twice.
+    """
+    merged = {}
+    for i, entry in enumerate(entries):
+        merged[entry.get("id", f"#{i}")] = entry
+    for record in records:
+        if record.get("op") == "add" and isinstance(record.get("entry"), dict):
+            entry = record["entry"]
+            merged[entry.get("id")] = entry  # A replaced entry keeps its position
+        elif record.get("op") == "remove":
+            merged.pop(record.get("id"), None)
+    return list(merged.values())
+
+
+def read_entries(kb: Path) -> list[dict]:
+    """Current entries: snapshot plus journal."""
+    return apply_log(read_snapshot(kb)["entries"], read_log(kb))
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+
+def _entry_id(entry: dict) -> str:
+    """Stable id from the report file name, so adding never scans the index."""
+    stem = Path(entry.get("file") or entry.get("title") or "entry").stem
+    return f"k-{stem}"
+
+
+def _append(kb: Path, record: dict) -> None:
+    """Add one record to the journal in a single write. Caller holds index_lock."""
+    line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+    fd = os.open(kb / LOG_NAME, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        size = os.fstat(fd).st_size
+        if size:
+            os.lseek(fd, size - 1, os.SEEK_SET)
+            if os.read(fd, 1) != b"\n":
+                line = b"\n" + line  # Last add was cut short; read_log skips it, not this one
+        os.write(fd, line)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _needs_compaction(kb: Path) -> bool:
+    log_bytes = _size(kb / LOG_NAME)
+    return log_bytes >= COMPACT_MIN_BYTES and log_bytes >= _size(kb / SNAPSHOT_NAME)
+
+
+def _compact_locked(kb: Path) -> int:
+    snapshot = read_snapshot(kb)
+    records = read_log(kb)
+    if not records:
+        return 0
+    snapshot["entries"] = apply_log(snapshot["entries"], records)
+    _write_atomic(kb / SNAPSHOT_NAME, json.dumps(snapshot, indent=2, ensure_ascii=False) + "\n")
+    # A crash before this truncate leaves records that replay harmlessly
+    os.truncate(kb / LOG_NAME, 0)
+    return len(records)
+
+
+def add_entry(kb: Path, entry: dict) -> dict:
+    """Journal an entry (insert or replace by id). Returns the stored entry."""
+    entry = dict(entry)
+    entry.setdefault("id", _entry_id(entry))
+    entry.setdefault("date", date.today().isoformat())
+    with index_lock(kb):
+        _append(kb, {"op": "add", "entry": entry})
+        if _needs_compaction(kb):
+            _compact_locked(kb)
+    return entry
+
+
+def remove_entry(kb: Path, entry_id: str) -> None:
+    with index_lock(kb):
+        _append(kb, {"op": "remove", "id": entry_id})
+        if _needs_compaction(kb):
+            _compact_locked(kb)
+
+
+def compact(kb: Path) -> int:
+    """Fold the journal into index.json. Returns how many records were folded."""
+    with index_lock(kb):
+        return _compact_locked(kb)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RECON — knowledge index maintenance")
+    parser.add_argument("--kb", type=Path, default=Path("knowledge"),
+                        help="Knowledge base directory (default: ./knowledge)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add = sub.add_parser("add", help="Add or replace an entry")
+    add.add_argument("--json", dest="entry_json", help="Full entry as a JSON object")
+    add.add_argument("--id")
+    add.add_argument("--title")
+    add.add_argument("--file", help="Report path relative to the knowledge base")
+    add.add_argument("--date", help="YYYY-MM-DD (default: today)")
+    add.add_argument("--tags", help="Comma-separated")
+    add.add_argument("--summary")
+
+    remove = sub.add_parser("remove", help="Remove an entry by id")
+    remove.add_argument("id")
+
+    sub.add_parser("compact", help="Fold the log into index.json")
+    sub.add_parser("list", help="Print all entries (snapshot + log)")
+    args = parser.parse_args()
+
+    args.kb.mkdir(parents=True, exist_ok=True)
+
+    if args.command == "add":
+        try:
+            entry = json.loads(args.entry_json) if args.entry_json else {}
+        except ValueError as e:
+            print(json.dumps({"error": f"--json is not valid JSON: {e}"}))
+            sys.exit(1)
+        if not isinstance(entry, dict):
+            print(json.dumps({"error": "--json must be a JSON object"}))
+            sys.exit(1)
+        for key in ("id", "title", "file", "date", "summary"):
+            if getattr(args, key):
+                entry[key] = getattr(args, key)
+        if args.tags:
+            entry["tags"] = [t.strip() for t in args.tags.split(",") if t.strip()]
+        if not entry.get("title") or not entry.get("file"):
+            print(json.dumps({"error": "An entry needs at least a title and a file"}))
+            sys.exit(1)
+        print(json.dumps(add_entry(args.kb, entry)))
+
+    elif args.command == "remove":
+        remove_entry(args.kb, args.id)
+        print(json.dumps({"removed": args.id}))
+
+    elif args.command == "compact":
+        print(json.dumps({"compacted": compact(args.kb)}))
+
+    elif args.command == "list":
+        print(json.dumps({"entries": read_entries(args.kb)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
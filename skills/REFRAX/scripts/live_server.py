@@ -0,0 +1,629 @@
+#!/usr/bin/env python3
+"""
+Live Server - Static file server that pushes data.json changes to the page
+
+A drop-in replacement for `python3 -m http.server` in skills whose page
+morphs when data.json is rewritten (REGTRAX, REFRAX). It watches data.json,
+with inotify on Linux and a stat() poll anywhere else, and pushes each
+new version to connected pages over Server-Sent Events. An update reaches
+the browser a few milliseconds after the write, and nothing crosses the
+wire while the file is unchanged.
+
+    GET /events      text/event-stream. On connect it sends the current
+                     data.json, then one `update` event per change. The
+                     event id is the ETag, so a reconnecting page is not
+                     resent a version it already has.
+    GET /data.json   The last valid version, with an ETag. A matching
+                     If-None-Match gets 304 Not Modified.
+    GET /<other>     Static files from the served directory.
+
+Only complete, valid JSON is published. A half-written file is skipped
+until the write that finishes it. Pages served by a plain static server,
+where /events is a 404, fall back to polling data.json.
+
+With --workspaces, one process instead hosts any number of isolated
+sessions, each under /w/<id>/. The templates are read once at startup and
+served from memory: every sibling skill that ships this script and a
+references/template.html, plus any --template NAME=PATH. Each session's
+data lives in memory and is set over HTTP, so parallel sessions never
+share a port or a data.json:
+
+    POST   /api/workspaces         {"template": "regtrax", "id"?: ..., "data"?: {...}}
+                                   -> 201 {"id", "template", "url", "etag"}
+    PUT    /w/<id>/data.json       Replace the data in one step (If-Match for
+                                   compare-and-swap, 412 if it moved on)
+    GET    /w/<id>/                The template; data.json and events as above
+    DELETE /w/<id>/                Drop the workspace
+    GET    /api/workspaces         Every workspace, its clients and idle time
+    GET    /api/health             {"ok": true, ...}
+
+A workspace with no page connected is removed after --idle-timeout seconds
+without requests. POST and PUT require Content-Type: application/json, so
+an ordinary web page cannot write to the server cross-origin.
+
+Usage:
+    python3 live_server.py /tmp/regtrax --port 8787
+    python3 live_server.py /tmp/refrax --port 8789 --watch poll
+    python3 live_server.py . --port 0          # Any free port (printed)
+    python3 live_server.py --workspaces --port 8787 --idle-timeout 3600
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import functools
+import hashlib
+import json
+import os
+import re
+import secrets
+import select
+import socket
+import struct
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+DATA_FILE = "data.json"
+POLL_INTERVAL = 0.05  # stat() fallback, seconds
+CLIENT_CHECK = 1.0    # How often an idle stream checks its client is still there
+RETRY_MS = 1000       # EventSource reconnect delay after the server goes away
+
+IDLE_TIMEOUT = 3600   # Workspace mode: seconds without requests or pages
+MAX_WORKSPACES = 256
+MAX_BODY = 16 * 1024 * 1024
+WORKSPACE_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+WORKSPACE_PATH_RE = re.compile(r"^/w/([^/]+)(/.*)?$")
+
+# inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_IGNORED = 0x00008000
+IN_EVENT = struct.Struct("iIII")
+
+
+def etag_of(raw: bytes) -> str:
+    return '"' + hashlib.sha1(raw).hexdigest()[:16] + '"'
+
+
+class LiveData:
+    """The current valid JSON document, and a condition to wait on for the next."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self.body: bytes | None = None
+        self.etag: str | None = None
+        self.clients = 0
+        self.closed = False
+        self._changed = threading.Condition()
+
+    def refresh(self) -> bool:
+        """Re-read the file; publish it if it is valid JSON and differs."""
+        before = self.etag
+        try:
+            return self.publish(self.path.read_bytes()) != before
+        except (OSError, ValueError):
+            return False  # Missing, or caught mid-write: the closing write triggers again
+
+    def publish(self, raw: bytes, expected: str | None = None) -> str | None:
+        """Make raw the current version (ValueError unless it is valid JSON).
+
+        With expected, only while the current ETag is still that one. Returns
+        the ETag now current, or None when the precondition failed.
+        """
+        json.loads(raw)
+        etag = etag_of(raw)
+        with self._changed:
+            if expected is not None and expected != self.etag:
+                return None
+            if etag != self.etag:
+                self.body, self.etag = raw, etag
+                self._changed.notify_all()
+            return etag
+
+    def close(self) -> None:
+        """End every open stream."""
+        with self._changed:
+            self.closed = True
+            self._changed.notify_all()
+
+    def snapshot(self) -> tuple[str | None, bytes | None]:
+        with self._changed:
+            return self.etag, self.body
+
+    def wait(self, etag: str | None, timeout: float) -> tuple[str | None, bytes | None]:
+        """Block until the version differs from etag, or closed (or timeout)."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.etag != etag or self.closed, timeout)
+            return self.etag, self.body
+
+    @contextmanager
+    def listening(self):
+        """Count an open event stream for as long as it lasts."""
+        with self._changed:
+            self.clients += 1
+        try:
+            yield
+        finally:
+            with self._changed:
+                self.clients -= 1
+            self.detached()
+
+    def detached(self) -> None:
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Watchers
+# ---------------------------------------------------------------------------
+
+
+def _inotify(directory: Path) -> int | None:
+    """inotify fd watching directory for finished writes and renames, or None."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    # The directory, not the file: editors and atomic writers replace data.json
+    # with a rename, which a watch on the old inode would never see
+    mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+    if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _watch_inotify(fd: int, data: LiveData) -> None:
+    """Refresh on every event for the file; returns when the watch goes away."""
+    name = os.fsencode(data.path.name)
+    with os.fdopen(fd, "rb", buffering=0) as events:
+        while True:
+            buf = events.read(64 * 1024)
+            offset, touched = 0, False
+            while offset < len(buf):
+                _, mask, _, length = IN_EVENT.unpack_from(buf, offset)
+                offset += IN_EVENT.size
+                if mask & IN_IGNORED:
+                    return  # Directory deleted or unmounted
+                touched |= buf[offset:offset + length].rstrip(b"\0") == name
+                offset += length
+            if touched:
+                data.refresh()
+
+
+def _watch_poll(data: LiveData, interval: float) -> None:
+    """Refresh whenever the file's mtime, size or inode changes."""
+    last = None
+    while True:
+        try:
+            st = data.path.stat()
+            sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+        except OSError:
+            sig = None
+        if sig != last and sig is not None:
+            data.refresh()
+        last = sig
+        time.sleep(interval)
+
+
+def start_watcher(data: LiveData, mode: str = "auto", interval: float = POLL_INTERVAL) -> str:
+    """Watch data.path in a daemon thread; returns the method in use."""
+    fd = _inotify(data.path.parent) if mode in ("auto", "inotify") else None
+    if fd is None and mode == "inotify":
+        raise OSError("inotify is not available here")
+
+    def run():
+        if fd is not None:
+            _watch_inotify(fd, data)  # Returns only if the watch is lost
+        _watch_poll(data, interval)
+
+    threading.Thread(target=run, name="live-watch", daemon=True).start()
+    return "inotify" if fd is not None else "poll"
+
+
+# ---------------------------------------------------------------------------
+# Workspaces
+# ---------------------------------------------------------------------------
+
+
+class WorkspaceError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Workspace(LiveData):
+    """One session's page: a template name plus its live data."""
+
+    def __init__(self, wid: str, template: str):
+        super().__init__()
+        self.id = wid
+        self.template = template
+        self.created = time.time()
+        self.touched = time.monotonic()
+
+    def touch(self) -> None:
+        self.touched = time.monotonic()
+
+    def detached(self) -> None:
+        self.touch()  # The idle clock starts when the last page closes
+
+    def describe(self, base_url: str) -> dict:
+        return {
+            "id": self.id,
+            "template": self.template,
+            "url": f"{base_url}/w/{self.id}/",
+            "etag": self.etag,
+            "clients": self.clients,
+            "idle": round(time.monotonic() - self.touched, 1),
+        }
+
+
+class WorkspaceHub:
+    """Every workspace in the process, and the templates they render."""
+
+    def __init__(self, templates: dict[str, Path], idle_timeout: float = IDLE_TIMEOUT,
+                 max_workspaces: int = MAX_WORKSPACES):
+        self.templates = {}
+        for name, path in templates.items():
+            body = Path(path).read_bytes()
+            self.templates[name] = (body, etag_of(body))
+        self.idle_timeout = idle_timeout
+        self.max_workspaces = max_workspaces
+        self._workspaces: dict[str, Workspace] = {}
+        self._lock = threading.Lock()
+
+    def create(self, template: str, wid: str | None = None) -> tuple[Workspace, bool]:
+        """New workspace (or the existing one with that id); True if created."""
+        if template not in self.templates:
+            raise WorkspaceError(HTTPStatus.BAD_REQUEST,
+                                 f"Unknown template '{template}' (have: {', '.join(sorted(self.templates))})")
+        if wid is not None and not WORKSPACE_ID_RE.match(wid):
+            raise WorkspaceError(HTTPStatus.BAD_REQUEST, "Workspace ids are 1-64 of A-Z a-z 0-9 _ -")
+        with self._lock:
+            if wid in self._workspaces:
+                workspace = self._workspaces[wid]
+                if workspace.template != template:
+                    raise WorkspaceError(HTTPStatus.CONFLICT,
+                                         f"Workspace '{wid}' already uses template '{workspace.template}'")
+                workspace.touch()
+                return workspace, False
+            if len(self._workspaces) >= self.max_workspaces:
+                raise WorkspaceError(HTTPStatus.SERVICE_UNAVAILABLE,
+                                     f"Workspace limit reached ({self.max_workspaces})")
+            while wid is None or wid in self._workspaces:
+                wid = secrets.token_hex(4)
+            workspace = self._workspaces[wid] = Workspace(wid, template)
+            return workspace, True
+
+    def get(self, wid: str) -> Workspace:
+        with self._lock:
+            workspace = self._workspaces.get(wid)
+        if workspace is None:
+            raise WorkspaceError(HTTPStatus.NOT_FOUND, f"No workspace '{wid}'")
+        workspace.touch()
+        return workspace
+
+    def delete(self, wid: str) -> None:
+        with self._lock:
+            workspace = self._workspaces.pop(wid, None)
+        if workspace is None:
+            raise WorkspaceError(HTTPStatus.NOT_FOUND, f"No workspace '{wid}'")
+        workspace.close()
+
+    def all(self) -> list[Workspace]:
+        with self._lock:
+            return sorted(self._workspaces.values(), key=lambda w: w.created)
+
+    def reap(self) -> list[str]:
+        """Remove workspaces with no page open and no request for idle_timeout."""
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._lock:
+            idle = [w for w in self._workspaces.values() if not w.clients and w.touched < cutoff]
+            for workspace in idle:
+                del self._workspaces[workspace.id]
+        for workspace in idle:
+            workspace.close()
+        return [w.id for w in idle]
+
+    def start_reaper(self) -> None:
+        interval = min(60.0, max(self.idle_timeout / 4, 0.05))
+
+        def run():
+            while True:
+                time.sleep(interval)
+                self.reap()
+
+        threading.Thread(target=run, name="workspace-reaper", daemon=True).start()
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+
+class LiveMixin:
+    """Conditional JSON and event-stream responses for a LiveData."""
+
+    quiet = True
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def end_headers(self):
+        self.send_header("Cache-Control", "no-cache")
+        super().end_headers()
+
+    def send_body(self, status: HTTPStatus, body: bytes, content_type: str, etag: str | None = None):
+        if etag and etag in {tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")}:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def send_data(self, live: LiveData):
+        etag, body = live.snapshot()
+        self.send_body(HTTPStatus.OK, body, "application/json", etag)
+
+    def send_events(self, live: LiveData):
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        self.wfile.write(f"retry: {RETRY_MS}\n\n".encode())
+        self.wfile.flush()
+        seen = self.headers.get("Last-Event-ID")
+        with live.listening():
+            try:
+                while not live.closed:
+                    etag, body = live.wait(seen, CLIENT_CHECK)
+                    if etag == seen or etag is None:
+                        if self.client_gone():
+                            return
+                        continue
+                    lines = body.decode("utf-8", "replace").splitlines() or [""]
+                    event = f"id: {etag}\nevent: update\n" + "".join(f"data: {line}\n" for line in lines)
+                    self.wfile.write((event + "\n").encode("utf-8"))
+                    self.wfile.flush()
+                    seen = etag
+            except (BrokenPipeError, ConnectionResetError):
+                return
+
+    def client_gone(self) -> bool:
+        """True once the page has closed the stream (EOF on a readable socket)."""
+        readable, _, _ = select.select([self.connection], [], [], 0)
+        if not readable:
+            return False
+        try:
+            return not self.connection.recv(1, socket.MSG_PEEK)
+        except OSError:
+            return True
+
+
+class LiveHandler(LiveMixin, SimpleHTTPRequestHandler):
+    """Static files, plus /events and a conditional /data.json."""
+
+    data: LiveData
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/events":
+            self.send_events(self.data)
+        elif path == "/" + self.data.path.name and self.data.snapshot()[0]:
+            self.send_data(self.data)
+        else:
+            super().do_GET()
+
+
+class WorkspaceHandler(LiveMixin, BaseHTTPRequestHandler):
+    """/api/... and /w/<id>/... routes over a WorkspaceHub."""
+
+    hub: WorkspaceHub
+    server_version = "LiveServer"
+
+    def do_GET(self):
+        self.route()
+
+    do_HEAD = do_POST = do_PUT = do_DELETE = do_GET
+
+    def route(self):
+        path = self.path.split("?", 1)[0]
+        try:
+            if path.startswith("/api/"):
+                self.route_api(path)
+                return
+            match = WORKSPACE_PATH_RE.match(path)
+            if not match:
+                raise WorkspaceError(HTTPStatus.NOT_FOUND, "Workspaces live under /w/<id>/")
+            workspace = self.hub.get(match.group(1))
+            self.route_workspace(workspace, match.group(2))
+        except WorkspaceError as e:
+            self.send_json(e.status, {"error": str(e)})
+
+    def route_api(self, path: str):
+        if path == "/api/health" and self.command in ("GET", "HEAD"):
+            self.send_json(HTTPStatus.OK, {
+                "ok": True, "pid": os.getpid(), "templates": sorted(self.hub.templates),
+                "workspaces": len(self.hub.all()),
+            })
+        elif path == "/api/workspaces" and self.command in ("GET", "HEAD"):
+            self.send_json(HTTPStatus.OK, {"workspaces": [w.describe(self.base_url) for w in self.hub.all()]})
+        elif path == "/api/workspaces" and self.command == "POST":
+            request = self.read_json()
+            if not isinstance(request, dict):
+                raise WorkspaceError(HTTPStatus.BAD_REQUEST, "Expected a JSON object")
+            workspace, created = self.hub.create(request.get("template", ""), request.get("id"))
+            if "data" in request:
+                workspace.publish(json.dumps(request["data"], indent=2).encode("utf-8"))
+            self.send_json(HTTPStatus.CREATED if created else HTTPStatus.OK, workspace.describe(self.base_url))
+        else:
+            raise WorkspaceError(HTTPStatus.NOT_FOUND, f"No route {self.command} {path}")
+
+    def route_workspace(self, workspace: Workspace, rest: str | None):
+        method = self.command
+        if rest is None and method in ("GET", "HEAD"):
+            self.send_response(HTTPStatus.MOVED_PERMANENTLY)
+            self.send_header("Location", f"/w/{workspace.id}/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif rest in (None, "/") and method == "DELETE":
+            self.hub.delete(workspace.id)
+            self.send_json(HTTPStatus.OK, {"deleted": workspace.id})
+        elif rest in ("/", "/index.html") and method in ("GET", "HEAD"):
+            body, etag = self.hub.templates[workspace.template]
+            self.send_body(HTTPStatus.OK, body, "text/html; charset=utf-8", etag)
+        elif rest == "/events" and method == "GET":
+            self.send_events(workspace)
+        elif rest == "/" + DATA_FILE and method in ("GET", "HEAD"):
+            if workspace.etag is None:
+                raise WorkspaceError(HTTPStatus.NOT_FOUND, f"Workspace '{workspace.id}' has no data yet")
+            self.send_data(workspace)
+        elif rest == "/" + DATA_FILE and method == "PUT":
+            raw = self.read_body()
+            try:
+                etag = workspace.publish(raw, self.headers.get("If-Match"))
+            except ValueError as e:
+                raise WorkspaceError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {e}")
+            if etag is None:
+                raise WorkspaceError(HTTPStatus.PRECONDITION_FAILED,
+                                     f"Data changed (now {workspace.etag}); re-read and retry")
+            self.send_json(HTTPStatus.OK, workspace.describe(self.base_url))
+        else:
+            raise WorkspaceError(HTTPStatus.NOT_FOUND, f"No route {method} /w/{workspace.id}{rest or ''}")
+
+    @property
+    def base_url(self) -> str:
+        host = self.headers.get("Host") or "{}:{}".format(*self.server.server_address[:2])
+        return f"http://{host}"
+
+    def read_body(self) -> bytes:
+        # A cross-origin page can only send form or text/plain bodies without
+        # a preflight this server never answers, so JSON-only means same-origin
+        if self.headers.get("Content-Type", "").split(";")[0].strip() != "application/json":
+            raise WorkspaceError(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, "Send Content-Type: application/json")
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            raise WorkspaceError(HTTPStatus.LENGTH_REQUIRED, "Content-Length required")
+        if length > MAX_BODY:
+            raise WorkspaceError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Body over {MAX_BODY} bytes")
+        return self.rfile.read(length)
+
+    def read_json(self):
+        try:
+            return json.loads(self.read_body())
+        except ValueError as e:
+            raise WorkspaceError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {e}")
+
+    def send_json(self, status: HTTPStatus, payload: dict):
+        self.send_body(status, json.dumps(payload).encode("utf-8"), "application/json")
+
+
+class LiveHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # Default 5 resets connections when many pages (re)connect at once
+
+
+def discover_templates() -> dict[str, Path]:
+    """Sibling skills that ship this script and a references/template.html."""
+    skills_dir = Path(__file__).resolve().parents[2]
+    found = {}
+    for script in sorted(skills_dir.glob("*/scripts/live_server.py")):
+        template = script.parent.parent / "references" / "template.html"
+        if template.is_file():
+            found[script.parent.parent.name.lower()] = template
+    return found
+
+
+def serve(directory: Path, host: str, port: int, watch: str, interval: float,
+          data_file: str = DATA_FILE, quiet: bool = True) -> None:
+    directory = directory.resolve()
+    data = LiveData(directory / data_file)
+    data.refresh()
+    method = start_watcher(data, watch, interval)
+    handler = type("Handler", (LiveHandler,), {"data": data, "quiet": quiet})
+    server = LiveHTTPServer((host, port), functools.partial(handler, directory=str(directory)))
+    print(f"Serving {directory} at http://{host}:{server.server_address[1]} "
+          f"(live {data_file}: {method})", flush=True)
+    _run(server)
+
+
+def serve_workspaces(hub: WorkspaceHub, host: str, port: int, quiet: bool = True) -> None:
+    hub.start_reaper()
+    handler = type("Handler", (WorkspaceHandler,), {"hub": hub, "quiet": quiet})
+    server = LiveHTTPServer((host, port), handler)
+    print(f"Serving workspaces at http://{host}:{server.server_address[1]}/w/<id>/ "
+          f"(templates: {', '.join(sorted(hub.templates))})", flush=True)
+    _run(server)
+
+
+def _run(server: LiveHTTPServer) -> None:
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Static server with live data.json push")
+    parser.add_argument("directory", nargs="?", type=Path, default=Path("."))
+    parser.add_argument("--port", "-p", type=int, default=8000, help="0 picks a free port")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: localhost only)")
+    parser.add_argument("--file", default=DATA_FILE, help="File to watch and push (default: data.json)")
+    parser.add_argument("--watch", choices=["auto", "inotify", "poll"], default="auto")
+    parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL)
+    parser.add_argument("--workspaces", action="store_true",
+                        help="Host many sessions under /w/<id>/ instead of one directory")
+    parser.add_argument("--template", action="append", default=[], metavar="NAME=PATH",
+                        help="Workspace template (default: every sibling skill's references/template.html)")
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT,
+                        help=f"Seconds before an unused workspace is removed (default: {IDLE_TIMEOUT})")
+    parser.add_argument("--max-workspaces", type=int, default=MAX_WORKSPACES)
+    parser.add_argument("--verbose", "-v", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    try:
+        if args.workspaces:
+            templates = discover_templates()
+            for spec in args.template:
+                name, sep, path = spec.partition("=")
+                if not sep or not name:
+                    parser.error(f"--template expects NAME=PATH, got '{spec}'")
+                templates[name.lower()] = Path(path).expanduser()
+            if not templates:
+                parser.error("no templates found; pass --template NAME=PATH")
+            hub = WorkspaceHub(templates, args.idle_timeout, args.max_workspaces)
+            serve_workspaces(hub, args.host, args.port, quiet=not args.verbose)
+        else:
+            if not args.directory.is_dir():
+                print(f"Error: {args.directory} is not a directory", file=sys.stderr)
+                sys.exit(1)
+            serve(args.directory, args.host, args.port, args.watch, args.poll_interval,
+                  args.file, quiet=not args.verbose)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
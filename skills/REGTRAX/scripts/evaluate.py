@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+REGTRAX Evaluate - Run a data.json regex over a whole corpus, headless
+
+The page checks testCases one string at a time in the browser. This reads
+the same data.json contract (pattern, flags, testCases) and streams any
+number of input files, or stdin, through the pattern line by line:
+
+    - how many lines match and fail, and which lines contradict --expect
+      (without it, the first lines that failed)
+    - whether each test case agrees with its shouldMatch
+    - per-line match time: mean, p50/p90/p99, max, and the slowest lines
+
+Lines are matched like the page's RegExp.exec: a search anywhere in the
+line, or anchored at the start with the sticky (y) flag. The JavaScript
+pattern is translated to Python's re wherever the two differ: `$` and `.`
+without the m/s flags, ASCII-only \\d \\w \\b, JS whitespace for \\s, named
+groups, `[^]`, and identity escapes. Large inputs are split into chunks
+that run on a pool of worker processes, and results are merged in input
+order.
+
+--write stores the summary as data.json's "evaluation" block, which the
+page renders under the diagram. In workspace mode, PUT the file afterwards.
+The summary is also printed as JSON. The exit status is 2 when a test case
+or (with --expect) a corpus line disagrees, and 1 on errors.
+
+Usage:
+    python3 evaluate.py /tmp/regtrax-3f9a1c2e.json access.log
+    zcat app.log.gz | python3 evaluate.py data.json - --expect match --write
+    python3 evaluate.py data.json part1.log part2.log --workers 8 --slowest 20
+    python3 evaluate.py data.json                     # testCases only
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+CHUNK_LINES = 5000
+MAX_EXAMPLES = 50
+SLOWEST = 10
+PREVIEW_CHARS = 200
+
+JS_FLAGS = set("dgimsuvy")
+JS_SPACE = "\\t\\n\\v\\f\\r \\u00a0\\u1680\\u2000-\\u200a\\u2028\\u2029\\u202f\\u205f\\u3000\\ufeff"
+JS_WORD = "A-Za-z0-9_"
+JS_BOUNDARY = f"(?:(?<=[{JS_WORD}])(?![{JS_WORD}])|(?<![{JS_WORD}])(?=[{JS_WORD}]))"
+JS_NOT_BOUNDARY = f"(?:(?<=[{JS_WORD}])(?=[{JS_WORD}])|(?<![{JS_WORD}])(?![{JS_WORD}]))"
+JS_LINE_CHAR = "[^\\n\\r\\u2028\\u2029]"
+
+# The same sets as code point ranges, for spelling out their complements
+JS_DIGIT_RANGES = [(0x30, 0x39)]
+JS_WORD_RANGES = [(0x30, 0x39), (0x41, 0x5A), (0x5F, 0x5F), (0x61, 0x7A)]
+JS_SPACE_RANGES = [
+    (0x09, 0x0D), (0x20, 0x20), (0xA0, 0xA0), (0x1680, 0x1680), (0x2000, 0x200A),
+    (0x2028, 0x2029), (0x202F, 0x202F), (0x205F, 0x205F), (0x3000, 0x3000), (0xFEFF, 0xFEFF),
+]
+
+
+def _code_point(c: int) -> str:
+    return f"\\x{c:02x}" if c < 0x100 else f"\\u{c:04x}" if c < 0x10000 else f"\\U{c:08x}"
+
+
+def _complement(ranges: list[tuple[int, int]]) -> str:
+    """Class body for every code point outside ranges (sorted, disjoint).
+
+    Inside a class, Python's own \\D, \\W and \\S are the Unicode complements,
+    not JavaScript's, so [\\S\\r\\n]-style classes get the ranges spelled out.
+    """
+    body, start = [], 0
+    for low, high in ranges + [(0x110000, 0x110000)]:
+        if low > start:
+            body.append(_code_point(start) if low - 1 == start else f"{_code_point(start)}-{_code_point(low - 1)}")
+        start = high + 1
+    return "".join(body)
+
+
+# Escapes translated to a class (outside / inside a character class)
+CLASS_ESCAPES = {
+    "d": ("[0-9]", "0-9"),
+    "D": ("[^0-9]", _complement(JS_DIGIT_RANGES)),
+    "w": (f"[{JS_WORD}]", JS_WORD),
+    "W": (f"[^{JS_WORD}]", _complement(JS_WORD_RANGES)),
+    "s": (f"[{JS_SPACE}]", JS_SPACE),
+    "S": (f"[^{JS_SPACE}]", _complement(JS_SPACE_RANGES)),
+}
+
+
+class EvaluateError(Exception):
+    pass
+
+
+def translate(pattern: str, flags: str = "") -> tuple[str, int]:
+    """JavaScript pattern + flags -> equivalent Python pattern and re flags."""
+    unknown = set(flags) - JS_FLAGS
+    if unknown:
+        raise EvaluateError(f"Unknown regex flag(s): {''.join(sorted(unknown))}")
+    unicode = "u" in flags or "v" in flags
+    out, i, n, in_class = [], 0, len(pattern), False
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            if i + 1 >= n:
+                raise EvaluateError("Pattern ends with a lone backslash")
+            e, i = pattern[i + 1], i + 2
+            hex4 = pattern[i:i + 4]
+            if e in CLASS_ESCAPES:
+                outside, inside = CLASS_ESCAPES[e]
+                out.append(inside if in_class else outside)
+            elif e in "pP" and unicode:
+                raise EvaluateError(f"\\{e}{{...}} Unicode property escapes have no Python equivalent here")
+            elif e == "q" and in_class and "v" in flags:
+                raise EvaluateError("\\q{...} string literals (v flag) have no Python equivalent here")
+            elif e == "b":
+                out.append("\\x08" if in_class else JS_BOUNDARY)
+            elif e == "B" and not in_class:
+                out.append(JS_NOT_BOUNDARY)
+            elif e == "k" and not in_class and pattern.startswith("<", i):
+                end = pattern.find(">", i)
+                if end < 0:
+                    raise EvaluateError("Unterminated \\k<name> backreference")
+                out.append(f"(?P={pattern[i + 1:end]})")
+                i = end + 1
+            elif e == "u" and unicode and pattern.startswith("{", i):
+                end = pattern.find("}", i)
+                if end < 0:
+                    raise EvaluateError(f"Unterminated \\u{{...}} escape at {i - 2}")
+                try:
+                    out.append(f"\\U{int(pattern[i + 1:end], 16):08x}")
+                except ValueError:
+                    raise EvaluateError(f"Invalid \\u{{...}} escape at {i - 2}")
+                i = end + 1
+            elif e == "u" and len(hex4) == 4 and all(h in "0123456789abcdefABCDEF" for h in hex4):
+                out.append("\\u" + hex4)
+                i += 4
+            elif e == "x" and len(pattern[i:i + 2]) == 2 and all(h in "0123456789abcdefABCDEF" for h in pattern[i:i + 2]):
+                out.append("\\x" + pattern[i:i + 2])
+                i += 2
+            elif e == "c" and i < n and pattern[i].isascii() and pattern[i].isalpha():
+                out.append(f"\\x{ord(pattern[i]) % 32:02x}")
+                i += 1
+            elif e == "0" and not (i < n and pattern[i].isdigit()):
+                out.append("\\x00")
+            elif e in "nrtfv123456789":
+                out.append("\\" + e)
+            else:
+                out.append(re.escape(e))  # Identity escape: \/ \- \. and letters JS reads literally
+            continue
+
+        if in_class:
+            if "v" in flags and (c == "[" or pattern.startswith(("&&", "--"), i)):
+                raise EvaluateError(f"v-flag set operation at {i} has no Python equivalent here")
+            if c == "]":
+                in_class = False
+                out.append(c)
+            else:
+                out.append(re.escape(c) if c in "[&~|" else c)  # Python warns on set operators
+            i += 1
+        elif pattern.startswith("[^]", i):
+            out.append("[\\s\\S]")
+            i += 3
+        elif pattern.startswith("[]", i):
+            out.append("(?!)")
+            i += 2
+        elif c == "[":
+            in_class = True
+            out.append("[^" if pattern.startswith("[^", i) else "[")
+            i += 2 if pattern.startswith("[^", i) else 1
+        elif pattern.startswith("(?<", i) and not pattern.startswith(("(?<=", "(?<!"), i):
+            out.append("(?P<")
+            i += 3
+        elif c == "." and "s" not in flags:
+            out.append(JS_LINE_CHAR)
+            i += 1
+        elif c == "$" and "m" not in flags:
+            out.append("\\Z")  # Python's $ also matches before a final newline
+            i += 1
+        elif pattern.startswith("{,", i):
+            out.append("\\{")  # Literal in JS, {0,n} in Python 3.11+
+            i += 1
+        else:
+            out.append(c)
+            i += 1
+    if in_class:
+        raise EvaluateError("Unterminated character class")
+
+    re_flags = 0
+    if "i" in flags:
+        re_flags |= re.IGNORECASE
+    if "m" in flags:
+        re_flags |= re.MULTILINE
+    if "s" in flags:
+        re_flags |= re.DOTALL
+    return "".join(out), re_flags
+
+
+def compile_js(pattern: str, flags: str = ""):
+    """Compiled matcher with RegExp.exec semantics: a bound search (or match if sticky)."""
+    source, re_flags = translate(pattern, flags)
+    try:
+        compiled = re.compile(source, re_flags)
+    except re.error as e:
+        raise EvaluateError(f"Pattern does not compile: {e}")
+    return compiled.match if "y" in flags else compiled.search
+
+
+def _preview(text: str) -> str:
+    return text if len(text) <= PREVIEW_CHARS else text[:PREVIEW_CHARS] + "…"
+
+
+# ---------------------------------------------------------------------------
+# Corpus evaluation (runs in worker processes)
+# ---------------------------------------------------------------------------
+
+_worker: dict = {}
+
+
+def _init_worker(pattern: str, flags: str, expect: str | None, max_examples: int, slowest: int) -> None:
+    _worker.update(match=compile_js(pattern, flags), expect=expect, max_examples=max_examples, slowest=slowest)
+
+
+def _evaluate_chunk(source: str, first_line: int, lines: list[str]) -> dict:
+    """Counts, examples, timing histogram and slowest lines for one chunk."""
+    match, expect = _worker["match"], _worker["expect"]
+    max_examples, keep_slowest = _worker["max_examples"], _worker["slowest"]
+    clock = time.perf_counter_ns
+    matched = contradicted = total_ns = max_ns = 0
+    examples, slowest, histogram = [], [], Counter()
+    for offset, line in enumerate(lines):
+        start = clock()
+        m = match(line)
+        ns = clock() - start
+        total_ns += ns
+        max_ns = max(max_ns, ns)
+        shift = max(ns.bit_length() - 3, 0)
+        histogram[(ns >> shift) << shift] += 1  # Log buckets, 4 per power of two
+        if len(slowest) < keep_slowest:
+            heapq.heappush(slowest, (ns, first_line + offset, line))
+        elif keep_slowest and ns > slowest[0][0]:
+            heapq.heapreplace(slowest, (ns, first_line + offset, line))
+        if m:
+            matched += 1
+        if (expect == "match" and not m) or (expect == "fail" and m) or (expect is None and not m):
+            contradicted += 1
+            if len(examples) < max_examples:
+                examples.append({
+                    "source": source, "line": first_line + offset, "input": _preview(line),
+                    "matched": bool(m), "match": _preview(m.group(0)) if m else None,
+                })
+    return {
+        "lines": len(lines), "matched": matched, "contradicted": contradicted, "examples": examples,
+        "total_ns": total_ns, "max_ns": max_ns, "histogram": histogram,
+        "slowest": [(ns, source, line, text) for ns, line, text in slowest],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+
+def _iter_chunks(sources: list[str], chunk_lines: int):
+    """(source, first line number, lines) per chunk, reading lazily."""
+    for source in sources:
+        try:
+            stream = sys.stdin.buffer if source == "-" else open(source, "rb")
+        except OSError as e:
+            raise EvaluateError(f"Cannot read {source}: {e.strerror}")
+        try:
+            numbered = enumerate(stream, 1)
+            while batch := list(itertools.islice(numbered, chunk_lines)):
+                lines = [raw.rstrip(b"\n").rstrip(b"\r").decode("utf-8", "replace") for _, raw in batch]
+                yield "stdin" if source == "-" else source, batch[0][0], lines
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+
+class _Totals:
+    def __init__(self, max_examples: int, slowest: int):
+        self.lines = self.matched = self.contradicted = self.total_ns = self.max_ns = 0
+        self.examples, self.slowest, self.histogram = [], [], Counter()
+        self.max_examples, self.keep_slowest = max_examples, slowest
+
+    def add(self, chunk: dict) -> None:
+        self.lines += chunk["lines"]
+        self.matched += chunk["matched"]
+        self.contradicted += chunk["contradicted"]
+        self.total_ns += chunk["total_ns"]
+        self.max_ns = max(self.max_ns, chunk["max_ns"])
+        self.histogram.update(chunk["histogram"])
+        self.examples.extend(chunk["examples"][:self.max_examples - len(self.examples)])
+        self.slowest = heapq.nlargest(self.keep_slowest, self.slowest + chunk["slowest"], key=lambda s: s[0])
+
+    def percentile(self, q: float) -> float:
+        """Lower bound of the histogram bucket holding the q-th line, in µs."""
+        rank, seen = q * self.lines, 0
+        for bucket, count in sorted(self.histogram.items()):
+            seen += count
+            if seen >= rank:
+                return round(bucket / 1000, 2)
+        return 0.0
+
+
+def evaluate_corpus(pattern: str, flags: str, sources: list[str], expect: str | None = None,
+                    workers: int = 0, chunk_lines: int = CHUNK_LINES,
+                    max_examples: int = MAX_EXAMPLES, slowest: int = SLOWEST) -> dict:
+    """Stream every source through the pattern; returns the corpus summary."""
+    compile_js(pattern, flags)  # Fail fast, before any worker starts
+    started = time.perf_counter()
+    totals = _Totals(max_examples, slowest)
+    args = (pattern, flags, expect, max_examples, slowest)
+    chunks = _iter_chunks(sources, chunk_lines)
+    first = next(chunks, None)
+    second = next(chunks, None) if first else None
+    workers = workers or os.cpu_count() or 1
+
+    if second is None or workers == 1:
+        # One chunk (or asked for no pool): not worth starting processes
+        _init_worker(*args)
+        for chunk in itertools.chain(filter(None, (first, second)), chunks):
+            totals.add(_evaluate_chunk(*chunk))
+        used = 1
+    else:
+        used = workers
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=args) as pool:
+            pending = deque()
+            for chunk in itertools.chain((first, second), chunks):
+                pending.append(pool.submit(_evaluate_chunk, *chunk))
+                if len(pending) >= workers * 2:  # Bounded read-ahead; merge in input order
+                    totals.add(pending.popleft().result())
+            while pending:
+                totals.add(pending.popleft().result())
+
+    return {
+        "sources": ["stdin" if s == "-" else s for s in sources],
+        "lines": totals.lines,
+        "matched": totals.matched,
+        "failed": totals.lines - totals.matched,
+        "expect": expect,
+        "mismatches": totals.contradicted if expect else None,
+        "examples": totals.examples,
+        "timing": {
+            "totalMs": round(totals.total_ns / 1e6, 3),
+            "meanUs": round(totals.total_ns / totals.lines / 1000, 2) if totals.lines else 0.0,
+            "p50Us": totals.percentile(0.50),
+            "p90Us": totals.percentile(0.90),
+            "p99Us": totals.percentile(0.99),
+            "maxUs": round(totals.max_ns / 1000, 2),
+            "slowest": [
+                {"source": src, "line": line, "us": round(ns / 1000, 2),
+                 "input": _preview(text)}
+                for ns, src, line, text in totals.slowest
+            ],
+        },
+        "workers": used,
+        "elapsedMs": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def evaluate_test_cases(pattern: str, flags: str, test_cases: list) -> dict:
+    """Each testCase against its shouldMatch; cases without one are only counted."""
+    match = compile_js(pattern, flags)
+    passed, failed = 0, []
+    for case in test_cases:
+        if not isinstance(case, dict) or not isinstance(case.get("input"), str):
+            raise EvaluateError(f"testCases entries need a string 'input': {case!r}")
+        m = match(case["input"])
+        expected = case.get("shouldMatch")
+        if expected is None:
+            continue
+        if bool(m) == bool(expected):
+            passed += 1
+        else:
+            failed.append({"input": _preview(case["input"]), "shouldMatch": bool(expected),
+                           "matched": bool(m), "match": _preview(m.group(0)) if m else None})
+    return {"total": len(test_cases), "passed": passed, "failed": failed}
+
+
+def evaluate(data: dict, sources: list[str], **options) -> dict:
+    """The "evaluation" block for a data.json document."""
+    pattern, flags = data.get("pattern"), data.get("flags") or ""
+    if not isinstance(pattern, str) or not pattern:
+        raise EvaluateError("data.json has no 'pattern'")
+    evaluation = {
+        "generatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "engine": "python-re",
+        "pattern": pattern,
+        "flags": flags,
+        "testCases": evaluate_test_cases(pattern, flags, data.get("testCases") or []),
+    }
+    if sources:
+        evaluation["corpus"] = evaluate_corpus(pattern, flags, sources, **options)
+    return evaluation
+
+
+def write_evaluation(path: Path, data: dict, evaluation: dict, key: str = "evaluation") -> None:
+    """Store the block in data.json atomically (the page never sees half a file)."""
+    data = {**data, key: evaluation}
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="REGTRAX — evaluate data.json against a corpus")
+    parser.add_argument("data", type=Path, help="REGTRAX data.json")
+    parser.add_argument("inputs", nargs="*", help="Files to stream line by line ('-' for stdin)")
+    parser.add_argument("--expect", choices=["match", "fail"],
+                        help="What every corpus line should do; contradicting lines are mismatches")
+    parser.add_argument("--workers", "-w", type=int, default=0, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-lines", type=int, default=CHUNK_LINES)
+    parser.add_argument("--examples", type=int, default=MAX_EXAMPLES, help="Example lines to keep")
+    parser.add_argument("--slowest", type=int, default=SLOWEST, help="Slowest lines to keep")
+    parser.add_argument("--write", action="store_true", help="Store the summary in data.json as 'evaluation'")
+    args = parser.parse_args()
+
+    try:
+        try:
+            data = json.loads(args.data.read_text(encoding="utf-8"))
+        except OSError as e:
+            raise EvaluateError(f"Cannot read {args.data}: {e.strerror}")
+        except ValueError as e:
+            raise EvaluateError(f"{args.data} is not valid JSON: {e}")
+        evaluation = evaluate(data, args.inputs, expect=args.expect, workers=args.workers,
+                              chunk_lines=max(args.chunk_lines, 1), max_examples=args.examples,
+                              slowest=args.slowest)
+        if args.write:
+            write_evaluation(args.data, data, evaluation)
+    except EvaluateError as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
+    print(json.dumps(evaluation, indent=2, ensure_ascii=False))
+    failed = evaluation["testCases"]["failed"] or (evaluation.get("corpus") or {}).get("mismatches")
+    sys.exit(2 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
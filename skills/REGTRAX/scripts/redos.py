@@ -0,0 +1,709 @@
+#!/usr/bin/env python3
+"""
+REGTRAX ReDoS - Find catastrophic backtracking in a data.json pattern
+
+The diagram draws nested quantifiers and ambiguous alternations faithfully
+but cannot say whether they blow up. This does, in two steps:
+
+1. Static: parse the pattern into the same node shapes as the template's
+   parseRegex, and flag the shapes that make a backtracking engine try
+   exponentially or polynomially many paths:
+
+       nested-quantifier        (a+)+, (\\w+\\s?)*   an unbounded repeat inside
+                                one whose next iteration can start the same way
+       overlapping-alternation  (\\w|\\d)+, (a|a)*   alternatives under * or +
+                                that can start with the same character
+       adjacent-quantifiers     \\d+\\d+, .*.*=      neighbouring unbounded repeats
+                                over overlapping characters
+       unanchored-repeat        \\s+$                a search that retries an
+                                unbounded leading repeat from every offset
+
+2. Empirical: for each finding, build adversarial inputs
+   (prefix + pump * n + failing suffix) of growing n and time one match at
+   each length in a subprocess. A match that exceeds --timeout is killed.
+   The log-log slope of the growth curve gives the verdict: linear,
+   polynomial (with its degree), or exponential.
+
+Timing runs in node when it is installed: V8 is the engine the page itself
+uses. Otherwise it falls back to Python's re on the translated pattern
+(see evaluate.py), which is also a backtracking engine but collapses some
+alternations such as (a|a) into a set, so it can understate a blowup.
+
+--write stores the result as data.json's "complexity" block (verdict, the
+findings, and the worst growth curve), which the page shows next to the
+pattern. The exit status is 2 when the verdict is at or above --fail-on
+(default: exponential).
+
+Usage:
+    python3 redos.py /tmp/regtrax-3f9a1c2e.json --write
+    python3 redos.py data.json --timeout 0.5 --fail-on polynomial
+    python3 redos.py data.json --static-only
+    python3 redos.py data.json --engine python-re
+"""
+
+import argparse
+import json
+import math
+import queue
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from evaluate import JS_FLAGS, EvaluateError, translate, write_evaluation
+
+TIMEOUT = 1.0            # Seconds one match may take before it is killed
+BUDGET = 60.0            # Seconds for the whole empirical pass
+LENGTHS = (1, 2, 4, 8, 12, 16, 20, 24, 28, 32, 48, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+NOISE_FLOOR = 20e-6      # Shorter timings are too noisy to fit a slope to
+EXPONENTIAL_BY = 64      # A timeout at or below this many pumps is exponential
+EXPONENTIAL_SLOPE = 5.0  # Steeper log-log growth than n^5 reads as exponential
+POLYNOMIAL_SLOPE = 1.6
+
+VERDICTS = ("safe", "linear", "polynomial", "exponential")
+PROBE_CHARS = [chr(c) for c in range(128)] + list("éßſKΩ٣  😀")
+PREFERRED_PUMPS = "a0A_ -.x1"
+SUFFIXES = ("!", "\x00", "\n", " ", "a", "0", "_", "A", "=", "")
+
+# Runs in the subprocess: compile once, then time each requested input
+PROBE = r"""
+import json, re, sys, time
+source, flags, sticky = json.loads(sys.stdin.readline())
+compiled = re.compile(source, flags)
+match = compiled.match if sticky else compiled.search
+clock = time.perf_counter
+print("ready", flush=True)
+for line in sys.stdin:
+    prefix, pump, suffix, n = json.loads(line)
+    text = prefix + pump * n + suffix
+    best = None
+    for _ in range(5):
+        start = clock()
+        match(text)
+        took = clock() - start
+        best = took if best is None else min(best, took)
+        if took > 0.01:
+            break
+    print(best, flush=True)
+"""
+
+# The same for V8, with the pattern exactly as the page compiles it
+NODE_PROBE = r"""
+let re = null;
+require('readline').createInterface({ input: process.stdin }).on('line', line => {
+  const msg = JSON.parse(line);
+  if (re === null) {
+    re = new RegExp(msg[0], msg[1]);
+    console.log('ready');
+    return;
+  }
+  const [prefix, pump, suffix, n] = msg;
+  const text = prefix + pump.repeat(n) + suffix;
+  let best = null;
+  for (let i = 0; i < 5; i++) {
+    re.lastIndex = 0;
+    const start = process.hrtime.bigint();
+    re.exec(text);
+    const took = Number(process.hrtime.bigint() - start) / 1e9;
+    best = best === null ? took : Math.min(best, took);
+    if (took > 0.01) break;
+  }
+  console.log(best);
+});
+"""
+
+
+# ---------------------------------------------------------------------------
+# Parser (node shapes follow parseRegex in references/template.html)
+# ---------------------------------------------------------------------------
+
+
+class _Parser:
+    def __init__(self, pattern: str, flags: str = ""):
+        self.pattern, self.pos = pattern, 0
+        self.unicode = "u" in flags or "v" in flags
+
+    def parse(self) -> dict:
+        node = self.alternation()
+        if self.pos < len(self.pattern):
+            raise EvaluateError(f"Unmatched ')' at {self.pos}")
+        return node
+
+    def peek(self, text: str) -> bool:
+        return self.pattern.startswith(text, self.pos)
+
+    def node(self, start: int, **fields) -> dict:
+        return {**fields, "start": start, "end": self.pos}
+
+    def alternation(self) -> dict:
+        start = self.pos
+        alternatives = [self.sequence()]
+        while self.peek("|"):
+            self.pos += 1
+            alternatives.append(self.sequence())
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return self.node(start, type="alternation", alternatives=alternatives)
+
+    def sequence(self) -> dict:
+        start, elements = self.pos, []
+        while self.pos < len(self.pattern) and self.pattern[self.pos] not in "|)":
+            elements.append(self.quantified())
+        if len(elements) == 1:
+            return elements[0]
+        return self.node(start, type="sequence", elements=elements)
+
+    def quantified(self) -> dict:
+        start = self.pos
+        node = self.atom()
+        while self.pos < len(self.pattern):
+            c = self.pattern[self.pos]
+            if c in "*+?":
+                low, high = {"*": (0, None), "+": (1, None), "?": (0, 1)}[c]
+                self.pos += 1
+            elif c == "{" and (bounds := self.brace()):
+                low, high = bounds
+            else:
+                break
+            lazy = self.peek("?")
+            self.pos += lazy
+            node = self.node(start, type="quantifier", min=low, max=high, lazy=lazy, body=node)
+        return node
+
+    def brace(self) -> tuple[int, int | None] | None:
+        """{n}, {n,} or {n,m} at pos (consumed), or None: then '{' is a literal."""
+        end = self.pattern.find("}", self.pos)
+        inner = self.pattern[self.pos + 1:end] if end > 0 else ""
+        low, comma, high = inner.partition(",")
+        if not low.isdigit() or (high and not high.isdigit()):
+            return None
+        self.pos = end + 1
+        return int(low), (int(high) if high else None) if comma else int(low)
+
+    def atom(self) -> dict:
+        start, c = self.pos, self.pattern[self.pos]
+        if c == "(":
+            return self.group()
+        if c == "[":
+            return self.char_class()
+        self.pos += 1
+        if c == "\\":
+            return self.escape(start)
+        if c == ".":
+            return self.node(start, type="dot")
+        if c in "^$":
+            return self.node(start, type="anchor", kind="start" if c == "^" else "end")
+        if c in "*+?":
+            raise EvaluateError(f"Nothing to repeat at {start}")
+        return self.node(start, type="literal", value=c)
+
+    def group(self) -> dict:
+        start = self.pos
+        kinds = {"(?:": ("group", False), "(?=": ("lookahead", True), "(?!": ("lookahead", False),
+                 "(?<=": ("lookbehind", True), "(?<!": ("lookbehind", False)}
+        opener = next((k for k in sorted(kinds, key=len, reverse=True) if self.peek(k)), None)
+        name = None
+        if opener:
+            self.pos += len(opener)
+        elif self.peek("(?<"):
+            end = self.pattern.find(">", self.pos)
+            if end < 0:
+                raise EvaluateError(f"Unterminated group name at {start}")
+            name, self.pos = self.pattern[self.pos + 3:end], end + 1
+        else:
+            self.pos += 1
+        body = self.alternation()
+        if not self.peek(")"):
+            raise EvaluateError(f"Unterminated group at {start}")
+        self.pos += 1
+        kind, flag = kinds.get(opener, ("group", True))
+        if kind == "group":
+            return self.node(start, type="group", capture=opener is None, name=name, body=body)
+        return self.node(start, type=kind, positive=flag, body=body)
+
+    def char_class(self) -> dict:
+        start = self.pos
+        self.pos += 2 if self.peek("[^") else 1
+        if self.peek("]") and self.pattern[start:self.pos] == "[^":
+            self.pos += 1  # [^] is any character
+            return self.node(start, type="charClass", negated=False)
+        while not self.peek("]"):
+            if self.pos >= len(self.pattern):
+                raise EvaluateError(f"Unterminated character class at {start}")
+            if self.unicode and self.pattern[self.pos:self.pos + 3] in ("\\u{", "\\p{", "\\P{"):
+                end = self.pattern.find("}", self.pos)
+                if end < 0:
+                    raise EvaluateError(f"Unterminated {self.pattern[self.pos:self.pos + 2]}{{...}} escape at {self.pos}")
+                self.pos = end + 1
+                continue
+            self.pos += 2 if self.peek("\\") else 1
+        self.pos += 1
+        return self.node(start, type="charClass", negated=self.pattern.startswith("[^", start))
+
+    def escape(self, start: int) -> dict:
+        if self.pos >= len(self.pattern):
+            raise EvaluateError("Pattern ends with a lone backslash")
+        c = self.pattern[self.pos]
+        self.pos += 1
+        if c in "dDwWsS":
+            return self.node(start, type="charClass", negated=c.isupper())
+        if c in "bB":
+            return self.node(start, type="anchor", kind="boundary" if c == "b" else "non-boundary")
+        if c.isdigit() and c != "0":
+            return self.node(start, type="backreference", index=int(c))
+        if c == "k" and self.peek("<"):
+            self.pos = self.pattern.find(">", self.pos) + 1 or len(self.pattern)
+            return self.node(start, type="backreference")
+        # \xHH, \uHHHH, \u{...}, \p{...}, \cX: extend the fragment so it stands on its own
+        if c in "upP" and self.unicode and self.peek("{"):
+            end = self.pattern.find("}", self.pos)
+            if end < 0:
+                raise EvaluateError(f"Unterminated \\{c}{{...}} escape at {start}")
+            self.pos = end + 1
+            if c in "pP":
+                return self.node(start, type="charClass", negated=c == "P")
+        elif c == "x":
+            self.pos += 2
+        elif c == "u" and re.fullmatch(r"[0-9a-fA-F]{4}", self.pattern[self.pos:self.pos + 4]):
+            self.pos += 4
+        elif c == "c":
+            self.pos += 1
+        return self.node(start, type="literal", value=self.pattern[start:self.pos])
+
+
+def parse(pattern: str, flags: str = "") -> dict:
+    return _Parser(pattern, flags).parse()
+
+
+def _children(node: dict) -> list[dict]:
+    if node["type"] == "alternation":
+        return node["alternatives"]
+    if node["type"] == "sequence":
+        return node["elements"]
+    return [node["body"]] if "body" in node else []
+
+
+def _unbounded(node: dict) -> bool:
+    """An unbounded quantifier, possibly wrapped in groups: (a+), (?:\\d*)."""
+    while node["type"] == "group":
+        node = node["body"]
+    return node["type"] == "quantifier" and node["max"] is None
+
+
+def _descendants(node: dict):
+    for child in _children(node):
+        if child["type"] not in ("lookahead", "lookbehind"):  # Zero-width: never repeated input
+            yield child
+            yield from _descendants(child)
+
+
+# ---------------------------------------------------------------------------
+# Static analysis
+# ---------------------------------------------------------------------------
+
+
+class Analysis:
+    """What each node can consume, over a probe alphabet."""
+
+    def __init__(self, pattern: str, flags: str):
+        self.pattern, self.flags = pattern, flags
+        self.root = parse(pattern, flags)
+        self._atoms: dict[str, frozenset] = {}
+
+    def atom_chars(self, node: dict) -> frozenset:
+        """Probe characters one atom (literal, class, dot) matches."""
+        fragment = self.pattern[node["start"]:node["end"]]
+        if fragment not in self._atoms:
+            try:
+                source, re_flags = translate(fragment, self.flags.replace("y", ""))
+                compiled = re.compile(source, re_flags)
+            except (EvaluateError, re.error):
+                # \p{...}, v-flag set operations: assume the widest reading, every probe char
+                self._atoms[fragment] = frozenset(PROBE_CHARS)
+            else:
+                self._atoms[fragment] = frozenset(c for c in PROBE_CHARS if compiled.fullmatch(c))
+        return self._atoms[fragment]
+
+    def nullable(self, node: dict) -> bool:
+        kind = node["type"]
+        if kind in ("literal", "charClass", "dot"):
+            return False
+        if kind == "sequence":
+            return all(self.nullable(e) for e in node["elements"])
+        if kind == "alternation":
+            return any(self.nullable(a) for a in node["alternatives"])
+        if kind == "quantifier":
+            return node["min"] == 0 or self.nullable(node["body"])
+        if kind == "group":
+            return self.nullable(node["body"])
+        return True  # Anchors, lookarounds, backreferences
+
+    def first(self, node: dict) -> frozenset:
+        """Characters a non-empty match of node can start with."""
+        kind = node["type"]
+        if kind in ("literal", "charClass", "dot"):
+            return self.atom_chars(node)
+        if kind == "sequence":
+            out = frozenset()
+            for element in node["elements"]:
+                out |= self.first(element)
+                if not self.nullable(element):
+                    break
+            return out
+        if kind == "alternation":
+            return frozenset().union(*(self.first(a) for a in node["alternatives"]))
+        if kind in ("quantifier", "group"):
+            return self.first(node["body"])
+        if kind == "backreference":
+            return frozenset(PROBE_CHARS)
+        return frozenset()
+
+    def chars(self, node: dict) -> frozenset:
+        """Every character node can consume anywhere in its match."""
+        if node["type"] in ("literal", "charClass", "dot"):
+            return self.atom_chars(node)
+        if node["type"] == "backreference":
+            return frozenset(PROBE_CHARS)
+        return frozenset().union(frozenset(), *(self.chars(c) for c in _children(node)
+                                                if c["type"] not in ("lookahead", "lookbehind")))
+
+    def sample(self, node: dict) -> str:
+        """A short string node matches (best effort)."""
+        kind = node["type"]
+        if kind == "literal" and len(node["value"]) == 1:
+            return node["value"]
+        if kind in ("literal", "charClass", "dot"):
+            return _pick(self.atom_chars(node))
+        if kind == "sequence":
+            return "".join(self.sample(e) for e in node["elements"])
+        if kind == "alternation":
+            return min((self.sample(a) for a in node["alternatives"]), key=len)
+        if kind == "quantifier":
+            return self.sample(node["body"]) * node["min"]
+        if kind == "group":
+            return self.sample(node["body"])
+        return ""
+
+    def prefix(self, target: dict, node: dict | None = None) -> str | None:
+        """Input that brings the matcher from the start to target."""
+        node = node or self.root
+        if node is target:
+            return ""
+        if node["type"] == "sequence":
+            before = ""
+            for element in node["elements"]:
+                inner = self.prefix(target, element)
+                if inner is not None:
+                    return before + inner
+                before += self.sample(element)
+            return None
+        for child in _children(node):
+            inner = self.prefix(target, child)
+            if inner is not None:
+                return inner
+        return None
+
+    def findings(self) -> list[dict]:
+        found = []
+
+        def add(kind: str, node: dict, pump_chars: frozenset, message: str, last: dict | None = None):
+            last = last or node
+            found.append({
+                "kind": kind,
+                "at": [node["start"], last["end"]],
+                "fragment": self.pattern[node["start"]:last["end"]],
+                "message": message,
+                "attack": {"prefix": self.prefix(node) or "", "pump": _pick(pump_chars),
+                           "avoid": "".join(sorted(self.chars(node) | self.chars(last)))},
+            })
+
+        nodes = [self.root, *_descendants(self.root)]
+        for node in nodes:
+            if node["type"] == "quantifier" and node["max"] is None:
+                body_first = self.first(node["body"])
+                for inner in _descendants(node):
+                    if _unbounded(inner):
+                        overlap = self.chars(inner) & body_first
+                        if overlap or self.nullable(node["body"]):
+                            add("nested-quantifier", node, overlap or self.chars(inner),
+                                "Unbounded repeat nested in another: the same input splits between "
+                                "iterations in exponentially many ways")
+                            break
+                for inner in [node["body"], *_descendants(node)]:
+                    if inner["type"] != "alternation":
+                        continue
+                    alternatives = inner["alternatives"]
+                    overlap = frozenset()
+                    for i, a in enumerate(alternatives):
+                        for b in alternatives[i + 1:]:
+                            overlap |= self.first(a) & self.first(b)
+                    if overlap:
+                        add("overlapping-alternation", node, overlap,
+                            "Alternatives under a repeat can start with the same character, "
+                            "so each repetition can take either branch")
+                        break
+            if node["type"] == "sequence":
+                elements = node["elements"]
+                for i, a in enumerate(elements):
+                    if not _unbounded(a):
+                        continue
+                    # Walk right while a could also consume what lies between
+                    through = self.chars(a)
+                    for b in elements[i + 1:]:
+                        if _unbounded(b):
+                            overlap = through & self.chars(b)
+                            if overlap:
+                                add("adjacent-quantifiers", a, overlap,
+                                    "Neighbouring unbounded repeats over the same characters: "
+                                    "every split of the input between them is tried", last=b)
+                            break
+                        if not self.nullable(b):
+                            through &= self.chars(b)
+                            if not self.first(b) <= self.chars(a) or not through:
+                                break
+
+        # A search retries from every offset: a leading unbounded repeat that
+        # can then fail is rescanned n times
+        anchored = "y" in self.flags
+        lead = self.root
+        while lead["type"] in ("sequence", "group"):
+            if lead["type"] == "group":
+                lead = lead["body"]
+                continue
+            first = lead["elements"][0]
+            anchored |= first["type"] == "anchor" and first["kind"] == "start"
+            lead = first
+        if not anchored and lead["type"] == "quantifier" and lead["max"] is None and lead is not self.root:
+            add("unanchored-repeat", lead, self.chars(lead),
+                "Unanchored search starting with an unbounded repeat: a failing input is "
+                "rescanned from every offset")
+
+        unique, seen = [], set()
+        for finding in found:
+            key = (finding["kind"], tuple(finding["at"]))
+            if key not in seen:
+                seen.add(key)
+                unique.append(finding)
+        return unique
+
+
+def _pick(chars: frozenset) -> str:
+    for c in PREFERRED_PUMPS:
+        if c in chars:
+            return c
+    return min(chars) if chars else ""
+
+
+# ---------------------------------------------------------------------------
+# Empirical confirmation
+# ---------------------------------------------------------------------------
+
+
+def pick_engine(engine: str = "auto") -> str:
+    """node (V8, what the page runs) when available, else python-re."""
+    if engine == "auto":
+        return "node" if shutil.which("node") else "python-re"
+    if engine == "node" and not shutil.which("node"):
+        raise EvaluateError("--engine node: node is not on PATH")
+    return engine
+
+
+class Probe:
+    """A subprocess that times one match at a time and is killed on timeout."""
+
+    def __init__(self, pattern: str, flags: str, engine: str = "python-re"):
+        if engine == "node":
+            self.command = [shutil.which("node"), "-e", NODE_PROBE]
+            self.config = json.dumps([pattern, flags]) + "\n"
+        else:
+            source, re_flags = translate(pattern, flags)
+            self.command = [sys.executable, "-c", PROBE]
+            self.config = json.dumps([source, re_flags, "y" in flags]) + "\n"
+        self.proc = None
+
+    def _start(self):
+        self.proc = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     stderr=subprocess.DEVNULL, text=True, encoding="utf-8")
+        self.lines = queue.Queue()
+        threading.Thread(target=self._read, args=(self.proc, self.lines), daemon=True).start()
+        self.proc.stdin.write(self.config)
+        self.proc.stdin.flush()
+        if self.lines.get(timeout=30) != "ready":
+            raise EvaluateError("Pattern does not compile in the probe")
+
+    @staticmethod
+    def _read(proc, lines):
+        for line in proc.stdout:
+            lines.put(line.strip())
+        lines.put("exit")
+
+    def time(self, prefix: str, pump: str, suffix: str, n: int, timeout: float) -> float | None:
+        """Seconds for one match of prefix + pump * n + suffix, or None if killed."""
+        if self.proc is None:
+            self._start()
+        self.proc.stdin.write(json.dumps([prefix, pump, suffix, n]) + "\n")
+        self.proc.stdin.flush()
+        try:
+            reply = self.lines.get(timeout=timeout)
+        except queue.Empty:
+            self.close()
+            return None
+        try:
+            return float(reply)
+        except ValueError:
+            self.close()
+            raise EvaluateError(f"Probe exited while matching {n} repetitions")
+
+    def close(self):
+        if self.proc is not None:
+            self.proc.kill()
+            self.proc.wait()
+            self.proc = None
+
+
+def classify(curve: list[dict], timeout: float) -> tuple[str, int | None, float | None]:
+    """(verdict, polynomial degree, log-log slope) for a growth curve."""
+    timed_out = next((p for p in curve if p["ms"] is None), None)
+    if timed_out and timed_out["n"] <= EXPONENTIAL_BY:
+        return "exponential", None, None
+    valid = [p for p in curve if p["ms"] is not None and p["ms"] / 1000 >= NOISE_FLOOR]
+    slope = None
+    if timed_out and valid:
+        last = valid[-1]  # Lower bound: the timed-out length took at least the timeout
+        slope = math.log(timeout * 1000 / last["ms"]) / math.log(timed_out["length"] / last["length"])
+    elif len(valid) >= 2:
+        a, b = valid[-2], valid[-1]
+        slope = math.log(b["ms"] / a["ms"]) / math.log(b["length"] / a["length"])
+    if slope is None:
+        return ("polynomial", 2, None) if timed_out else ("linear", None, None)
+    slope = round(slope, 2)
+    if slope >= EXPONENTIAL_SLOPE:
+        return "exponential", None, slope
+    if slope >= POLYNOMIAL_SLOPE or timed_out:
+        return "polynomial", max(2, round(slope)), slope
+    return "linear", None, slope
+
+
+def growth_curve(probe: Probe, prefix: str, pump: str, suffix: str, timeout: float,
+                 max_length: int, deadline: float) -> list[dict]:
+    curve = []
+    for n in LENGTHS:
+        length = len(prefix) + len(pump) * n + len(suffix)
+        if length > max_length or time.monotonic() > deadline:
+            break
+        took = probe.time(prefix, pump, suffix, n, timeout)
+        curve.append({"n": n, "length": length, "ms": None if took is None else round(took * 1000, 4)})
+        if took is None:
+            break
+    return curve
+
+
+def confirm(analysis: Analysis, findings: list[dict], timeout: float = TIMEOUT,
+            max_length: int = 100_000, budget: float = BUDGET, engine: str = "python-re") -> None:
+    """Time each finding's attack; fills in its verdict and curve."""
+    deadline = time.monotonic() + budget
+    probe = Probe(analysis.pattern, analysis.flags, engine)
+    rank = VERDICTS.index
+    try:
+        for finding in findings:
+            attack = finding["attack"]
+            best = None
+            suffixes = [s for s in SUFFIXES if s not in attack["avoid"] or s == ""][:4]
+            if suffixes == [""]:  # Every suffix avoided (an untranslatable class): time the usual ones
+                suffixes = list(SUFFIXES[:4])
+            for suffix in suffixes:
+                curve = growth_curve(probe, attack["prefix"], attack["pump"], suffix, timeout, max_length, deadline)
+                verdict, degree, slope = classify(curve, timeout)
+                worst_ms = max((p["ms"] or timeout * 1000) for p in curve) if curve else 0
+                candidate = (rank(verdict), slope or 0, worst_ms, suffix, verdict, degree, curve)
+                if best is None or candidate[:3] > best[:3]:
+                    best = candidate
+                if verdict == "exponential" or time.monotonic() > deadline:
+                    break
+            if best is None:
+                finding.update(verdict=None, curve=[])
+                continue
+            _, slope, _, suffix, verdict, degree, curve = best
+            attack["suffix"] = suffix
+            finding.update(verdict=verdict, degree=degree, slope=slope or None, curve=curve)
+    finally:
+        probe.close()
+
+
+def analyze(data: dict, timeout: float = TIMEOUT, static_only: bool = False,
+            max_length: int = 100_000, budget: float = BUDGET, engine: str = "auto") -> dict:
+    """The "complexity" block for a data.json document."""
+    pattern, flags = data.get("pattern"), data.get("flags") or ""
+    if not isinstance(pattern, str) or not pattern:
+        raise EvaluateError("data.json has no 'pattern'")
+    unknown = set(flags) - JS_FLAGS
+    if unknown:
+        raise EvaluateError(f"Unknown regex flag(s): {''.join(sorted(unknown))}")
+    engine = None if static_only else pick_engine(engine)
+    if engine == "python-re":
+        translate(pattern, flags)  # Syntax Python's re can't reproduce fails here
+    analysis = Analysis(pattern, flags)
+    findings = analysis.findings()
+    if findings and engine:
+        confirm(analysis, findings, timeout, max_length, budget, engine)
+    for finding in findings:
+        finding["attack"].pop("avoid", None)
+
+    confirmed = [f for f in findings if f.get("verdict")]
+    worst = max(confirmed, key=lambda f: (VERDICTS.index(f["verdict"]), f.get("slope") or 0), default=None)
+    if static_only:
+        verdict = "unconfirmed" if findings else "safe"
+    else:
+        verdict = worst["verdict"] if worst else "safe"
+    return {
+        "generatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "engine": engine,
+        "pattern": pattern,
+        "flags": flags,
+        "verdict": verdict,
+        "degree": worst.get("degree") if worst else None,
+        "timeoutMs": round(timeout * 1000),
+        "findings": findings,
+        "curve": worst["curve"] if worst else [],
+        "attack": worst["attack"] if worst else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="REGTRAX — catastrophic backtracking check")
+    parser.add_argument("data", type=Path, help="REGTRAX data.json")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="Seconds per match before it is killed")
+    parser.add_argument("--budget", type=float, default=BUDGET, help="Seconds for all timing runs")
+    parser.add_argument("--max-length", type=int, default=100_000, help="Longest adversarial input")
+    parser.add_argument("--static-only", action="store_true", help="Report risky shapes without timing them")
+    parser.add_argument("--engine", choices=["auto", "node", "python-re"], default="auto",
+                        help="Timing engine (default: node when installed, else python-re)")
+    parser.add_argument("--fail-on", choices=["polynomial", "exponential"], default="exponential",
+                        help="Exit 2 at or above this verdict (default: exponential)")
+    parser.add_argument("--write", action="store_true", help="Store the result in data.json as 'complexity'")
+    args = parser.parse_args()
+
+    try:
+        try:
+            data = json.loads(args.data.read_text(encoding="utf-8"))
+        except OSError as e:
+            raise EvaluateError(f"Cannot read {args.data}: {e.strerror}")
+        except ValueError as e:
+            raise EvaluateError(f"{args.data} is not valid JSON: {e}")
+        complexity = analyze(data, args.timeout, args.static_only, args.max_length, args.budget, args.engine)
+        if args.write:
+            write_evaluation(args.data, data, complexity, key="complexity")
+    except EvaluateError as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
+    print(json.dumps(complexity, indent=2, ensure_ascii=False))
+    verdict = complexity["verdict"]
+    sys.exit(2 if verdict in VERDICTS and VERDICTS.index(verdict) >= VERDICTS.index(args.fail_on) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Stand-in Gemini generateContent endpoint for testing OPTIC's generator offline.
+
+Serves POST /<version>/models/<model>:generateContent on 127.0.0.1 (random
+port, printed as "ready <port>") and answers every request with a small PNG
+whose tEXt chunk records the prompt, model, aspect ratio and size, so tests
+can check which request produced which file. Requests are handled on
+concurrent threads, like the real service.
+
+Environment:
+    FAKE_GEMINI_DELAY        Seconds each generation takes (default 0)
+    FAKE_GEMINI_RATE_LIMIT   Answer the first N requests of every prompt with
+                             429 RESOURCE_EXHAUSTED (Retry-After: 0)
+    FAKE_GEMINI_LOG          JSON-lines log: prompt, status, start/end times
+A prompt containing "[reject]" gets a permanent 400 INVALID_ARGUMENT.
+"""
+
+import base64
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+attempts: Counter = Counter()
+attempts_lock = threading.Lock()
+log_lock = threading.Lock()
+
+
+def png(text: str) -> bytes:
+    """1x1 PNG carrying text in a tEXt chunk."""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0))
+        + chunk(b"tEXt", b"optic\x00" + text.encode("utf-8"))
+        + chunk(b"IDAT", zlib.compress(b"\x00\xff\xff\xff"))
+        + chunk(b"IEND", b"")
+    )
+
+
+def log(entry: dict) -> None:
+    path = os.environ.get("FAKE_GEMINI_LOG")
+    if path:
+        with log_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status: int, body: dict, headers: dict | None = None) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        start = time.time()
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.path.split("?")[0].endswith(":generateContent"):
+            self.reply(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+            return
+        model = self.path.split("/models/", 1)[-1].split(":", 1)[0]
+        parts = request.get("contents", [{}])[0].get("parts", [])
+        prompt = next((p["text"] for p in parts if "text" in p), "")
+        image_config = request.get("generationConfig", {}).get("imageConfig", {})
+        entry = {"prompt": prompt, "model": model, "references": sum("inlineData" in p for p in parts),
+                 "aspect": image_config.get("aspectRatio"), "size": image_config.get("imageSize"),
+                 "start": start}
+
+        with attempts_lock:
+            attempts[prompt] += 1
+            attempt = attempts[prompt]
+        if attempt <= int(os.environ.get("FAKE_GEMINI_RATE_LIMIT", "0")):
+            log({**entry, "status": 429, "end": time.time()})
+            self.reply(429, {"error": {"code": 429, "message": "Resource has been exhausted",
+                                       "status": "RESOURCE_EXHAUSTED"}}, {"Retry-After": "0"})
+            return
+        if "[reject]" in prompt:
+            log({**entry, "status": 400, "end": time.time()})
+            self.reply(400, {"error": {"code": 400, "message": "Prompt rejected",
+                                       "status": "INVALID_ARGUMENT"}})
+            return
+
+        time.sleep(float(os.environ.get("FAKE_GEMINI_DELAY", "0")))
+        image = png(json.dumps({k: entry[k] for k in ("prompt", "model", "aspect", "size", "references")}))
+        log({**entry, "status": 200, "end": time.time()})
+        self.reply(200, {
+            "candidates": [{
+                "content": {"role": "model", "parts": [
+                    {"inlineData": {"mimeType": "image/png", "data": base64.b64encode(image).decode("ascii")}}
+                ]},
+                "finishReason": "STOP",
+            }],
+        })
+
+
+def main() -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    print(f"ready {server.server_address[1]}", flush=True)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Stand-in org.freedesktop.Notifications server for testing NOTIFY's D-Bus backend.
+
+Connect it to a private dbus-daemon (tests start one with
+`dbus-daemon --session --print-address --nofork`) and it answers Notify,
+GetCapabilities, GetServerInformation and CloseNotification like a desktop
+notification daemon would, logging every Notify call. CloseNotification on an
+ID that is not showing returns an error, as the spec requires.
+
+Environment:
+    DBUS_SESSION_BUS_ADDRESS   Bus to serve on
+    FAKE_NOTIFY_LOG            JSON-lines log of Notify calls
+    FAKE_NOTIFY_ACTION         If set, immediately "click" this action key on
+                               any notification that has actions. "dismiss"
+                               closes it instead (NotificationClosed, reason 2);
+                               "vanish" drops it without any signal
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "skills" / "NOTIFY" / "scripts"))
+
+from dbus_notify import (  # noqa: E402
+    BUS_NAME, BUS_PATH, ERROR, METHOD_CALL, NOTIFICATIONS_NAME, NOTIFICATIONS_PATH,
+    DBusConnection, DBusMessage,
+)
+
+
+def log(entry: dict) -> None:
+    path = os.environ.get("FAKE_NOTIFY_LOG")
+    if path:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+def reply_error(conn: DBusConnection, call: DBusMessage, name: str, text: str) -> None:
+    conn.send(DBusMessage(
+        ERROR,
+        {"reply_serial": call.serial, "destination": call.fields.get("sender", ""), "error_name": name},
+        [text],
+        signature="s",
+    ))
+
+
+def main() -> int:
+    conn = DBusConnection()
+    conn.call(BUS_NAME, BUS_PATH, BUS_NAME, "RequestName", "su", [NOTIFICATIONS_NAME, 4])
+    print("ready", flush=True)
+
+    next_id = 1
+    showing = set()
+    while True:
+        message = conn.pending.popleft() if conn.pending else conn.recv()
+        if message is None or message.type != METHOD_CALL:
+            continue
+
+        if message.member == "Notify":
+            app_name, replaces_id, icon, summary, body, actions, hints, expire = message.body
+            if replaces_id:
+                notification_id = replaces_id
+            else:
+                notification_id = next_id
+                next_id += 1
+            log({
+                "id": notification_id, "replaces_id": replaces_id, "app_name": app_name,
+                "summary": summary, "body": body, "actions": actions,
+                "urgency": hints.get("urgency"), "sender": message.fields.get("sender"),
+            })
+            conn.reply(message, "u", [notification_id])
+            showing.add(notification_id)
+            action = os.environ.get("FAKE_NOTIFY_ACTION")
+            if action == "dismiss" and actions:
+                showing.discard(notification_id)
+                conn.emit(NOTIFICATIONS_PATH, NOTIFICATIONS_NAME, "NotificationClosed",
+                          "uu", [notification_id, 2])
+            elif action == "vanish" and actions:
+                showing.discard(notification_id)
+            elif action and actions:
+                conn.emit(NOTIFICATIONS_PATH, NOTIFICATIONS_NAME, "ActionInvoked",
+                          "us", [notification_id, action])
+
+        elif message.member == "GetCapabilities":
+            conn.reply(message, "as", [["actions", "body"]])
+
+        elif message.member == "GetServerInformation":
+            conn.reply(message, "ssss", ["fake", "jord0.skills", "1.0", "1.2"])
+
+        elif message.member == "CloseNotification":
+            (notification_id,) = message.body
+            if notification_id not in showing:
+                reply_error(conn, message, "org.freedesktop.DBus.Error.InvalidArgs",
+                            f"No notification {notification_id}")
+                continue
+            showing.discard(notification_id)
+            conn.reply(message)
+            conn.emit(NOTIFICATIONS_PATH, NOTIFICATIONS_NAME, "NotificationClosed",
+                      "uu", [notification_id, 3])
+
+        else:
+            conn.reply(message)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
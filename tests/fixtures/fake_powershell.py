@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Stand-in powershell.exe for testing NOTIFY on plain Linux.
+
+Accepts the same `-Command <script>` invocation toast.py and worker.py use.
+Nothing is executed; every script is appended to $FAKE_POWERSHELL_LOG as a
+JSON line so tests can assert on what would have run.
+
+Modes:
+    one-shot   log {"mode": "oneshot", "script": ...} and exit 0
+    worker     script contains "NOTIFY-WORKER-LOOP": log {"mode": "worker-start"},
+               print the ready line, then answer JSON-lines requests like the
+               real worker loop (scripts containing "throw" report failure)
+
+Environment:
+    FAKE_POWERSHELL_LOG     Log file (default: no logging)
+    FAKE_POWERSHELL_DELAY   Seconds to sleep on startup (mimics Import-Module)
+"""
+
+import base64
+import json
+import os
+import sys
+import time
+
+
+def log(entry: dict) -> None:
+    path = os.environ.get("FAKE_POWERSHELL_LOG")
+    if path:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+def main() -> int:
+    args = sys.argv[1:]
+    script = args[args.index("-Command") + 1] if "-Command" in args else ""
+    time.sleep(float(os.environ.get("FAKE_POWERSHELL_DELAY", "0")))
+
+    if "NOTIFY-WORKER-LOOP" not in script:
+        log({"mode": "oneshot", "pid": os.getpid(), "script": script})
+        return 1 if "throw" in script else 0
+
+    log({"mode": "worker-start", "pid": os.getpid()})
+    print(json.dumps({"ready": True}), flush=True)
+    for line in sys.stdin:
+        request = json.loads(line)
+        body = base64.b64decode(request["script"]).decode("utf-8")
+        log({"mode": "worker", "pid": os.getpid(), "script": body})
+        if "throw" in body:
+            response = {"id": request["id"], "ok": False, "error": "thrown"}
+        else:
+            response = {"id": request["id"], "ok": True}
+        print(json.dumps(response), flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+#!/usr/bin/env node
+/*
+ * Behavioural check of REGTRAX's incremental diagram layout, run under node.
+ *
+ * Loads every <script> of template.html into a vm context backed by a minimal
+ * DOM (just what the renderer touches), then:
+ *   - rebuilds pattern A into an edited pattern B and compares the SVG markup,
+ *     nodePositions and size with a cold build of B (layout cache cleared);
+ *   - checks an unchanged sibling subtree keeps its SVG element;
+ *   - counts how many subtrees an edit re-renders.
+ *
+ * Usage: node regtrax_layout_check.js <template.html>
+ * Prints one JSON line per check: {"name", "ok", "detail"} (detail only on failure).
+ */
+
+const fs = require('fs');
+const vm = require('vm');
+
+// ---------------------------------------------------------------------------
+// Minimal DOM
+// ---------------------------------------------------------------------------
+
+class El {
+  constructor(tag) {
+    this.tagName = tag; this.attrs = new Map(); this.children = []; this.parent = null;
+    this.style = {}; this._text = ''; this.value = ''; this.hidden = false;
+  }
+  setAttribute(k, v) { this.attrs.set(k, String(v)); }
+  getAttribute(k) { return this.attrs.has(k) ? this.attrs.get(k) : null; }
+  hasAttribute(k) { return this.attrs.has(k); }
+  removeAttribute(k) { this.attrs.delete(k); }
+  get classList() {
+    const get = () => (this.getAttribute('class') || '').split(/\s+/).filter(Boolean);
+    const set = list => this.setAttribute('class', list.join(' '));
+    return {
+      add: (...c) => set([...new Set([...get(), ...c])]),
+      remove: (...c) => set(get().filter(x => !c.includes(x))),
+      toggle: (c, on = !get().includes(c)) => on ? set([...new Set([...get(), c])]) : set(get().filter(x => x !== c)),
+      contains: c => get().includes(c),
+    };
+  }
+  appendChild(c) { if (c.parent) c.remove(); c.parent = this; this.children.push(c); return c; }
+  remove() {
+    if (this.parent) { this.parent.children = this.parent.children.filter(x => x !== this); this.parent = null; }
+  }
+  replaceWith(n) {
+    if (n.parent) n.remove();
+    const p = this.parent;
+    p.children.splice(p.children.indexOf(this), 1, n);
+    n.parent = p; this.parent = null;
+  }
+  insertAdjacentHTML(where, html) {
+    const holder = new El('#holder');
+    parseInto(holder, html);
+    for (const c of [...holder.children]) this.appendChild(c);
+  }
+  contains(o) { for (let x = o; x; x = x.parent) if (x === this) return true; return false; }
+  closest(sel) { for (let x = this; x && x.attrs; x = x.parent) if (matches(x, sel)) return x; return null; }
+  addEventListener() {}
+  removeEventListener() {}
+  getBoundingClientRect() { return { x: 0, y: 0, width: 0, height: 0, left: 0, top: 0 }; }
+  set textContent(t) { this.children = []; this._text = String(t); }
+  get textContent() { return this._text + this.children.map(c => c.textContent).join(''); }
+  set innerHTML(h) { this.children.forEach(c => { c.parent = null; }); this.children = []; this._text = ''; parseInto(this, h); }
+  get innerHTML() { return this._text + this.children.map(c => c.outerHTML).join(''); }
+  get outerHTML() {
+    if (this.tagName === '#text') return this._text;
+    const a = [...this.attrs].map(([k, v]) => ` ${k}="${v}"`).join('');
+    return `<${this.tagName}${a}>${this.innerHTML}</${this.tagName}>`;
+  }
+  *walk() { for (const c of this.children) if (c.tagName !== '#text') { yield c; yield* c.walk(); } }
+  querySelectorAll(sel) { return [...this.walk()].filter(e => matches(e, sel)); }
+  querySelector(sel) { return this.querySelectorAll(sel)[0] || null; }
+}
+
+function matchesOne(el, sel) {
+  const m = sel.trim().match(/^([a-zA-Z]*)((?:\.[\w-]+|\[[^\]]+\])*)$/);
+  if (!m) throw new Error('unsupported selector: ' + sel);
+  if (m[1] && el.tagName !== m[1]) return false;
+  for (const part of m[2].match(/\.[\w-]+|\[[^\]]+\]/g) || []) {
+    if (part[0] === '.') { if (!el.classList.contains(part.slice(1))) return false; continue; }
+    const [, name, op, want] = part.slice(1, -1).match(/^([\w-]+)(?:(\^?=)"(.*)")?$/);
+    const v = el.getAttribute(name);
+    if (v === null || (op === '=' && v !== want) || (op === '^=' && !v.startsWith(want))) return false;
+  }
+  return true;
+}
+const matches = (el, sel) => sel.split(',').some(s => matchesOne(el, s));
+
+function parseInto(root, html) {
+  const tag = /<\/?([a-zA-Z][\w-]*)((?:\s+[\w:-]+="[^"]*")*)\s*(\/?)>/y;
+  let cur = root, i = 0;
+  while (i < html.length) {
+    if (html[i] === '<') {
+      tag.lastIndex = i;
+      const m = tag.exec(html);
+      if (!m) throw new Error('unparsed markup: ' + html.slice(i, i + 60));
+      i = tag.lastIndex;
+      if (m[0][1] === '/') { cur = cur.parent; continue; }
+      const el = new El(m[1]);
+      for (const a of m[2].matchAll(/([\w:-]+)="([^"]*)"/g)) el.setAttribute(a[1], a[2]);
+      cur.appendChild(el);
+      if (!m[3]) cur = el;
+    } else {
+      const j = html.indexOf('<', i);
+      const text = new El('#text');
+      text._text = html.slice(i, j < 0 ? undefined : j);
+      cur.appendChild(text);
+      i = j < 0 ? html.length : j;
+    }
+  }
+}
+
+function loadTemplate(path) {
+  const ids = {};
+  const document = {
+    getElementById(id) {
+      if (!ids[id]) {
+        ids[id] = new El(id === 'diagram' ? 'svg' : 'div');
+        if (id === 'diagram') ids[id].innerHTML = '<defs><filter id="glowSmall"></filter></defs>';
+      }
+      return ids[id];
+    },
+    createElementNS: (ns, tag) => new El(tag),
+    createElement: tag => new El(tag),
+    addEventListener() {},
+  };
+  const win = vm.createContext({
+    document, console, Math, JSON, Number, String, Object, Array, Set, Map, parseInt, Promise,
+    requestAnimationFrame: () => 1, cancelAnimationFrame() {},
+    setInterval: () => 1, clearInterval() {}, setTimeout: () => 1, clearTimeout() {},
+    fetch: () => Promise.reject(new Error('offline')),
+    EventSource: class { constructor() { this.readyState = 0; } addEventListener() {} close() {} },
+    performance: { now: () => Number(process.hrtime.bigint()) / 1e6 },
+    location: { search: '', pathname: '/' },
+  });
+  win.window = win;
+  win.eval = code => vm.runInContext(code, win);
+  const html = fs.readFileSync(path, 'utf8');
+  vm.runInContext([...html.matchAll(/<script>([\s\S]*?)<\/script>/g)].map(m => m[1]).join('\n'), win);
+  return win;
+}
+
+// ---------------------------------------------------------------------------
+// Checks
+// ---------------------------------------------------------------------------
+
+// Markup, positions and size with node ids renumbered by first appearance, so
+// builds that allocated different ids (reused vs fresh subtrees) compare equal
+function layoutSnapshot(win) {
+  const svg = win.document.getElementById('diagram');
+  const ranks = new Map();
+  const rank = nid => { if (!ranks.has(nid)) ranks.set(nid, ranks.size); return 'n' + ranks.get(nid); };
+  const markup = svg.innerHTML
+    .replace(/data-nid="(\d+)"/g, (_, n) => `data-nid="${rank(+n)}"`)
+    .replace(/data-seg="([a-z]+-)?(\d+)/g, (_, kind, n) => `data-seg="${kind || ''}${rank(+n)}`);
+  const positions = win.eval('nodePositions').map(p => ({
+    ...p,
+    id: p.id >= 0 ? rank(p.id) : p.id < -2 ? `${rank(Math.floor(-p.id / 1000))}:${-p.id % 1000}` : p.id,
+    altContext: p.altContext && p.altContext.map(a => `${rank(a.altNid)}/${a.branchIdx}`),
+  }));
+  return JSON.stringify({ markup, positions, width: svg.getAttribute('width'), height: svg.getAttribute('height') });
+}
+
+const build = (win, pattern) => win.rebuildDiagram({ pattern, flags: '', explanation: 'layout check' });
+
+const field = (i, width = 8) => `(?<f${i}>[A-Za-z]{1,${width}}(?:-\\d+|_[a-f0-9]{2})*|\\d{1,3}(?:\\.\\d{1,3}){3})`;
+const fields = (n, edit = -1) => '^' + Array.from({ length: n }, (_, i) => field(i, i === edit ? 9 : 8)).join('\\s+') + '$';
+
+// [pattern A, pattern B]: B is A with one part edited
+const EDITS = [
+  [fields(12), fields(12, 6)],                                       // one group's quantifier
+  [fields(12), fields(13)],                                          // a group appended
+  [fields(12), fields(11)],                                          // a group removed
+  [String.raw`^(GET|POST) (\S+) (\d{3})$`, String.raw`^(GET|POST|PUT) (\S+) (\d{3})$`],  // a branch added
+  [String.raw`(a)(b)(c)`, String.raw`(b)(a(b))`],                    // subtrees reordered and nested
+  [String.raw`(?:ab|cd)*(?:ef)+`, String.raw`(?:ab|cd)+?(?:ef)+`],   // quantifier kind changed
+];
+
+function report(name, ok, detail) {
+  console.log(JSON.stringify({ name, ok, detail: ok ? '' : detail }));
+}
+
+function main() {
+  const templatePath = process.argv[2];
+  const win = loadTemplate(templatePath);
+
+  const wrong = [];
+  for (const [a, b] of EDITS) {
+    build(win, a);
+    const before = layoutSnapshot(win);
+    build(win, b);
+    const incremental = layoutSnapshot(win);
+    win.clearLayoutCache();
+    build(win, b);
+    const cold = layoutSnapshot(win);
+    if (incremental !== cold) wrong.push(`${a} -> ${b}`);
+    if (before === cold) wrong.push(`snapshot can't tell ${a} from ${b}`);
+  }
+  report(`incremental-equals-cold (${EDITS.length} edits)`, !wrong.length, wrong.join('; '));
+
+  const svg = win.document.getElementById('diagram');
+  build(win, fields(12));
+  const first = svg.querySelector('.node-group');
+  let rendered = 0;
+  const renderNode = win.eval('renderNode');
+  win.eval('f => { renderNode = f; }')(node => { rendered++; return renderNode(node); });
+  build(win, fields(12, 6));
+  report('unchanged-sibling-kept', svg.querySelector('.node-group') === first && svg.contains(first),
+    'first group element was re-created');
+  // The edited group, its changed quantifier and class, the enclosing sequence and alternation
+  report(`edit-renders-changed-path (${rendered} subtrees)`, rendered > 0 && rendered <= 6,
+    `a one-group edit rendered ${rendered} subtrees`);
+}
+
+main();
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+jord0.skills — ECHO Script Test Suite
+
+Exercises skills/ECHO/scripts/echo_store.py (indexed decision store with a
+query log) in throwaway echoes directories.
+Execute: python tests/test_echo.py
+"""
+
+import importlib.util
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from test_skills import TestResults
+
+REPO_ROOT = Path(__file__).parent.parent
+ECHO_STORE_PY = REPO_ROOT / "skills" / "ECHO" / "scripts" / "echo_store.py"
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def load_store():
+    """Import a fresh copy of echo_store.py."""
+    spec = importlib.util.spec_from_file_location("echo_store_under_test", ECHO_STORE_PY)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def decision(what: str, confidence=0.8, unknowns=()) -> dict:
+    return {
+        "what": what,
+        "reasoning": f"Because of {what}",
+        "alternatives_rejected": [],
+        "confidence": confidence,
+        "unknowns": list(unknowns),
+    }
+
+
+# Each process creates its own echoes and queries a shared one, so creates,
+# index repairs and log appends from different processes interleave.
+WORKER = """
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location("echo_store", sys.argv[1])
+echo_store = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(echo_store)
+store = echo_store.EchoStore(echo_store.Path(sys.argv[2]))
+worker, count = int(sys.argv[3]), int(sys.argv[4])
+for i in range(count):
+    store.create(f"w{worker}-{i}", {"what": f"choice {i}"}, {"project": f"p{worker}"})
+    store.query("shared", f"worker {worker} question {i}")
+"""
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+def test_query(results: TestResults):
+    """Queries read the decision once and append to the log; the file is never rewritten."""
+    echo_store = load_store()
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp) / "echoes"
+        store = echo_store.EchoStore(directory)
+        eid = store.create("auth-strategy", decision("JWT", unknowns=["revocation"]), {"project": "api"})["id"]
+        path = directory / f"{eid}.json"
+        before = (path.read_bytes(), path.stat().st_mtime_ns)
+
+        answered = [store.query(ref, "why JWT?")["decision"]["what"] for ref in (eid, "auth-strategy", eid.lower())]
+        log = [json.loads(line) for line in (directory / "queries.log.jsonl").read_text(encoding="utf-8").splitlines()]
+        if (
+            answered == ["JWT"] * 3
+            and (path.read_bytes(), path.stat().st_mtime_ns) == before
+            and [r["id"] for r in log] == [eid] * 3
+        ):
+            results.ok("query/no-rewrite")
+        else:
+            results.fail("query/no-rewrite", f"answered={answered} log={log}")
+
+        with open(directory / "queries.log.jsonl", "a", encoding="utf-8") as f:
+            f.write('{"id": "ECHO-')  # Writer killed mid-line
+        store.query(eid, "after the crash")
+        history = store.history(eid)
+        if len(history) == 4 and history[0]["question"] == "after the crash":
+            results.ok("query/torn-line-skipped")
+        else:
+            results.fail("query/torn-line-skipped", f"history={history}")
+
+        # An echo from before the query log, with its queries inline
+        legacy = {
+            "id": "ECHO-OLD1", "name": "legacy", "created": "2024-01-15T14:30:00",
+            "decision": decision("Postgres"), "context": {"project": "api"},
+            "queries": [{"question": "why not mysql?", "timestamp": "2024-02-01T09:00:00"}],
+        }
+        (directory / "ECHO-OLD1.json").write_text(json.dumps(legacy), encoding="utf-8")
+        store.query("legacy", "still right?")
+        questions = [q["question"] for q in echo_store.EchoStore(directory).history("legacy")]
+        if questions == ["still right?", "why not mysql?"]:
+            results.ok("query/legacy-inline-queries")
+        else:
+            results.fail("query/legacy-inline-queries", f"questions={questions}")
+
+        try:
+            store.create("auth-strategy", decision("Sessions"), {})
+            results.fail("query/duplicate-name", "second 'auth-strategy' echo was created")
+        except echo_store.EchoError:
+            results.ok("query/duplicate-name")
+
+
+def test_list(results: TestResults):
+    """list filters on the index and never parses decision files."""
+    echo_store = load_store()
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp) / "echoes"
+        store = echo_store.EchoStore(directory)
+        ids = {}
+        for name, project, confidence, unknowns in [
+            ("db", "api", 0.9, []),
+            ("cache", "api", 0.4, ["eviction"]),
+            ("theme", "web", 55, ["contrast"]),   # Percent, as older echoes recorded it
+            ("router", "web", None, []),
+        ]:
+            ids[name] = store.create(name, decision(name, confidence, unknowns), {"project": project})["id"]
+
+        # Corrupt every decision in place (no directory change): list must not read them
+        for eid in ids.values():
+            (directory / f"{eid}.json").write_text("not json", encoding="utf-8")
+        reader = echo_store.EchoStore(directory)
+
+        def names(**filters):
+            return [e["name"] for e in reader.list(**filters)["echoes"]]
+
+        if (
+            names() == ["router", "theme", "cache", "db"]
+            and names(project="API") == ["cache", "db"]
+            and names(max_confidence=0.6) == ["theme", "cache"]
+            and names(open_unknowns=True, project="web") == ["theme"]
+        ):
+            results.ok("list/index-filters")
+        else:
+            results.fail("list/index-filters", f"all={names()} low={names(max_confidence=0.6)}")
+
+        page = reader.list(limit=3, page=2)
+        if page["total"] == 4 and page["pages"] == 2 and [e["name"] for e in page["echoes"]] == ["db"]:
+            results.ok("list/paginated")
+        else:
+            results.fail("list/paginated", f"page={page}")
+
+        rejected = []
+        for limit, number in ((0, 1), (3, 0), (-1, 1)):
+            try:
+                reader.list(limit=limit, page=number)
+            except echo_store.EchoError:
+                rejected.append((limit, number))
+        if len(rejected) == 3:
+            results.ok("list/bad-paging-rejected")
+        else:
+            results.fail("list/bad-paging-rejected", f"accepted {set(((0, 1), (3, 0), (-1, 1))) - set(rejected)}")
+
+        # git pull replaced one decision and removed another; the directory
+        # changed, so the files corrupted above are re-read and dropped too
+        (directory / f"{ids['db']}.json").unlink()
+        (directory / f"{ids['cache']}.json").unlink()
+        (directory / f"{ids['cache']}.json").write_text(json.dumps({
+            "id": ids["cache"], "name": "cache", "created": "2099-01-01T00:00:00+00:00",
+            "decision": decision("cache", 0.95), "context": {"project": "api"},
+        }), encoding="utf-8")
+        listed = echo_store.EchoStore(directory).list()["echoes"]
+        if [(e["name"], e["confidence"]) for e in listed] == [("cache", 0.95)]:
+            results.ok("list/repairs-after-sync")
+        else:
+            results.fail("list/repairs-after-sync", f"listed={listed}")
+
+
+def test_concurrency(results: TestResults):
+    """Parallel sessions creating and querying lose neither echoes nor log lines."""
+    echo_store = load_store()
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp) / "echoes"
+        echo_store.EchoStore(directory).create("shared", decision("shared"), {})
+        workers, count = 5, 15
+        procs = [
+            subprocess.Popen([sys.executable, "-c", WORKER, str(ECHO_STORE_PY), str(directory), str(w), str(count)])
+            for w in range(workers)
+        ]
+        codes = [p.wait(timeout=60) for p in procs]
+        store = echo_store.EchoStore(directory)
+        total = store.list()["total"]
+        logged = store.history("shared", limit=1000)
+        if codes == [0] * workers and total == workers * count + 1 and len(logged) == workers * count:
+            results.ok("concurrency/no-lost-writes")
+        else:
+            results.fail("concurrency/no-lost-writes",
+                         f"exit codes {codes}, {total} echoes, {len(logged)} queries logged")
+
+
+def test_cli(results: TestResults):
+    """create / query / list print JSON; errors are JSON with exit status 1."""
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp) / "echoes"
+
+        def run(*args):
+            proc = subprocess.run(
+                [sys.executable, str(ECHO_STORE_PY), "--dir", str(directory), *args],
+                capture_output=True, text=True, timeout=30,
+            )
+            try:
+                return proc.returncode, json.loads(proc.stdout)
+            except ValueError:
+                return proc.returncode, {"raw": proc.stdout + proc.stderr}
+
+        run("create", "auth-strategy", "--decision", "JWT", "--alternatives", "Sessions, API keys",
+            "--confidence", "0.5", "--unknowns", "Revocation", "--project", "api")
+        code, queried = run("query", "auth-strategy", "why not sessions?")
+        code_list, listed = run("list", "--low-confidence", "--open-unknowns")
+        if (
+            code == 0 and code_list == 0
+            and queried.get("decision", {}).get("alternatives_rejected") == ["Sessions", "API keys"]
+            and [e["name"] for e in listed.get("echoes", [])] == ["auth-strategy"]
+        ):
+            results.ok("cli/create-query-list")
+        else:
+            results.fail("cli/create-query-list", f"query={queried} list={listed}")
+
+        code, error = run("create", "bad", "--decision", "x", "--confidence", "high")
+        if code == 1 and "error" in error:
+            results.ok("cli/invalid-confidence")
+        else:
+            results.fail("cli/invalid-confidence", f"rc={code} out={error}")
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def main():
+    print()
+    print("=" * 60)
+    print("  jord0.skills — ECHO Script Suite")
+    print("=" * 60)
+    print()
+
+    results = TestResults()
+
+    print("[1/4] Queries")
+    test_query(results)
+    print()
+
+    print("[2/4] Indexed list")
+    test_list(results)
+    print()
+
+    print("[3/4] Concurrent sessions")
+    test_concurrency(results)
+    print()
+
+    print("[4/4] Command line")
+    test_cli(results)
+    print()
+
+    print("=" * 60)
+    total = results.passed + results.failed
+    if results.failed == 0:
+        print(f"  ALL {total} CHECKS PASSED")
+    else:
+        print(f"  {results.passed}/{total} passed, {results.failed} FAILED")
+        print()
+        for error in results.errors:
+            print(f"  X  {error}")
+    print("=" * 60)
+    print()
+
+    sys.exit(1 if results.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+jord0.skills — Live Server Test Suite
+
+Runs the live-reload dev server shipped with REGTRAX and REFRAX
+(skills/*/scripts/live_server.py) against a throwaway directory and checks
+the Server-Sent Events stream, ETag revalidation, and the templates that
+consume them.
+Execute: python tests/test_live_server.py
+"""
+
+import http.client
+import json
+import os
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from test_skills import TestResults
+
+REPO_ROOT = Path(__file__).parent.parent
+LIVE_SKILLS = ("REGTRAX", "REFRAX")
+LIVE_SERVER_PY = REPO_ROOT / "skills" / "REGTRAX" / "scripts" / "live_server.py"
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def live_server(*args: str):
+    """Run live_server.py on a free port; yields (port, startup banner)."""
+    proc = subprocess.Popen(
+        [sys.executable, str(LIVE_SERVER_PY), "--port", "0", *args],
+        stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        line = proc.stdout.readline()
+        yield int(re.search(r"127\.0\.0\.1:(\d+)", line).group(1)), line
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+class EventStream:
+    """Minimal text/event-stream reader over a raw socket."""
+
+    def __init__(self, port: int, last_event_id: str | None = None, path: str = "/events"):
+        self.sock = socket.create_connection(("127.0.0.1", port), timeout=5)
+        extra = f"Last-Event-ID: {last_event_id}\r\n" if last_event_id else ""
+        self.sock.sendall(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n{extra}\r\n".encode())
+        self.buffer = b""
+        head = self._read_until(b"\r\n\r\n", 5)
+        self.status = int(head.split()[1]) if head else 0
+
+    def _read_until(self, marker: bytes, timeout: float) -> bytes | None:
+        deadline = time.monotonic() + timeout
+        while marker not in self.buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            self.sock.settimeout(remaining)
+            try:
+                chunk = self.sock.recv(65536)
+            except socket.timeout:
+                return None
+            if not chunk:
+                return None
+            self.buffer += chunk
+        block, self.buffer = self.buffer.split(marker, 1)
+        return block
+
+    def next_event(self, timeout: float = 5) -> dict | None:
+        """Next dispatched event as {"id", "event", "data"}; None on timeout."""
+        while True:
+            block = self._read_until(b"\n\n", timeout)
+            if block is None:
+                return None
+            event, data = {}, []
+            for line in block.decode("utf-8").split("\n"):
+                field, _, value = line.partition(": ")
+                if field == "data":
+                    data.append(value)
+                elif field in ("id", "event"):
+                    event[field] = value
+            if data:
+                return {**event, "data": "\n".join(data)}
+
+    def pending(self, wait: float) -> bytes:
+        """Whatever arrives within wait seconds."""
+        self.sock.settimeout(wait)
+        try:
+            return self.buffer + self.sock.recv(65536)
+        except socket.timeout:
+            return self.buffer
+
+    def close(self):
+        self.sock.close()
+
+
+def get(port: int, path: str, headers: dict | None = None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    conn.request("GET", path, headers=headers or {})
+    response = conn.getresponse()
+    body = response.read()
+    conn.close()
+    return response.status, response.getheader("ETag"), body
+
+
+def api(port: int, method: str, path: str, payload=None, headers: dict | None = None):
+    """JSON request; returns (status, decoded JSON body or raw bytes)."""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    body = payload if isinstance(payload, bytes) or payload is None else json.dumps(payload).encode()
+    conn.request(method, path, body=body, headers={"Content-Type": "application/json", **(headers or {})})
+    response = conn.getresponse()
+    raw = response.read()
+    conn.close()
+    try:
+        return response.status, json.loads(raw)
+    except ValueError:
+        return response.status, raw
+
+
+def write_atomic(path: Path, text: str):
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+def test_push(results: TestResults, mode: str):
+    """Every finished write is pushed within milliseconds; nothing is sent while idle."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        data = tmp / "data.json"
+        data.write_text('{"pattern": "a+"}', encoding="utf-8")
+        with live_server(str(tmp), "--watch", mode) as (port, banner):
+            stream = EventStream(port)
+            first = stream.next_event()
+            if stream.status == 200 and first and json.loads(first["data"]) == {"pattern": "a+"}:
+                results.ok(f"push-{mode}/initial-state")
+            else:
+                results.fail(f"push-{mode}/initial-state", f"status={stream.status} event={first} {banner}")
+
+            latencies, received = [], []
+            for n in range(5):
+                text = json.dumps({"pattern": f"b{{{n}}}", "explanation": "one\ntwo"}, indent=2)
+                start = time.monotonic()
+                if n % 2:
+                    write_atomic(data, text)
+                else:
+                    data.write_text(text, encoding="utf-8")
+                event = stream.next_event()
+                latencies.append(time.monotonic() - start)
+                received.append(event and event["data"] == text)
+            limit = 0.05 if mode == "inotify" else 0.5
+            if all(received) and max(latencies) < limit:
+                results.ok(f"push-{mode}/latency")
+            else:
+                results.fail(f"push-{mode}/latency",
+                             f"received={received} max={max(latencies) * 1000:.1f}ms (limit {limit * 1000:.0f}ms)")
+
+            # A torn write (invalid JSON) is never pushed; the completed one is
+            data.write_text('{"pattern": "c', encoding="utf-8")
+            idle = stream.pending(0.3)
+            data.write_text('{"pattern": "c"}', encoding="utf-8")
+            event = stream.next_event()
+            if not idle and event and json.loads(event["data"]) == {"pattern": "c"}:
+                results.ok(f"push-{mode}/invalid-json-skipped")
+            else:
+                results.fail(f"push-{mode}/invalid-json-skipped", f"idle={idle!r} event={event}")
+
+            # Rewriting identical content is not a change
+            data.write_text('{"pattern": "c"}', encoding="utf-8")
+            idle = stream.pending(0.5)
+            if not idle:
+                results.ok(f"push-{mode}/silent-when-idle")
+            else:
+                results.fail(f"push-{mode}/silent-when-idle", f"sent {idle!r}")
+            stream.close()
+
+
+def test_revalidation(results: TestResults):
+    """data.json carries an ETag; reconnects and revalidations skip unchanged data."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        data = tmp / "data.json"
+        data.write_text('{"pattern": "x"}', encoding="utf-8")
+        (tmp / "index.html").write_text("<html></html>", encoding="utf-8")
+        with live_server(str(tmp)) as (port, _):
+            status, etag, body = get(port, "/data.json")
+            revalidated, _, empty = get(port, "/data.json?t=1", {"If-None-Match": etag})
+            data.write_text('{"pattern": "y"}', encoding="utf-8")
+            time.sleep(0.2)
+            changed, new_etag, new_body = get(port, "/data.json", {"If-None-Match": etag})
+            if (
+                (status, revalidated, changed) == (200, 304, 200)
+                and body == b'{"pattern": "x"}' and not empty
+                and new_etag != etag and new_body == b'{"pattern": "y"}'
+            ):
+                results.ok("revalidation/etag-304")
+            else:
+                results.fail("revalidation/etag-304", f"statuses={(status, revalidated, changed)} etags={etag, new_etag}")
+
+            stream = EventStream(port, last_event_id=new_etag)
+            skipped = stream.pending(0.3)
+            data.write_text('{"pattern": "z"}', encoding="utf-8")
+            event = stream.next_event()
+            stream.close()
+            if b"data:" not in skipped and event and json.loads(event["data"]) == {"pattern": "z"}:
+                results.ok("revalidation/last-event-id")
+            else:
+                results.fail("revalidation/last-event-id", f"skipped={skipped!r} event={event}")
+
+            page, _, html = get(port, "/index.html")
+            missing, _, _ = get(port, "/nope.html")
+            if page == 200 and html == b"<html></html>" and missing == 404:
+                results.ok("revalidation/static-files")
+            else:
+                results.fail("revalidation/static-files", f"index={page} missing={missing}")
+
+
+def test_workspaces(results: TestResults):
+    """One process hosts many isolated sessions with in-memory templates."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        custom = tmp / "custom.html"
+        custom.write_text("<html>custom</html>", encoding="utf-8")
+        with live_server("--workspaces", "--template", f"custom={custom}") as (port, banner):
+            custom.unlink()  # Served from memory from here on
+            status, health = api(port, "GET", "/api/health")
+            status_ws, created = api(port, "POST", "/api/workspaces", {"template": "custom", "id": "c1"})
+            page, _, html = get(port, "/w/c1/")
+            regtrax = (REPO_ROOT / "skills" / "REGTRAX" / "references" / "template.html").read_bytes()
+            api(port, "POST", "/api/workspaces", {"template": "regtrax", "id": "r1"})
+            _, _, regtrax_page = get(port, "/w/r1/")
+            if (
+                status == 200 and health.get("templates") == ["custom", "refrax", "regtrax"]
+                and status_ws == 201 and created["url"].endswith(f":{port}/w/c1/")
+                and page == 200 and html == b"<html>custom</html>" and regtrax_page == regtrax
+            ):
+                results.ok("workspaces/templates-from-memory")
+            else:
+                results.fail("workspaces/templates-from-memory", f"health={health} created={created} page={page}")
+
+            # 20 sessions at once: each creates its workspace, pushes its data,
+            # and its page sees only its own updates
+            def session(n: int):
+                wid = f"s{n:02d}"
+                code, _ = api(port, "POST", "/api/workspaces",
+                              {"template": "regtrax" if n % 2 else "refrax", "id": wid, "data": {"n": n}})
+                stream = EventStream(port, path=f"/w/{wid}/events")
+                first = stream.next_event()
+                api(port, "PUT", f"/w/{wid}/data.json", {"n": n, "rev": 2})
+                second = stream.next_event()
+                stream.close()
+                return code, json.loads(first["data"]) if first else None, json.loads(second["data"]) if second else None
+
+            with ThreadPoolExecutor(max_workers=20) as pool:
+                outcomes = list(pool.map(session, range(20)))
+            _, listing = api(port, "GET", "/api/workspaces")
+            if (
+                outcomes == [(201, {"n": n}, {"n": n, "rev": 2}) for n in range(20)]
+                and len(listing["workspaces"]) == 22
+            ):
+                results.ok("workspaces/isolated-sessions")
+            else:
+                results.fail("workspaces/isolated-sessions", f"outcomes={outcomes[:3]} listed={len(listing['workspaces'])}")
+
+            status, etag, _ = get(port, "/w/s00/data.json")
+            stale = api(port, "PUT", "/w/s00/data.json", {"n": "stale"}, {"If-Match": '"0000000000000000"'})[0]
+            swapped = api(port, "PUT", "/w/s00/data.json", {"n": "swapped"}, {"If-Match": etag})[0]
+            invalid = api(port, "PUT", "/w/s00/data.json", b'{"n": ')[0]
+            plain = api(port, "PUT", "/w/s00/data.json", b'{"n": 1}', {"Content-Type": "text/plain"})[0]
+            _, _, body = get(port, "/w/s00/data.json")
+            if (stale, swapped, invalid, plain) == (412, 200, 400, 415) and json.loads(body) == {"n": "swapped"}:
+                results.ok("workspaces/atomic-updates")
+            else:
+                results.fail("workspaces/atomic-updates", f"statuses={(stale, swapped, invalid, plain)} body={body}")
+
+            unknown = api(port, "POST", "/api/workspaces", {"template": "nope"})[0]
+            clash = api(port, "POST", "/api/workspaces", {"template": "refrax", "id": "r1"})[0]
+            again = api(port, "POST", "/api/workspaces", {"template": "regtrax", "id": "r1"})[0]
+            bad_id = api(port, "POST", "/api/workspaces", {"template": "regtrax", "id": "../x"})[0]
+            missing = get(port, "/w/zzz/")[0]
+            if (unknown, clash, again, bad_id, missing) == (400, 409, 200, 400, 404):
+                results.ok("workspaces/create-errors")
+            else:
+                results.fail("workspaces/create-errors", f"statuses={(unknown, clash, again, bad_id, missing)}")
+
+    with live_server("--workspaces", "--idle-timeout", "0.5") as (port, _):
+        for wid in ("open", "closed", "deleted"):
+            api(port, "POST", "/api/workspaces", {"template": "regtrax", "id": wid, "data": {}})
+        watching = EventStream(port, path="/w/open/events")
+        doomed = EventStream(port, path="/w/deleted/events")
+        watching.next_event(), doomed.next_event()
+        deleted = api(port, "DELETE", "/w/deleted/")[0]
+        ended = doomed.sock.recv(1) == b""
+        time.sleep(1.5)
+        alive = {wid: get(port, f"/w/{wid}/")[0] for wid in ("open", "closed")}
+        watching.close()
+        time.sleep(1.5)
+        after = get(port, "/w/open/")[0]
+        if deleted == 200 and ended and alive == {"open": 200, "closed": 404} and after == 404:
+            results.ok("workspaces/idle-reaped")
+        else:
+            results.fail("workspaces/idle-reaped", f"deleted={deleted} ended={ended} alive={alive} after={after}")
+
+
+def test_skill_wiring(results: TestResults):
+    """Both skills ship the same server, and their pages listen for pushes."""
+    copies = {s: (REPO_ROOT / "skills" / s / "scripts" / "live_server.py") for s in LIVE_SKILLS}
+    contents = {s: p.read_bytes() if p.exists() else None for s, p in copies.items()}
+    if None not in contents.values() and len(set(contents.values())) == 1:
+        results.ok("wiring/identical-copies")
+    else:
+        results.fail("wiring/identical-copies", "skills/*/scripts/live_server.py differ or are missing")
+
+    for skill in LIVE_SKILLS:
+        template = (REPO_ROOT / "skills" / skill / "references" / "template.html").read_text(encoding="utf-8")
+        skill_md = (REPO_ROOT / "skills" / skill / "SKILL.md").read_text(encoding="utf-8")
+        if (
+            "new EventSource('events')" in template
+            and "addEventListener('update'" in template
+            and "live_server.py --workspaces" in skill_md
+            and "&& python3 -m http.server" not in skill_md
+        ):
+            results.ok(f"wiring/{skill.lower()}")
+        else:
+            results.fail(f"wiring/{skill.lower()}", "template or SKILL.md still relies on http.server polling")
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def main():
+    print()
+    print("=" * 60)
+    print("  jord0.skills — Live Server Suite")
+    print("=" * 60)
+    print()
+
+    results = TestResults()
+
+    print("[1/5] Push (inotify)")
+    if sys.platform.startswith("linux"):
+        test_push(results, "inotify")
+    else:
+        print("  SKIP  push-inotify (Linux only)")
+    print()
+
+    print("[2/5] Push (mtime polling)")
+    test_push(results, "poll")
+    print()
+
+    print("[3/5] Revalidation")
+    test_revalidation(results)
+    print()
+
+    print("[4/5] Workspaces")
+    test_workspaces(results)
+    print()
+
+    print("[5/5] Skill wiring")
+    test_skill_wiring(results)
+    print()
+
+    print("=" * 60)
+    total = results.passed + results.failed
+    if results.failed == 0:
+        print(f"  ALL {total} CHECKS PASSED")
+    else:
+        print(f"  {results.passed}/{total} passed, {results.failed} FAILED")
+        print()
+        for error in results.errors:
+            print(f"  X  {error}")
+    print("=" * 60)
+    print()
+
+    sys.exit(1 if results.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
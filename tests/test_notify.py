@@ -0,0 +1,795 @@
+#!/usr/bin/env python3
+"""
+jord0.skills — NOTIFY Script Test Suite
+
+Exercises skills/NOTIFY/scripts/toast.py against stub binaries so it runs on
+any plain Linux box (no desktop, no WSL, no BurntToast needed).
+Execute: python tests/test_notify.py
+"""
+
+import asyncio
+import importlib.util
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from pathlib import Path
+
+from test_skills import TestResults
+
+REPO_ROOT = Path(__file__).parent.parent
+TOAST_PY = REPO_ROOT / "skills" / "NOTIFY" / "scripts" / "toast.py"
+WORKER_PY = TOAST_PY.with_name("worker.py")
+FAKE_POWERSHELL = Path(__file__).parent / "fixtures" / "fake_powershell.py"
+FAKE_NOTIFICATION_SERVER = Path(__file__).parent / "fixtures" / "fake_notification_server.py"
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def write_stub(bin_dir: Path, name: str, body: str) -> Path:
+    """Create an executable stub script in bin_dir."""
+    path = bin_dir / name
+    path.write_text(f"#!/bin/sh\n{body}\n", encoding="utf-8")
+    path.chmod(0o755)
+    return path
+
+
+@contextmanager
+def patched_env(**values: str | None):
+    """Temporarily set (or unset, with None) environment variables."""
+    saved = {key: os.environ.get(key) for key in values}
+    for key, value in values.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def read_log(path: Path) -> list[dict]:
+    """Parse a fake_powershell JSON-lines log."""
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def wait_for(predicate, timeout: float = 10.0) -> bool:
+    """Poll predicate until it returns truthy or timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def load_toast():
+    """Import a fresh copy of toast.py (module-level state reset)."""
+    spec = importlib.util.spec_from_file_location("toast_under_test", TOAST_PY)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@contextmanager
+def counted_subprocess_calls(module):
+    """Count subprocess.run/Popen calls made through the toast module."""
+    calls = []
+    real_run, real_popen = subprocess.run, subprocess.Popen
+
+    def run(*args, **kwargs):
+        calls.append(args[0] if args else kwargs.get("args"))
+        return real_run(*args, **kwargs)
+
+    class Popen(real_popen):
+        def __init__(self, *args, **kwargs):
+            calls.append(args[0] if args else kwargs.get("args"))
+            super().__init__(*args, **kwargs)
+
+    module.subprocess.run, module.subprocess.Popen = run, Popen
+    try:
+        yield calls
+    finally:
+        module.subprocess.run, module.subprocess.Popen = real_run, real_popen
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+def test_env_cache(results: TestResults):
+    """Detection runs once, then warm calls spawn zero subprocesses."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        stub = write_stub(bin_dir, "notify-send", 'echo "--action --icon --replace-id"')
+        path = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+
+        with patched_env(
+            NOTIFY_CACHE_DIR=str(tmp_path / "cache"), PATH=path,
+            DISPLAY=":99", WAYLAND_DISPLAY=None,
+        ):
+            cold = load_toast()
+            with counted_subprocess_calls(cold) as calls:
+                caps = cold.LINUX_CAPS
+            if calls and caps.get("replace") and cold.IS_LINUX:
+                results.ok("env-cache/cold-detects")
+            else:
+                results.fail("env-cache/cold-detects", f"calls={calls} caps={caps}")
+
+            warm = load_toast()
+            with counted_subprocess_calls(warm) as calls:
+                warm_caps = warm.LINUX_CAPS
+            if not calls and warm_caps == caps:
+                results.ok("env-cache/warm-no-subprocess")
+            else:
+                results.fail("env-cache/warm-no-subprocess", f"calls={calls}")
+
+            with counted_subprocess_calls(warm) as calls:
+                warm.get_environment(refresh=True)
+            if calls:
+                results.ok("env-cache/refresh")
+            else:
+                results.fail("env-cache/refresh", "refresh did not re-detect")
+
+            # Touching the binary (upgrade/reinstall) invalidates the cache
+            later = time.time() + 10
+            os.utime(stub, (later, later))
+            touched = load_toast()
+            with counted_subprocess_calls(touched) as calls:
+                touched.get_environment()
+            if calls:
+                results.ok("env-cache/binary-mtime-invalidates")
+            else:
+                results.fail("env-cache/binary-mtime-invalidates", "cache reused")
+
+        # Installing notify-send later, into a directory already on PATH, invalidates too
+        later_dir = tmp_path / "later-bin"
+        later_dir.mkdir()
+        with patched_env(
+            NOTIFY_CACHE_DIR=str(tmp_path / "later-cache"),
+            PATH=f"{later_dir}{os.pathsep}/nonexistent", DISPLAY=":99", WAYLAND_DISPLAY=None,
+        ):
+            before = load_toast().LINUX_CAPS
+            write_stub(later_dir, "notify-send", 'echo "--action --icon --replace-id"')
+            after = load_toast().LINUX_CAPS
+            if not before.get("available") and after.get("available"):
+                results.ok("env-cache/new-binary-invalidates")
+            else:
+                results.fail("env-cache/new-binary-invalidates", f"before={before} after={after}")
+
+        with patched_env(
+            NOTIFY_CACHE_DIR=str(tmp_path / "cache"), PATH=path,
+            DISPLAY=None, WAYLAND_DISPLAY=None,
+        ):
+            no_display = load_toast()
+            if not no_display.IS_LINUX:
+                results.ok("env-cache/display-invalidates")
+            else:
+                results.fail("env-cache/display-invalidates", "stale IS_LINUX")
+
+
+def test_worker(results: TestResults):
+    """Warm PowerShell worker: one process, many toasts, one-shot fallback."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        log_path = tmp_path / "powershell.log"
+        with patched_env(
+            NOTIFY_CACHE_DIR=str(tmp_path / "cache"),
+            FAKE_POWERSHELL_LOG=str(log_path),
+            NOTIFY_WORKER=None,
+        ):
+            toast = load_toast()
+            toast._environment = {"POWERSHELL_EXE": str(FAKE_POWERSHELL)}
+
+            worker = subprocess.Popen(
+                [sys.executable, str(WORKER_PY), "serve",
+                 "--powershell", str(FAKE_POWERSHELL), "--idle-timeout", "30"],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            try:
+                if wait_for(lambda: toast.worker_request({"command": "ping"}, 1)):
+                    results.ok("worker/starts")
+                else:
+                    results.fail("worker/starts", "worker never answered ping")
+                    return
+
+                sent = [toast._run_powershell(f"New-BurntToastNotification -Text 'n{i}'")
+                        for i in range(5)]
+                failed = toast._run_powershell("throw 'boom'")
+                entries = read_log(log_path)
+                starts = [e for e in entries if e["mode"] == "worker-start"]
+                handled = [e for e in entries if e["mode"] == "worker"]
+                if all(sent) and not failed and len(starts) == 1 and len(handled) == 6:
+                    results.ok("worker/reuses-one-powershell")
+                else:
+                    results.fail("worker/reuses-one-powershell", f"sent={sent} log={entries}")
+
+                toast.worker_request({"command": "stop"})
+                worker.wait(timeout=10)
+                if not toast.WORKER_SOCKET.exists():
+                    results.ok("worker/stop-cleans-socket")
+                else:
+                    results.fail("worker/stop-cleans-socket", "socket left behind")
+            finally:
+                if worker.poll() is None:
+                    worker.kill()
+                    worker.wait()
+
+            if toast._run_powershell("New-BurntToastNotification -Text 'solo'"):
+                oneshot = [e for e in read_log(log_path) if e["mode"] == "oneshot"]
+                if len(oneshot) == 1:
+                    results.ok("worker/oneshot-fallback")
+                else:
+                    results.fail("worker/oneshot-fallback", f"log={oneshot}")
+            else:
+                results.fail("worker/oneshot-fallback", "fallback send failed")
+
+            idle = subprocess.Popen(
+                [sys.executable, str(WORKER_PY), "serve",
+                 "--powershell", str(FAKE_POWERSHELL), "--idle-timeout", "0.5"],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            try:
+                idle.wait(timeout=10)
+                results.ok("worker/idle-timeout")
+            except subprocess.TimeoutExpired:
+                idle.kill()
+                idle.wait()
+                results.fail("worker/idle-timeout", "worker still running")
+
+
+def test_notification_queue(results: TestResults):
+    """Enqueueing never waits on the backend; drop policy and drain hold."""
+    with tempfile.TemporaryDirectory() as tmp, patched_env(NOTIFY_CACHE_DIR=tmp):
+        toast = load_toast()
+        delivered = []
+
+        def slow_send(i):
+            time.sleep(0.002)
+            delivered.append(i)
+            return True
+
+        queue = toast.NotificationQueue(maxsize=5000)
+        start = time.perf_counter()
+        for i in range(2000):
+            queue.put(slow_send, i)
+        per_put = (time.perf_counter() - start) / 2000
+        if per_put < 0.0005:
+            results.ok(f"queue/enqueue-fast ({per_put * 1e6:.1f}us)")
+        else:
+            results.fail("queue/enqueue-fast", f"{per_put * 1e6:.1f}us per put")
+
+        drained = queue.close(timeout=30)
+        if drained and delivered == list(range(2000)) and queue.sent == 2000:
+            results.ok("queue/close-drains-in-order")
+        else:
+            results.fail("queue/close-drains-in-order", f"sent={queue.sent}")
+        if not queue.put(slow_send, -1):
+            results.ok("queue/closed-rejects")
+        else:
+            results.fail("queue/closed-rejects", "put accepted after close")
+
+        for policy, survivor in (("oldest", 9), ("newest", 0)):
+            gate = threading.Event()
+            seen = []
+            bounded = toast.NotificationQueue(maxsize=3, drop=policy)
+            bounded.put(lambda: gate.wait(5))  # Park the sender thread
+            time.sleep(0.05)
+            for i in range(10):
+                bounded.put(seen.append, i)
+            gate.set()
+            bounded.close(timeout=5)
+            if bounded.dropped == 7 and survivor in seen and len(seen) == 3:
+                results.ok(f"queue/drop-{policy}")
+            else:
+                results.fail(f"queue/drop-{policy}", f"seen={seen} dropped={bounded.dropped}")
+
+        async def run_async():
+            return await toast.async_send_toast("Title", "Message")
+
+        # No desktop backend here, so the send reports False — but it returns
+        if asyncio.run(run_async()) is False:
+            results.ok("queue/async-send-returns")
+        else:
+            results.fail("queue/async-send-returns", "unexpected result")
+
+
+def test_progress_session(results: TestResults):
+    """Progress updates are coalesced, final 100% always lands, IDs are per session."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        log_path = tmp_path / "notify-send.log"
+        write_stub(  # One log line per call (bodies contain newlines)
+            bin_dir, "notify-send", f'echo "$*" | tr "\\n" " " >> "{log_path}"; echo >> "{log_path}"'
+        )
+        path = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+
+        with patched_env(NOTIFY_CACHE_DIR=str(tmp_path / "cache"), PATH=path):
+            toast = load_toast()
+            toast._environment = {
+                "IS_WSL": False, "IS_LINUX": True, "IS_MACOS": False,
+                "LINUX_CAPS": {"available": True, "replace": True},
+            }
+
+            with toast.progress("Building", max_rate=5) as bar:
+                for i in range(200):
+                    bar.update(i / 200, f"file {i}")
+                    time.sleep(0.001)
+                bar.update(1.0, "Done")
+            lines = log_path.read_text(encoding="utf-8").splitlines()
+            if 2 <= len(lines) <= 6 and "100%" in lines[-1] and "Done" in lines[-1]:
+                results.ok(f"progress/coalesced ({len(lines)} sends for 201 updates)")
+            else:
+                results.fail("progress/coalesced", f"{len(lines)} sends, last={lines[-1:]}")
+
+            log_path.unlink()
+            trailing = toast.progress("Trailing", max_rate=10)
+            trailing.update(0.1)
+            trailing.update(0.5, "halfway")  # Coalesced; must still arrive
+            time.sleep(0.3)
+            lines = log_path.read_text(encoding="utf-8").splitlines()
+            trailing.close()
+            if len(lines) == 2 and "50%" in lines[-1]:
+                results.ok("progress/trailing-send")
+            else:
+                results.fail("progress/trailing-send", f"log={lines}")
+
+            first, second = toast.progress("A"), toast.progress("B")
+            if first.replace_id != second.replace_id and first.tag != second.tag:
+                results.ok("progress/unique-replace-ids")
+            else:
+                results.fail("progress/unique-replace-ids", f"{first.replace_id} == {second.replace_id}")
+
+            log_path.unlink()
+            first.update(0.3)
+            second.update(0.6)
+            lines = log_path.read_text(encoding="utf-8").splitlines()
+            if f"-r {first.replace_id}" in lines[0] and f"-r {second.replace_id}" in lines[1]:
+                results.ok("progress/replace-id-sent")
+            else:
+                results.fail("progress/replace-id-sent", f"log={lines}")
+
+        with patched_env(
+            NOTIFY_CACHE_DIR=str(tmp_path / "cache"),
+            FAKE_POWERSHELL_LOG=str(tmp_path / "powershell.log"),
+        ):
+            toast = load_toast()
+            toast._environment = {
+                "IS_WSL": True, "IS_LINUX": False, "IS_MACOS": False,
+                "POWERSHELL_EXE": str(FAKE_POWERSHELL),
+            }
+            with toast.progress("Copying", max_rate=0) as bar:
+                bar.update(0.2, "1/5")
+                bar.update(0.4, "2/5")
+            scripts = [e["script"] for e in read_log(tmp_path / "powershell.log")]
+            if (
+                len(scripts) == 2
+                and "New-BurntToastNotification" in scripts[0]
+                and f"-UniqueIdentifier '{bar.tag}'" in scripts[0]
+                and "Update-BTNotification" in scripts[1]
+                and "New-BurntToastNotification" not in scripts[1]
+            ):
+                results.ok("progress/wsl-updates-in-place")
+            else:
+                results.fail("progress/wsl-updates-in-place", f"scripts={scripts}")
+
+
+def click_button(win_temp: Path, index: int, ping: bool = True) -> None:
+    """Play the part of Windows running a choice button's batch file."""
+    script = next(win_temp.glob(f"notify_choice_*_{index}.bat"))
+    lines = script.read_text(encoding="ascii").splitlines()
+    answer_name = lines[1].split("%TEMP%\\")[1].rstrip('"')
+    (win_temp / answer_name).write_text(f"{index} \r\n", encoding="ascii")
+    if ping:
+        url = lines[2].split('"')[1]
+        urllib.request.urlopen(url, timeout=2).read()
+
+
+def test_choice_channel(results: TestResults):
+    """Button answers arrive via loopback ping in ms; requests are isolated."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        win_temp = tmp_path / "wintemp"
+        win_temp.mkdir()
+        with patched_env(NOTIFY_CACHE_DIR=str(tmp_path / "cache"), FAKE_POWERSHELL_LOG=None):
+            toast = load_toast()
+            toast._environment = {
+                "IS_WSL": True, "IS_LINUX": False, "IS_MACOS": False,
+                "WIN_TEMP": str(win_temp), "POWERSHELL_EXE": str(FAKE_POWERSHELL),
+            }
+
+            clicked_at = []
+
+            def click_later():
+                wait_for(lambda: list(win_temp.glob("notify_choice_*_2.bat")))
+                time.sleep(0.2)
+                clicked_at.append(time.monotonic())
+                click_button(win_temp, 2)
+
+            clicker = threading.Thread(target=click_later)
+            clicker.start()
+            choice = toast.ask_choice("Deploy?", ["Prod", "Staging", "Cancel"], timeout=10)
+            latency = time.monotonic() - clicked_at[0] if clicked_at else None
+            clicker.join()
+            if choice == 2 and latency is not None and latency < 0.05:
+                results.ok(f"choice/socket-wakeup ({latency * 1000:.1f}ms)")
+            else:
+                results.fail("choice/socket-wakeup", f"choice={choice} latency={latency}")
+
+            if not list(win_temp.iterdir()):
+                results.ok("choice/cleans-up-files")
+            else:
+                results.fail("choice/cleans-up-files", str(list(win_temp.iterdir())))
+
+            with toast.ChoiceChannel(3) as first, toast.ChoiceChannel(3) as second:
+                first.write_scripts()
+                second.write_scripts()
+                (win_temp / first.choice_file.name).write_text("3\r\n", encoding="ascii")
+                if first.wait(timeout=2) == 3 and second.wait(timeout=0.3) is None:
+                    results.ok("choice/file-fallback-isolated")
+                else:
+                    results.fail("choice/file-fallback-isolated", "answers crossed or missing")
+
+                bogus = f"http://127.0.0.1:{second.port}/not-the-token/1"
+                pinger = threading.Thread(
+                    target=lambda: urllib.request.urlopen(bogus, timeout=2).read()
+                )
+                pinger.start()
+                answer = second.wait(timeout=0.3)
+                pinger.join()
+                if answer is None:
+                    results.ok("choice/rejects-foreign-token")
+                else:
+                    results.fail("choice/rejects-foreign-token", "accepted bad token")
+
+
+def test_digest(results: TestResults):
+    """Bursts from separate processes collapse into one backend call."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        log_path = tmp_path / "notify-send.log"
+        write_stub(
+            bin_dir, "notify-send",
+            f'[ "$1" = --help ] && exit 0; echo "$*" | tr "\\n" " " >> "{log_path}"; echo >> "{log_path}"',
+        )
+        path = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+
+        with patched_env(
+            NOTIFY_CACHE_DIR=str(tmp_path / "cache"), PATH=path,
+            DISPLAY=":99", WAYLAND_DISPLAY=None,
+        ):
+            procs = [
+                subprocess.Popen(
+                    [sys.executable, str(TOAST_PY), f"Job {i}", "finished",
+                     "--digest", "--digest-window", "1"],
+                    stdout=subprocess.DEVNULL,
+                )
+                for i in range(5)
+            ]
+            for proc in procs:
+                proc.wait(timeout=10)
+            wait_for(lambda: log_path.exists(), timeout=5)
+            time.sleep(0.3)  # Any stray second flush would land by now
+            lines = log_path.read_text(encoding="utf-8").splitlines() if log_path.exists() else []
+            if len(lines) == 1 and lines[0].startswith("5 notifications"):
+                results.ok("digest/cross-process-burst")
+            else:
+                results.fail("digest/cross-process-burst", f"log={lines}")
+
+            log_path.unlink(missing_ok=True)
+            toast = load_toast()
+            toast.send_toast("Deploy", "FAILED", alarm=True, digest=True)
+            lines = log_path.read_text(encoding="utf-8").splitlines()
+            if len(lines) == 1 and "critical" in lines[0]:
+                results.ok("digest/alarm-bypasses")
+            else:
+                results.fail("digest/alarm-bypasses", f"log={lines}")
+
+            log_path.unlink()
+            for i in range(3):
+                toast.queue_digest(f"Task {i}", "done", window=30, max_count=3)
+            lines = log_path.read_text(encoding="utf-8").splitlines() if log_path.exists() else []
+            if len(lines) == 1 and lines[0].startswith("3 notifications"):
+                results.ok("digest/max-count-flushes")
+            else:
+                results.fail("digest/max-count-flushes", f"log={lines}")
+
+            # A burst whose flusher died is sent by the next caller, which opens a new window
+            log_path.unlink()
+            spool = toast.DIGEST_SPOOL
+            spool.write_text("\n".join(json.dumps(r) for r in [
+                {"window": "dead", "deadline": time.time() - 60, "max": 10},
+                {"title": "Old 1", "message": "done", "line3": None},
+                {"title": "Old 2", "message": "done", "line3": None},
+            ]) + "\n", encoding="utf-8")
+            toast.queue_digest("Fresh", "done", window=0.5)
+            orphan_lines = log_path.read_text(encoding="utf-8").splitlines() if log_path.exists() else []
+            header, entries = toast._read_digest_spool()
+            wait_for(lambda: len(log_path.read_text(encoding="utf-8").splitlines()) >= 2, timeout=5)
+            lines = log_path.read_text(encoding="utf-8").splitlines()
+            if (
+                len(orphan_lines) == 1 and orphan_lines[0].startswith("2 notifications")
+                and header is not None and header["window"] != "dead" and len(entries) == 1
+                and len(lines) == 2 and lines[1].startswith("Fresh")
+            ):
+                results.ok("digest/orphaned-window-recovered")
+            else:
+                results.fail("digest/orphaned-window-recovered",
+                             f"first={orphan_lines} header={header} log={lines}")
+
+    # Bad settings fall back to the defaults with a warning instead of failing the import
+    warnings = []
+    handler = logging.Handler()
+    handler.emit = warnings.append
+    logger = logging.getLogger("toast_under_test")
+    logger.addHandler(handler)
+    try:
+        settings = {}
+        for window, count in (("soon", "0"), ("nan", "ten"), ("0.5", "4")):
+            with patched_env(NOTIFY_DIGEST_WINDOW=window, NOTIFY_DIGEST_MAX=count):
+                toast = load_toast()
+            settings[(window, count)] = (toast.DIGEST_WINDOW, toast.DIGEST_MAX)
+    finally:
+        logger.removeHandler(handler)
+    if (
+        settings == {("soon", "0"): (2.0, 10), ("nan", "ten"): (2.0, 10), ("0.5", "4"): (0.5, 4)}
+        and len(warnings) == 4
+    ):
+        results.ok("digest/bad-env-uses-defaults")
+    else:
+        results.fail("digest/bad-env-uses-defaults", f"settings={settings} warnings={len(warnings)}")
+
+
+def test_dbus_backend(results: TestResults):
+    """Linux notifications go over one D-Bus connection, no process per toast."""
+    if not shutil.which("dbus-daemon"):
+        print("  SKIP  dbus/* — dbus-daemon not installed")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        log_path = tmp_path / "notifications.log"
+        daemon = subprocess.Popen(
+            ["dbus-daemon", "--session", "--nofork", "--print-address=1"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+        server = None
+        try:
+            address = daemon.stdout.readline().strip()
+            with patched_env(
+                NOTIFY_CACHE_DIR=str(tmp_path / "cache"),
+                DBUS_SESSION_BUS_ADDRESS=address,
+                FAKE_NOTIFY_LOG=str(log_path),
+                FAKE_NOTIFY_ACTION="2",
+                NOTIFY_DBUS=None,
+            ):
+                server = subprocess.Popen(
+                    [sys.executable, str(FAKE_NOTIFICATION_SERVER)],
+                    stdout=subprocess.PIPE, text=True,
+                )
+                server.stdout.readline()  # "ready"
+
+                sys.path.insert(0, str(TOAST_PY.parent))
+                toast = load_toast()
+                toast._environment = {
+                    "IS_WSL": False, "IS_LINUX": True, "IS_MACOS": False,
+                    "LINUX_CAPS": {},  # No notify-send at all
+                }
+                with counted_subprocess_calls(toast) as calls:
+                    sent = [toast.send_toast("Build", f"step {i}") for i in range(20)]
+                    with toast.progress("Copying", max_rate=0) as bar:
+                        bar.update(0.5)
+                        bar.update(1.0)
+                    choice = toast.ask_choice("Deploy?", ["Prod", "Staging"], timeout=5)
+                entries = read_log(log_path)
+
+                if all(sent) and len(entries) == 23 and not calls:
+                    results.ok("dbus/no-process-per-notification")
+                else:
+                    results.fail("dbus/no-process-per-notification",
+                                 f"sent={sum(sent)} logged={len(entries)} calls={calls}")
+
+                if len({e["sender"] for e in entries}) == 1:
+                    results.ok("dbus/single-connection")
+                else:
+                    results.fail("dbus/single-connection", "multiple bus connections")
+
+                progress_ids = [e["id"] for e in entries[20:22]]
+                if entries[21]["replaces_id"] == progress_ids[0] == progress_ids[1]:
+                    results.ok("dbus/replace-by-id")
+                else:
+                    results.fail("dbus/replace-by-id", f"entries={entries[20:22]}")
+
+                if choice == 2 and entries[-1]["actions"] == ["1", "1. Prod", "2", "2. Staging"]:
+                    results.ok("dbus/action-invoked")
+                else:
+                    results.fail("dbus/action-invoked", f"choice={choice}")
+
+                bin_dir = tmp_path / "bin"
+                bin_dir.mkdir()
+                send_log = tmp_path / "notify-send.log"
+                write_stub(bin_dir, "notify-send", f'echo "$*" >> "{send_log}"')
+                toast._environment["LINUX_CAPS"] = {"available": True, "actions": True}
+                stub_path = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+
+                # A dismissed question is answered "no choice" at once, and a timed-out one
+                # the server already dropped (CloseNotification errors) is not asked again
+                for mode, timeout in (("dismiss", 5), ("vanish", 0.5)):
+                    server.kill()
+                    server.wait()
+                    with patched_env(FAKE_NOTIFY_ACTION=mode, PATH=stub_path):
+                        server = subprocess.Popen(
+                            [sys.executable, str(FAKE_NOTIFICATION_SERVER)],
+                            stdout=subprocess.PIPE, text=True,
+                        )
+                        server.stdout.readline()
+                        start = time.monotonic()
+                        choice = toast.ask_choice("Deploy?", ["Prod", "Staging"], timeout=timeout)
+                        took = time.monotonic() - start
+                    if (choice is None and took < timeout + 1 and toast._bus is not None
+                            and not send_log.exists()):
+                        results.ok(f"dbus/{mode}-not-asked-again")
+                    else:
+                        results.fail(f"dbus/{mode}-not-asked-again",
+                                     f"choice={choice} took={took:.1f}s bus={toast._bus} "
+                                     f"notify-send={send_log.exists()}")
+
+                # Bus goes away mid-session -> notify-send takes over
+                server.kill()
+                server.wait()
+                daemon.kill()
+                daemon.wait()
+                with patched_env(PATH=stub_path):
+                    fell_back = toast.send_toast("After", "bus died")
+                if fell_back and send_log.exists():
+                    results.ok("dbus/falls-back-to-notify-send")
+                else:
+                    results.fail("dbus/falls-back-to-notify-send", "no fallback send")
+        finally:
+            if str(TOAST_PY.parent) in sys.path:
+                sys.path.remove(str(TOAST_PY.parent))
+            for proc in (server, daemon):
+                if proc is not None and proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+
+
+def test_timing_hook(results: TestResults):
+    """NOTIFY_TIMING / set_timing_callback report a per-phase breakdown."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        write_stub(bin_dir, "notify-send", "exit 0")
+        timing_log = tmp_path / "timing.jsonl"
+        path = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+
+        with patched_env(NOTIFY_CACHE_DIR=str(tmp_path / "cache"), PATH=path,
+                         NOTIFY_TIMING=str(timing_log)):
+            toast = load_toast()
+            toast._environment = {
+                "IS_WSL": False, "IS_LINUX": True, "IS_MACOS": False,
+                "LINUX_CAPS": {"available": True, "replace": True},
+            }
+            toast.send_toast("Build", "done")
+            toast.send_progress("Build", "half", 0.5)
+            records = read_log(timing_log)
+            if (
+                [r["call"] for r in records] == ["send_toast", "send_progress"]
+                and {"detect", "build", "spawn"} <= set(records[0]["phases_ms"])
+                and sum(records[0]["phases_ms"].values()) <= records[0]["total_ms"] + 0.01
+            ):
+                results.ok("timing/env-var-jsonl")
+            else:
+                results.fail("timing/env-var-jsonl", f"records={records}")
+
+            seen = []
+            toast.set_timing_callback(seen.append)
+            toast.send_toast("Build", "again")
+            toast.set_timing_callback(None)
+            if len(seen) == 1 and len(read_log(timing_log)) == 2:
+                results.ok("timing/callback-overrides-env")
+            else:
+                results.fail("timing/callback-overrides-env", f"seen={seen}")
+
+        with patched_env(NOTIFY_CACHE_DIR=str(tmp_path / "cache"), PATH=path, NOTIFY_TIMING=None):
+            toast = load_toast()
+            toast._environment = {
+                "IS_WSL": False, "IS_LINUX": True, "IS_MACOS": False,
+                "LINUX_CAPS": {"available": True},
+            }
+            toast.send_toast("Build", "quiet")
+            if len(read_log(timing_log)) == 2:
+                results.ok("timing/off-by-default")
+            else:
+                results.fail("timing/off-by-default", "record written without NOTIFY_TIMING")
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def main():
+    print()
+    print("=" * 60)
+    print("  jord0.skills — NOTIFY Script Suite")
+    print("=" * 60)
+    print()
+
+    # Never talk to the real desktop's notification server from tests
+    os.environ.pop("DBUS_SESSION_BUS_ADDRESS", None)
+
+    results = TestResults()
+
+    print("[1/8] Environment detection cache")
+    test_env_cache(results)
+    print()
+
+    print("[2/8] PowerShell worker")
+    test_worker(results)
+    print()
+
+    print("[3/8] Non-blocking queue")
+    test_notification_queue(results)
+    print()
+
+    print("[4/8] Progress sessions")
+    test_progress_session(results)
+    print()
+
+    print("[5/8] Choice channel")
+    test_choice_channel(results)
+    print()
+
+    print("[6/8] Digest mode")
+    test_digest(results)
+    print()
+
+    print("[7/8] D-Bus backend")
+    test_dbus_backend(results)
+    print()
+
+    print("[8/8] Timing instrumentation")
+    test_timing_hook(results)
+    print()
+
+    print("=" * 60)
+    total = results.passed + results.failed
+    if results.failed == 0:
+        print(f"  ALL {total} CHECKS PASSED")
+    else:
+        print(f"  {results.passed}/{total} passed, {results.failed} FAILED")
+        print()
+        for error in results.errors:
+            print(f"  X  {error}")
+    print("=" * 60)
+    print()
+
+    sys.exit(1 if results.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
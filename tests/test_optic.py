@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+jord0.skills — OPTIC Script Test Suite
+
+Runs skills/OPTIC/scripts/generate.py (single and batch mode) offline
+against tests/fixtures/fake_gemini_server.py, through the real google-genai
+client. Skipped when google-genai is not installed.
+Execute: python tests/test_optic.py
+"""
+
+import importlib.util
+import json
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from test_skills import TestResults
+
+REPO_ROOT = Path(__file__).parent.parent
+GENERATE_PY = REPO_ROOT / "skills" / "OPTIC" / "scripts" / "generate.py"
+FAKE_GEMINI_SERVER = REPO_ROOT / "tests" / "fixtures" / "fake_gemini_server.py"
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def fake_server(tmp: Path, **env: str):
+    """Run the fake Gemini endpoint; yields (base URL, request log path)."""
+    log = tmp / f"requests-{time.monotonic_ns()}.jsonl"
+    proc = subprocess.Popen(
+        [sys.executable, str(FAKE_GEMINI_SERVER)],
+        stdout=subprocess.PIPE, text=True,
+        env={**os.environ, "FAKE_GEMINI_LOG": str(log), **env},
+    )
+    try:
+        port = proc.stdout.readline().split()[1]
+        yield f"http://127.0.0.1:{port}", log
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def generate(cwd: Path, base_url: str, *args: str):
+    """Run generate.py; returns (exit code, combined output)."""
+    proc = subprocess.run(
+        [sys.executable, str(GENERATE_PY), *args],
+        cwd=cwd, capture_output=True, text=True, timeout=120,
+        env={**os.environ, "OPTIC_BASE_URL": base_url, "GEMINI_API_KEY": "test-key"},
+    )
+    return proc.returncode, proc.stdout + proc.stderr
+
+
+def png_text(path: Path) -> dict:
+    """The fake server's tEXt payload: which request produced this image."""
+    data = path.read_bytes()
+    offset = 8
+    while offset < len(data):
+        length, kind = struct.unpack(">I4s", data[offset:offset + 8])
+        if kind == b"tEXt":
+            return json.loads(data[offset + 8:offset + 8 + length].split(b"\x00", 1)[1])
+        offset += 12 + length
+    return {}
+
+
+def read_jsonl(path: Path) -> list[dict]:
+    try:
+        return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line]
+    except FileNotFoundError:
+        return []
+
+
+def max_overlap(requests: list[dict]) -> int:
+    """Most requests the server was handling at the same moment."""
+    events = sorted([(r["start"], 1) for r in requests] + [(r["end"], -1) for r in requests])
+    current = peak = 0
+    for _, delta in events:
+        current += delta
+        peak = max(peak, current)
+    return peak
+
+
+def write_manifest(path: Path, jobs: list[dict]) -> Path:
+    path.write_text("".join(json.dumps(job) + "\n" for job in jobs), encoding="utf-8")
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+def test_batch(results: TestResults):
+    """A manifest runs concurrently on a bounded pool, one file per entry."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        jobs = [{"prompt": f"icon {n}", "aspect": "1:1", "size": "2K"} for n in range(12)]
+        jobs[3].update(output="hero", aspect="16:9", quality=True)
+        manifest = write_manifest(tmp / "pack.jsonl", jobs)
+
+        with fake_server(tmp, FAKE_GEMINI_DELAY="0.25") as (url, log):
+            start = time.monotonic()
+            code, out = generate(tmp, url, "--batch", str(manifest), "--workers", "4")
+            elapsed = time.monotonic() - start
+            requests = read_jsonl(log)
+
+        output = tmp / "output"
+        names = [job.get("output", f"pack_{n + 1:03d}") + ".png" for n, job in enumerate(jobs)]
+        produced = [png_text(output / name) if (output / name).exists() else {} for name in names]
+        if (
+            code == 0
+            and [p.get("prompt") for p in produced] == [job["prompt"] for job in jobs]
+            and produced[3]["aspect"] == "16:9" and produced[3]["model"] == "gemini-3-pro-image-preview"
+            and produced[0]["size"] == "2K" and produced[0]["model"] == "gemini-2.5-flash-image"
+        ):
+            results.ok("batch/every-entry-generated")
+        else:
+            results.fail("batch/every-entry-generated", f"rc={code} produced={produced} out={out[-500:]}")
+
+        overlap = max_overlap(requests)
+        if overlap == 4 and elapsed < 12 * 0.25:
+            results.ok("batch/bounded-concurrency")
+        else:
+            results.fail("batch/bounded-concurrency", f"peak {overlap} in flight, {elapsed:.2f}s")
+
+        records = read_jsonl(output / "pack.results.jsonl")
+        if (
+            sorted(r["index"] for r in records) == list(range(12))
+            and all(r["status"] == "ok" and r["attempts"] == 1 for r in records)
+            and {Path(r["output"]).name for r in records} == set(names)
+        ):
+            results.ok("batch/results-manifest")
+        else:
+            results.fail("batch/results-manifest", f"records={records[:3]}")
+
+        # Resume: everything exists, nothing is requested again
+        with fake_server(tmp) as (url, log):
+            code, out = generate(tmp, url, "--batch", str(manifest), "--skip-existing",
+                                 "--results", str(tmp / "resume.jsonl"))
+            requests = read_jsonl(log)
+        statuses = {r["status"] for r in read_jsonl(tmp / "resume.jsonl")}
+        if code == 0 and not requests and statuses == {"skipped"}:
+            results.ok("batch/skip-existing")
+        else:
+            results.fail("batch/skip-existing", f"rc={code} {len(requests)} requests, statuses {statuses}")
+
+
+def test_retries(results: TestResults):
+    """429s are retried with backoff; permanent errors fail fast without stopping the batch."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        write_manifest(tmp / "limited.jsonl", [{"prompt": f"frame {n}"} for n in range(6)])
+        with fake_server(tmp, FAKE_GEMINI_RATE_LIMIT="2") as (url, log):
+            code, out = generate(tmp, url, "--batch", "limited.jsonl", "--workers", "3", "--backoff", "0.01")
+            requests = read_jsonl(log)
+        records = read_jsonl(tmp / "output" / "limited.results.jsonl")
+        if (
+            code == 0
+            and [r["attempts"] for r in records] == [3] * 6
+            and sum(r["status"] == 429 for r in requests) == 12
+        ):
+            results.ok("retries/rate-limit-backoff")
+        else:
+            results.fail("retries/rate-limit-backoff", f"rc={code} attempts={[r.get('attempts') for r in records]}")
+
+        write_manifest(tmp / "mixed.jsonl", [
+            {"prompt": "fine 1"}, {"prompt": "nope [reject]", "output": "nope"}, {"prompt": "fine 2"},
+        ])
+        with fake_server(tmp, FAKE_GEMINI_RATE_LIMIT="9") as (url, log):
+            code, out = generate(tmp, url, "--batch", "mixed.jsonl", "--retries", "1", "--backoff", "0.01",
+                                 "--results", "mixed-results.jsonl")
+        by_prompt = {r["prompt"]: r for r in read_jsonl(tmp / "mixed-results.jsonl")}
+        if code == 1 and all(r["status"] == "failed" and r["attempts"] == 2 for r in by_prompt.values()):
+            results.ok("retries/gives-up-after-limit")
+        else:
+            results.fail("retries/gives-up-after-limit", f"rc={code} records={by_prompt}")
+
+        with fake_server(tmp) as (url, log):
+            code, out = generate(tmp, url, "--batch", "mixed.jsonl", "--backoff", "0.01",
+                                 "--results", "mixed-results.jsonl")
+            requests = read_jsonl(log)
+        by_prompt = {r["prompt"]: r for r in read_jsonl(tmp / "mixed-results.jsonl")}
+        rejected = by_prompt.get("nope [reject]", {})
+        if (
+            code == 1
+            and rejected.get("status") == "failed" and rejected.get("attempts") == 1
+            and "400" in rejected.get("error", "")
+            and by_prompt["fine 1"]["status"] == by_prompt["fine 2"]["status"] == "ok"
+            and len(requests) == 3
+        ):
+            results.ok("retries/permanent-error-not-retried")
+        else:
+            results.fail("retries/permanent-error-not-retried", f"rc={code} records={by_prompt}")
+
+        # A directory passes the existence check but can't be read: that job fails, the rest run
+        (tmp / "refdir").mkdir()
+        write_manifest(tmp / "unreadable.jsonl", [
+            {"prompt": "fine 1"}, {"prompt": "from a folder", "reference": "refdir"}, {"prompt": "fine 2"},
+        ])
+        with fake_server(tmp) as (url, log):
+            code, out = generate(tmp, url, "--batch", "unreadable.jsonl", "--results", "unreadable-results.jsonl")
+        by_prompt = {r["prompt"]: r for r in read_jsonl(tmp / "unreadable-results.jsonl")}
+        broken = by_prompt.get("from a folder", {})
+        if (
+            code == 1 and len(by_prompt) == 3
+            and broken.get("status") == "failed" and "Error" in broken.get("error", "")
+            and by_prompt["fine 1"]["status"] == by_prompt["fine 2"]["status"] == "ok"
+        ):
+            results.ok("retries/unexpected-error-fails-one-job")
+        else:
+            results.fail("retries/unexpected-error-fails-one-job", f"rc={code} records={by_prompt} out={out[-300:]}")
+
+
+def test_cli(results: TestResults):
+    """Single-image mode, references, and manifest validation."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        with fake_server(tmp) as (url, log):
+            code, out = generate(tmp, url, "a cozy coffee shop", "-o", "coffee", "-a", "16:9", "-s", "2K")
+            single = tmp / "output" / "coffee.png"
+            meta = png_text(single) if single.exists() else {}
+            if code == 0 and meta.get("prompt") == "a cozy coffee shop" and meta.get("size") == "2K":
+                results.ok("cli/single-image")
+            else:
+                results.fail("cli/single-image", f"rc={code} meta={meta} out={out[-300:]}")
+
+            (tmp / "refs").mkdir()
+            (tmp / "refs" / "base.png").write_bytes(single.read_bytes() if single.exists() else b"")
+            write_manifest(tmp / "refs" / "edits.jsonl", [{"prompt": "same, at dusk", "reference": "base.png"}])
+            code, out = generate(tmp, url, "--batch", "refs/edits.jsonl")
+            edited = tmp / "output" / "edits_001.png"
+            if code == 0 and edited.exists() and png_text(edited).get("references") == 1:
+                results.ok("cli/batch-reference-relative-to-manifest")
+            else:
+                results.fail("cli/batch-reference-relative-to-manifest", f"rc={code} out={out[-300:]}")
+
+            write_manifest(tmp / "broken.jsonl", [{"prompt": "ok"}, {"aspect": "1:1"}])
+            code, out = generate(tmp, url, "--batch", "broken.jsonl")
+            if code == 1 and "broken.jsonl:2" in out and not read_jsonl(log)[2:]:
+                results.ok("cli/manifest-validated-first")
+            else:
+                results.fail("cli/manifest-validated-first", f"rc={code} out={out[-300:]}")
+
+            escapes = [
+                ("escape.jsonl", [{"prompt": "ok"}, {"prompt": "x", "output": "../outside"}]),
+                ("absolute.jsonl", [{"prompt": "ok"}, {"prompt": "x", "output": str(tmp / "abs.png")}]),
+                ("twice.jsonl", [{"prompt": "x", "output": "same.png"}, {"prompt": "y", "output": "./same"}]),
+                ("number.jsonl", [{"prompt": "ok"}, {"prompt": "x", "output": 5}]),
+                ("reflist.jsonl", [{"prompt": "ok"}, {"prompt": "x", "reference": ["base.png"]}]),
+            ]
+            rejected = []
+            for name, jobs in escapes:
+                write_manifest(tmp / name, jobs)
+                code, out = generate(tmp, url, "--batch", name)
+                if code == 1 and f"{name}:" in out:
+                    rejected.append(name)
+            stray = [p for p in (tmp / "outside.png", tmp / "abs.png") if p.exists()]
+            if len(rejected) == len(escapes) and not stray and not read_jsonl(log)[2:]:
+                results.ok("cli/manifest-outputs-contained-and-unique")
+            else:
+                results.fail("cli/manifest-outputs-contained-and-unique",
+                             f"rejected={rejected} stray={stray}")
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def main():
+    print()
+    print("=" * 60)
+    print("  jord0.skills — OPTIC Script Suite")
+    print("=" * 60)
+    print()
+
+    results = TestResults()
+
+    if importlib.util.find_spec("google.genai") is None:
+        print("  SKIP  optic (google-genai not installed; pip install google-genai)")
+        print()
+        sys.exit(0)
+
+    print("[1/3] Batch generation")
+    test_batch(results)
+    print()
+
+    print("[2/3] Rate limits and retries")
+    test_retries(results)
+    print()
+
+    print("[3/3] Command line")
+    test_cli(results)
+    print()
+
+    print("=" * 60)
+    total = results.passed + results.failed
+    if results.failed == 0:
+        print(f"  ALL {total} CHECKS PASSED")
+    else:
+        print(f"  {results.passed}/{total} passed, {results.failed} FAILED")
+        print()
+        for error in results.errors:
+            print(f"  X  {error}")
+    print("=" * 60)
+    print()
+
+    sys.exit(1 if results.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+jord0.skills — PORTAL Script Test Suite
+
+Exercises skills/PORTAL/scripts/portal_store.py (indexed, delta-encoded portal
+store) in
+throwaway portals directories.
+Execute: python tests/test_portal.py
+"""
+
+import importlib.util
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from test_skills import TestResults
+
+REPO_ROOT = Path(__file__).parent.parent
+PORTAL_STORE_PY = REPO_ROOT / "skills" / "PORTAL" / "scripts" / "portal_store.py"
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def load_store():
+    """Import a fresh copy of portal_store.py."""
+    spec = importlib.util.spec_from_file_location("portal_store_under_test", PORTAL_STORE_PY)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def synced_portal(pid: str, name: str, created: str) -> dict:
+    """A portal file as another machine would have written it."""
+    return {
+        "portal ID": pid,
+        "name": name,
+        "type": "portal",
+        "created": created,
+        "origin": {"project": "elsewhere", "machine": "laptop"},
+        "context": {"summary": f"Work on {name}"},
+    }
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+def test_lifecycle(results: TestResults):
+    """create / open by ID or name / update / close keep file and index in step."""
+    portal_store = load_store()
+    with tempfile.TemporaryDirectory() as tmp:
+        store = portal_store.PortalStore(Path(tmp) / "portals")
+        first = store.create("auth-refactor", {"context.summary": "Auth 60%",
+                                               "context.decisions": ["JWT"]})
+        second = store.create("docs", {"context.summary": "Docs pass"})
+        pid = first["portal ID"]
+
+        if (
+            store.open(pid)["context"]["decisions"] == ["JWT"]
+            and store.open("auth-refactor")["portal ID"] == pid
+            and store.open(pid.lower())["portal ID"] == pid
+            and store.open("AUTH-REFACTOR")["portal ID"] == pid
+        ):
+            results.ok("lifecycle/open-by-id-or-name")
+        else:
+            results.fail("lifecycle/open-by-id-or-name", "lookup returned the wrong portal")
+
+        try:
+            store.create("docs", {})
+            results.fail("lifecycle/duplicate-name", "second 'docs' portal was created")
+        except portal_store.PortalError:
+            results.ok("lifecycle/duplicate-name")
+
+        try:
+            store.create("../escape", {})
+            results.fail("lifecycle/name-validation", "path-like name accepted")
+        except portal_store.PortalError:
+            results.ok("lifecycle/name-validation")
+
+        store.update("auth-refactor", {"continuation.next_steps": ["Token refresh"]})
+        listed = [p["id"] for p in store.list()["portals"]]
+        portal = store.open(pid)
+        if (
+            listed == [pid, second["portal ID"]]
+            and portal["continuation"]["next_steps"] == ["Token refresh"]
+            and portal["context"]["summary"] == "Auth 60%"
+        ):
+            results.ok("lifecycle/update-moves-to-top")
+        else:
+            results.fail("lifecycle/update-moves-to-top", f"list order {listed}")
+
+        store.close(pid)
+        fresh = portal_store.PortalStore(store.dir)
+        try:
+            fresh.open(pid)
+            closed = False
+        except portal_store.PortalError:
+            closed = True
+        if closed and not (store.dir / f"{pid}.json").exists() and fresh.list()["total"] == 1:
+            results.ok("lifecycle/close")
+        else:
+            results.fail("lifecycle/close", "closed portal still reachable")
+
+
+def test_index(results: TestResults):
+    """list and open are served from the index; synced files repair it."""
+    portal_store = load_store()
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp) / "portals"
+        store = portal_store.PortalStore(directory)
+        created = [store.create(f"task-{n}", {"context.summary": f"Task {n}"})["portal ID"] for n in range(25)]
+
+        page = store.list(limit=10, page=3)
+        if page["total"] == 25 and page["pages"] == 3 and [p["id"] for p in page["portals"]] == created[::-1][20:]:
+            results.ok("index/paginated-recency")
+        else:
+            results.fail("index/paginated-recency", f"page={page['page']} ids={[p['id'] for p in page['portals']]}")
+
+        rejected = []
+        for limit, number in ((0, 1), (10, 0), (-5, 1)):
+            try:
+                store.list(limit=limit, page=number)
+            except portal_store.PortalError:
+                rejected.append((limit, number))
+        if len(rejected) == 3:
+            results.ok("index/bad-paging-rejected")
+        else:
+            results.fail("index/bad-paging-rejected", f"accepted {set(((0, 1), (10, 0), (-5, 1))) - set(rejected)}")
+
+        # Corrupt every other portal in place (no directory change): open and
+        # list must not parse them
+        for pid in created[1:]:
+            (directory / f"{pid}.json").write_text("not json", encoding="utf-8")
+        reader = portal_store.PortalStore(directory)
+        if reader.open(created[0])["name"] == "task-0" and reader.list(limit=100)["total"] == 25:
+            results.ok("index/one-file-read")
+        else:
+            results.fail("index/one-file-read", "lookup depended on other portal files")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp) / "portals"
+        store = portal_store.PortalStore(directory)
+        local = store.create("local", {})["portal ID"]
+
+        # git pull: one portal arrives, the local one is deleted upstream
+        (directory / "PORTAL-SYNC.json").write_text(
+            json.dumps(synced_portal("PORTAL-SYNC", "from-laptop", "2099-01-01T00:00:00+00:00")), encoding="utf-8"
+        )
+        (directory / f"{local}.json").unlink()
+        reader = portal_store.PortalStore(directory)
+        ids = [p["id"] for p in reader.list()["portals"]]
+        if ids == ["PORTAL-SYNC"] and reader.open("from-laptop")["origin"]["machine"] == "laptop":
+            results.ok("index/repairs-after-sync")
+        else:
+            results.fail("index/repairs-after-sync", f"ids={ids}")
+
+        index_before = (directory / ".portal-index" / "index.json").read_text(encoding="utf-8")
+        portal_store.PortalStore(directory).list()
+        if (directory / ".portal-index" / "index.json").read_text(encoding="utf-8") == index_before:
+            results.ok("index/reads-do-not-write")
+        else:
+            results.fail("index/reads-do-not-write", "a clean list rewrote the index")
+
+        (directory / ".portal-index" / "index.json").write_text("{broken", encoding="utf-8")
+        if portal_store.PortalStore(directory).rebuild() == 1 and (
+            directory / ".portal-index" / ".gitignore"
+        ).read_text(encoding="utf-8").strip() == "*":
+            results.ok("index/rebuild")
+        else:
+            results.fail("index/rebuild", "rebuild did not recover the index")
+
+
+def test_deltas(results: TestResults):
+    """Updates write small deltas that replay to the full state and compact."""
+    portal_store = load_store()
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp) / "portals"
+        store = portal_store.PortalStore(directory, compact_every=10)
+        pid = store.create("long-task", {"context.summary": "Start"})["portal ID"]
+        base_before = (directory / f"{pid}.json").read_bytes()
+        for n in range(1, 8):
+            expected = store.update(pid, {
+                "context.decisions": [f"decision {i}" for i in range(n)],
+                "session_state.notes": f"note {n}",
+            })
+
+        deltas = sorted(directory.glob(f"{pid}.*.delta.json"))
+        reopened = portal_store.PortalStore(directory).open(pid)
+        if (
+            len(deltas) == 7
+            and (directory / f"{pid}.json").read_bytes() == base_before
+            and reopened == expected
+            and max(p.stat().st_size for p in deltas) < len(base_before)
+        ):
+            results.ok("deltas/replay-equals-full-state")
+        else:
+            results.fail("deltas/replay-equals-full-state", f"{len(deltas)} deltas, equal={reopened == expected}")
+
+        # Deltas from another machine: the cached replay no longer matches
+        (directory / f"{pid}.0008.delta.json").write_text(json.dumps({"revision": 8, "ops": [
+            {"op": "add", "path": "/continuation/next_steps", "value": ["From laptop"]}
+        ]}), encoding="utf-8")
+        synced = portal_store.PortalStore(directory).open(pid)
+        for cache in (directory / ".portal-index").glob("*.cache.json"):
+            cache.unlink()
+        replayed = portal_store.PortalStore(directory).open(pid)
+        if synced["continuation"]["next_steps"] == ["From laptop"] and replayed == synced:
+            results.ok("deltas/synced-delta-replayed")
+        else:
+            results.fail("deltas/synced-delta-replayed", f"synced={synced.get('continuation')}")
+
+        for n in range(9, 11):
+            expected = store.update(pid, {"session_state.notes": f"note {n}"})
+        base = json.loads((directory / f"{pid}.json").read_text(encoding="utf-8"))
+        if not list(directory.glob("*.delta.json*")) and base == expected and base["revision"] == 10:
+            results.ok("deltas/compaction")
+        else:
+            results.fail("deltas/compaction", f"deltas left: {list(directory.glob('*.delta.json*'))}")
+
+        # Crash mid-compaction: new base written, folded deltas not yet deleted
+        store.update(pid, {"session_state.notes": "note 11"})
+        leftover = directory / f"{pid}.0005.delta.json"
+        leftover.write_text(json.dumps({"revision": 5, "ops": [
+            {"op": "replace", "path": "/session_state/notes", "value": "stale"}
+        ]}), encoding="utf-8")
+        if portal_store.PortalStore(directory).open(pid)["session_state"]["notes"] == "note 11":
+            results.ok("deltas/folded-leftovers-ignored")
+        else:
+            results.fail("deltas/folded-leftovers-ignored", "an already-compacted delta was replayed")
+
+        # A full-JSON portal from before deltas is a valid base
+        (directory / "PORTAL-OLD1.json").write_text(json.dumps(
+            synced_portal("PORTAL-OLD1", "legacy", "2020-01-01T00:00:00+00:00")), encoding="utf-8")
+        legacy = portal_store.PortalStore(directory)
+        legacy.update("legacy", {"continuation.next_steps": ["Resume"]})
+        portal = portal_store.PortalStore(directory).open("legacy")
+        if portal["context"]["summary"] == "Work on legacy" and portal["continuation"]["next_steps"] == ["Resume"]:
+            results.ok("deltas/legacy-portal")
+        else:
+            results.fail("deltas/legacy-portal", f"got {portal}")
+
+    ops = portal_store.diff({"a/b": 1, "l": [1], "gone": 0}, {"a/b": 2, "l": [1, 2], "new": {"x": 1}})
+    if portal_store.apply_patch({"a/b": 1, "l": [1], "gone": 0}, ops) == {"a/b": 2, "l": [1, 2], "new": {"x": 1}}:
+        results.ok("deltas/patch-roundtrip")
+    else:
+        results.fail("deltas/patch-roundtrip", f"ops {ops}")
+
+
+def test_compression(results: TestResults):
+    """gzip / zstd portals read transparently and compact keeps the format."""
+    portal_store = load_store()
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp) / "portals"
+        store = portal_store.PortalStore(directory, compression="gzip")
+        pid = store.create("zipped", {"context.summary": "Compressed"})["portal ID"]
+        store.update(pid, {"continuation.next_steps": ["Ship"]})
+        plain = portal_store.PortalStore(directory)  # Default: follow the portal's format
+        plain.update(pid, {"session_state.mood": "focused"})
+        files = sorted(p.name for p in directory.iterdir() if p.is_file())
+        portal = plain.open("zipped")
+        if (
+            files == [f"{pid}.0001.delta.json.gz", f"{pid}.0002.delta.json.gz", f"{pid}.json.gz"]
+            and portal["continuation"]["next_steps"] == ["Ship"]
+            and portal["session_state"]["mood"] == "focused"
+        ):
+            results.ok("compression/gzip-roundtrip")
+        else:
+            results.fail("compression/gzip-roundtrip", f"files {files}")
+
+        portal_store.PortalStore(directory, compression="none").compact()
+        files = sorted(p.name for p in directory.iterdir() if p.is_file())
+        if files == [f"{pid}.json"] and portal_store.PortalStore(directory).open(pid) == portal:
+            results.ok("compression/recompress-on-compact")
+        else:
+            results.fail("compression/recompress-on-compact", f"files {files}")
+
+        try:
+            portal_store._zstd()
+        except portal_store.PortalError:
+            print("  SKIP  compression/zstd-roundtrip (needs Python 3.14+ or zstandard)")
+            return
+        zstore = portal_store.PortalStore(directory, compression="zstd")
+        zstore.compact(pid)
+        zstore.update(pid, {"session_state.energy": "high"})
+        reopened = portal_store.PortalStore(directory).open(pid)
+        if (directory / f"{pid}.json.zst").exists() and reopened["session_state"]["energy"] == "high":
+            results.ok("compression/zstd-roundtrip")
+        else:
+            results.fail("compression/zstd-roundtrip", "zstd portal did not reopen")
+
+
+def test_cli(results: TestResults):
+    """create prints the portal; errors are JSON with exit status 1."""
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp) / "portals"
+
+        def run(*args):
+            proc = subprocess.run(
+                [sys.executable, str(PORTAL_STORE_PY), "--dir", str(directory), *args],
+                capture_output=True, text=True, timeout=30,
+            )
+            try:
+                return proc.returncode, json.loads(proc.stdout)
+            except ValueError:
+                return proc.returncode, {"raw": proc.stdout + proc.stderr}
+
+        code, created = run("create", "cli-test", "--context", "CLI", "--files", "a.py", "b.py")
+        code_open, opened = run("open", "cli-test")
+        if code == 0 and code_open == 0 and opened.get("context", {}).get("files_touched") == ["a.py", "b.py"]:
+            results.ok("cli/create-open")
+        else:
+            results.fail("cli/create-open", f"create={created} open={opened}")
+
+        code, error = run("open", "missing")
+        if code == 1 and "error" in error:
+            results.ok("cli/unknown-portal")
+        else:
+            results.fail("cli/unknown-portal", f"rc={code} out={error}")
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def main():
+    print()
+    print("=" * 60)
+    print("  jord0.skills — PORTAL Script Suite")
+    print("=" * 60)
+    print()
+
+    results = TestResults()
+
+    print("[1/5] Portal lifecycle")
+    test_lifecycle(results)
+    print()
+
+    print("[2/5] Index")
+    test_index(results)
+    print()
+
+    print("[3/5] Deltas")
+    test_deltas(results)
+    print()
+
+    print("[4/5] Compression")
+    test_compression(results)
+    print()
+
+    print("[5/5] Command line")
+    test_cli(results)
+    print()
+
+    print("=" * 60)
+    total = results.passed + results.failed
+    if results.failed == 0:
+        print(f"  ALL {total} CHECKS PASSED")
+    else:
+        print(f"  {results.passed}/{total} passed, {results.failed} FAILED")
+        print()
+        for error in results.errors:
+            print(f"  X  {error}")
+    print("=" * 60)
+    print()
+
+    sys.exit(1 if results.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
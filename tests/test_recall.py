@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+jord0.skills — RECALL Script Test Suite
+
+Exercises skills/RECALL/scripts/search.py against small throwaway knowledge
+bases built in a temp directory.
+Execute: python tests/test_recall.py
+"""
+
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from test_skills import TestResults
+
+REPO_ROOT = Path(__file__).parent.parent
+SEARCH_PY = REPO_ROOT / "skills" / "RECALL" / "scripts" / "search.py"
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def load_search():
+    """Import a fresh copy of search.py."""
+    spec = importlib.util.spec_from_file_location("search_under_test", SEARCH_PY)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_kb(root: Path, entries: list[dict], reports: dict[str, str]) -> Path:
+    """Write index.json plus research/ reports under root/knowledge."""
+    kb = root / "knowledge"
+    (kb / "research").mkdir(parents=True)
+    for rel, body in reports.items():
+        (kb / rel).write_text(body, encoding="utf-8")
+    (kb / "index.json").write_text(json.dumps({"entries": entries}), encoding="utf-8")
+    return kb
+
+
+def touch_later(path: Path) -> None:
+    """Bump mtime past filesystem timestamp granularity."""
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 2_000_000_000))
+
+
+ENTRIES = [
+    {"id": "k-001", "title": "WebSocket Auth", "file": "research/ws-auth.md",
+     "tags": ["networking"], "summary": "Token handshakes for sockets"},
+    {"id": "k-002", "title": "Rust Async Runtimes", "file": "research/rust.md",
+     "tags": ["rust", "websocket"], "summary": "Tokio versus async-std"},
+    {"id": "k-003", "title": "Caching Layers", "file": "research/cache.md",
+     "tags": ["backend"], "summary": "Redis in front of a websocket gateway"},
+    {"id": "k-004", "title": "Deploy Notes", "file": "research/deploy.md",
+     "tags": ["ops"], "summary": "Blue green rollouts"},
+]
+
+REPORTS = {
+    "research/ws-auth.md": "# WebSocket Auth\n\nJWT on upgrade.\n",
+    "research/rust.md": "# Rust Async\n\nTokio runtime notes.\n",
+    "research/cache.md": "# Caching\n\nRedis eviction.\n",
+    "research/deploy.md": "# Deploy\n\nThe websocket pods drain first.\n",
+}
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+def test_ranking(results: TestResults):
+    """Title > tag > summary > full text, then the tag filter."""
+    search = load_search()
+    with tempfile.TemporaryDirectory() as tmp:
+        kb = make_kb(Path(tmp), ENTRIES, REPORTS)
+        with search.SearchIndex(kb) as index:
+            index.refresh()
+            hits = index.search("websocket")
+            order = [(h["id"], h["tier"]) for h in hits]
+            expected = [("k-001", "title"), ("k-002", "tag"), ("k-003", "summary"), ("k-004", "fulltext")]
+            if order == expected:
+                results.ok("ranking/tiers")
+            else:
+                results.fail("ranking/tiers", f"got {order}")
+
+            hits = index.search("websocket auth")
+            if hits and hits[0]["id"] == "k-001" and hits[0]["tier"] == "title":
+                results.ok("ranking/multi-term")
+            else:
+                results.fail("ranking/multi-term", f"got {hits[:1]}")
+
+            hits = index.search("websocket", tag="RUST")
+            if [h["id"] for h in hits] == ["k-002"]:
+                results.ok("ranking/tag-filter")
+            else:
+                results.fail("ranking/tag-filter", f"got {[h['id'] for h in hits]}")
+
+            if index.search("websocket", k=2) == index.search("websocket")[:2]:
+                results.ok("ranking/top-k")
+            else:
+                results.fail("ranking/top-k", "k=2 is not a prefix of the full ranking")
+
+            if index.search("zeppelin") == [] and index.search("!!!") == []:
+                results.ok("ranking/no-match")
+            else:
+                results.fail("ranking/no-match", "expected no results")
+
+
+def test_incremental(results: TestResults):
+    """Only changed entries are re-indexed; orphans and removals are tracked."""
+    search = load_search()
+    with tempfile.TemporaryDirectory() as tmp:
+        kb = make_kb(Path(tmp), ENTRIES, REPORTS)
+        with search.SearchIndex(kb) as index:
+            first, second = index.refresh(), index.refresh()
+            if (first, second) == (4, 0):
+                results.ok("incremental/unchanged-is-free")
+            else:
+                results.fail("incremental/unchanged-is-free", f"refresh counts {first}, {second}")
+
+            (kb / "research" / "orphan.md").write_text("# Kafka Streams\n\nPartitions.\n", encoding="utf-8")
+            touch_later(kb / "research")
+            reindexed = index.refresh()
+            hits = index.search("kafka")
+            if reindexed == 1 and hits and hits[0]["title"] == "Kafka Streams" and hits[0]["id"] is None:
+                results.ok("incremental/orphan-report")
+            else:
+                results.fail("incremental/orphan-report", f"reindexed={reindexed} hits={hits}")
+
+            entries = [dict(ENTRIES[0], summary="Now about gRPC"), *ENTRIES[1:3]]
+            (kb / "index.json").write_text(json.dumps({"entries": entries}), encoding="utf-8")
+            touch_later(kb / "index.json")
+            reindexed = index.refresh()
+            # k-004 leaves the index but its report stays, so it comes back as an orphan
+            files = {h["file"]: h["id"] for h in index.search("websocket")}
+            if (
+                reindexed == 2
+                and [h["id"] for h in index.search("grpc")] == ["k-001"]
+                and files.get("research/deploy.md", "k-004") is None
+            ):
+                results.ok("incremental/edit-and-remove")
+            else:
+                results.fail("incremental/edit-and-remove", f"reindexed={reindexed} files={files}")
+
+            report = kb / "research" / "rust.md"
+            report.write_text("# Rust Async\n\nNow mentions smol.\n", encoding="utf-8")
+            touch_later(report)
+            if index.refresh() == 0 and index.refresh(force=True) == 1 and index.search("smol"):
+                results.ok("incremental/build-rescans-reports")
+            else:
+                results.fail("incremental/build-rescans-reports", "edited report not picked up by force refresh")
+
+        with search.SearchIndex(kb) as index:
+            if index.refresh() == 0 and index.search("grpc"):
+                results.ok("incremental/persists")
+            else:
+                results.fail("incremental/persists", "index not reused across opens")
+
+
+SIMILAR_ENTRIES = [
+    {"id": "k-101", "title": "Securing Realtime Connections", "file": "research/realtime.md",
+     "tags": ["networking"], "summary": "Authentication tokens for websocket handshakes"},
+    {"id": "k-102", "title": "Container Orchestration", "file": "research/k8s.md",
+     "tags": ["ops"], "summary": "Scheduling pods across clusters"},
+    {"id": "k-103", "title": "Socket Session Hijacking", "file": "research/hijack.md",
+     "tags": ["security"], "summary": "Attacks on authenticated websocket sessions"},
+]
+
+SIMILAR_REPORTS = {
+    "research/realtime.md": "# Realtime\n\nAuthenticate the upgrade request with a signed token.\n",
+    "research/k8s.md": "# Orchestration\n\nKubernetes schedulers and node pools.\n",
+    "research/hijack.md": "# Hijacking\n\nStolen session tokens replayed against sockets.\n",
+}
+
+
+def test_similar(results: TestResults):
+    """Hashed TF-IDF cosine search: paraphrases, related entries, incremental sync."""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("  SKIP  similar/* — numpy not installed")
+        return
+    search = load_search()
+    sys.path.insert(0, str(SEARCH_PY.parent))
+    try:
+        vectors = importlib.import_module("vectors")
+    finally:
+        sys.path.pop(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        kb = make_kb(Path(tmp), SIMILAR_ENTRIES, SIMILAR_REPORTS)
+        with search.SearchIndex(kb) as index:
+            index.refresh()
+            vector_index = vectors.VectorIndex(index)
+            embedded = vector_index.sync()
+
+            hits = vector_index.similar("authenticating websockets")
+            if embedded == 3 and [key for key, _ in hits][:1] == ["id:k-101"] and "id:k-102" not in dict(hits):
+                results.ok("similar/paraphrase")
+            else:
+                results.fail("similar/paraphrase", f"embedded={embedded} hits={hits}")
+
+            hits = vector_index.similar(key="id:k-101")
+            if [key for key, _ in hits][:1] == ["id:k-103"] and "id:k-101" not in dict(hits):
+                results.ok("similar/related-entry")
+            else:
+                results.fail("similar/related-entry", f"hits={hits}")
+
+            hits = vector_index.similar("authenticating websockets", tag="security")
+            if [key for key, _ in hits] == ["id:k-103"]:
+                results.ok("similar/tag-filter")
+            else:
+                results.fail("similar/tag-filter", f"hits={hits}")
+
+            size = vector_index.path.stat().st_size
+            entries = [SIMILAR_ENTRIES[0], SIMILAR_ENTRIES[2],
+                       {"id": "k-104", "title": "Pod Autoscaling", "file": "research/k8s.md",
+                        "tags": ["ops"], "summary": "Scaling kubernetes clusters"}]
+            (kb / "index.json").write_text(json.dumps({"entries": entries}), encoding="utf-8")
+            touch_later(kb / "index.json")
+            index.refresh()
+            embedded = vector_index.sync()
+            hits = vector_index.similar("kubernetes clusters")
+            if (
+                embedded == 1
+                and [key for key, _ in hits][:1] == ["id:k-104"]
+                and vector_index.path.stat().st_size == size
+                and vector_index.sync() == 0
+            ):
+                results.ok("similar/incremental")
+            else:
+                results.fail("similar/incremental", f"embedded={embedded} hits={hits}")
+
+        proc = subprocess.run(
+            [sys.executable, str(SEARCH_PY), "--kb", str(kb), "similar", "--id", "k-101", "-k", "1"],
+            capture_output=True, text=True, timeout=30,
+        )
+        try:
+            data = json.loads(proc.stdout)
+        except ValueError:
+            data = {}
+        if proc.returncode == 0 and [r["id"] for r in data.get("results", [])] == ["k-103"]:
+            results.ok("similar/cli")
+        else:
+            results.fail("similar/cli", f"rc={proc.returncode} out={proc.stdout[:200]} err={proc.stderr[:200]}")
+
+
+def test_cli(results: TestResults):
+    """query prints JSON; a missing knowledge base is an error."""
+    with tempfile.TemporaryDirectory() as tmp:
+        kb = make_kb(Path(tmp), ENTRIES, REPORTS)
+        proc = subprocess.run(
+            [sys.executable, str(SEARCH_PY), "--kb", str(kb), "query", "rust", "-k", "1"],
+            capture_output=True, text=True, timeout=30,
+        )
+        try:
+            data = json.loads(proc.stdout)
+        except ValueError:
+            data = {}
+        if proc.returncode == 0 and [r["id"] for r in data.get("results", [])] == ["k-002"]:
+            results.ok("cli/query-json")
+        else:
+            results.fail("cli/query-json", f"rc={proc.returncode} out={proc.stdout[:200]} err={proc.stderr[:200]}")
+
+        proc = subprocess.run(
+            [sys.executable, str(SEARCH_PY), "--kb", str(Path(tmp) / "missing"), "stats"],
+            capture_output=True, text=True, timeout=30,
+        )
+        if proc.returncode == 1 and "error" in proc.stdout:
+            results.ok("cli/missing-kb")
+        else:
+            results.fail("cli/missing-kb", f"rc={proc.returncode} out={proc.stdout[:200]}")
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def main():
+    print()
+    print("=" * 60)
+    print("  jord0.skills — RECALL Script Suite")
+    print("=" * 60)
+    print()
+
+    results = TestResults()
+
+    print("[1/4] Ranking")
+    test_ranking(results)
+    print()
+
+    print("[2/4] Incremental refresh")
+    test_incremental(results)
+    print()
+
+    print("[3/4] Similarity search")
+    test_similar(results)
+    print()
+
+    print("[4/4] Command line")
+    test_cli(results)
+    print()
+
+    print("=" * 60)
+    total = results.passed + results.failed
+    if results.failed == 0:
+        print(f"  ALL {total} CHECKS PASSED")
+    else:
+        print(f"  {results.passed}/{total} passed, {results.failed} FAILED")
+        print()
+        for error in results.errors:
+            print(f"  X  {error}")
+    print("=" * 60)
+    print()
+
+    sys.exit(1 if results.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+jord0.skills — RECON Script Test Suite
+
+Exercises skills/RECON/scripts/kb_index.py (journaled knowledge index) in
+throwaway knowledge base directories.
+Execute: python tests/test_recon.py
+"""
+
+import importlib.util
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from test_skills import TestResults
+
+REPO_ROOT = Path(__file__).parent.parent
+KB_INDEX_PY = REPO_ROOT / "skills" / "RECON" / "scripts" / "kb_index.py"
+SEARCH_PY = REPO_ROOT / "skills" / "RECALL" / "scripts" / "search.py"
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def load_module(path: Path, name: str):
+    """Import a fresh copy of a skill script."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def entry(n: int) -> dict:
+    return {
+        "id": f"k-{n:03d}",
+        "title": f"Topic {n}",
+        "file": f"research/topic-{n}.md",
+        "tags": ["bulk"],
+        "summary": f"Summary for topic {n}",
+    }
+
+
+# Each writer process adds its own slice of entries with a tiny compaction
+# threshold, so appends and compactions from different processes interleave.
+WRITER = """
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location("kb_index", sys.argv[1])
+kb_index = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(kb_index)
+kb_index.COMPACT_MIN_BYTES = 512
+worker, count = int(sys.argv[3]), int(sys.argv[4])
+for i in range(count):
+    n = worker * count + i
+    kb_index.add_entry(kb_index.Path(sys.argv[2]), {
+        "id": f"k-{n:03d}", "title": f"Topic {n}", "file": f"research/topic-{n}.md",
+    })
+"""
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+def test_journal(results: TestResults):
+    """Adds append to the log; replace, remove and torn lines replay correctly."""
+    kb_index = load_module(KB_INDEX_PY, "kb_index_under_test")
+    with tempfile.TemporaryDirectory() as tmp:
+        kb = Path(tmp)
+        (kb / "index.json").write_text(json.dumps({"entries": [entry(1), entry(2)]}), encoding="utf-8")
+        snapshot_before = (kb / "index.json").read_bytes()
+
+        kb_index.add_entry(kb, entry(3))
+        if (kb / "index.json").read_bytes() == snapshot_before and len(kb_index.read_log(kb)) == 1:
+            results.ok("journal/add-appends-only")
+        else:
+            results.fail("journal/add-appends-only", "index.json was rewritten")
+
+        kb_index.add_entry(kb, dict(entry(1), title="Topic 1, revised"))
+        kb_index.remove_entry(kb, "k-002")
+        entries = kb_index.read_entries(kb)
+        if [(e["id"], e["title"]) for e in entries] == [("k-001", "Topic 1, revised"), ("k-003", "Topic 3")]:
+            results.ok("journal/replace-and-remove")
+        else:
+            results.fail("journal/replace-and-remove", f"got {[(e['id'], e['title']) for e in entries]}")
+
+        with open(kb / "index.log.jsonl", "a", encoding="utf-8") as f:
+            f.write('{"op": "add", "entry": {"id": "k-0')  # Writer killed mid-line
+        if [e["id"] for e in kb_index.read_entries(kb)] == ["k-001", "k-003"]:
+            results.ok("journal/torn-line-skipped")
+        else:
+            results.fail("journal/torn-line-skipped", "torn record changed the entries")
+
+        added = kb_index.add_entry(kb, {"title": "No Id", "file": "research/2026-01-02_no-id.md"})
+        ids = [e["id"] for e in kb_index.read_entries(kb)]
+        if added["id"] == "k-2026-01-02_no-id" and added.get("date") and ids[-1] == added["id"]:
+            results.ok("journal/default-id-and-date")
+        else:
+            results.fail("journal/default-id-and-date", f"got {added}, entries {ids}")
+
+        rejected = []
+        for bad in ("{not json", '["a list"]', "5"):
+            proc = subprocess.run(
+                [sys.executable, str(KB_INDEX_PY), "--kb", str(kb), "add", "--json", bad,
+                 "--title", "T", "--file", "research/t.md"],
+                capture_output=True, text=True, timeout=30,
+            )
+            try:
+                error = json.loads(proc.stdout).get("error")
+            except ValueError:
+                error = None
+            if proc.returncode == 1 and error and not proc.stderr:
+                rejected.append(bad)
+        if len(rejected) == 3 and [e["id"] for e in kb_index.read_entries(kb)] == ids:
+            results.ok("journal/cli-rejects-bad-json")
+        else:
+            results.fail("journal/cli-rejects-bad-json", f"rejected only {rejected}")
+
+
+def test_compaction(results: TestResults):
+    """Compaction folds the log into index.json atomically and keeps extra keys."""
+    kb_index = load_module(KB_INDEX_PY, "kb_index_under_test")
+    with tempfile.TemporaryDirectory() as tmp:
+        kb = Path(tmp)
+        (kb / "index.json").write_text(json.dumps({"version": 2, "entries": [entry(1)]}), encoding="utf-8")
+        for n in range(2, 6):
+            kb_index.add_entry(kb, entry(n))
+        kb_index.remove_entry(kb, "k-001")
+        expected = kb_index.read_entries(kb)
+
+        folded = kb_index.compact(kb)
+        snapshot = json.loads((kb / "index.json").read_text(encoding="utf-8"))
+        if (
+            folded == 5
+            and snapshot["entries"] == expected
+            and snapshot.get("version") == 2
+            and (kb / "index.log.jsonl").stat().st_size == 0
+            and not list(kb.glob("*.tmp"))
+        ):
+            results.ok("compaction/fold")
+        else:
+            results.fail("compaction/fold", f"folded={folded} snapshot={snapshot}")
+
+        # Crash between rename and truncate: the old log replays harmlessly
+        kb_index.add_entry(kb, entry(6))
+        log = (kb / "index.log.jsonl").read_text(encoding="utf-8")
+        kb_index.compact(kb)
+        (kb / "index.log.jsonl").write_text(log, encoding="utf-8")
+        if [e["id"] for e in kb_index.read_entries(kb)] == [e["id"] for e in expected] + ["k-006"]:
+            results.ok("compaction/replay-idempotent")
+        else:
+            results.fail("compaction/replay-idempotent", "replaying a folded log changed the entries")
+
+        kb_index.COMPACT_MIN_BYTES = 256
+        for n in range(7, 40):
+            kb_index.add_entry(kb, entry(n))
+        log_bytes = (kb / "index.log.jsonl").stat().st_size
+        if log_bytes < (kb / "index.json").stat().st_size and len(kb_index.read_entries(kb)) == 38:
+            results.ok("compaction/automatic")
+        else:
+            results.fail("compaction/automatic", f"log still {log_bytes} bytes")
+
+
+def test_concurrency(results: TestResults):
+    """Parallel writers (with interleaved compactions) never lose entries."""
+    with tempfile.TemporaryDirectory() as tmp:
+        kb = Path(tmp)
+        workers, count = 6, 30
+        procs = [
+            subprocess.Popen([sys.executable, "-c", WRITER, str(KB_INDEX_PY), str(kb), str(w), str(count)])
+            for w in range(workers)
+        ]
+        codes = [p.wait(timeout=60) for p in procs]
+        kb_index = load_module(KB_INDEX_PY, "kb_index_under_test")
+        ids = {e["id"] for e in kb_index.read_entries(kb)}
+        snapshot = json.loads((kb / "index.json").read_text(encoding="utf-8"))
+        if codes == [0] * workers and len(ids) == workers * count and snapshot["entries"]:
+            results.ok("concurrency/no-lost-entries")
+        else:
+            results.fail("concurrency/no-lost-entries",
+                         f"exit codes {codes}, {len(ids)}/{workers * count} entries")
+
+
+def test_recall_reads_journal(results: TestResults):
+    """RECALL's search index sees journaled entries, before and after compaction."""
+    kb_index = load_module(KB_INDEX_PY, "kb_index_under_test")
+    search = load_module(SEARCH_PY, "search_under_test")
+    with tempfile.TemporaryDirectory() as tmp:
+        kb = Path(tmp)
+        (kb / "research").mkdir()
+        (kb / "index.json").write_text(json.dumps({"entries": [entry(1)]}), encoding="utf-8")
+        kb_index.add_entry(kb, {"id": "k-ws", "title": "WebSocket Auth", "file": "research/ws.md",
+                                "tags": ["networking"]})
+        with search.SearchIndex(kb) as index:
+            index.refresh()
+            found_in_log = [h["id"] for h in index.search("websocket")] == ["k-ws"]
+            kb_index.remove_entry(kb, "k-001")
+            kb_index.compact(kb)
+            index.refresh()
+            after = [h["id"] for h in index.search("topic websocket")]
+        if found_in_log and after == ["k-ws"]:
+            results.ok("recall/journal-visible")
+        else:
+            results.fail("recall/journal-visible", f"found_in_log={found_in_log} after={after}")
+
+    # Writers only add, so a reader racing their compactions must never see the count drop
+    with tempfile.TemporaryDirectory() as tmp:
+        kb = Path(tmp)
+        workers, count = 4, 40
+        procs = [
+            subprocess.Popen([sys.executable, "-c", WRITER, str(KB_INDEX_PY), str(kb), str(w), str(count)])
+            for w in range(workers)
+        ]
+        seen = []
+        while any(p.poll() is None for p in procs):
+            seen.append(len(search.load_entries(kb)))
+        seen.append(len(search.load_entries(kb)))
+        drops = [(a, b) for a, b in zip(seen, seen[1:]) if b < a]
+        if not drops and seen[-1] == workers * count:
+            results.ok(f"recall/reads-consistent-during-compaction ({len(seen)} reads)")
+        else:
+            results.fail("recall/reads-consistent-during-compaction",
+                         f"count dropped {drops[:3]}, final {seen[-1]}/{workers * count}")
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def main():
+    print()
+    print("=" * 60)
+    print("  jord0.skills — RECON Script Suite")
+    print("=" * 60)
+    print()
+
+    results = TestResults()
+
+    print("[1/4] Journal")
+    test_journal(results)
+    print()
+
+    print("[2/4] Compaction")
+    test_compaction(results)
+    print()
+
+    print("[3/4] Concurrent writers")
+    test_concurrency(results)
+    print()
+
+    print("[4/4] RECALL integration")
+    test_recall_reads_journal(results)
+    print()
+
+    print("=" * 60)
+    total = results.passed + results.failed
+    if results.failed == 0:
+        print(f"  ALL {total} CHECKS PASSED")
+    else:
+        print(f"  {results.passed}/{total} passed, {results.failed} FAILED")
+        print()
+        for error in results.errors:
+            print(f"  X  {error}")
+    print("=" * 60)
+    print()
+
+    sys.exit(1 if results.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
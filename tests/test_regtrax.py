@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+jord0.skills — REGTRAX Script Test Suite
+
+Exercises skills/REGTRAX/scripts/evaluate.py (headless data.json evaluator)
+against generated corpora in throwaway directories, redos.py
+(catastrophic backtracking check) against known-bad and known-safe patterns,
+and the template's incremental diagram layout against cold rebuilds (under
+node, with tests/fixtures/regtrax_layout_check.js) and its benchmark page.
+Execute: python tests/test_regtrax.py
+"""
+
+import importlib.util
+import json
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from test_skills import TestResults
+
+REPO_ROOT = Path(__file__).parent.parent
+EVALUATE_PY = REPO_ROOT / "skills" / "REGTRAX" / "scripts" / "evaluate.py"
+REDOS_PY = REPO_ROOT / "skills" / "REGTRAX" / "scripts" / "redos.py"
+TEMPLATE = REPO_ROOT / "skills" / "REGTRAX" / "references" / "template.html"
+LAYOUT_BENCH = REPO_ROOT / "benchmarks" / "bench_regtrax_layout.html"
+LAYOUT_CHECK_JS = Path(__file__).parent / "fixtures" / "regtrax_layout_check.js"
+
+LOG_PATTERN = r'^(?<ip>\d{1,3}(?:\.\d{1,3}){3}) - - \[[^\]]+\] "(GET|POST) \S+" (\d{3})$'
+
+# (pattern, flags, input, what RegExp.exec does in a browser)
+JS_SEMANTICS = [
+    ("^a$", "", "a\n", False),                      # $ is end of input, not before a final \n
+    ("^a$", "m", "a\nb", True),
+    ("a.c", "", "a\nc", False),
+    ("a.c", "", "a\rc", False),                     # . excludes \r as well
+    ("a.c", "s", "a\nc", True),
+    (r"\d", "", "٣", False),                   # \d is ASCII-only
+    (r"\bx", "", "éx", True),                  # é is not a word character for \b
+    (r"^\w+$", "", "naïve", False),
+    (r"\s", "", " ", True),
+    (r"\s", "", "\u0085", False),                   # NEL: whitespace to Python, not to JS
+    (r"(?<y>\d{4})-\k<y>", "", "2024-2024", True),
+    (r"(?<y>\d{4})-\k<y>", "", "2024-2025", False),
+    ("[^]", "", "\n", True),
+    (r"\/api\/v1", "", "/api/v1/users", True),
+    ("a{,2}", "", "a{,2}", True),                   # Literal in JS
+    (r"A", "", "A", True),
+    (r"\u{1F600}", "u", "\U0001F600", True),
+    (r"\cJ", "", "\n", True),
+    (r"[\b]", "", "\x08", True),
+    (r"\e", "", "e", True),                         # Identity escape
+    (r"^\p{L}$", "", "p{L}", True),                 # Without u, \p is a plain p
+    (r"<p>[\s\S]*?</p>", "", "<p>a\nb</p>", True),  # Negated escapes inside a class
+    (r"^[^\S\r\n]+$", "", " \t", True),
+    (r"^[^\S\r\n]+$", "", " \n", False),
+    (r"^[\W_]+$", "", "-_/", True),
+    (r"^[\W_]+$", "", "a_", False),
+    (r"^[\W]$", "", "é", True),                       # JS \W is ASCII-based
+    (r"^[\D]$", "", "٣", True),
+    (r"^[\S]$", "", "\u0085", True),
+    (r"^[\S]$", "", "\u3000", False),
+    ("b", "y", "ab", False),                        # Sticky: anchored at 0
+    ("B", "i", "b", True),
+    ("b", "g", "ab", True),
+]
+
+# (pattern, risky shapes redos.py should flag)
+REDOS_SHAPES = [
+    (r"^(a+)+$", {"nested-quantifier"}),
+    (r"^(\w+\s?)*$", {"nested-quantifier"}),
+    (r"^(\w|\d)+$", {"overlapping-alternation"}),
+    (r"^\d+\d+$", {"adjacent-quantifiers"}),
+    (r"^(.*),(.*)$", {"adjacent-quantifiers"}),     # .* can swallow the comma
+    (r"\s+$", {"unanchored-repeat"}),
+    (r"^[a-z]+@[a-z]+\.com$", set()),               # @ cannot be swallowed
+    (r"^(ab+)+$", set()),                            # Each iteration must start with a
+    (r"^(\w+)\s*=\s*(\w+)$", set()),
+    (r"^\d{3}-\d{4}$", set()),
+]
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def load_evaluate():
+    """Import a fresh copy of evaluate.py."""
+    spec = importlib.util.spec_from_file_location("regtrax_evaluate_under_test", EVALUATE_PY)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_redos():
+    """Import redos.py; it imports its sibling evaluate.py like the CLI does."""
+    sys.path.insert(0, str(REDOS_PY.parent))
+    try:
+        spec = importlib.util.spec_from_file_location("regtrax_redos_under_test", REDOS_PY)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        sys.path.remove(str(REDOS_PY.parent))
+
+
+def write_corpus(path: Path, lines: int, bad_every: int) -> list[int]:
+    """Access-log lines, every bad_every-th one garbage; returns the garbage line numbers."""
+    bad = []
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for n in range(1, lines + 1):
+            if n % bad_every == 0:
+                bad.append(n)
+                f.write(f"garbage {n}\r\n")
+            else:
+                f.write(f'10.0.{n % 255}.{n % 7} - - [18/Oct/2026:10:00:00 +0000] "GET /p/{n}" 200\n')
+    return bad
+
+
+def run(*args, stdin: str | None = None, script: Path = EVALUATE_PY):
+    proc = subprocess.run(
+        [sys.executable, str(script), *map(str, args)],
+        input=stdin, capture_output=True, text=True, timeout=120,
+    )
+    try:
+        return proc.returncode, json.loads(proc.stdout)
+    except ValueError:
+        return proc.returncode, {"raw": proc.stdout + proc.stderr}
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+def test_semantics(results: TestResults):
+    """The translated pattern behaves like the browser's RegExp."""
+    evaluate = load_evaluate()
+    wrong = []
+    for pattern, flags, text, expected in JS_SEMANTICS:
+        try:
+            got = bool(evaluate.compile_js(pattern, flags)(text))
+        except evaluate.EvaluateError as e:
+            got = f"error: {e}"
+        if got != expected:
+            wrong.append(f"/{pattern}/{flags} on {text!r}: {got}")
+    if not wrong:
+        results.ok(f"semantics/js-regexp ({len(JS_SEMANTICS)} cases)")
+    else:
+        results.fail("semantics/js-regexp", "; ".join(wrong))
+
+    rejected = []
+    invalid = [("a", "x"), ("(", ""), ("[abc", ""), ("a\\", ""), (r"\u{41", "u")]
+    for pattern, flags in invalid:
+        try:
+            evaluate.compile_js(pattern, flags)
+        except evaluate.EvaluateError:
+            rejected.append(pattern)
+    if len(rejected) == len(invalid):
+        results.ok("semantics/invalid-rejected")
+    else:
+        results.fail("semantics/invalid-rejected", f"only rejected {rejected}")
+
+    # Unicode properties and v-flag sets can't be emulated; miscounting silently is worse
+    unsupported = [(r"^\p{L}+$", "u"), (r"\P{Lu}", "u"), (r"\p{L}", "v"),
+                   (r"[\w--\d]", "v"), (r"[\w&&[a-z]]", "v"), (r"[[a-z]x]", "v"), (r"[\q{abc}]", "v")]
+    accepted = []
+    for pattern, flags in unsupported:
+        try:
+            evaluate.compile_js(pattern, flags)
+            accepted.append(f"/{pattern}/{flags}")
+        except evaluate.EvaluateError:
+            pass
+    if not accepted:
+        results.ok(f"semantics/unsupported-rejected ({len(unsupported)} cases)")
+    else:
+        results.fail("semantics/unsupported-rejected", f"accepted {accepted}")
+
+
+def test_corpus(results: TestResults):
+    """Counts, mismatches and timing for a corpus, with and without the worker pool."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        corpus = tmp / "access.log"
+        bad = write_corpus(corpus, 30000, 97)
+        data = tmp / "data.json"
+        data.write_text(json.dumps({"pattern": LOG_PATTERN, "flags": "", "explanation": "Access log"}),
+                        encoding="utf-8")
+
+        code, pooled = run(data, corpus, "--expect", "match", "--workers", "3", "--chunk-lines", "1000",
+                           "--examples", "5", "--slowest", "4")
+        code_serial, serial = run(data, corpus, "--expect", "match", "--workers", "1", "--examples", "5")
+        c = pooled.get("corpus", {})
+        if (
+            code == 2 and c.get("workers") == 3
+            and (c["lines"], c["matched"], c["failed"], c["mismatches"]) == (30000, 30000 - len(bad), len(bad), len(bad))
+            and [e["line"] for e in c["examples"]] == bad[:5]
+            and c["examples"][0]["input"] == f"garbage {bad[0]}"
+        ):
+            results.ok("corpus/pooled-counts-and-examples")
+        else:
+            results.fail("corpus/pooled-counts-and-examples", f"rc={code} corpus={str(c)[:400]}")
+
+        s = serial.get("corpus", {})
+        if code_serial == 2 and s.get("workers") == 1 and (s["matched"], s["examples"]) == (c["matched"], c["examples"]):
+            results.ok("corpus/serial-agrees")
+        else:
+            results.fail("corpus/serial-agrees", f"serial={str(s)[:300]}")
+
+        t = c.get("timing", {})
+        slowest = [x["us"] for x in t.get("slowest", [])]
+        if (
+            0 < t.get("p50Us", 0) <= t["p90Us"] <= t["p99Us"] <= t["maxUs"]
+            and len(slowest) == 4 and slowest == sorted(slowest, reverse=True) and slowest[0] == t["maxUs"]
+        ):
+            results.ok("corpus/timing")
+        else:
+            results.fail("corpus/timing", f"timing={t}")
+
+        # stdin and several sources; line numbers restart per source
+        code, both = run(data, "-", corpus, "--expect", "fail", "--examples", "3",
+                         stdin="garbage\n10.0.0.1 - - [x] \"GET /\" 200\n")
+        c = both.get("corpus", {})
+        if (
+            c.get("sources") == ["stdin", str(corpus)] and c["lines"] == 30002
+            and c["mismatches"] == 30001 - len(bad)
+            and [(e["source"], e["line"]) for e in c["examples"]] == [("stdin", 2), (str(corpus), 1), (str(corpus), 2)]
+        ):
+            results.ok("corpus/stdin-and-sources")
+        else:
+            results.fail("corpus/stdin-and-sources", f"rc={code} corpus={str(c)[:400]}")
+
+
+def test_data_json(results: TestResults):
+    """testCases are checked and --write stores the summary for the page."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        data = tmp / "data.json"
+        original = {
+            "pattern": r"^\d{3}-\d{4}$", "flags": "", "explanation": "Phone",
+            "testCases": [
+                {"input": "555-1234", "shouldMatch": True},
+                {"input": "5551234", "shouldMatch": False},
+                {"input": "555-12345", "shouldMatch": True},   # Wrong expectation
+                {"input": "no expectation"},
+            ],
+        }
+        data.write_text(json.dumps(original), encoding="utf-8")
+        code, evaluation = run(data, "--write")
+        tc = evaluation.get("testCases", {})
+        stored = json.loads(data.read_text(encoding="utf-8"))
+        if (
+            code == 2 and tc.get("total") == 4 and tc.get("passed") == 2
+            and [f["input"] for f in tc["failed"]] == ["555-12345"]
+            and "corpus" not in evaluation
+            and {k: v for k, v in stored.items() if k != "evaluation"} == original
+            and stored["evaluation"]["testCases"] == tc
+        ):
+            results.ok("data-json/test-cases-written")
+        else:
+            results.fail("data-json/test-cases-written", f"rc={code} evaluation={evaluation}")
+
+        data.write_text(json.dumps({"explanation": "no pattern"}), encoding="utf-8")
+        code, error = run(data)
+        if code == 1 and "pattern" in error.get("error", ""):
+            results.ok("data-json/missing-pattern")
+        else:
+            results.fail("data-json/missing-pattern", f"rc={code} out={error}")
+
+    template = TEMPLATE.read_text(encoding="utf-8")
+    if "renderEvaluation(data.evaluation)" in template and 'id="evaluation"' in template:
+        results.ok("data-json/page-renders-evaluation")
+    else:
+        results.fail("data-json/page-renders-evaluation", "template has no evaluation panel")
+
+
+def test_redos(results: TestResults):
+    """Risky shapes are found statically and confirmed by timing under a hard timeout."""
+    redos = load_redos()
+    wrong = []
+    for pattern, expected in REDOS_SHAPES:
+        kinds = {f["kind"] for f in redos.Analysis(pattern, "").findings()}
+        if kinds != expected:
+            wrong.append(f"/{pattern}/: {sorted(kinds)}")
+    if not wrong:
+        results.ok(f"redos/static-shapes ({len(REDOS_SHAPES)} patterns)")
+    else:
+        results.fail("redos/static-shapes", "; ".join(wrong))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data = Path(tmp) / "data.json"
+
+        def check(pattern, *args, flags=""):
+            original = {"pattern": pattern, "flags": flags, "explanation": "Words"}
+            data.write_text(json.dumps(original), encoding="utf-8")
+            start = time.monotonic()
+            code, out = run(data, "--timeout", "0.3", *args, script=REDOS_PY)
+            return code, out, time.monotonic() - start, original
+
+        # Exponential: the killed match ends the curve and the run stays short
+        code, cx, took, original = check(r"^(\w+\s?)*$", "--engine", "python-re", "--write")
+        stored = json.loads(data.read_text(encoding="utf-8"))
+        curve = cx.get("curve", [])
+        if (
+            code == 2 and cx.get("verdict") == "exponential" and cx["engine"] == "python-re"
+            and curve and curve[-1]["ms"] is None and all(p["ms"] is not None for p in curve[:-1])
+            and curve[-1]["n"] <= 64 and took < 30
+            and cx["attack"] == {"prefix": "", "pump": "a", "suffix": "!"}
+            and {k: v for k, v in stored.items() if k != "complexity"} == original
+            and stored["complexity"]["verdict"] == "exponential"
+        ):
+            results.ok(f"redos/exponential-killed ({took:.1f}s)")
+        else:
+            results.fail("redos/exponential-killed", f"rc={code} took={took:.1f}s out={str(cx)[:400]}")
+
+        code, cx, took, _ = check(r"^\d+\d+$", "--engine", "python-re", "--fail-on", "polynomial")
+        if code == 2 and cx.get("verdict") == "polynomial" and cx["degree"] >= 2:
+            results.ok(f"redos/polynomial-degree (n^{cx['degree']})")
+        else:
+            results.fail("redos/polynomial-degree", f"rc={code} out={str(cx)[:400]}")
+
+        code, cx, _, _ = check(r"^[a-z]+@[a-z]+\.com$")
+        if code == 0 and cx.get("verdict") == "safe" and cx["findings"] == [] and cx["curve"] == []:
+            results.ok("redos/safe-pattern")
+        else:
+            results.fail("redos/safe-pattern", f"rc={code} out={cx}")
+
+        code, cx, _, _ = check("(a+", "--static-only")
+        if code == 1 and "Unterminated" in cx.get("error", ""):
+            results.ok("redos/invalid-pattern")
+        else:
+            results.fail("redos/invalid-pattern", f"rc={code} out={cx}")
+
+        code, cx, _, _ = check(r"^\u{41+$", "--static-only", flags="u")
+        if code == 1 and "Unterminated" in cx.get("error", ""):
+            results.ok("redos/unterminated-code-point")
+        else:
+            results.fail("redos/unterminated-code-point", f"rc={code} out={cx}")
+
+        # \p{...} has no Python re equivalent: analysed statically, timed only under node
+        code, cx, _, _ = check(r"^(\p{L}+\s?)*$", "--static-only", flags="u")
+        if code == 0 and cx.get("verdict") == "unconfirmed" and cx["findings"]:
+            results.ok("redos/untranslatable-static")
+        else:
+            results.fail("redos/untranslatable-static", f"rc={code} out={str(cx)[:400]}")
+
+        # Python's re folds (\w|\d) into one set; V8, like the page, does not
+        if shutil.which("node"):
+            code, cx, _, _ = check(r"^(\w|\d)+$", "--engine", "node")
+            if code == 2 and cx.get("verdict") == "exponential" and cx["engine"] == "node":
+                results.ok("redos/node-engine")
+            else:
+                results.fail("redos/node-engine", f"rc={code} out={str(cx)[:400]}")
+            code, cx, _, _ = check(r"^(\p{L}+\s?)*$", "--engine", "node", flags="u")
+            if code == 2 and cx.get("verdict") == "exponential":
+                results.ok("redos/untranslatable-node")
+            else:
+                results.fail("redos/untranslatable-node", f"rc={code} out={str(cx)[:400]}")
+        else:
+            print("  SKIP  redos/node-engine (node not installed)")
+
+    template = TEMPLATE.read_text(encoding="utf-8")
+    if "renderComplexity(data.complexity)" in template and 'id="complexity"' in template:
+        results.ok("redos/page-renders-complexity")
+    else:
+        results.fail("redos/page-renders-complexity", "template has no complexity panel")
+
+
+def test_layout(results: TestResults):
+    template = TEMPLATE.read_text(encoding="utf-8")
+    script = "\n".join(re.findall(r"<script>(.*?)</script>", template, re.S))
+
+    missing = [fn for fn in ("layoutKey", "acquire", "keepLayout", "placeLayout", "clearLayoutCache")
+               if f"function {fn}(" not in script]
+    if not missing:
+        results.ok("layout/memoized-subtrees")
+    else:
+        results.fail("layout/memoized-subtrees", f"template lacks {missing}")
+
+    # rebuildDiagram must not re-wire hover per rebuild now that the listener is delegated
+    rebuild = script[script.index("function rebuildDiagram("):]
+    rebuild = rebuild[:rebuild.index("\nfunction ")]
+    if "wireHoverHighlight(" not in rebuild and script.count("wireHoverHighlight();") == 1:
+        results.ok("layout/hover-wired-once")
+    else:
+        results.fail("layout/hover-wired-once", "rebuildDiagram re-wires hover listeners")
+
+    bench = LAYOUT_BENCH.read_text(encoding="utf-8")
+    used = sorted(set(re.findall(r"\bwin\.(\w+)\(", bench)) - {"eval"})
+    undefined = [fn for fn in used if f"function {fn}(" not in script]
+    # Script-level let/const bindings aren't window properties; the page reads them through eval
+    undefined += [name for name in re.findall(r"\bwin\.eval\('(\w+)'\)", bench)
+                  if not re.search(rf"^(?:let|const|var) {name}\b", script, re.M)]
+    if used and not undefined:
+        results.ok(f"layout/bench-calls-resolve ({len(used)} functions)")
+    else:
+        results.fail("layout/bench-calls-resolve", f"template lacks {undefined or 'any win.* call'}")
+
+    if shutil.which("node"):
+        with tempfile.TemporaryDirectory() as tmp:
+            js = Path(tmp) / "template.js"
+            js.write_text(script, encoding="utf-8")
+            proc = subprocess.run(["node", "--check", str(js)], capture_output=True, text=True, timeout=60)
+        if proc.returncode == 0:
+            results.ok("layout/template-script-parses")
+        else:
+            results.fail("layout/template-script-parses", proc.stderr.strip()[:400])
+
+        # Incremental rebuilds against cold builds, under a minimal DOM
+        proc = subprocess.run(["node", str(LAYOUT_CHECK_JS), str(TEMPLATE)],
+                              capture_output=True, text=True, timeout=120)
+        checks = [json.loads(line) for line in proc.stdout.splitlines() if line.startswith("{")]
+        for check in checks:
+            if check["ok"]:
+                results.ok(f"layout/{check['name']}")
+            else:
+                results.fail(f"layout/{check['name']}", check["detail"][:400])
+        if proc.returncode != 0 or not checks:
+            results.fail("layout/dom-check-ran", f"rc={proc.returncode} {proc.stderr.strip()[-400:]}")
+    else:
+        print("  SKIP  layout/template-script-parses (node not installed)")
+        print("  SKIP  layout/incremental-equals-cold (node not installed)")
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def main():
+    print()
+    print("=" * 60)
+    print("  jord0.skills — REGTRAX Script Suite")
+    print("=" * 60)
+    print()
+
+    results = TestResults()
+
+    print("[1/5] JavaScript semantics")
+    test_semantics(results)
+    print()
+
+    print("[2/5] Corpus evaluation")
+    test_corpus(results)
+    print()
+
+    print("[3/5] data.json")
+    test_data_json(results)
+    print()
+
+    print("[4/5] Catastrophic backtracking")
+    test_redos(results)
+    print()
+
+    print("[5/5] Diagram layout")
+    test_layout(results)
+    print()
+
+    print("=" * 60)
+    total = results.passed + results.failed
+    if results.failed == 0:
+        print(f"  ALL {total} CHECKS PASSED")
+    else:
+        print(f"  {results.passed}/{total} passed, {results.failed} FAILED")
+        print()
+        for error in results.errors:
+            print(f"  X  {error}")
+    print("=" * 60)
+    print()
+
+    sys.exit(1 if results.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
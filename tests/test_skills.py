@@ -4,19 +4,34 @@ jord0.skills — Skill Validation Test Suite
 
 Runs against all skills in the repository to ensure quality standards.
 Execute: python -m pytest tests/ -v
-Or:      python tests/test_skills.py
+Or:      python tests/test_skills.py             # incremental, cached in .skillcheck-cache
+         python tests/test_skills.py --no-cache  # re-check everything
 """
 
 import re
+import argparse
 import ast
+import hashlib
+import json
+import mmap
+import os
+import stat
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
+from types import MappingProxyType
 
 # Find repo root (parent of tests/)
 REPO_ROOT = Path(__file__).parent.parent
 SKILLS_DIR = REPO_ROOT / "skills"
 
+sys.path.insert(0, str(REPO_ROOT / "tools"))
+from skill_index import INDEX_FILE, get_sections, is_ignored, load_index, parse_frontmatter  # noqa: E402
+
 # All expected skills
 EXPECTED_SKILLS = [
     "PORTAL", "STRICT", "FORGE", "CONCLAVE", "NOTIFY",
@@ -41,12 +56,29 @@ BANNED_PATTERNS = [
     r"(?i)\broom42\b",
 ]
 
+# Hardcoded home directories (/home/user/.config, /Users/someone/.ssh, ...)
+ABSOLUTE_PATH_PATTERNS = [
+    r"/home/\w+/\.",
+    r"/Users/\w+/\.",
+]
+
 # Required YAML frontmatter fields
 REQUIRED_FRONTMATTER = ["name", "description", "user-invocable", "allowed-tools"]
 
 # Required sections in every SKILL.md
 REQUIRED_SECTIONS = ["Usage", "Prerequisites"]
 
+# A NUL byte in the first SNIFF_BYTES marks a file as binary (images, archives)
+SNIFF_BYTES = 8192
+# Files at least this large are scanned through mmap instead of held in memory
+STREAM_THRESHOLD = 1 << 20
+
+# Incremental mode: per-file results keyed by content hash and validator version
+CACHE_FILE = REPO_ROOT / ".skillcheck-cache"
+VALIDATOR_VERSION = hashlib.sha256(
+    Path(__file__).read_bytes() + (REPO_ROOT / "tools" / "skill_index.py").read_bytes()
+).hexdigest()[:16]
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -63,38 +95,369 @@ def read_skill(skill_dir: Path) -> str:
     return (skill_dir / "SKILL.md").read_text(encoding="utf-8")
 
 
-def parse_frontmatter(content: str) -> dict[str, str]:
-    """Extract YAML frontmatter from markdown."""
-    if not content.startswith("---"):
-        return {}
-    end = content.index("---", 3)
-    frontmatter_text = content[3:end].strip()
-    result = {}
-    current_key = None
-    current_value = []
+# ---------------------------------------------------------------------------
+# Snapshot — every file is read and parsed at most once, then shared by all
+# checks. The walk only stats files; content is loaded on first use, which
+# happens on the thread pool via scan(), and never for cache hits.
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class SkillFile:
+    path: Path
+    rel_path: Path              # Relative to SKILLS_DIR
+    size: int
+    mtime_ns: int
+
+    @cached_property
+    def _content(self) -> tuple[bytes, bytes | None]:
+        """(head, full data) — data is None for binary and STREAM_THRESHOLD-sized files."""
+        with open(self.path, "rb") as f:
+            head = f.read(SNIFF_BYTES)
+            if b"\0" in head or self.size >= STREAM_THRESHOLD:
+                return head, None
+            return head, head + f.read()
+
+    @property
+    def binary(self) -> bool:
+        return b"\0" in self._content[0]
+
+    @property
+    def data(self) -> bytes | None:
+        return self._content[1]
+
+    @cached_property
+    def text(self) -> str | None:
+        """Decoded content, or None for binary / non-UTF-8 files."""
+        if self.binary:
+            return None
+        data = self.data if self.data is not None else self.path.read_bytes()
+        try:
+            return data.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+
+
+@dataclass(frozen=True)
+class Skill:
+    name: str
+    dir: Path
+    files: tuple[SkillFile, ...]
+
+    @cached_property
+    def skill_md(self) -> SkillFile | None:
+        return next((f for f in self.files if f.path == self.dir / "SKILL.md"), None)
+
+    @cached_property
+    def content(self) -> str:
+        return (self.skill_md.text or "") if self.skill_md else ""
+
+    @cached_property
+    def frontmatter(self) -> MappingProxyType:
+        return MappingProxyType(parse_frontmatter(self.content))
+
+    @cached_property
+    def sections(self) -> tuple[str, ...]:
+        return tuple(get_sections(self.content))
+
+    @property
+    def scripts(self) -> tuple[SkillFile, ...]:
+        """Files directly inside scripts/."""
+        scripts_dir = self.dir / "scripts"
+        return tuple(f for f in self.files if f.path.parent == scripts_dir)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    skills: tuple[Skill, ...]
+
+    @property
+    def files(self) -> tuple[SkillFile, ...]:
+        return tuple(f for skill in self.skills for f in skill.files)
+
+
+_pool = ThreadPoolExecutor(thread_name_prefix="skillcheck")
+
+
+def _walk(skill_dir: Path) -> tuple[SkillFile, ...]:
+    files = []
+    for path in skill_dir.rglob("*"):
+        st = path.stat()
+        if stat.S_ISREG(st.st_mode):
+            files.append(SkillFile(path, path.relative_to(SKILLS_DIR), st.st_size, st.st_mtime_ns))
+    return tuple(files)
+
 
-    for line in frontmatter_text.split("\n"):
-        # Check for key: value
-        match = re.match(r"^(\w[\w-]*):\s*(.*)", line)
-        if match:
-            # Save previous key
-            if current_key:
-                result[current_key] = "\n".join(current_value).strip()
-            current_key = match.group(1)
-            current_value = [match.group(2)] if match.group(2) and not match.group(2) == "|" else []
-        elif current_key and line.startswith("  "):
-            current_value.append(line.strip())
+@lru_cache(maxsize=None)
+def get_snapshot() -> Snapshot:
+    """Walk every skill once; later calls return the same snapshot."""
+    return Snapshot(tuple(Skill(d.name, d, _walk(d)) for d in get_skill_dirs()))
 
-    # Save last key
-    if current_key:
-        result[current_key] = "\n".join(current_value).strip()
 
-    return result
+def scan(check, files):
+    """Run check(file) across the pool; results come back in file order."""
+    return list(_pool.map(check, files))
 
 
-def get_sections(content: str) -> list[str]:
-    """Extract ## section headers from markdown."""
-    return re.findall(r"^##\s+(.+)$", content, re.MULTILINE)
+# ---------------------------------------------------------------------------
+# Pattern scanner — all patterns in one alternation, one pass per file
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Hit:
+    pattern: str
+    match: str
+    line: int
+    column: int
+
+    def __str__(self) -> str:
+        return f"{self.match} ({self.line}:{self.column})"
+
+
+class PatternScanner:
+    """Compile many regexes into one named-group alternation.
+
+    Each input is scanned once no matter how many patterns there are. A
+    leading global flag such as (?i) is rewritten to a scoped (?i:...) so it
+    only applies to its own alternative.
+    """
+
+    def __init__(self, patterns: list[str], prefix: str = "p"):
+        self.patterns = {f"{prefix}{i}": pattern for i, pattern in enumerate(patterns)}
+        alternatives = []
+        for name, pattern in self.patterns.items():
+            flags = re.match(r"\(\?([aiLmsux]+)\)", pattern)
+            if flags:
+                pattern = f"(?{flags.group(1)}:{pattern[flags.end():]})"
+            alternatives.append(f"(?P<{name}>{pattern})")
+        self.regex = re.compile("|".join(alternatives).encode("utf-8"))
+
+    def scan_bytes(self, buffer) -> list[Hit]:
+        """Scan bytes or an mmap, tracking line/column incrementally."""
+        hits = []
+        line, line_start, counted_to = 1, 0, 0
+        for m in self.regex.finditer(buffer):
+            start = m.start()
+            newlines = buffer[counted_to:start].count(b"\n")
+            if newlines:
+                line += newlines
+                line_start = buffer.rfind(b"\n", counted_to, start) + 1
+            counted_to = start
+            column = len(buffer[line_start:start].decode("utf-8", errors="replace")) + 1
+            hits.append(Hit(
+                self.patterns[m.lastgroup],
+                m.group().decode("utf-8", errors="replace"),
+                line,
+                column,
+            ))
+        return hits
+
+    def scan_text(self, content: str) -> list[Hit]:
+        return self.scan_bytes(content.encode("utf-8"))
+
+    def scan_file(self, file: SkillFile) -> list[Hit]:
+        """Scan a snapshot file; large files are streamed through mmap."""
+        if file.binary or file.size == 0:
+            return []
+        if file.data is not None:
+            return self.scan_bytes(file.data)
+        with open(file.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return self.scan_bytes(mm)
+
+
+BANNED_SCANNER = PatternScanner(BANNED_PATTERNS, prefix="banned")
+ABSOLUTE_PATH_SCANNER = PatternScanner(ABSOLUTE_PATH_PATTERNS, prefix="abspath")
+
+
+def describe_hits(hits: list[Hit], limit: int = 3) -> str:
+    """First few distinct matches with the position of their first hit."""
+    first: dict[str, Hit] = {}
+    for hit in hits:
+        first.setdefault(hit.match, hit)
+    return ", ".join(str(hit) for hit in list(first.values())[:limit])
+
+
+# ---------------------------------------------------------------------------
+# Result cache — incremental mode
+# ---------------------------------------------------------------------------
+
+SKIPPED = "skip"
+
+
+class ResultCache:
+    """Check outcomes from previous runs, keyed by content hash.
+
+    A file whose size and mtime match its entry reuses the recorded hash
+    without being read (entries recorded within MTIME_SLACK_NS of the file's
+    mtime are re-hashed, since a same-tick edit would be invisible). Any
+    change to this validator changes VALIDATOR_VERSION and drops everything.
+    Only entries touched by the current run are written back.
+    """
+
+    MTIME_SLACK_NS = 2_000_000_000
+
+    def __init__(self, path: Path | None):
+        self.path = path
+        self._old = {"files": {}, "groups": {}}
+        self._new = {"version": VALIDATOR_VERSION, "files": {}, "groups": {}}
+        if path is None:
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == VALIDATOR_VERSION:
+            self._old = data
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def file_hash(self, path: Path, size: int, mtime_ns: int) -> str:
+        """Content hash, from the cache when size and mtime are unchanged."""
+        key = str(path.relative_to(REPO_ROOT))
+        entry = self._new["files"].get(key) or self._old["files"].get(key)
+        if (
+            entry
+            and entry["size"] == size
+            and entry["mtime_ns"] == mtime_ns
+            and entry["hashed_ns"] - mtime_ns > self.MTIME_SLACK_NS
+        ):
+            digest = entry["hash"]
+        else:
+            hashed_ns = time.time_ns()
+            sha = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    sha.update(chunk)
+            digest = sha.hexdigest()
+            entry = {"size": size, "mtime_ns": mtime_ns, "hashed_ns": hashed_ns,
+                     "hash": digest, "checks": {}}
+        if key not in self._new["files"]:
+            old_checks = entry["checks"] if entry.get("hash") == digest else {}
+            self._new["files"][key] = {**entry, "checks": dict(old_checks)}
+        return digest
+
+    def hash_paths(self, paths: list[Path]) -> str:
+        """One key over several files (missing files hash as absent)."""
+        sha = hashlib.sha256()
+        for path in paths:
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                sha.update(f"{path}:absent\n".encode())
+                continue
+            sha.update(f"{path}:{self.file_hash(path, st.st_size, st.st_mtime_ns)}\n".encode())
+        return sha.hexdigest()
+
+    def file_outcome(self, check: str, file: SkillFile):
+        """Recorded outcome of check on file, or None if it must run."""
+        if not self.enabled:
+            return None
+        self.file_hash(file.path, file.size, file.mtime_ns)
+        key = str(file.path.relative_to(REPO_ROOT))
+        return self._new["files"][key]["checks"].get(check)
+
+    def store_file_outcome(self, check: str, file: SkillFile, outcome: list) -> None:
+        if self.enabled:
+            key = str(file.path.relative_to(REPO_ROOT))
+            self._new["files"][key]["checks"][check] = outcome
+
+    def group(self, name: str, key: str) -> list | None:
+        """Recorded results of a whole check if its inputs hash to key."""
+        entry = self._old["groups"].get(name)
+        if self.enabled and entry and entry["key"] == key:
+            self._new["groups"][name] = entry
+            return entry["results"]
+        return None
+
+    def store_group(self, name: str, key: str, recorded: list) -> None:
+        if self.enabled:
+            self._new["groups"][name] = {"key": key, "results": recorded}
+
+    def save(self) -> None:
+        if not self.enabled:
+            return
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps(self._new, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+
+# Replaced by main(); the default keeps imported use (test_notify) cache-free
+CACHE = ResultCache(None)
+
+
+def file_hash(file: SkillFile) -> str:
+    """sha256 of a snapshot file, reused from the cache when unchanged."""
+    return CACHE.file_hash(file.path, file.size, file.mtime_ns)
+
+
+class RecordingResults:
+    """Forward ok/fail to results while recording them for the cache."""
+
+    def __init__(self, results):
+        self.results = results
+        self.recorded = []
+
+    def ok(self, name: str, **kwargs):
+        self.recorded.append(["ok", name, None])
+        self.results.ok(name, **kwargs)
+
+    def fail(self, name: str, reason: str, **kwargs):
+        self.recorded.append(["fail", name, reason])
+        self.results.fail(name, reason, **kwargs)
+
+
+def replay(results, recorded: list) -> None:
+    for status, name, reason in recorded:
+        if status == "ok":
+            results.ok(name, duration=0.0, cached=True)
+        else:
+            results.fail(name, reason, duration=0.0, cached=True)
+
+
+def run_cached(results, test, inputs: list[Path], extra: str = "") -> None:
+    """Run test(results) unless none of its input files (or extra) changed."""
+    if not CACHE.enabled:
+        test(results)
+        return
+    key = hashlib.sha256(f"{CACHE.hash_paths(inputs)}:{extra}".encode()).hexdigest()
+    recorded = CACHE.group(test.__name__, key)
+    if recorded is not None:
+        replay(results, recorded)
+        return
+    recorder = RecordingResults(results)
+    test(recorder)
+    CACHE.store_group(test.__name__, key, recorder.recorded)
+
+
+def check_files(results, label: str, files: list[SkillFile], check) -> None:
+    """Report check(file) for each file: None passes, a string fails, SKIPPED is silent.
+
+    Only files without a cached outcome are checked, in parallel.
+    """
+    def timed_check(file):
+        start = time.perf_counter()
+        reason = check(file)
+        return reason, time.perf_counter() - start
+
+    outcomes = [CACHE.file_outcome(label, f) for f in files]
+    misses = [f for f, outcome in zip(files, outcomes) if outcome is None]
+    fresh = iter(scan(timed_check, misses))
+    for file, outcome in zip(files, outcomes):
+        cached, duration = outcome is not None, 0.0
+        if outcome is None:
+            reason, duration = next(fresh)
+            outcome = ["skip" if reason == SKIPPED else "fail" if reason else "ok", reason]
+            CACHE.store_file_outcome(label, file, outcome)
+        status, reason = outcome
+        name, rel_path = f"{label}/{file.rel_path}", str(file.rel_path)
+        if status == "ok":
+            results.ok(name, duration=duration, file=rel_path, cached=cached)
+        elif status == "fail":
+            results.fail(name, reason, duration=duration, file=rel_path, cached=cached)
 
 
 # ---------------------------------------------------------------------------
@@ -102,19 +465,74 @@ def get_sections(content: str) -> list[str]:
 # ---------------------------------------------------------------------------
 
 class TestResults:
-    def __init__(self):
+    """Collects PASS/FAIL outcomes with wall time per check, file and section.
+
+    duration defaults to the time since the previous report; per-file checks
+    pass their own measured time. quiet=True suppresses the text output
+    (for --format json/junit on stdout).
+    """
+
+    def __init__(self, quiet: bool = False):
         self.passed = 0
         self.failed = 0
         self.errors = []
-
-    def ok(self, name: str):
+        self.records = []
+        self.sections = []
+        self.quiet = quiet
+        self._last = time.perf_counter()
+
+    def log(self, text: str = ""):
+        if not self.quiet:
+            print(text)
+
+    def section(self, title: str):
+        """Start timing a new section and print its header."""
+        self._end_section()
+        self.sections.append({"name": title, "start": time.perf_counter(), "duration": 0.0})
+        self._last = time.perf_counter()
+        self.log(title)
+
+    def _end_section(self):
+        if self.sections and "end" not in self.sections[-1]:
+            self.sections[-1]["end"] = time.perf_counter()
+            self.sections[-1]["duration"] = self.sections[-1]["end"] - self.sections[-1]["start"]
+
+    def _record(self, name, status, reason, duration, file, cached):
+        now = time.perf_counter()
+        self.records.append({
+            "section": self.sections[-1]["name"] if self.sections else "",
+            "name": name,
+            "status": status,
+            "reason": reason,
+            "duration": now - self._last if duration is None else duration,
+            "file": file,
+            "cached": cached,
+        })
+        self._last = now
+
+    def ok(self, name: str, duration: float | None = None, file: str | None = None,
+           cached: bool = False):
         self.passed += 1
-        print(f"  PASS  {name}")
+        self._record(name, "pass", None, duration, file, cached)
+        self.log(f"  PASS  {name}")
 
-    def fail(self, name: str, reason: str):
+    def fail(self, name: str, reason: str, duration: float | None = None,
+             file: str | None = None, cached: bool = False):
         self.failed += 1
         self.errors.append(f"{name}: {reason}")
-        print(f"  FAIL  {name} — {reason}")
+        self._record(name, "fail", reason, duration, file, cached)
+        self.log(f"  FAIL  {name} — {reason}")
+
+    def finish(self):
+        self._end_section()
+
+    def file_times(self) -> dict[str, float]:
+        """Total check time per file, across all checks."""
+        totals: dict[str, float] = {}
+        for record in self.records:
+            if record["file"]:
+                totals[record["file"]] = totals.get(record["file"], 0.0) + record["duration"]
+        return totals
 
 
 def test_all_skills_exist(results: TestResults):
@@ -132,15 +550,14 @@ def test_all_skills_exist(results: TestResults):
 
 def test_frontmatter(results: TestResults):
     """Every SKILL.md has valid YAML frontmatter with required fields."""
-    for skill_dir in get_skill_dirs():
-        name = skill_dir.name
-        content = read_skill(skill_dir)
+    for skill in get_snapshot().skills:
+        name = skill.name
 
-        if not content.startswith("---"):
+        if not skill.content.startswith("---"):
             results.fail(f"frontmatter/{name}", "No YAML frontmatter found")
             continue
 
-        fm = parse_frontmatter(content)
+        fm = skill.frontmatter
         missing = [f for f in REQUIRED_FRONTMATTER if f not in fm]
 
         if missing:
@@ -153,54 +570,36 @@ def test_frontmatter(results: TestResults):
             results.ok(f"frontmatter/{name}")
 
 
-def test_no_personal_references(results: TestResults):
-    """Zero personal references in any file."""
-    for skill_dir in get_skill_dirs():
-        name = skill_dir.name
-        # Check all files in the skill directory
-        for file_path in skill_dir.rglob("*"):
-            if not file_path.is_file():
-                continue
-            try:
-                content = file_path.read_text(encoding="utf-8")
-            except UnicodeDecodeError:
-                continue
+def check_personal_references(file: SkillFile) -> str | None:
+    if file.binary:
+        return SKIPPED
+    hits = BANNED_SCANNER.scan_file(file)
+    return f"Found: {describe_hits(hits)}" if hits else None
 
-            violations = []
-            for pattern in BANNED_PATTERNS:
-                matches = re.findall(pattern, content)
-                if matches:
-                    violations.extend(matches)
 
-            rel_path = file_path.relative_to(SKILLS_DIR)
-            if violations:
-                results.fail(
-                    f"personal-refs/{rel_path}",
-                    f"Found: {', '.join(set(violations)[:3])}"
-                )
-            else:
-                results.ok(f"personal-refs/{rel_path}")
+def test_no_personal_references(results: TestResults):
+    """Zero personal references in any file."""
+    check_files(results, "personal-refs", get_snapshot().files, check_personal_references)
 
 
 def test_required_sections(results: TestResults):
     """Every SKILL.md has required sections."""
-    for skill_dir in get_skill_dirs():
-        name = skill_dir.name
-        content = read_skill(skill_dir)
-        sections = get_sections(content)
-
-        missing = [s for s in REQUIRED_SECTIONS if not any(s.lower() in sec.lower() for sec in sections)]
+    for skill in get_snapshot().skills:
+        missing = [
+            s for s in REQUIRED_SECTIONS
+            if not any(s.lower() in sec.lower() for sec in skill.sections)
+        ]
 
         if missing:
-            results.fail(f"sections/{name}", f"Missing sections: {', '.join(missing)}")
+            results.fail(f"sections/{skill.name}", f"Missing sections: {', '.join(missing)}")
         else:
-            results.ok(f"sections/{name}")
+            results.ok(f"sections/{skill.name}")
 
 
 def test_skill_names_uppercase(results: TestResults):
     """All skill directory names are ALL CAPS."""
-    for skill_dir in get_skill_dirs():
-        name = skill_dir.name
+    for skill in get_snapshot().skills:
+        name = skill.name
         if name != name.upper():
             results.fail(f"uppercase/{name}", f"Should be {name.upper()}")
         else:
@@ -209,10 +608,9 @@ def test_skill_names_uppercase(results: TestResults):
 
 def test_frontmatter_name_matches_dir(results: TestResults):
     """Frontmatter 'name' matches directory name."""
-    for skill_dir in get_skill_dirs():
-        dir_name = skill_dir.name
-        fm = parse_frontmatter(read_skill(skill_dir))
-        fm_name = fm.get("name", "").strip()
+    for skill in get_snapshot().skills:
+        dir_name = skill.name
+        fm_name = skill.frontmatter.get("name", "").strip()
 
         if fm_name.upper() != dir_name.upper():
             results.fail(f"name-match/{dir_name}", f"Frontmatter name '{fm_name}' != dir '{dir_name}'")
@@ -220,64 +618,50 @@ def test_frontmatter_name_matches_dir(results: TestResults):
             results.ok(f"name-match/{dir_name}")
 
 
+def check_script_syntax(script: SkillFile) -> str | None:
+    """Return an error message, or None if the script's syntax is valid."""
+    if script.path.suffix == ".py":
+        if script.text is None:
+            return "Python source is not valid UTF-8"
+        try:
+            ast.parse(script.text, filename=str(script.path))
+        except SyntaxError as e:
+            return f"Python syntax error: {e}"
+        return None
+
+    try:
+        result = subprocess.run(
+            ["bash", "-n", str(script.path)],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+        return str(e)
+    if result.returncode != 0:
+        return f"Bash syntax error: {result.stderr.strip()}"
+    return None
+
+
 def test_scripts_syntax(results: TestResults):
     """All Python scripts pass syntax check. All shell scripts pass bash -n."""
-    for skill_dir in get_skill_dirs():
-        scripts_dir = skill_dir / "scripts"
-        if not scripts_dir.exists():
-            continue
+    scripts = [
+        f for skill in get_snapshot().skills for f in skill.scripts
+        if f.path.suffix in (".py", ".sh")
+    ]
+    check_files(results, "syntax", scripts, check_script_syntax)
 
-        for script in scripts_dir.iterdir():
-            rel_path = script.relative_to(SKILLS_DIR)
-
-            if script.suffix == ".py":
-                try:
-                    source = script.read_text(encoding="utf-8")
-                    ast.parse(source, filename=str(script))
-                    results.ok(f"syntax/{rel_path}")
-                except SyntaxError as e:
-                    results.fail(f"syntax/{rel_path}", f"Python syntax error: {e}")
-
-            elif script.suffix == ".sh":
-                try:
-                    result = subprocess.run(
-                        ["bash", "-n", str(script)],
-                        capture_output=True,
-                        text=True,
-                        timeout=10,
-                    )
-                    if result.returncode == 0:
-                        results.ok(f"syntax/{rel_path}")
-                    else:
-                        results.fail(f"syntax/{rel_path}", f"Bash syntax error: {result.stderr.strip()}")
-                except (subprocess.TimeoutExpired, FileNotFoundError) as e:
-                    results.fail(f"syntax/{rel_path}", str(e))
+
+def check_absolute_paths(file: SkillFile) -> str | None:
+    if file.binary:
+        return SKIPPED
+    hits = ABSOLUTE_PATH_SCANNER.scan_file(file)
+    return f"Hardcoded paths: {describe_hits(hits, 2)}" if hits else None
 
 
 def test_no_absolute_paths(results: TestResults):
     """No hardcoded absolute paths to personal directories."""
-    # Paths that are OK (documentation examples)
-    allowed_patterns = [r"~/.claude/skills/", r"~/.claude/portals/"]
-
-    for skill_dir in get_skill_dirs():
-        name = skill_dir.name
-        for file_path in skill_dir.rglob("*"):
-            if not file_path.is_file():
-                continue
-            try:
-                content = file_path.read_text(encoding="utf-8")
-            except UnicodeDecodeError:
-                continue
-
-            # Check for /home/user or /Users/specific-person type paths
-            bad_paths = re.findall(r"/home/\w+/\.", content)
-            bad_paths += re.findall(r"/Users/\w+/\.", content)
-
-            rel_path = file_path.relative_to(SKILLS_DIR)
-            if bad_paths:
-                results.fail(f"abs-paths/{rel_path}", f"Hardcoded paths: {bad_paths[:2]}")
-            else:
-                results.ok(f"abs-paths/{rel_path}")
+    check_files(results, "abs-paths", get_snapshot().files, check_absolute_paths)
 
 
 def test_readme_skill_count(results: TestResults):
@@ -288,7 +672,7 @@ def test_readme_skill_count(results: TestResults):
         return
 
     content = readme.read_text(encoding="utf-8")
-    actual_count = len(get_skill_dirs())
+    actual_count = len(get_snapshot().skills)
 
     # Check that the stated count matches reality
     if f"{actual_count} production" in content.lower() or f"{actual_count} skills" in content.lower():
@@ -305,8 +689,9 @@ def test_plugin_json(results: TestResults):
         return
 
     import json
+    content = plugin_file.read_text(encoding="utf-8")
     try:
-        data = json.loads(plugin_file.read_text(encoding="utf-8"))
+        data = json.loads(content)
     except json.JSONDecodeError as e:
         results.fail("plugin/valid-json", f"Invalid JSON: {e}")
         return
@@ -321,14 +706,9 @@ def test_plugin_json(results: TestResults):
         results.ok("plugin/required-fields")
 
     # Check no personal references in plugin.json
-    content = plugin_file.read_text(encoding="utf-8")
-    violations = []
-    for pattern in BANNED_PATTERNS:
-        matches = re.findall(pattern, content)
-        if matches:
-            violations.extend(matches)
-    if violations:
-        results.fail("plugin/no-personal-refs", f"Found: {', '.join(set(violations)[:3])}")
+    hits = BANNED_SCANNER.scan_text(content)
+    if hits:
+        results.fail("plugin/no-personal-refs", f"Found: {describe_hits(hits)}")
     else:
         results.ok("plugin/no-personal-refs")
 
@@ -341,8 +721,9 @@ def test_marketplace_json(results: TestResults):
         return
 
     import json
+    content = marketplace_file.read_text(encoding="utf-8")
     try:
-        data = json.loads(marketplace_file.read_text(encoding="utf-8"))
+        data = json.loads(content)
     except json.JSONDecodeError as e:
         results.fail("marketplace/valid-json", f"Invalid JSON: {e}")
         return
@@ -364,86 +745,214 @@ def test_marketplace_json(results: TestResults):
         results.ok(f"marketplace/has-plugins ({len(plugins)})")
 
     # Check no personal references
-    content = marketplace_file.read_text(encoding="utf-8")
-    violations = []
-    for pattern in BANNED_PATTERNS:
-        matches = re.findall(pattern, content)
-        if matches:
-            violations.extend(matches)
-    if violations:
-        results.fail("marketplace/no-personal-refs", f"Found: {', '.join(set(violations)[:3])}")
+    hits = BANNED_SCANNER.scan_text(content)
+    if hits:
+        results.fail("marketplace/no-personal-refs", f"Found: {describe_hits(hits)}")
     else:
         results.ok("marketplace/no-personal-refs")
 
 
-# ---------------------------------------------------------------------------
-# Runner
-# ---------------------------------------------------------------------------
-
-def main():
-    print()
-    print("=" * 60)
-    print("  jord0.skills — Skill Validation Suite")
-    print("=" * 60)
-    print()
-
-    results = TestResults()
-
-    print("[1/11] Skill directories exist")
-    test_all_skills_exist(results)
-    print()
+def test_skill_index(results: TestResults):
+    """skills.index.json matches the tree (file sizes and content hashes)."""
+    try:
+        index = load_index()
+    except (OSError, ValueError, KeyError) as e:
+        results.fail("index/loadable", f"{INDEX_FILE.name}: {e}")
+        return
+    results.ok("index/loadable")
 
-    print("[2/11] YAML frontmatter valid")
-    test_frontmatter(results)
-    print()
+    crlf = get_sections("# Title\r\n\r\n## Usage\r\nText\r\n## When to Invoke \r\n")
+    if crlf == ["Usage", "When to Invoke"]:
+        results.ok("index/crlf-sections")
+    else:
+        results.fail("index/crlf-sections", f"CRLF headers parsed as {crlf}")
 
-    print("[3/11] No personal references")
-    test_no_personal_references(results)
-    print()
+    tree = {skill.name: skill for skill in get_snapshot().skills}
+    for name in sorted(set(tree) | set(index.names())):
+        if name not in index.skills:
+            results.fail(f"index/{name}", "Not in index — run: python tools/skill_index.py build")
+            continue
+        if name not in tree:
+            results.fail(f"index/{name}", "Indexed but missing from skills/")
+            continue
+        indexed = index.files(name)
+        actual = {}
+        for file in tree[name].files:
+            rel_path = file.path.relative_to(tree[name].dir)
+            if not is_ignored(rel_path):
+                actual[rel_path.as_posix()] = file
+        changed = sorted(
+            path for path in set(indexed) | set(actual)
+            if path not in indexed or path not in actual
+            or indexed[path][0] != actual[path].size
+            or indexed[path][1] != file_hash(actual[path])
+        )
+        if changed:
+            results.fail(f"index/{name}", f"Stale ({', '.join(changed[:3])}) — run: python tools/skill_index.py build")
+        else:
+            results.ok(f"index/{name}")
 
-    print("[4/11] Required sections present")
-    test_required_sections(results)
-    print()
 
-    print("[5/11] Names are ALL CAPS")
-    test_skill_names_uppercase(results)
-    print()
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
 
-    print("[6/11] Frontmatter name matches directory")
-    test_frontmatter_name_matches_dir(results)
+REPORT_VERSION = 1
+
+
+def json_report(results: TestResults, total: float) -> str:
+    return json.dumps({
+        "version": REPORT_VERSION,
+        "validator": VALIDATOR_VERSION,
+        "duration_s": round(total, 6),
+        "passed": results.passed,
+        "failed": results.failed,
+        "cached": sum(r["cached"] for r in results.records),
+        "sections": [
+            {"name": sec["name"], "duration_s": round(sec["duration"], 6)}
+            for sec in results.sections
+        ],
+        "checks": [
+            {**{k: v for k, v in r.items() if k != "duration"}, "duration_s": round(r["duration"], 6)}
+            for r in results.records
+        ],
+        "files": {path: round(t, 6) for path, t in sorted(results.file_times().items())},
+    }, indent=2)
+
+
+def junit_report(results: TestResults, total: float) -> str:
+    """JUnit XML: one <testsuite> per section, one <testcase> per check."""
+    import xml.etree.ElementTree as ET
+
+    suites = ET.Element("testsuites", name="skill-validation", tests=str(len(results.records)),
+                        failures=str(results.failed), time=f"{total:.6f}")
+    by_section: dict[str, list[dict]] = {}
+    for record in results.records:
+        by_section.setdefault(record["section"], []).append(record)
+    for sec in results.sections:
+        records = by_section.get(sec["name"], [])
+        suite = ET.SubElement(
+            suites, "testsuite", name=re.sub(r"^\[\d+/\d+\]\s*", "", sec["name"]),
+            tests=str(len(records)), failures=str(sum(r["status"] == "fail" for r in records)),
+            time=f"{sec['duration']:.6f}",
+        )
+        for record in records:
+            classname, _, case = record["name"].partition("/")
+            testcase = ET.SubElement(suite, "testcase", classname=classname,
+                                     name=case or classname, time=f"{record['duration']:.6f}")
+            if record["status"] == "fail":
+                ET.SubElement(testcase, "failure", message=record["reason"])
+    ET.indent(suites)
+    return ET.tostring(suites, encoding="unicode", xml_declaration=True)
+
+
+def print_slowest(results: TestResults, count: int) -> None:
+    """Slowest individual checks and slowest files (all checks summed)."""
+    print(f"  Slowest {count} checks:")
+    for record in sorted(results.records, key=lambda r: r["duration"], reverse=True)[:count]:
+        print(f"    {record['duration'] * 1000:9.2f} ms  {record['name']}")
+    files = sorted(results.file_times().items(), key=lambda item: item[1], reverse=True)[:count]
+    if files:
+        print(f"  Slowest {count} files:")
+        for path, duration in files:
+            print(f"    {duration * 1000:9.2f} ms  {path}")
     print()
 
-    print("[7/11] Script syntax valid")
-    test_scripts_syntax(results)
-    print()
 
-    print("[8/11] No hardcoded absolute paths")
-    test_no_absolute_paths(results)
-    print()
+def run_checks(results: TestResults) -> None:
+    snapshot = get_snapshot()
+    names = ",".join(skill.name for skill in snapshot.skills)
+    skill_mds = [skill.dir / "SKILL.md" for skill in snapshot.skills]
+    plugin_dir = REPO_ROOT / ".claude-plugin"
+
+    sections = [
+        ("Skill directories exist", lambda r: run_cached(
+            r, test_all_skills_exist, [SKILLS_DIR / n / "SKILL.md" for n in EXPECTED_SKILLS],
+            extra=repr([(SKILLS_DIR / n).is_dir() for n in EXPECTED_SKILLS]))),
+        ("YAML frontmatter valid", lambda r: run_cached(r, test_frontmatter, skill_mds, extra=names)),
+        ("No personal references", test_no_personal_references),
+        ("Required sections present",
+         lambda r: run_cached(r, test_required_sections, skill_mds, extra=names)),
+        ("Names are ALL CAPS", lambda r: run_cached(r, test_skill_names_uppercase, [], extra=names)),
+        ("Frontmatter name matches directory",
+         lambda r: run_cached(r, test_frontmatter_name_matches_dir, skill_mds, extra=names)),
+        ("Script syntax valid", test_scripts_syntax),
+        ("No hardcoded absolute paths", test_no_absolute_paths),
+        ("README consistency",
+         lambda r: run_cached(r, test_readme_skill_count, [REPO_ROOT / "README.md"], extra=names)),
+        ("Plugin manifest", lambda r: run_cached(r, test_plugin_json, [plugin_dir / "plugin.json"])),
+        ("Marketplace catalog",
+         lambda r: run_cached(r, test_marketplace_json, [plugin_dir / "marketplace.json"])),
+        ("Skill index", test_skill_index),
+    ]
+    for i, (title, run) in enumerate(sections, 1):
+        results.section(f"[{i}/{len(sections)}] {title}")
+        run(results)
+        results.log()
+    results.finish()
 
-    print("[9/11] README consistency")
-    test_readme_skill_count(results)
-    print()
 
-    print("[10/11] Plugin manifest")
-    test_plugin_json(results)
-    print()
+def main():
+    global CACHE
+    parser = argparse.ArgumentParser(description="jord0.skills — Skill Validation Suite")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"Re-check everything and ignore {CACHE_FILE.name}")
+    parser.add_argument("--format", choices=["text", "json", "junit"], default="text",
+                        help="Report format (json/junit include per-check timings)")
+    parser.add_argument("--output", type=Path,
+                        help="Write the json/junit report here instead of stdout")
+    parser.add_argument("--slowest", type=int, metavar="N",
+                        help="Print the N slowest checks and files")
+    parser.add_argument("--profile", nargs="?", const=REPO_ROOT / "skillcheck.prof", type=Path,
+                        metavar="PATH", help="Run under cProfile and write stats (default: skillcheck.prof)")
+    args = parser.parse_args()
+    CACHE = ResultCache(None if args.no_cache else CACHE_FILE)
+
+    # Text output stays on unless the machine-readable report takes stdout
+    results = TestResults(quiet=args.format != "text" and args.output is None)
+    results.log()
+    results.log("=" * 60)
+    results.log("  jord0.skills — Skill Validation Suite")
+    results.log("=" * 60)
+    results.log()
+
+    start = time.perf_counter()
+    if args.profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.runcall(run_checks, results)
+        profiler.dump_stats(args.profile)
+    else:
+        run_checks(results)
+    total = time.perf_counter() - start
 
-    print("[11/11] Marketplace catalog")
-    test_marketplace_json(results)
-    print()
+    CACHE.save()
 
-    print("=" * 60)
-    total = results.passed + results.failed
+    results.log("=" * 60)
+    count = results.passed + results.failed
     if results.failed == 0:
-        print(f"  ALL {total} CHECKS PASSED")
+        results.log(f"  ALL {count} CHECKS PASSED")
     else:
-        print(f"  {results.passed}/{total} passed, {results.failed} FAILED")
-        print()
+        results.log(f"  {results.passed}/{count} passed, {results.failed} FAILED")
+        results.log()
         for error in results.errors:
-            print(f"  X  {error}")
-    print("=" * 60)
-    print()
+            results.log(f"  X  {error}")
+    results.log("=" * 60)
+    results.log()
+
+    if args.slowest and not results.quiet:
+        print_slowest(results, args.slowest)
+    if args.profile and not results.quiet:
+        print(f"  Profile written to {args.profile} (python -m pstats {args.profile})")
+        print()
+
+    if args.format != "text":
+        report = json_report(results, total) if args.format == "json" else junit_report(results, total)
+        if args.output:
+            args.output.write_text(report + "\n", encoding="utf-8")
+        else:
+            print(report)
 
     sys.exit(1 if results.failed else 0)
 
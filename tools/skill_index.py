@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+jord0.skills — Skill Index
+
+Compiles every skill's frontmatter, section list, file inventory and content
+hashes into .claude-plugin/skills.index.json, so "which skills, which tools,
+what description" is answered with one file read: no directory walk, no
+frontmatter parsing.
+
+Usage:
+    python tools/skill_index.py build     # Rebuild after changing any skill
+    python tools/skill_index.py check     # Exit 1 if the index is stale
+    python tools/skill_index.py list      # Print skills from the index
+
+Loader API:
+    from skill_index import load_index
+    index = load_index()
+    index.names()                    # ["CONCLAVE", "ECHO", ...]
+    index.description("NOTIFY")
+    index.tools("NOTIFY")            # ["Bash", "Read", ...]
+    index.skills_using("WebSearch")
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SKILLS_DIR = REPO_ROOT / "skills"
+INDEX_FILE = REPO_ROOT / ".claude-plugin" / "skills.index.json"
+INDEX_VERSION = 1
+
+# Build artifacts that never ship with a skill
+IGNORED_DIRS = {"__pycache__"}
+IGNORED_SUFFIXES = {".pyc"}
+
+# ---------------------------------------------------------------------------
+# Parsing (shared with tests/test_skills.py)
+# ---------------------------------------------------------------------------
+
+
+def parse_frontmatter(content: str) -> dict[str, str]:
+    """Extract YAML frontmatter from markdown."""
+    if not content.startswith("---"):
+        return {}
+    end = content.index("---", 3)
+    frontmatter_text = content[3:end].strip()
+    result = {}
+    current_key = None
+    current_value = []
+
+    for line in frontmatter_text.splitlines():  # Tolerates CRLF files
+        # Check for key: value
+        match = re.match(r"^(\w[\w-]*):\s*(.*)", line)
+        if match:
+            # Save previous key
+            if current_key:
+                result[current_key] = "\n".join(current_value).strip()
+            current_key = match.group(1)
+            current_value = [match.group(2)] if match.group(2) and not match.group(2) == "|" else []
+        elif current_key and line.startswith("  "):
+            current_value.append(line.strip())
+
+    # Save last key
+    if current_key:
+        result[current_key] = "\n".join(current_value).strip()
+
+    return result
+
+
+def get_sections(content: str) -> list[str]:
+    """Extract ## section headers from markdown (LF or CRLF line endings)."""
+    return re.findall(r"^##[ \t]+([^\r\n]+?)[ \t\r]*$", content, re.MULTILINE)
+
+
+def split_tools(allowed_tools: str) -> list[str]:
+    """'Read, Write, Bash  # comment' -> ['Read', 'Write', 'Bash']."""
+    allowed_tools = allowed_tools.split("#", 1)[0]
+    return [tool.strip() for tool in allowed_tools.split(",") if tool.strip()]
+
+
+# ---------------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------------
+
+
+def is_ignored(rel_path: Path) -> bool:
+    """True for build artifacts (relative to the skill directory)."""
+    return rel_path.suffix in IGNORED_SUFFIXES or bool(IGNORED_DIRS.intersection(rel_path.parts))
+
+
+def iter_skill_files(skill_dir: Path):
+    """Every shipped file in a skill, in a stable order."""
+    for path in sorted(skill_dir.rglob("*")):
+        if path.is_file() and not is_ignored(path.relative_to(skill_dir)):
+            yield path
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def build_entry(skill_dir: Path) -> dict:
+    """Index entry for one skill directory."""
+    files = {}
+    content = ""
+    for path in iter_skill_files(skill_dir):
+        data = path.read_bytes()
+        files[path.relative_to(skill_dir).as_posix()] = [len(data), hash_bytes(data)]
+        if path.name == "SKILL.md" and path.parent == skill_dir:
+            content = data.decode("utf-8")
+    frontmatter = parse_frontmatter(content)
+    return {
+        "name": frontmatter.get("name", skill_dir.name),
+        "description": frontmatter.get("description", ""),
+        "user_invocable": frontmatter.get("user-invocable", "").strip() == "true",
+        "tools": split_tools(frontmatter.get("allowed-tools", "")),
+        "frontmatter": frontmatter,
+        "sections": get_sections(content),
+        "files": files,
+    }
+
+
+def build_index(skills_dir: Path = SKILLS_DIR) -> dict:
+    skill_dirs = sorted(d for d in skills_dir.iterdir() if d.is_dir() and (d / "SKILL.md").exists())
+    return {
+        "version": INDEX_VERSION,
+        "skills": {d.name: build_entry(d) for d in skill_dirs},
+    }
+
+
+def dumps_index(index: dict) -> str:
+    """Compact JSON with one skill per line, so diffs stay readable."""
+    lines = [f'{{"version":{index["version"]},"skills":{{']
+    skills = list(index["skills"].items())
+    for i, (name, entry) in enumerate(skills):
+        comma = "," if i < len(skills) - 1 else ""
+        lines.append(f"{json.dumps(name)}:{json.dumps(entry, separators=(',', ':'))}{comma}")
+    lines.append("}}")
+    return "\n".join(lines) + "\n"
+
+
+def write_index(index: dict, path: Path = INDEX_FILE) -> None:
+    path.write_text(dumps_index(index), encoding="utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Loader
+# ---------------------------------------------------------------------------
+
+
+class SkillIndex:
+    """Read-only view of skills.index.json."""
+
+    def __init__(self, data: dict):
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported skill index version: {data.get('version')!r}")
+        self.skills: dict[str, dict] = data["skills"]
+
+    def names(self) -> list[str]:
+        return list(self.skills)
+
+    def get(self, name: str) -> dict:
+        return self.skills[name]
+
+    def description(self, name: str) -> str:
+        return self.skills[name]["description"]
+
+    def tools(self, name: str) -> list[str]:
+        return self.skills[name]["tools"]
+
+    def skills_using(self, tool: str) -> list[str]:
+        return [name for name, entry in self.skills.items() if tool in entry["tools"]]
+
+    def files(self, name: str) -> dict[str, list]:
+        """{relative path: [size, sha256]} for one skill."""
+        return self.skills[name]["files"]
+
+
+def load_index(path: Path = INDEX_FILE) -> SkillIndex:
+    """Load the compiled index with a single file read."""
+    return SkillIndex(json.loads(path.read_text(encoding="utf-8")))
+
+
+def stale_skills(index: SkillIndex, skills_dir: Path = SKILLS_DIR) -> dict[str, str]:
+    """{skill: reason} for every skill whose index entry no longer matches the tree."""
+    fresh = build_index(skills_dir)["skills"]
+    stale = {}
+    for name in sorted(set(fresh) | set(index.skills)):
+        if name not in index.skills:
+            stale[name] = "not in index"
+        elif name not in fresh:
+            stale[name] = "indexed but missing from skills/"
+        elif fresh[name] != index.skills[name]:
+            changed = sorted(
+                path for path in set(fresh[name]["files"]) | set(index.files(name))
+                if fresh[name]["files"].get(path) != index.files(name).get(path)
+            )
+            stale[name] = f"changed: {', '.join(changed[:3]) or 'metadata'}"
+    return stale
+
+
+def main():
+    parser = argparse.ArgumentParser(description="jord0.skills — compile skills.index.json")
+    parser.add_argument("action", choices=["build", "check", "list"])
+    args = parser.parse_args()
+
+    if args.action == "build":
+        index = build_index()
+        write_index(index)
+        print(f"Indexed {len(index['skills'])} skills -> {INDEX_FILE.relative_to(REPO_ROOT)}")
+
+    elif args.action == "check":
+        try:
+            stale = stale_skills(load_index())
+        except (OSError, ValueError) as e:
+            print(f"Skill index unreadable: {e}", file=sys.stderr)
+            sys.exit(1)
+        for name, reason in stale.items():
+            print(f"  STALE  {name} — {reason}")
+        if stale:
+            print("Run: python tools/skill_index.py build", file=sys.stderr)
+            sys.exit(1)
+        print("Skill index up to date")
+
+    elif args.action == "list":
+        index = load_index()
+        for name in index.names():
+            summary = index.description(name).split("\n", 1)[0]
+            print(f"{name:<10} {', '.join(index.tools(name)):<40} {summary}")
+
+
+if __name__ == "__main__":
+    main()